@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Callable
+
+from namel3ss import ast_nodes
+from namel3ss.ir import IRCollectionKeepRowsStep, IRCollectionPipeline, IRCollectionSortStep, IRCollectionTakeStep
+from namel3ss.runtime.expressions import ExpressionEvaluator, VariableEnvironment
+from namel3ss.runtime.frames import FrameRegistry, FrameSpec
+
+
+class _Interpreted(ExpressionEvaluator):
+    """The evaluator without the compiler: every node goes through the isinstance chain."""
+
+    evaluate = ExpressionEvaluator._evaluate_node
+
+
+def _row_field(name: str) -> ast_nodes.Expr:
+    return ast_nodes.VarRef(name=f"row.{name}", root="row", path=[name])
+
+
+def _shapes() -> dict[str, ast_nodes.Expr]:
+    return {
+        # keep rows where row.amount > 100 and row.status is "open"
+        "filter": ast_nodes.BinaryOp(
+            left=ast_nodes.BinaryOp(left=_row_field("amount"), op=">", right=ast_nodes.Literal(value=100)),
+            op="and",
+            right=ast_nodes.BinaryOp(left=_row_field("status"), op="is", right=ast_nodes.Literal(value="open")),
+        ),
+        # when total * 2 - discount >= limit
+        "condition": ast_nodes.BinaryOp(
+            left=ast_nodes.BinaryOp(
+                left=ast_nodes.BinaryOp(left=ast_nodes.Identifier(name="total"), op="*", right=ast_nodes.Literal(value=2)),
+                op="-",
+                right=ast_nodes.Identifier(name="discount"),
+            ),
+            op=">=",
+            right=ast_nodes.Identifier(name="limit"),
+        ),
+        # get row.region otherwise "unknown"
+        "field_default": ast_nodes.GetRecordFieldWithDefault(
+            record=ast_nodes.Identifier(name="row"), field="region", default=ast_nodes.Literal(value="unknown")
+        ),
+        # not (row.amount < 10 or row.flagged)
+        "negation": ast_nodes.UnaryOp(
+            op="not",
+            operand=ast_nodes.BinaryOp(
+                left=ast_nodes.BinaryOp(left=_row_field("amount"), op="<", right=ast_nodes.Literal(value=10)),
+                op="or",
+                right=_row_field("flagged"),
+            ),
+        ),
+    }
+
+
+def _evaluators() -> tuple[ExpressionEvaluator, ExpressionEvaluator]:
+    env = VariableEnvironment(
+        {
+            "row": {"amount": 250, "status": "open", "flagged": False},
+            "total": 120,
+            "discount": 15,
+            "limit": 200,
+        }
+    )
+
+    def resolver(_name: str) -> tuple[bool, Any]:
+        return False, None
+
+    return ExpressionEvaluator(env, resolver=resolver), _Interpreted(env, resolver=resolver)
+
+
+def _time(fn: Callable[[], Any], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return 1e6 * (time.perf_counter() - start) / iterations
+
+
+def run_benchmark(iterations: int, rows: int) -> dict[str, float]:
+    compiled, interpreted = _evaluators()
+    results: dict[str, float] = {}
+    for name, expr in _shapes().items():
+        compiled.evaluate(expr)  # compile outside the timed loop
+        fast = _time(lambda: compiled.evaluate(expr), iterations)
+        slow = _time(lambda: interpreted.evaluate(expr), iterations)
+        results[f"{name}_us"] = fast
+        results[f"{name}_speedup"] = slow / fast
+
+    registry = FrameRegistry({"orders": FrameSpec(name="orders", backend="memory")})
+    for idx in range(rows):
+        registry.insert("orders", {"amount": idx % 500, "status": "open" if idx % 3 else "closed", "flagged": False})
+    where = _shapes()["filter"]
+    start = time.perf_counter()
+    registry.query("orders", where)
+    results["frame_query_us_per_row"] = 1e6 * (time.perf_counter() - start) / rows
+
+    env = VariableEnvironment({"orders": registry.get_rows("orders")})
+    evaluator = ExpressionEvaluator(env, resolver=lambda _name: (False, None))
+    take = IRCollectionTakeStep(count=ast_nodes.Literal(value=10))
+    pipelines = {
+        "pipeline_keep_take": [IRCollectionKeepRowsStep(condition=where), take],
+        "pipeline_sort_take": [IRCollectionSortStep(kind="rows", key=_row_field("amount"), direction="desc"), take],
+    }
+    for name, steps in pipelines.items():
+        pipeline = IRCollectionPipeline(source=ast_nodes.Identifier(name="orders"), steps=steps)
+        start = time.perf_counter()
+        evaluator.evaluate(pipeline)
+        results[f"{name}_ms"] = 1000 * (time.perf_counter() - start)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compiled vs interpreted evaluation of hot expression shapes.")
+    parser.add_argument("--iterations", type=int, default=50000, help="Evaluations per expression shape")
+    parser.add_argument("--rows", type=int, default=100000, help="Rows in the frame filter and pipeline benchmarks")
+    args = parser.parse_args()
+    for key, value in run_benchmark(args.iterations, args.rows).items():
+        print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
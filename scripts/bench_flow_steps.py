@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from namel3ss.agent.engine import AgentRunner
+from namel3ss.ai.registry import ModelRegistry
+from namel3ss.ai.router import ModelRouter
+from namel3ss.flows.engine import FlowEngine
+from namel3ss.flows.graph import FlowState
+from namel3ss.flows.plan import compiled_flow
+from namel3ss.ir import IRFlow, IRFlowStep, IRProgram
+from namel3ss.runtime.context import ExecutionContext
+from namel3ss.tools.registry import ToolRegistry
+
+
+def _build(steps: int) -> tuple[FlowEngine, IRFlow]:
+    flow = IRFlow(
+        name="bench",
+        description=None,
+        steps=[IRFlowStep(name=f"s{idx}", kind="noop", target=f"s{idx}") for idx in range(steps)],
+    )
+    program = IRProgram(flows={"bench": flow})
+    registry = ModelRegistry()
+    router = ModelRouter(registry)
+    tools = ToolRegistry()
+    engine = FlowEngine(program, registry, tools, AgentRunner(program, registry, tools, router), router)
+    return engine, flow
+
+
+def run_benchmark(steps: int, runs: int) -> dict[str, float]:
+    engine, flow = _build(steps)
+    runtime_ctx = engine._build_runtime_context(ExecutionContext(app_name="bench", request_id="bench"))
+
+    start = time.perf_counter()
+    compiled_flow(flow, engine._resolve_step_kind)
+    compile_seconds = time.perf_counter() - start
+
+    async def _runs() -> None:
+        for _ in range(runs):
+            graph, plan = compiled_flow(flow, engine._resolve_step_kind)
+            result = await engine.a_run_flow(graph, FlowState(), runtime_ctx, flow_name=flow.name, plan=plan)
+            if result.errors:
+                raise RuntimeError(result.errors[0].error)
+
+    start = time.perf_counter()
+    asyncio.run(_runs())
+    elapsed = time.perf_counter() - start
+    return {
+        "steps": steps,
+        "runs": runs,
+        "plan_compile_ms": 1000 * compile_seconds,
+        "us_per_step": 1e6 * elapsed / (steps * runs),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-step driver overhead of compiled flow plans.")
+    parser.add_argument("--steps", type=int, default=1000, help="Number of noop steps in the flow")
+    parser.add_argument("--runs", type=int, default=20, help="Number of runs to average")
+    args = parser.parse_args()
+    for key, value in run_benchmark(args.steps, args.runs).items():
+        print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
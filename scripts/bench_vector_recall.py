@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from namel3ss.rag.models import RAGItem
+from namel3ss.rag.vectorstores.ivf import IVFVectorStore
+from namel3ss.rag.vectorstores.memory import InMemoryVectorStore
+
+
+def _clustered_vectors(count: int, dimension: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    centers = rng.normal(size=(clusters, dimension))
+    labels = rng.integers(0, clusters, size=count)
+    return (centers[labels] + 0.35 * rng.normal(size=(count, dimension))).astype("float32")
+
+
+def run_benchmark(count: int, dimension: int, queries: int, k: int, nprobe: int, nlist: int | None, seed: int) -> dict[str, float]:
+    rng = np.random.default_rng(seed)
+    data = _clustered_vectors(count, dimension, clusters=max(8, count // 500), rng=rng)
+    probes = _clustered_vectors(queries, dimension, clusters=max(8, count // 500), rng=rng)
+    items = [RAGItem(id=str(i), text="", embedding=vec.tolist()) for i, vec in enumerate(data)]
+
+    exact = InMemoryVectorStore()
+    exact.add_sync(items)
+    approx = IVFVectorStore(nlist=nlist, nprobe=nprobe, train_threshold=1)
+    build_start = time.perf_counter()
+    approx.add_sync(items)
+    build_seconds = time.perf_counter() - build_start
+
+    query_list = probes.tolist()
+    start = time.perf_counter()
+    truth = [exact.search(q, top_k=k) for q in query_list]
+    exact_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    found = [approx.search(q, top_k=k) for q in query_list]
+    approx_seconds = time.perf_counter() - start
+
+    hits = 0
+    for expected, actual in zip(truth, found):
+        hits += len({r.item.id for r in expected} & {r.item.id for r in actual})
+    return {
+        "vectors": count,
+        "nlist": len(approx._centroids) if approx._centroids is not None else 0,
+        "nprobe": nprobe,
+        f"recall_at_{k}": hits / float(k * queries),
+        "build_seconds": build_seconds,
+        "exact_ms_per_query": 1000 * exact_seconds / queries,
+        "ivf_ms_per_query": 1000 * approx_seconds / queries,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recall@k and latency of the IVF vector store against exact search.")
+    parser.add_argument("--vectors", type=int, default=50000, help="Number of indexed vectors")
+    parser.add_argument("--dimension", type=int, default=128, help="Embedding dimension")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    parser.add_argument("--k", type=int, default=10, help="Top-k to compare")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16], help="nprobe values to sweep")
+    parser.add_argument("--nlist", type=int, default=None, help="Number of clusters (default sqrt(vectors))")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for nprobe in args.nprobe:
+        summary = run_benchmark(args.vectors, args.dimension, args.queries, args.k, nprobe, args.nlist, args.seed)
+        print("IVF benchmark:")
+        for key, value in summary.items():
+            print(f"  {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
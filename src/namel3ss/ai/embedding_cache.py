@@ -0,0 +1,222 @@
+"""
+Content-addressed embedding cache.
+
+Vectors are keyed by ``sha256(provider, model, text)`` and kept in an
+in-process LRU bounded by a byte budget, with an optional SQLite tier so
+embeddings survive restarts and can be shared between processes. Vectors are
+stored as packed doubles, so a cached embedding is bit-identical to the one
+the provider returned.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from hashlib import sha256
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..observability.metrics import MetricsRegistry, default_metrics
+from ..runtime.singleflight import default_single_flight, single_flight_enabled
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def embedding_cache_key(provider: str, model: str | None, text: str) -> str:
+    digest = sha256()
+    for part in (provider or "unknown", model or "unknown", text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """Two-tier (LRU + optional SQLite) cache of embedding vectors."""
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        path: str | os.PathLike[str] | None = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self.path = str(path) if path is not None else None
+        self.metrics = metrics or default_metrics
+        self._lru: "OrderedDict[str, array]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.path is not None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embedding_cache (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._lru),
+            "bytes": self._bytes,
+        }
+
+    @staticmethod
+    def _entry_bytes(key: str, vector: array) -> int:
+        return len(key) + vector.itemsize * len(vector)
+
+    def _remember(self, key: str, vector: array) -> None:
+        if key in self._lru:
+            self._lru.move_to_end(key)
+            return
+        size = self._entry_bytes(key, vector)
+        if size > self.max_bytes:
+            return
+        self._lru[key] = vector
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            old_key, old_vector = self._lru.popitem(last=False)
+            self._bytes -= self._entry_bytes(old_key, old_vector)
+            self.evictions += 1
+
+    def _lookup(self, keys: Sequence[str]) -> Dict[str, array]:
+        found: Dict[str, array] = {}
+        missing: List[str] = []
+        for key in keys:
+            vector = self._lru.get(key)
+            if vector is None:
+                missing.append(key)
+            else:
+                self._lru.move_to_end(key)
+                found[key] = vector
+        if missing and self._conn is not None:
+            for start in range(0, len(missing), 500):
+                chunk = missing[start : start + 500]
+                placeholders = ",".join("?" for _ in chunk)
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embedding_cache WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    vector = array("d")
+                    vector.frombytes(blob)
+                    found[key] = vector
+                    self._remember(key, vector)
+        return found
+
+    def _store(self, entries: List[Tuple[str, array]]) -> None:
+        for key, vector in entries:
+            self._remember(key, vector)
+        if entries and self._conn is not None:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache (key, vector) VALUES (?, ?)",
+                [(key, vector.tobytes()) for key, vector in entries],
+            )
+            self._conn.commit()
+
+    def get_or_embed(
+        self,
+        provider: str,
+        model: str | None,
+        texts: Sequence[str],
+        embed: Callable[[List[str]], List[List[float]]],
+    ) -> List[List[float]]:
+        """
+        Return one vector per text, calling ``embed`` once with only the
+        distinct texts that are not cached.
+        """
+        keys = [embedding_cache_key(provider, model, text) for text in texts]
+        with self._lock:
+            found = self._lookup(keys)
+        pending: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                pending.setdefault(key, text)
+        misses = sum(1 for key in keys if key not in found)
+        hits = len(keys) - misses
+        if pending:
+            batch = list(pending.values())
+            if single_flight_enabled():
+                # concurrent callers embedding the same uncached batch share one provider call
+                flight_key = sha256("\0".join(pending.keys()).encode("utf-8")).hexdigest()
+                vectors = default_single_flight.do(
+                    flight_key, lambda: embed(batch), kind="embedding", name=f"{provider}:{model or 'unknown'}"
+                )
+            else:
+                vectors = embed(batch)
+            entries = [(key, array("d", vector)) for key, vector in zip(pending.keys(), vectors)]
+            with self._lock:
+                self._store(entries)
+            fresh = dict(zip(pending.keys(), vectors))
+        else:
+            fresh = {}
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+        try:
+            self.metrics.record_embedding_cache(provider, model or "unknown", hits=hits, misses=misses)
+        except Exception:
+            pass
+        return [list(fresh[key]) if key in fresh else found[key].tolist() for key in keys]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+            self._bytes = 0
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM embedding_cache")
+                self._conn.commit()
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+_default_cache: EmbeddingCache | None = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_embedding_cache() -> EmbeddingCache | None:
+    """
+    The process-wide cache built from ``N3_EMBEDDING_CACHE_*`` settings
+    (enabled by default, in-process only unless a path is given), shared by
+    every embedding router and registry.
+    """
+    global _default_cache
+    enabled = os.getenv("N3_EMBEDDING_CACHE_ENABLED", "1").strip().lower() in {"1", "true", "yes", "on"}
+    if not enabled:
+        return None
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                try:
+                    max_bytes = int(os.getenv("N3_EMBEDDING_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+                except (TypeError, ValueError):
+                    max_bytes = DEFAULT_MAX_BYTES
+                _default_cache = EmbeddingCache(max_bytes=max_bytes, path=os.getenv("N3_EMBEDDING_CACHE_PATH") or None)
+    return _default_cache
+
+
+def reset_default_embedding_cache() -> None:
+    """Forget the process-wide cache so the next lookup rereads the environment."""
+    global _default_cache
+    with _default_cache_lock:
+        cache, _default_cache = _default_cache, None
+    if cache is not None:
+        cache.close()
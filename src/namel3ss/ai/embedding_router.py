@@ -6,15 +6,17 @@ from typing import Dict, Optional, Sequence
 
 from ..errors import Namel3ssError
 from ..secrets.manager import SecretsManager, get_default_secrets_manager
+from .embedding_cache import EmbeddingCache, get_default_embedding_cache
 from .embeddings import EmbeddingBatchResult, EmbeddingProvider, DeterministicEmbeddingProvider
 from .embeddings.http_generic import HTTPEmbeddingProvider
 from .embeddings.openai import OpenAIEmbeddingProvider
 
 
 class EmbeddingRouter:
-    def __init__(self, secrets: Optional[SecretsManager] = None) -> None:
+    def __init__(self, secrets: Optional[SecretsManager] = None, embedding_cache: Optional[EmbeddingCache] = None) -> None:
         self.secrets = secrets or get_default_secrets_manager()
         self._cache: Dict[str, EmbeddingProvider] = {}
+        self.embedding_cache = embedding_cache if embedding_cache is not None else get_default_embedding_cache()
 
     def _provider_from_prefix(self, prefix: str, model: Optional[str]) -> EmbeddingProvider:
         if prefix in self._cache:
@@ -56,10 +58,32 @@ class EmbeddingRouter:
                 model,
             )
             chosen_model = self.secrets.get_embedding_model() or self.secrets.get("N3_DEFAULT_EMBEDDING_MODEL")
-            return provider.embed(texts, model=chosen_model)
+            return self._embed_cached(chosen_provider, provider, texts, chosen_model)
         if ":" in model:
             prefix, model_name = model.split(":", 1)
         else:
             prefix, model_name = model, None
         provider = self._provider_from_prefix(prefix, model_name)
-        return provider.embed(texts, model=model_name)
+        return self._embed_cached(prefix, provider, texts, model_name)
+
+    def _embed_cached(
+        self, prefix: str, provider: EmbeddingProvider, texts: Sequence[str], model: str | None
+    ) -> EmbeddingBatchResult:
+        if self.embedding_cache is None:
+            return provider.embed(texts, model=model)
+        results: list[EmbeddingBatchResult] = []
+
+        def embed_misses(misses: list[str]) -> list[list[float]]:
+            result = provider.embed(misses, model=model)
+            results.append(result)
+            return result.vectors
+
+        vectors = self.embedding_cache.get_or_embed(prefix, model, texts, embed_misses)
+        fresh = results[0] if results else None
+        return EmbeddingBatchResult(
+            vectors=vectors,
+            dim=len(vectors[0]) if vectors else 0,
+            model_name=fresh.model_name if fresh is not None else (model or getattr(provider, "model", None) or "unknown"),
+            # raw provider payload only describes the batch when nothing was served from cache
+            raw=fresh.raw if fresh is not None and len(fresh.vectors) == len(texts) else None,
+        )
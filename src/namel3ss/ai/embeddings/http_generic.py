@@ -2,11 +2,10 @@
 
 from __future__ import annotations
 
-import json
-import urllib.request
 from typing import Any, Callable, Dict, Optional, Sequence
 
 from ...errors import Namel3ssError
+from ..transport import get_transport
 from . import EmbeddingBatchResult
 
 HttpClient = Callable[[str, Dict[str, Any], Dict[str, str]], Dict[str, Any]]
@@ -48,8 +47,4 @@ class HTTPEmbeddingProvider:
         return EmbeddingBatchResult(vectors=vectors, dim=dim, model_name=model or self.model, raw=data)
 
     def _default_http_client(self, url: str, body: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
-        payload = json.dumps(body).encode("utf-8")
-        req = urllib.request.Request(url, data=payload, headers=headers, method="POST")
-        with urllib.request.urlopen(req, timeout=15) as resp:  # pragma: no cover - live calls
-            text = resp.read().decode("utf-8")
-            return json.loads(text)
+        return get_transport().post_json(url, body, headers)
@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
+import threading
+import weakref
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional, TypedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, TypedDict
 
 from ..models import ModelResponse, ModelStreamChunk
+from ..transport import default_provider_concurrency, get_transport
+
+AsyncHttpClient = Callable[[str, Dict[str, Any], Dict[str, str]], Awaitable[Dict[str, Any]]]
+AsyncHttpStreamClient = Callable[[str, Dict[str, Any], Dict[str, str]], AsyncIterator[Dict[str, Any]]]
 
 
 class ToolSchema(TypedDict, total=False):
@@ -40,6 +48,11 @@ class ModelProvider(ABC):
         self.supports_tools: bool = False
         # Providers that implement streaming should set this to True.
         self.supports_streaming: bool = False
+        # Async calls allowed in flight at once (agenerate/astream); None uses N3_PROVIDER_MAX_CONCURRENCY.
+        self.max_concurrency: int | None = None
+        self._async_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
 
     @abstractmethod
     def generate(self, messages: List[Dict[str, str]], **kwargs: Any) -> ModelResponse:
@@ -49,6 +62,29 @@ class ModelProvider(ABC):
     def stream(self, messages: List[Dict[str, str]], **kwargs: Any) -> Iterable[ModelStreamChunk]:
         """Stream responses as an iterable of chunks."""
 
+    async def agenerate(self, messages: List[Dict[str, str]], **kwargs: Any) -> ModelResponse:
+        """
+        Async generate(). Providers with a native async HTTP path override this;
+        the default runs generate() in a worker thread.
+        """
+        async with self._async_slot():
+            return await asyncio.to_thread(self.generate, messages, **kwargs)
+
+    async def astream(self, messages: List[Dict[str, str]], **kwargs: Any) -> AsyncIterator[ModelStreamChunk]:
+        """Async stream(); the default drives stream() from a worker thread."""
+        async with self._async_slot():
+            async for chunk in iterate_in_thread(lambda: self.stream(messages, **kwargs)):
+                yield chunk
+
+    @asynccontextmanager
+    async def _async_slot(self) -> AsyncIterator[None]:
+        loop = asyncio.get_running_loop()
+        slots = self._async_slots.get(loop)
+        if slots is None:
+            slots = self._async_slots[loop] = asyncio.Semaphore(self.max_concurrency or default_provider_concurrency())
+        async with slots:
+            yield
+
     # Backwards-compatibility wrappers
     def invoke(self, messages: List[Dict[str, str]], **kwargs: Any) -> ModelResponse:
         return self.generate(messages, **kwargs)
@@ -83,6 +119,72 @@ class ModelProvider(ABC):
         return self.stream(messages, **kwargs)
 
 
+class TransportClients:
+    """
+    Default HTTP hooks for providers, backed by the shared keep-alive transport.
+    Injected http_client/http_stream hooks switch the native async path off,
+    so agenerate/astream run the injected hook in a worker thread instead.
+    """
+
+    _async_http_client: Optional[AsyncHttpClient] = None
+    _async_http_stream: Optional[AsyncHttpStreamClient] = None
+
+    def _init_async_clients(self, http_client: Any = None, http_stream: Any = None) -> None:
+        self._async_http_client = None if http_client else self._default_async_http_client
+        self._async_http_stream = None if http_stream else self._default_async_http_stream
+
+    def _default_http_client(self, url: str, body: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
+        return get_transport().post_json(url, body, headers)
+
+    def _default_http_stream(self, url: str, body: Dict[str, Any], headers: Dict[str, str]) -> Iterable[Dict[str, Any]]:
+        return get_transport().stream_json(url, body, headers)
+
+    async def _default_async_http_client(self, url: str, body: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
+        return await get_transport().apost_json(url, body, headers)
+
+    def _default_async_http_stream(
+        self, url: str, body: Dict[str, Any], headers: Dict[str, str]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        return get_transport().astream_json(url, body, headers)
+
+
+async def iterate_in_thread(make_iterable: Any) -> AsyncIterator[Any]:
+    """Drive a blocking iterable in a worker thread and yield its items on the event loop."""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+    done = object()
+
+    def _put(item: Any) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:  # the loop closed under us
+            stop.set()
+
+    def _produce() -> None:
+        try:
+            for item in make_iterable():
+                if stop.is_set():
+                    return
+                _put((True, item))
+        except BaseException as exc:  # handed to the consumer
+            _put((False, exc))
+        else:
+            _put((True, done))
+
+    loop.run_in_executor(None, _produce)
+    try:
+        while True:
+            ok, item = await queue.get()
+            if not ok:
+                raise item
+            if item is done:
+                break
+            yield item
+    finally:
+        stop.set()
+
+
 class DummyProvider(ModelProvider):
     """Deterministic provider used for tests/CI."""
 
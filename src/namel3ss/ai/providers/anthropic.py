@@ -2,19 +2,17 @@
 
 from __future__ import annotations
 
-import json
-import urllib.request
-from typing import Any, Callable, Dict, Iterable, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
 
 from ...errors import Namel3ssError
 from ..models import ModelResponse, ModelStreamChunk, TokenUsage
-from . import ModelProvider
+from . import ModelProvider, TransportClients
 
 HttpClient = Callable[[str, Dict[str, Any], Dict[str, str]], Dict[str, Any]]
 HttpStreamClient = Callable[[str, Dict[str, Any], Dict[str, str]], Iterable[Dict[str, Any]]]
 
 
-class AnthropicProvider(ModelProvider):
+class AnthropicProvider(TransportClients, ModelProvider):
     """Claude provider for text/JSON generation with optional streaming."""
 
     def __init__(
@@ -31,6 +29,7 @@ class AnthropicProvider(ModelProvider):
         self.base_url = base_url or "https://api.anthropic.com/v1/messages"
         self._http_client = http_client or self._default_http_client
         self._http_stream = http_stream or self._default_http_stream
+        self._init_async_clients(http_client, http_stream)
         self.supports_streaming = True
         self.supports_tools = False
 
@@ -52,7 +51,7 @@ class AnthropicProvider(ModelProvider):
             )
         return converted
 
-    def generate(self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any) -> ModelResponse:
+    def _build_body(self, messages: List[Dict[str, str]], json_mode: bool, stream: bool, **kwargs: Any) -> Dict[str, Any]:
         if not self.api_key:
             raise Namel3ssError("Anthropic API key missing for provider")
         model = kwargs.get("model") or self.default_model
@@ -63,9 +62,26 @@ class AnthropicProvider(ModelProvider):
             "messages": self._convert_messages(messages),
             "max_tokens": kwargs.get("max_tokens", 1024),
         }
-        if json_mode:
+        if stream:
+            body["stream"] = True
+        elif json_mode:
             body["system"] = (kwargs.get("system") or "") + "\nReturn JSON."
+        return body
+
+    def generate(self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any) -> ModelResponse:
+        body = self._build_body(messages, json_mode, False, **kwargs)
         data = self._http_client(self.base_url, body, self._build_headers())
+        return self._to_response(messages, body, data)
+
+    async def agenerate(self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any) -> ModelResponse:
+        if self._async_http_client is None:
+            return await super().agenerate(messages, json_mode=json_mode, **kwargs)
+        body = self._build_body(messages, json_mode, False, **kwargs)
+        async with self._async_slot():
+            data = await self._async_http_client(self.base_url, body, self._build_headers())
+        return self._to_response(messages, body, data)
+
+    def _to_response(self, messages: List[Dict[str, str]], body: Dict[str, Any], data: Any) -> ModelResponse:
         text = ""
         if isinstance(data, dict):
             content = data.get("content") or []
@@ -81,7 +97,7 @@ class AnthropicProvider(ModelProvider):
             )
         return ModelResponse(
             provider=self.name,
-            model=model,
+            model=body["model"],
             messages=messages,
             text=text,
             raw=data,
@@ -89,28 +105,33 @@ class AnthropicProvider(ModelProvider):
         )
 
     def stream(self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any) -> Iterable[ModelStreamChunk]:
-        if not self.api_key:
-            raise Namel3ssError("Anthropic API key missing for provider")
-        model = kwargs.get("model") or self.default_model
-        if not model:
-            raise Namel3ssError("Anthropic model name is required")
-        body: Dict[str, Any] = {
-            "model": model,
-            "messages": self._convert_messages(messages),
-            "max_tokens": kwargs.get("max_tokens", 1024),
-            "stream": True,
-        }
+        body = self._build_body(messages, json_mode, True, **kwargs)
         for chunk in self._http_stream(self.base_url, body, self._build_headers()):
-            delta = ""
-            if isinstance(chunk, dict):
-                delta = chunk.get("delta", {}).get("text", "") or chunk.get("text", "") or ""
-            yield ModelStreamChunk(
-                provider=self.name,
-                model=model,
-                delta=delta,
-                raw=chunk,
-                is_final=False,
-            )
+            yield self._to_chunk(body, chunk)
+
+    async def astream(
+        self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any
+    ) -> AsyncIterator[ModelStreamChunk]:
+        if self._async_http_stream is None:
+            async for chunk in super().astream(messages, json_mode=json_mode, **kwargs):
+                yield chunk
+            return
+        body = self._build_body(messages, json_mode, True, **kwargs)
+        async with self._async_slot():
+            async for chunk in self._async_http_stream(self.base_url, body, self._build_headers()):
+                yield self._to_chunk(body, chunk)
+
+    def _to_chunk(self, body: Dict[str, Any], chunk: Any) -> ModelStreamChunk:
+        delta = ""
+        if isinstance(chunk, dict):
+            delta = chunk.get("delta", {}).get("text", "") or chunk.get("text", "") or ""
+        return ModelStreamChunk(
+            provider=self.name,
+            model=body["model"],
+            delta=delta,
+            raw=chunk,
+            is_final=False,
+        )
 
     def chat_with_tools(
         self,
@@ -121,13 +142,3 @@ class AnthropicProvider(ModelProvider):
         **kwargs: Any,
     ):
         raise Namel3ssError("AnthropicProvider does not support tool calling yet.")
-
-    def _default_http_client(self, url: str, body: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
-        payload = json.dumps(body).encode("utf-8")
-        req = urllib.request.Request(url, data=payload, headers=headers, method="POST")
-        with urllib.request.urlopen(req, timeout=15) as resp:  # pragma: no cover - live calls
-            text = resp.read().decode("utf-8")
-            return json.loads(text)
-
-    def _default_http_stream(self, url: str, body: Dict[str, Any], headers: Dict[str, str]) -> Iterable[Dict[str, Any]]:
-        yield self._default_http_client(url, body, headers)
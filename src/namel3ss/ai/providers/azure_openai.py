@@ -2,20 +2,18 @@
 
 from __future__ import annotations
 
-import json
 import urllib.parse
-import urllib.request
-from typing import Any, Callable, Dict, Iterable, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
 
 from ...errors import Namel3ssError
 from ..models import ModelResponse, ModelStreamChunk, TokenUsage
-from . import ChatToolResponse, ModelProvider
+from . import ChatToolResponse, ModelProvider, TransportClients
 
 HttpClient = Callable[[str, Dict[str, Any], Dict[str, str]], Dict[str, Any]]
 HttpStreamClient = Callable[[str, Dict[str, Any], Dict[str, str]], Iterable[Dict[str, Any]]]
 
 
-class AzureOpenAIProvider(ModelProvider):
+class AzureOpenAIProvider(TransportClients, ModelProvider):
     """
     Azure-hosted OpenAI compatible provider. Uses deployment + api_version instead of model name.
     """
@@ -38,6 +36,7 @@ class AzureOpenAIProvider(ModelProvider):
         self.api_version = api_version
         self._http_client = http_client or self._default_http_client
         self._http_stream = http_stream or self._default_http_stream
+        self._init_async_clients(http_client, http_stream)
         self.supports_tools = True
         self.supports_streaming = True
 
@@ -60,14 +59,32 @@ class AzureOpenAIProvider(ModelProvider):
             total_tokens=usage.get("total_tokens"),
         )
 
-    def generate(self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any) -> ModelResponse:
+    def _build_body(self, messages: List[Dict[str, str]], json_mode: bool, stream: bool, **kwargs: Any) -> Dict[str, Any]:
         body: Dict[str, Any] = {"messages": messages}
+        if stream:
+            body["stream"] = True
         if json_mode:
             body["response_format"] = {"type": "json_object"}
         for key in ("temperature", "top_p", "max_tokens", "seed", "frequency_penalty", "presence_penalty"):
             if key in kwargs and kwargs[key] is not None:
                 body[key] = kwargs[key]
+        return body
+
+    def generate(self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any) -> ModelResponse:
+        body = self._build_body(messages, json_mode, False, **kwargs)
         data = self._http_client(self._endpoint(), body, self._headers())
+        return self._to_response(messages, data)
+
+    async def agenerate(self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any) -> ModelResponse:
+        if self._async_http_client is None:
+            return await super().agenerate(messages, json_mode=json_mode, **kwargs)
+        body = self._build_body(messages, json_mode, False, **kwargs)
+        headers = self._headers()
+        async with self._async_slot():
+            data = await self._async_http_client(self._endpoint(), body, headers)
+        return self._to_response(messages, data)
+
+    def _to_response(self, messages: List[Dict[str, str]], data: Any) -> ModelResponse:
         content = ""
         finish_reason = None
         if isinstance(data, dict):
@@ -87,39 +104,40 @@ class AzureOpenAIProvider(ModelProvider):
         )
 
     def stream(self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any) -> Iterable[ModelStreamChunk]:
-        body: Dict[str, Any] = {"messages": messages, "stream": True}
-        if json_mode:
-            body["response_format"] = {"type": "json_object"}
-        for key in ("temperature", "top_p", "max_tokens", "seed", "frequency_penalty", "presence_penalty"):
-            if key in kwargs and kwargs[key] is not None:
-                body[key] = kwargs[key]
+        body = self._build_body(messages, json_mode, True, **kwargs)
         for chunk in self._http_stream(self._endpoint(), body, self._headers()):
-            delta = ""
-            finish_reason = None
-            if isinstance(chunk, dict):
-                choices = chunk.get("choices") or []
-                if choices:
-                    choice = choices[0]
-                    delta = choice.get("delta", {}).get("content", "") or ""
-                    finish_reason = choice.get("finish_reason")
-            yield ModelStreamChunk(
-                provider=self.name,
-                model=self.deployment,
-                delta=delta,
-                raw=chunk,
-                finish_reason=finish_reason,
-                is_final=finish_reason is not None,
-            )
-
-    def _default_http_client(self, url: str, body: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
-        payload = json.dumps(body).encode("utf-8")
-        req = urllib.request.Request(url, data=payload, headers=headers, method="POST")
-        with urllib.request.urlopen(req, timeout=15) as resp:  # pragma: no cover - live calls
-            text = resp.read().decode("utf-8")
-            return json.loads(text)
-
-    def _default_http_stream(self, url: str, body: Dict[str, Any], headers: Dict[str, str]) -> Iterable[Dict[str, Any]]:
-        yield self._default_http_client(url, body, headers)
+            yield self._to_chunk(chunk)
+
+    async def astream(
+        self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any
+    ) -> AsyncIterator[ModelStreamChunk]:
+        if self._async_http_stream is None:
+            async for chunk in super().astream(messages, json_mode=json_mode, **kwargs):
+                yield chunk
+            return
+        body = self._build_body(messages, json_mode, True, **kwargs)
+        headers = self._headers()
+        async with self._async_slot():
+            async for chunk in self._async_http_stream(self._endpoint(), body, headers):
+                yield self._to_chunk(chunk)
+
+    def _to_chunk(self, chunk: Any) -> ModelStreamChunk:
+        delta = ""
+        finish_reason = None
+        if isinstance(chunk, dict):
+            choices = chunk.get("choices") or []
+            if choices:
+                choice = choices[0]
+                delta = choice.get("delta", {}).get("content", "") or ""
+                finish_reason = choice.get("finish_reason")
+        return ModelStreamChunk(
+            provider=self.name,
+            model=self.deployment,
+            delta=delta,
+            raw=chunk,
+            finish_reason=finish_reason,
+            is_final=finish_reason is not None,
+        )
 
     def chat_with_tools(
         self,
@@ -131,9 +149,7 @@ class AzureOpenAIProvider(ModelProvider):
     ):
         if not self.api_key:
             raise Namel3ssError("Azure OpenAI API key missing for provider")
-        body: Dict[str, Any] = {"messages": messages}
-        if json_mode:
-            body["response_format"] = {"type": "json_object"}
+        body = self._build_body(messages, json_mode, False, **kwargs)
         if tools:
             normalized: List[Dict[str, Any]] = []
             for tool in tools:
@@ -153,9 +169,6 @@ class AzureOpenAIProvider(ModelProvider):
             body["tools"] = normalized
         if tool_choice:
             body["tool_choice"] = tool_choice
-        for key in ("temperature", "top_p", "max_tokens", "seed", "frequency_penalty", "presence_penalty"):
-            if key in kwargs and kwargs[key] is not None:
-                body[key] = kwargs[key]
         data = self._http_client(self._endpoint(), body, self._headers())
         tool_calls: List[Dict[str, Any]] = []
         content = ""
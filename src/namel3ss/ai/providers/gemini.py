@@ -4,18 +4,17 @@ from __future__ import annotations
 
 import json
 import urllib.parse
-import urllib.request
-from typing import Any, Callable, Dict, Iterable, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
 
 from ...errors import Namel3ssError
 from ..models import ModelResponse, ModelStreamChunk
-from . import ChatToolResponse, ModelProvider
+from . import ChatToolResponse, ModelProvider, TransportClients
 
 HttpClient = Callable[[str, Dict[str, Any], Dict[str, str]], Dict[str, Any]]
 HttpStreamClient = Callable[[str, Dict[str, Any], Dict[str, str]], Iterable[Dict[str, Any]]]
 
 
-class GeminiProvider(ModelProvider):
+class GeminiProvider(TransportClients, ModelProvider):
     """Google Gemini provider (non-streaming for now)."""
 
     def __init__(
@@ -32,24 +31,44 @@ class GeminiProvider(ModelProvider):
         self.base_url = base_url or "https://generativelanguage.googleapis.com/v1beta"
         self._http_client = http_client or self._default_http_client
         self._http_stream = http_stream or self._default_http_stream
+        self._init_async_clients(http_client, http_stream)
         self.supports_tools = True
         self.supports_streaming = True
 
     def _build_url(self, model: str) -> str:
         return urllib.parse.urljoin(self.base_url + "/", f"models/{model}:generateContent")
 
-    def generate(self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any) -> ModelResponse:
+    def _build_request(
+        self, messages: List[Dict[str, str]], json_mode: bool, stream: bool, **kwargs: Any
+    ) -> Tuple[str, str, Dict[str, Any]]:
         if not self.api_key:
             raise Namel3ssError("Gemini API key missing for provider")
         model = kwargs.get("model") or self.default_model
         if not model:
             raise Namel3ssError("Gemini model name is required")
         contents = [{"role": msg.get("role", "user"), "parts": [{"text": msg.get("content", "")}]} for msg in messages]
-        body = {"contents": contents}
+        body: Dict[str, Any] = {"contents": contents}
+        if stream:
+            body["stream"] = True
         if json_mode:
             body["generationConfig"] = {"responseMimeType": "application/json"}
         url = f"{self._build_url(model)}?key={urllib.parse.quote(self.api_key)}"
+        return model, url, body
+
+    def generate(self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any) -> ModelResponse:
+        model, url, body = self._build_request(messages, json_mode, False, **kwargs)
         data = self._http_client(url, body, {"Content-Type": "application/json"})
+        return self._to_response(messages, model, json_mode, data)
+
+    async def agenerate(self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any) -> ModelResponse:
+        if self._async_http_client is None:
+            return await super().agenerate(messages, json_mode=json_mode, **kwargs)
+        model, url, body = self._build_request(messages, json_mode, False, **kwargs)
+        async with self._async_slot():
+            data = await self._async_http_client(url, body, {"Content-Type": "application/json"})
+        return self._to_response(messages, model, json_mode, data)
+
+    def _to_response(self, messages: List[Dict[str, str]], model: str, json_mode: bool, data: Any) -> ModelResponse:
         text = ""
         if isinstance(data, dict):
             candidates = data.get("candidates") or []
@@ -66,53 +85,47 @@ class GeminiProvider(ModelProvider):
         return ModelResponse(provider=self.name, model=model, messages=messages, text=text, raw=data, json=parsed_json)
 
     def stream(self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any) -> Iterable[ModelStreamChunk]:
-        if not self.api_key:
-            raise Namel3ssError("Gemini API key missing for provider")
-        model = kwargs.get("model") or self.default_model
-        if not model:
-            raise Namel3ssError("Gemini model name is required")
-        contents = [{"role": msg.get("role", "user"), "parts": [{"text": msg.get("content", "")}]} for msg in messages]
-        body = {"contents": contents, "stream": True}
-        if json_mode:
-            body["generationConfig"] = {"responseMimeType": "application/json"}
-        url = f"{self._build_url(model)}?key={urllib.parse.quote(self.api_key)}"
-        chunks = self._http_stream(url, body, {"Content-Type": "application/json"})
-        for raw_chunk in chunks:
-            delta = ""
-            finish_reason = None
-            if isinstance(raw_chunk, dict):
-                candidates = raw_chunk.get("candidates") or []
-                if candidates:
-                    parts = candidates[0].get("content", {}).get("parts", [])
-                    if parts:
-                        delta = parts[0].get("text", "") or ""
-                    finish_reason = candidates[0].get("finish_reason")
-            chunk_json = None
-            if json_mode and delta:
-                try:
-                    chunk_json = json.loads(delta)
-                except json.JSONDecodeError as exc:
-                    raise Namel3ssError(f"Gemini returned invalid JSON: {exc}") from exc
-            yield ModelStreamChunk(
-                provider=self.name,
-                model=model,
-                delta=delta,
-                raw=raw_chunk,
-                json=chunk_json,
-                finish_reason=finish_reason,
-                is_final=finish_reason is not None,
-            )
-
-    def _default_http_client(self, url: str, body: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
-        payload = json.dumps(body).encode("utf-8")
-        req = urllib.request.Request(url, data=payload, headers=headers, method="POST")
-        with urllib.request.urlopen(req, timeout=15) as resp:  # pragma: no cover - live calls
-            text = resp.read().decode("utf-8")
-            return json.loads(text)
-
-    def _default_http_stream(self, url: str, body: Dict[str, Any], headers: Dict[str, str]) -> Iterable[Dict[str, Any]]:
-        # Basic fallback: reuse non-streaming client and wrap as a single chunk.
-        yield self._default_http_client(url, body, headers)
+        model, url, body = self._build_request(messages, json_mode, True, **kwargs)
+        for raw_chunk in self._http_stream(url, body, {"Content-Type": "application/json"}):
+            yield self._to_chunk(model, json_mode, raw_chunk)
+
+    async def astream(
+        self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any
+    ) -> AsyncIterator[ModelStreamChunk]:
+        if self._async_http_stream is None:
+            async for chunk in super().astream(messages, json_mode=json_mode, **kwargs):
+                yield chunk
+            return
+        model, url, body = self._build_request(messages, json_mode, True, **kwargs)
+        async with self._async_slot():
+            async for raw_chunk in self._async_http_stream(url, body, {"Content-Type": "application/json"}):
+                yield self._to_chunk(model, json_mode, raw_chunk)
+
+    def _to_chunk(self, model: str, json_mode: bool, raw_chunk: Any) -> ModelStreamChunk:
+        delta = ""
+        finish_reason = None
+        if isinstance(raw_chunk, dict):
+            candidates = raw_chunk.get("candidates") or []
+            if candidates:
+                parts = candidates[0].get("content", {}).get("parts", [])
+                if parts:
+                    delta = parts[0].get("text", "") or ""
+                finish_reason = candidates[0].get("finish_reason")
+        chunk_json = None
+        if json_mode and delta:
+            try:
+                chunk_json = json.loads(delta)
+            except json.JSONDecodeError as exc:
+                raise Namel3ssError(f"Gemini returned invalid JSON: {exc}") from exc
+        return ModelStreamChunk(
+            provider=self.name,
+            model=model,
+            delta=delta,
+            raw=raw_chunk,
+            json=chunk_json,
+            finish_reason=finish_reason,
+            is_final=finish_reason is not None,
+        )
 
     def chat_with_tools(
         self,
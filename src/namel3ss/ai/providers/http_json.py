@@ -2,14 +2,12 @@
 
 from __future__ import annotations
 
-import json
 import urllib.parse
-import urllib.request
-from typing import Any, Callable, Dict, Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from ...errors import Namel3ssError
 from ..models import ModelResponse, ModelStreamChunk
-from . import ModelProvider
+from . import ModelProvider, TransportClients
 
 HttpClient = Callable[[str, Dict[str, Any], Dict[str, str]], Dict[str, Any]]
 
@@ -24,7 +22,7 @@ def _traverse_path(data: Dict[str, Any], path: str) -> Any:
     return node
 
 
-class HTTPJsonProvider(ModelProvider):
+class HTTPJsonProvider(TransportClients, ModelProvider):
     def __init__(
         self,
         name: str,
@@ -40,18 +38,34 @@ class HTTPJsonProvider(ModelProvider):
         self.path = path or ""
         self.response_path = response_path
         self._http_client = http_client or self._default_http_client
+        self._init_async_clients(http_client)
         self._headers = headers or {"Content-Type": "application/json"}
         self.supports_streaming = False
         self.supports_tools = False
 
-    def generate(self, messages: List[Dict[str, str]], **kwargs: Any) -> ModelResponse:
+    def _build_request(self, messages: List[Dict[str, str]], **kwargs: Any) -> Tuple[str, Dict[str, Any]]:
         model_name = kwargs.get("model") or self.default_model or "http-json"
         url = urllib.parse.urljoin(self.base_url.rstrip("/") + "/", self.path.lstrip("/"))
         body: Dict[str, Any] = {"model": model_name, "messages": messages}
         extra_params = {k: v for k, v in kwargs.items() if k not in {"model", "json_mode"} and v is not None}
         if extra_params:
             body["parameters"] = extra_params
+        return url, body
+
+    def generate(self, messages: List[Dict[str, str]], **kwargs: Any) -> ModelResponse:
+        url, body = self._build_request(messages, **kwargs)
         data = self._http_client(url, body, dict(self._headers))
+        return self._to_response(messages, body["model"], data)
+
+    async def agenerate(self, messages: List[Dict[str, str]], **kwargs: Any) -> ModelResponse:
+        if self._async_http_client is None:
+            return await super().agenerate(messages, **kwargs)
+        url, body = self._build_request(messages, **kwargs)
+        async with self._async_slot():
+            data = await self._async_http_client(url, body, dict(self._headers))
+        return self._to_response(messages, body["model"], data)
+
+    def _to_response(self, messages: List[Dict[str, str]], model_name: str, data: Any) -> ModelResponse:
         content = self._extract_content(data)
         return ModelResponse(
             provider=self.name,
@@ -70,13 +84,6 @@ class HTTPJsonProvider(ModelProvider):
             is_final=True,
         )
 
-    def _default_http_client(self, url: str, body: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
-        payload = json.dumps(body).encode("utf-8")
-        req = urllib.request.Request(url, data=payload, headers=headers, method="POST")
-        with urllib.request.urlopen(req, timeout=15) as resp:  # pragma: no cover - live calls
-            text = resp.read().decode("utf-8")
-            return json.loads(text)
-
     def _extract_content(self, data: Dict[str, Any]) -> Any:
         if self.response_path:
             return _traverse_path(data, self.response_path)
@@ -2,19 +2,17 @@
 
 from __future__ import annotations
 
-import json
-import urllib.request
-from typing import Any, Callable, Dict, Iterable, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
 
 from ...errors import Namel3ssError
 from ..models import ModelResponse, ModelStreamChunk
-from . import ModelProvider
+from . import ModelProvider, TransportClients
 
 HttpClient = Callable[[str, Dict[str, Any], Dict[str, str]], Dict[str, Any]]
 HttpStreamClient = Callable[[str, Dict[str, Any], Dict[str, str]], Iterable[Dict[str, Any]]]
 
 
-class OllamaProvider(ModelProvider):
+class OllamaProvider(TransportClients, ModelProvider):
     """Local Ollama HTTP provider."""
 
     def __init__(
@@ -29,6 +27,7 @@ class OllamaProvider(ModelProvider):
         self.base_url = base_url.rstrip("/")
         self._http_client = http_client or self._default_http_client
         self._http_stream = http_stream or self._default_http_stream
+        self._init_async_clients(http_client, http_stream)
         self.supports_streaming = True
         self.supports_tools = False
 
@@ -47,6 +46,19 @@ class OllamaProvider(ModelProvider):
         if json_mode:
             body.setdefault("format", "json")
         data = self._http_client(f"{self.base_url}/api/chat", body, {"Content-Type": "application/json"})
+        return self._to_response(messages, body, data)
+
+    async def agenerate(self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any) -> ModelResponse:
+        if self._async_http_client is None:
+            return await super().agenerate(messages, json_mode=json_mode, **kwargs)
+        body = self._build_body(messages, False, **kwargs)
+        if json_mode:
+            body.setdefault("format", "json")
+        async with self._async_slot():
+            data = await self._async_http_client(f"{self.base_url}/api/chat", body, {"Content-Type": "application/json"})
+        return self._to_response(messages, body, data)
+
+    def _to_response(self, messages: List[Dict[str, str]], body: Dict[str, Any], data: Any) -> ModelResponse:
         text = ""
         if isinstance(data, dict):
             text = data.get("message", {}).get("content", data.get("response", "")) or ""
@@ -63,26 +75,35 @@ class OllamaProvider(ModelProvider):
         if json_mode:
             body.setdefault("format", "json")
         for chunk in self._http_stream(f"{self.base_url}/api/chat", body, {"Content-Type": "application/json"}):
-            delta = ""
-            if isinstance(chunk, dict):
-                delta = chunk.get("message", {}).get("content", chunk.get("response", "")) or ""
-            yield ModelStreamChunk(
-                provider=self.name,
-                model=body["model"],
-                delta=delta,
-                raw=chunk,
-                is_final=bool(chunk.get("done")) if isinstance(chunk, dict) else False,
-            )
+            yield self._to_chunk(body, chunk)
 
-    def _default_http_client(self, url: str, body: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
-        payload = json.dumps(body).encode("utf-8")
-        req = urllib.request.Request(url, data=payload, headers=headers, method="POST")
-        with urllib.request.urlopen(req, timeout=15) as resp:  # pragma: no cover - live calls
-            text = resp.read().decode("utf-8")
-            return json.loads(text)
+    async def astream(
+        self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any
+    ) -> AsyncIterator[ModelStreamChunk]:
+        if self._async_http_stream is None:
+            async for chunk in super().astream(messages, json_mode=json_mode, **kwargs):
+                yield chunk
+            return
+        body = self._build_body(messages, True, **kwargs)
+        if json_mode:
+            body.setdefault("format", "json")
+        async with self._async_slot():
+            async for chunk in self._async_http_stream(
+                f"{self.base_url}/api/chat", body, {"Content-Type": "application/json"}
+            ):
+                yield self._to_chunk(body, chunk)
 
-    def _default_http_stream(self, url: str, body: Dict[str, Any], headers: Dict[str, str]) -> Iterable[Dict[str, Any]]:
-        yield self._default_http_client(url, body, headers)
+    def _to_chunk(self, body: Dict[str, Any], chunk: Any) -> ModelStreamChunk:
+        delta = ""
+        if isinstance(chunk, dict):
+            delta = chunk.get("message", {}).get("content", chunk.get("response", "")) or ""
+        return ModelStreamChunk(
+            provider=self.name,
+            model=body["model"],
+            delta=delta,
+            raw=chunk,
+            is_final=bool(chunk.get("done")) if isinstance(chunk, dict) else False,
+        )
 
     def chat_with_tools(
         self,
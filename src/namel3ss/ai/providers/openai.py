@@ -3,21 +3,21 @@
 from __future__ import annotations
 
 import json
-import urllib.request
-from typing import Any, Callable, Dict, Iterable, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
 
 from ...errors import Namel3ssError
 from ..models import ModelResponse, ModelStreamChunk, TokenUsage
-from . import ChatToolResponse, ModelProvider, ToolCallResult
+from . import ChatToolResponse, ModelProvider, ToolCallResult, TransportClients
 
 HttpClient = Callable[[str, Dict[str, Any], Dict[str, str]], Dict[str, Any]]
 HttpStreamClient = Callable[[str, Dict[str, Any], Dict[str, str]], Iterable[Dict[str, Any]]]
 
 
-class OpenAIProvider(ModelProvider):
+class OpenAIProvider(TransportClients, ModelProvider):
     """
     OpenAI-compatible chat provider supporting messages, JSON mode, and streaming.
-    The http_client/http_stream parameters allow deterministic mocking in tests.
+    The http_client/http_stream parameters allow deterministic mocking in tests;
+    when they are injected, agenerate/astream run them in a worker thread.
     """
 
     def __init__(
@@ -35,6 +35,7 @@ class OpenAIProvider(ModelProvider):
         self.base_url = base_url or "https://api.openai.com/v1/chat/completions"
         self._http_client = http_client or self._default_http_client
         self._http_stream = http_stream or self._default_http_stream
+        self._init_async_clients(http_client, http_stream)
         self._extra_headers = extra_headers or {}
         self.supports_tools = True
         self.supports_streaming = True
@@ -95,11 +96,26 @@ class OpenAIProvider(ModelProvider):
             total_tokens=usage.get("total_tokens"),
         )
 
-    def generate(self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any) -> ModelResponse:
+    def _check_auth(self) -> None:
         if not self.api_key and "Authorization" not in self._extra_headers:
             raise Namel3ssError("OpenAI API key missing for provider")
+
+    def generate(self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any) -> ModelResponse:
+        self._check_auth()
         body = self._build_body(messages, json_mode, **kwargs)
         data = self._http_client(self.base_url, body, self._build_headers())
+        return self._to_response(messages, body, data)
+
+    async def agenerate(self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any) -> ModelResponse:
+        if self._async_http_client is None:
+            return await super().agenerate(messages, json_mode=json_mode, **kwargs)
+        self._check_auth()
+        body = self._build_body(messages, json_mode, **kwargs)
+        async with self._async_slot():
+            data = await self._async_http_client(self.base_url, body, self._build_headers())
+        return self._to_response(messages, body, data)
+
+    def _to_response(self, messages: List[Dict[str, str]], body: Dict[str, Any], data: Any) -> ModelResponse:
         content = ""
         finish_reason = None
         if isinstance(data, dict):
@@ -119,27 +135,43 @@ class OpenAIProvider(ModelProvider):
         )
 
     def stream(self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any) -> Iterable[ModelStreamChunk]:
-        if not self.api_key and "Authorization" not in self._extra_headers:
-            raise Namel3ssError("OpenAI API key missing for provider")
+        self._check_auth()
         body = self._build_body(messages, json_mode, **kwargs)
         body["stream"] = True
         for chunk in self._http_stream(self.base_url, body, self._build_headers()):
-            delta = ""
-            finish_reason = None
-            if isinstance(chunk, dict):
-                choices = chunk.get("choices") or []
-                if choices:
-                    choice = choices[0]
-                    delta = choice.get("delta", {}).get("content", "") or ""
-                    finish_reason = choice.get("finish_reason")
-            yield ModelStreamChunk(
-                provider=self.name,
-                model=body["model"],
-                delta=delta,
-                raw=chunk,
-                finish_reason=finish_reason,
-                is_final=finish_reason is not None,
-            )
+            yield self._to_chunk(body, chunk)
+
+    async def astream(
+        self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any
+    ) -> AsyncIterator[ModelStreamChunk]:
+        if self._async_http_stream is None:
+            async for chunk in super().astream(messages, json_mode=json_mode, **kwargs):
+                yield chunk
+            return
+        self._check_auth()
+        body = self._build_body(messages, json_mode, **kwargs)
+        body["stream"] = True
+        async with self._async_slot():
+            async for chunk in self._async_http_stream(self.base_url, body, self._build_headers()):
+                yield self._to_chunk(body, chunk)
+
+    def _to_chunk(self, body: Dict[str, Any], chunk: Any) -> ModelStreamChunk:
+        delta = ""
+        finish_reason = None
+        if isinstance(chunk, dict):
+            choices = chunk.get("choices") or []
+            if choices:
+                choice = choices[0]
+                delta = choice.get("delta", {}).get("content", "") or ""
+                finish_reason = choice.get("finish_reason")
+        return ModelStreamChunk(
+            provider=self.name,
+            model=body["model"],
+            delta=delta,
+            raw=chunk,
+            finish_reason=finish_reason,
+            is_final=finish_reason is not None,
+        )
 
     def chat_with_tools(
         self,
@@ -149,8 +181,7 @@ class OpenAIProvider(ModelProvider):
         json_mode: bool = False,
         **kwargs: Any,
     ) -> ChatToolResponse:
-        if not self.api_key and "Authorization" not in self._extra_headers:
-            raise Namel3ssError("OpenAI API key missing for provider")
+        self._check_auth()
         body = self._build_body(messages, json_mode, tools=tools, tool_choice=tool_choice, **kwargs)
         data = self._http_client(self.base_url, body, self._build_headers())
         tool_calls: List[ToolCallResult] = []
@@ -184,15 +215,3 @@ class OpenAIProvider(ModelProvider):
             raw=data,
             finish_reason=finish_reason,
         )
-
-    # Default HTTP client implementations (stdlib)
-    def _default_http_client(self, url: str, body: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
-        payload = json.dumps(body).encode("utf-8")
-        req = urllib.request.Request(url, data=payload, headers=headers, method="POST")
-        with urllib.request.urlopen(req, timeout=15) as resp:  # pragma: no cover - live calls
-            text = resp.read().decode("utf-8")
-            return json.loads(text)
-
-    def _default_http_stream(self, url: str, body: Dict[str, Any], headers: Dict[str, str]) -> Iterable[Dict[str, Any]]:
-        # For simplicity, reuse non-streaming client and wrap as a single chunk.
-        yield self._default_http_client(url, body, headers)
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
 
 from ...errors import Namel3ssError
 from .openai import HttpClient, HttpStreamClient, OpenAIProvider
@@ -44,3 +44,14 @@ class OpenAICompatibleProvider(OpenAIProvider):
         if not self.base_url:
             raise Namel3ssError("OpenAI-compatible provider requires base_url")
         return super().stream(messages, json_mode=json_mode, **kwargs)
+
+    async def agenerate(self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any):
+        if not self.base_url:
+            raise Namel3ssError("OpenAI-compatible provider requires base_url")
+        return await super().agenerate(messages, json_mode=json_mode, **kwargs)
+
+    async def astream(self, messages: List[Dict[str, str]], json_mode: bool = False, **kwargs: Any) -> AsyncIterator[Any]:
+        if not self.base_url:
+            raise Namel3ssError("OpenAI-compatible provider requires base_url")
+        async for chunk in super().astream(messages, json_mode=json_mode, **kwargs):
+            yield chunk
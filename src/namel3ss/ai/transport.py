@@ -0,0 +1,578 @@
+"""
+Shared HTTP transport for model and embedding providers.
+
+Connections are kept alive and reused per (scheme, host, port), so repeated
+provider calls skip the TCP/TLS handshake. The blocking API pools
+``http.client`` connections; the async API speaks HTTP/1.1 directly over
+``asyncio`` streams with its own per-event-loop pools. With
+``N3_PROVIDER_HTTP2`` on and ``httpx`` and ``h2`` installed, the async API
+goes through an HTTP/2 ``httpx.AsyncClient`` instead.
+
+Errors match ``urllib.request.urlopen`` on either path: non-2xx responses
+raise ``urllib.error.HTTPError`` and connection failures raise
+``urllib.error.URLError``, so existing retry and auth handling keeps working.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import email.message
+import http.client
+import io
+import json
+import os
+import socket
+import ssl
+import threading
+import urllib.error
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+try:  # pragma: no cover - optional dependency
+    import h2  # noqa: F401
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+__all__ = [
+    "HttpResponse",
+    "HttpTransport",
+    "default_provider_concurrency",
+    "http2_enabled",
+    "get_transport",
+    "reset_transport",
+]
+
+DEFAULT_TIMEOUT = 15.0
+_STALE_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError, http.client.BadStatusLine)
+
+_HostKey = Tuple[str, str, int]
+
+
+def http2_enabled() -> bool:
+    """Whether async calls may use HTTP/2 (``N3_PROVIDER_HTTP2``, default off)."""
+    return os.getenv("N3_PROVIDER_HTTP2", "0").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def default_provider_concurrency() -> int:
+    """Async calls allowed in flight per provider (``N3_PROVIDER_MAX_CONCURRENCY``, default 16)."""
+    try:
+        return max(1, int(os.getenv("N3_PROVIDER_MAX_CONCURRENCY", "16")))
+    except ValueError:
+        return 16
+
+
+@dataclass
+class HttpResponse:
+    status: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+    @property
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.body.decode("utf-8"))
+
+
+def _split(url: str) -> Tuple[_HostKey, str]:
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in {"http", "https"} or not parts.hostname:
+        raise urllib.error.URLError(f"unsupported URL: {url}")
+    port = parts.port or (443 if scheme == "https" else 80)
+    target = parts.path or "/"
+    if parts.query:
+        target = f"{target}?{parts.query}"
+    return (scheme, parts.hostname, port), target
+
+
+def _http_error(url: str, status: int, reason: str, headers: Dict[str, str], body: bytes) -> urllib.error.HTTPError:
+    message = email.message.Message()
+    for name, value in headers.items():
+        message[name] = value
+    return urllib.error.HTTPError(url, status, reason, message, io.BytesIO(body))
+
+
+def _json_body(body: Any, headers: Optional[Dict[str, str]]) -> Tuple[bytes, Dict[str, str]]:
+    merged = dict(headers or {})
+    if not any(name.lower() == "content-type" for name in merged):
+        merged["Content-Type"] = "application/json"
+    return json.dumps(body).encode("utf-8"), merged
+
+
+def _is_event_stream(headers: Dict[str, str]) -> bool:
+    return "text/event-stream" in headers.get("content-type", "")
+
+
+def _decode_line(line: bytes, event_stream: bool) -> Tuple[bool, Any]:
+    """Decode one streamed line; returns (done, payload) where payload None means skip."""
+    text = line.decode("utf-8").strip()
+    if not text:
+        return False, None
+    if event_stream or text.startswith("data:"):
+        if not text.startswith("data:"):
+            # event:, id:, retry: and comment lines carry no payload
+            return False, None
+        text = text[5:].strip()
+        if text == "[DONE]":
+            return True, None
+        if not text:
+            return False, None
+    return False, json.loads(text)
+
+
+class HttpTransport:
+    """Keep-alive HTTP client shared by providers; see the module docstring."""
+
+    def __init__(self, max_idle_per_host: int = 8, http2: bool | None = None) -> None:
+        self.max_idle_per_host = max_idle_per_host
+        self.http2 = httpx is not None and (http2_enabled() if http2 is None else bool(http2))
+        self._idle: Dict[_HostKey, List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._ssl_context: ssl.SSLContext | None = None
+        # per event loop: idle asyncio connections, and the httpx client when HTTP/2 is on
+        self._async_idle: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[_HostKey, list]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._httpx_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+    # --- blocking API -------------------------------------------------
+
+    def _ssl(self) -> ssl.SSLContext:
+        if self._ssl_context is None:
+            self._ssl_context = ssl.create_default_context()
+        return self._ssl_context
+
+    def _checkout(self, key: _HostKey, timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+        if conn is not None:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            return conn, True
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl()), False
+        return http.client.HTTPConnection(host, port, timeout=timeout), False
+
+    def _checkin(self, key: _HostKey, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _open(
+        self, method: str, url: str, body: bytes | None, headers: Dict[str, str], timeout: float
+    ) -> Tuple[_HostKey, http.client.HTTPConnection, http.client.HTTPResponse]:
+        key, target = _split(url)
+        while True:
+            conn, reused = self._checkout(key, timeout)
+            try:
+                conn.request(method, target, body=body, headers=headers)
+                return key, conn, conn.getresponse()
+            except _STALE_ERRORS:
+                conn.close()
+                if not reused:
+                    raise
+                # the server dropped an idle keep-alive connection; retry on a fresh one
+            except (socket.timeout, TimeoutError):
+                conn.close()
+                raise
+            except OSError as exc:
+                conn.close()
+                raise urllib.error.URLError(exc) from exc
+            except BaseException:
+                conn.close()
+                raise
+
+    def _finish(self, key: _HostKey, conn: http.client.HTTPConnection, resp: http.client.HTTPResponse) -> None:
+        if resp.will_close:
+            conn.close()
+        else:
+            self._checkin(key, conn)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        raise_for_status: bool = True,
+    ) -> HttpResponse:
+        key, conn, resp = self._open(method, url, body, dict(headers or {}), timeout)
+        try:
+            data = resp.read()
+        except BaseException:
+            conn.close()
+            raise
+        self._finish(key, conn, resp)
+        result = HttpResponse(resp.status, {k.lower(): v for k, v in resp.getheaders()}, data)
+        if raise_for_status and not 200 <= resp.status < 300:
+            raise _http_error(url, resp.status, resp.reason, result.headers, data)
+        return result
+
+    def post_json(
+        self, url: str, body: Any, headers: Optional[Dict[str, str]] = None, timeout: float = DEFAULT_TIMEOUT
+    ) -> Any:
+        payload, merged = _json_body(body, headers)
+        return self.request("POST", url, payload, merged, timeout).json()
+
+    def stream_json(
+        self, url: str, body: Any, headers: Optional[Dict[str, str]] = None, timeout: float = DEFAULT_TIMEOUT
+    ) -> Iterator[Any]:
+        """POST ``body`` and yield decoded JSON events (server-sent events, JSON lines, or one JSON document)."""
+        payload, merged = _json_body(body, headers)
+        key, conn, resp = self._open("POST", url, payload, merged, timeout)
+        done = False
+        try:
+            resp_headers = {k.lower(): v for k, v in resp.getheaders()}
+            if not 200 <= resp.status < 300:
+                raise _http_error(url, resp.status, resp.reason, resp_headers, resp.read())
+            if "application/json" in resp_headers.get("content-type", ""):
+                text = resp.read()
+                done = True
+                yield from _json_document(text)
+                return
+            event_stream = _is_event_stream(resp_headers)
+            while True:
+                line = resp.readline()
+                if not line:
+                    done = True
+                    break
+                finished, item = _decode_line(line, event_stream)
+                if finished:
+                    resp.read()
+                    done = True
+                    break
+                if item is not None:
+                    yield item
+        finally:
+            if done:
+                self._finish(key, conn, resp)
+            else:
+                conn.close()
+
+    # --- async API ----------------------------------------------------
+
+    def _httpx_client(self) -> Any:
+        loop = asyncio.get_running_loop()
+        client = self._httpx_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                http2=True, limits=httpx.Limits(max_keepalive_connections=self.max_idle_per_host)
+            )
+            self._httpx_clients[loop] = client
+        return client
+
+    async def _aconnect(self, key: _HostKey, timeout: float) -> Tuple["_AsyncConnection", bool]:
+        pools = self._async_idle.setdefault(asyncio.get_running_loop(), {})
+        idle = pools.get(key)
+        while idle:
+            conn = idle.pop()
+            if not conn.reader.at_eof() and not conn.writer.is_closing():
+                return conn, True
+            conn.close()
+        scheme, host, port = key
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port, ssl=self._ssl() if scheme == "https" else None),
+                timeout,
+            )
+        except (asyncio.TimeoutError, TimeoutError):
+            raise
+        except OSError as exc:
+            raise urllib.error.URLError(exc) from exc
+        return _AsyncConnection(reader, writer), False
+
+    def _acheckin(self, key: _HostKey, conn: "_AsyncConnection") -> None:
+        pools = self._async_idle.setdefault(asyncio.get_running_loop(), {})
+        idle = pools.setdefault(key, [])
+        if len(idle) < self.max_idle_per_host:
+            idle.append(conn)
+        else:
+            conn.close()
+
+    async def _aopen(
+        self, method: str, url: str, body: bytes | None, headers: Dict[str, str], timeout: float
+    ) -> Tuple[_HostKey, "_AsyncConnection", "_AsyncResponse"]:
+        key, target = _split(url)
+        while True:
+            conn, reused = await self._aconnect(key, timeout)
+            try:
+                await asyncio.wait_for(conn.send(method, key, target, headers, body), timeout)
+                resp = await asyncio.wait_for(conn.read_head(), timeout)
+                return key, conn, resp
+            except (asyncio.IncompleteReadError, ConnectionError, http.client.BadStatusLine):
+                conn.close()
+                if not reused:
+                    raise
+            except BaseException:
+                conn.close()
+                raise
+
+    async def arequest(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        raise_for_status: bool = True,
+    ) -> HttpResponse:
+        if self.http2:  # pragma: no cover - needs httpx and h2
+            try:
+                resp = await self._httpx_client().request(method, url, content=body, headers=headers, timeout=timeout)
+            except httpx.TransportError as exc:
+                raise urllib.error.URLError(exc) from exc
+            result = HttpResponse(resp.status_code, {k.lower(): v for k, v in resp.headers.items()}, resp.content)
+            reason = resp.reason_phrase
+        else:
+            key, conn, head = await self._aopen(method, url, body, dict(headers or {}), timeout)
+            try:
+                data = await asyncio.wait_for(head.read_all(), timeout)
+            except BaseException:
+                conn.close()
+                raise
+            if head.complete and head.reusable:
+                self._acheckin(key, conn)
+            else:
+                conn.close()
+            result = HttpResponse(head.status, head.headers, data)
+            reason = head.reason
+        if raise_for_status and not 200 <= result.status < 300:
+            raise _http_error(url, result.status, reason, result.headers, result.body)
+        return result
+
+    async def apost_json(
+        self, url: str, body: Any, headers: Optional[Dict[str, str]] = None, timeout: float = DEFAULT_TIMEOUT
+    ) -> Any:
+        payload, merged = _json_body(body, headers)
+        return (await self.arequest("POST", url, payload, merged, timeout)).json()
+
+    async def astream_json(
+        self, url: str, body: Any, headers: Optional[Dict[str, str]] = None, timeout: float = DEFAULT_TIMEOUT
+    ) -> AsyncIterator[Any]:
+        """Async counterpart of ``stream_json``; ``timeout`` bounds each read, not the whole stream."""
+        payload, merged = _json_body(body, headers)
+        if self.http2:  # pragma: no cover - needs httpx and h2
+            try:
+                async with self._httpx_client().stream(
+                    "POST", url, content=payload, headers=merged, timeout=timeout
+                ) as resp:
+                    resp_headers = {k.lower(): v for k, v in resp.headers.items()}
+                    if not 200 <= resp.status_code < 300:
+                        raise _http_error(url, resp.status_code, resp.reason_phrase, resp_headers, await resp.aread())
+                    if "application/json" in resp_headers.get("content-type", ""):
+                        for item in _json_document(await resp.aread()):
+                            yield item
+                        return
+                    event_stream = _is_event_stream(resp_headers)
+                    async for line in resp.aiter_lines():
+                        finished, item = _decode_line(line.encode("utf-8"), event_stream)
+                        if finished:
+                            return
+                        if item is not None:
+                            yield item
+            except httpx.TransportError as exc:
+                raise urllib.error.URLError(exc) from exc
+            return
+        key, conn, head = await self._aopen("POST", url, payload, merged, timeout)
+        try:
+            if not 200 <= head.status < 300:
+                raise _http_error(url, head.status, head.reason, head.headers, await head.read_all())
+            if "application/json" in head.headers.get("content-type", ""):
+                text = await asyncio.wait_for(head.read_all(), timeout)
+                for item in _json_document(text):
+                    yield item
+                return
+            event_stream = _is_event_stream(head.headers)
+            buffer = b""
+            async for piece in head.iter_body(timeout):
+                buffer += piece
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    finished, item = _decode_line(line, event_stream)
+                    if finished:
+                        await head.read_all()
+                        return
+                    if item is not None:
+                        yield item
+            finished, item = _decode_line(buffer, event_stream)
+            if item is not None:
+                yield item
+        finally:
+            if head.complete and head.reusable:
+                self._acheckin(key, conn)
+            else:
+                conn.close()
+
+    def close(self) -> None:
+        """Close idle blocking connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    async def aclose(self) -> None:
+        """Close the running event loop's idle connections; call before a short-lived loop ends."""
+        loop = asyncio.get_running_loop()
+        for conns in self._async_idle.pop(loop, {}).values():
+            for conn in conns:
+                conn.close()
+                await conn.writer.wait_closed()
+        client = self._httpx_clients.pop(loop, None)
+        if client is not None:  # pragma: no cover - needs httpx and h2
+            await client.aclose()
+
+
+def _json_document(data: bytes) -> Iterator[Any]:
+    text = data.decode("utf-8")
+    try:
+        yield json.loads(text)
+    except json.JSONDecodeError:
+        # some servers label JSON lines as application/json
+        for line in text.splitlines():
+            if line.strip():
+                yield json.loads(line)
+
+
+class _AsyncConnection:
+    __slots__ = ("reader", "writer")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+
+    async def send(self, method: str, key: _HostKey, target: str, headers: Dict[str, str], body: bytes | None) -> None:
+        scheme, host, port = key
+        default_port = 443 if scheme == "https" else 80
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {host if port == default_port else f'{host}:{port}'}"]
+        names = {name.lower() for name in headers}
+        for name, value in headers.items():
+            lines.append(f"{name}: {value}")
+        if "content-length" not in names:
+            lines.append(f"Content-Length: {len(body or b'')}")
+        if "connection" not in names:
+            lines.append("Connection: keep-alive")
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if body:
+            self.writer.write(body)
+        await self.writer.drain()
+
+    async def read_head(self) -> "_AsyncResponse":
+        while True:
+            status_line = (await self.reader.readuntil(b"\r\n")).decode("latin-1").rstrip("\r\n")
+            parts = status_line.split(" ", 2)
+            if len(parts) < 2 or not parts[0].startswith("HTTP/") or not parts[1].isdigit():
+                raise http.client.BadStatusLine(status_line)
+            headers: Dict[str, str] = {}
+            while True:
+                line = (await self.reader.readuntil(b"\r\n")).decode("latin-1").rstrip("\r\n")
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                name = name.strip().lower()
+                value = value.strip()
+                headers[name] = f"{headers[name]}, {value}" if name in headers else value
+            status = int(parts[1])
+            if 100 <= status < 200:
+                # interim responses (100 Continue) have no body
+                continue
+            return _AsyncResponse(self.reader, parts[0], status, parts[2] if len(parts) > 2 else "", headers)
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class _AsyncResponse:
+    __slots__ = ("reader", "status", "reason", "headers", "reusable", "complete", "_body")
+
+    def __init__(self, reader: asyncio.StreamReader, version: str, status: int, reason: str, headers: Dict[str, str]):
+        self.reader = reader
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        connection = headers.get("connection", "").lower()
+        self.reusable = (
+            version == "HTTP/1.1"
+            and connection != "close"
+            and ("content-length" in headers or "chunked" in headers.get("transfer-encoding", "").lower())
+        )
+        # set once the whole body has been read off the connection
+        self.complete = False
+        self._body: AsyncIterator[bytes] | None = None
+
+    def iter_body(self, timeout: float) -> AsyncIterator[bytes]:
+        """Body pieces; calling this again resumes the same iterator."""
+        if self._body is None:
+            self._body = self._read_body(timeout)
+        return self._body
+
+    async def _read_body(self, timeout: float) -> AsyncIterator[bytes]:
+        async for piece in self._read_pieces(timeout):
+            yield piece
+        self.complete = True
+
+    async def _read_pieces(self, timeout: float) -> AsyncIterator[bytes]:
+        if "chunked" in self.headers.get("transfer-encoding", "").lower():
+            while True:
+                size_line = await asyncio.wait_for(self.reader.readuntil(b"\r\n"), timeout)
+                size = int(size_line.split(b";", 1)[0].strip(), 16)
+                if size == 0:
+                    # skip trailers up to the blank line
+                    while (await asyncio.wait_for(self.reader.readuntil(b"\r\n"), timeout)) != b"\r\n":
+                        pass
+                    return
+                chunk = await asyncio.wait_for(self.reader.readexactly(size + 2), timeout)
+                yield chunk[:-2]
+        elif "content-length" in self.headers:
+            remaining = int(self.headers["content-length"])
+            while remaining > 0:
+                chunk = await asyncio.wait_for(self.reader.read(min(remaining, 65536)), timeout)
+                if not chunk:
+                    raise asyncio.IncompleteReadError(b"", remaining)
+                remaining -= len(chunk)
+                yield chunk
+        else:
+            while True:
+                chunk = await asyncio.wait_for(self.reader.read(65536), timeout)
+                if not chunk:
+                    return
+                yield chunk
+
+    async def read_all(self) -> bytes:
+        pieces = [piece async for piece in self.iter_body(DEFAULT_TIMEOUT)]
+        return b"".join(pieces)
+
+
+_transport: HttpTransport | None = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> HttpTransport:
+    """The process-wide transport used by providers' default HTTP clients."""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = HttpTransport()
+    return _transport
+
+
+def reset_transport() -> None:
+    """Drop the shared transport and its idle connections (tests, fork)."""
+    global _transport
+    with _transport_lock:
+        transport, _transport = _transport, None
+    if transport is not None:
+        transport.close()
@@ -92,6 +92,7 @@ class AICallDecl:
     memory: Optional["AiMemoryConfig"] = None
     memory_profiles: List[str] = field(default_factory=list)
     tools: List[AiToolBinding] = field(default_factory=list)
+    semantic_cache: Optional["AiSemanticCacheConfig"] = None
     span: Optional[Span] = None
 
 
@@ -256,6 +257,17 @@ class AiMemoryConfig:
     span: Optional[Span] = None
 
 
+@dataclass
+class AiSemanticCacheConfig:
+    """semantic_cache: reuse answers to prompts similar to earlier ones."""
+
+    threshold: Optional[float] = None
+    ttl_seconds: Optional[int] = None
+    embedding_model: Optional[str] = None
+    max_entries: Optional[int] = None
+    span: Optional[Span] = None
+
+
 @dataclass
 class FrameDecl:
     """frame \"name\": data source and query."""
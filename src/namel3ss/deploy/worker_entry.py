@@ -1,16 +1,21 @@
 """
 Worker entrypoint for deployed environments.
+
+``N3_WORKER_CONCURRENCY`` sets the number of concurrent job slots per process
+and ``N3_WORKER_PROCESSES`` the number of worker processes; more than one
+process only makes sense with a persistent job store
+(``N3_ENABLE_PERSISTENT_JOBS``).
 """
 
 from __future__ import annotations
 
-import asyncio
 import os
 from pathlib import Path
 
 from namel3ss.server import create_app
 from namel3ss.runtime.engine import Engine
-from namel3ss.distributed.workers import Worker
+from namel3ss.runtime.program_cache import ProgramCache
+from namel3ss.distributed.workers import Worker, run_worker_processes
 from namel3ss.distributed.queue import global_job_queue
 from namel3ss.obs.tracer import Tracer
 
@@ -22,19 +27,33 @@ def _load_source() -> str:
     return ""
 
 
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
 def build_worker() -> Worker:
     code = _load_source()
+    concurrency = _env_int("N3_WORKER_CONCURRENCY", 1)
+    runtime_cache = ProgramCache(
+        # like runtime_factory, deployed workers always run the bundled program
+        compile_fn=lambda _source: Engine._load_program(code or "", filename="<string>"),
+        engine_factory=lambda program: Engine(program, trigger_manager=None),
+    )
     return Worker(
         runtime_factory=lambda _: Engine.from_source(code or "", trigger_manager=None),
         job_queue=global_job_queue,
         tracer=Tracer(),
+        concurrency=concurrency,
+        runtime_cache=runtime_cache,
     )
 
 
-async def main() -> None:
-    worker = build_worker()
-    await worker.run_forever()
+def main() -> None:
+    run_worker_processes(build_worker, processes=_env_int("N3_WORKER_PROCESSES", 1))
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
@@ -5,7 +5,7 @@ Distributed runtime primitives for Namel3ss.
 from .models import Job
 from .queue import JobQueue, global_job_queue
 from .scheduler import JobScheduler
-from .workers import Worker
+from .workers import Worker, run_worker_processes
 from .file_watcher import FileWatcher
 
-__all__ = ["Job", "JobQueue", "JobScheduler", "Worker", "global_job_queue", "FileWatcher"]
+__all__ = ["Job", "JobQueue", "JobScheduler", "Worker", "run_worker_processes", "global_job_queue", "FileWatcher"]
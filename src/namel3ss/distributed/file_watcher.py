@@ -1,56 +1,125 @@
 """
 Simple file watcher for file-based flow triggers.
+
+When watchdog is available, filesystem events wake the watcher and it rescans
+right away; the periodic rescan then only runs every ``idle_poll_interval``
+as a fallback (e.g. for directories created after startup). Without watchdog
+it polls every ``poll_interval``.
 """
 
 from __future__ import annotations
 
 import asyncio
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Set
+
+from ..runtime.notify import ChangeNotifier
+
+try:  # pragma: no cover - optional dependency handled gracefully
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except Exception:  # pragma: no cover
+    FileSystemEventHandler = object  # type: ignore
+    Observer = None  # type: ignore
+
+
+class _WakeHandler(FileSystemEventHandler):  # type: ignore[misc]
+    def __init__(self, changes: ChangeNotifier) -> None:
+        super().__init__()
+        self.changes = changes
+
+    def on_any_event(self, event) -> None:  # pragma: no cover - watchdog thread
+        self.changes.notify()
 
 
 class FileWatcher:
-    def __init__(self, trigger_manager, project_root: Path, poll_interval: float = 1.0) -> None:
+    def __init__(
+        self,
+        trigger_manager,
+        project_root: Path,
+        poll_interval: float = 1.0,
+        idle_poll_interval: float = 30.0,
+    ) -> None:
         self.trigger_manager = trigger_manager
         self.project_root = project_root.resolve()
         self.poll_interval = poll_interval
+        self.idle_poll_interval = idle_poll_interval
         self._trigger_files: Dict[str, Dict[Path, float]] = {}
         self._triggers: Dict[str, object] = {}
         self._task: asyncio.Task | None = None
         self._running = False
+        self._changes = ChangeNotifier()
+        self._observer = None
+        self._watched: Set[Path] = set()
 
     def add_trigger(self, trigger) -> None:
         if trigger.id in self._triggers:
             return
         self._triggers[trigger.id] = trigger
         self._trigger_files[trigger.id] = {}
+        self._changes.notify()
 
     async def start(self) -> None:
         if self._running:
             return
         self._running = True
+        if Observer is not None:
+            try:
+                self._observer = Observer()
+                self._observer.start()
+            except Exception:  # pragma: no cover - e.g. inotify limits
+                self._observer = None
         self._task = asyncio.create_task(self._run())
 
     async def stop(self) -> None:
         self._running = False
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+                self._observer.join(timeout=1.0)
+            except Exception:  # pragma: no cover - best effort shutdown
+                pass
+            self._observer = None
+            self._watched.clear()
         if self._task:
             self._task.cancel()
             try:
                 await self._task
-            except Exception:  # pragma: no cover - best effort shutdown
+            except (asyncio.CancelledError, Exception):  # pragma: no cover - best effort shutdown
                 pass
 
     async def _run(self) -> None:
         while self._running:
+            since = self._changes.version
             await self.poll_once()
-            await asyncio.sleep(self.poll_interval)
+            self._watch_trigger_dirs()
+            timeout = self.idle_poll_interval if self._observer is not None else self.poll_interval
+            await self._changes.wait(since, timeout=timeout)
+
+    def _trigger_base(self, trigger) -> Path:
+        base = Path((trigger.config or {}).get("path", "."))
+        if not base.is_absolute():
+            base = (self.project_root / base).resolve()
+        return base
+
+    def _watch_trigger_dirs(self) -> None:
+        if self._observer is None:
+            return
+        for trigger in list(self._triggers.values()):
+            base = self._trigger_base(trigger)
+            if base in self._watched or not base.is_dir():
+                continue
+            try:
+                recursive = "**" in str((trigger.config or {}).get("pattern", "*"))
+                self._observer.schedule(_WakeHandler(self._changes), str(base), recursive=recursive)
+                self._watched.add(base)
+            except Exception:  # pragma: no cover - fall back to periodic rescans
+                pass
 
     async def poll_once(self) -> None:
         for trigger_id, trigger in list(self._triggers.items()):
             cfg = trigger.config or {}
-            base = Path(cfg.get("path", "."))
-            if not base.is_absolute():
-                base = (self.project_root / base).resolve()
+            base = self._trigger_base(trigger)
             pattern = cfg.get("pattern", "*")
             known = self._trigger_files.get(trigger_id, {})
             seen: Dict[Path, float] = {}
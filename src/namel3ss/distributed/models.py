@@ -21,3 +21,6 @@ class Job:
     status: JobStatus = "queued"
     result: Any | None = None
     error: str | None = None
+    priority: int = 0  # higher runs first
+    run_at: float | None = None  # epoch seconds; not dequeued before this time
+    attempts: int = 0
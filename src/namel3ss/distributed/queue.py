@@ -4,43 +4,104 @@ Job queue abstraction with pluggable persistence.
 
 from __future__ import annotations
 
+import asyncio
 from typing import List, Optional
 from uuid import uuid4
 
 from ..secrets.manager import SecretsManager, get_default_secrets_manager
 from ..runtime.persistence import InMemoryJobStore, SQLiteJobStore
+from ..runtime.persistence.sqlite import DEFAULT_VISIBILITY_TIMEOUT
+from ..runtime.notify import ChangeNotifier
 from .models import Job
 
 
+# bounds for polling a store's cross-process change token while idle
+_MIN_WAKE_CHECK = 0.005
+_MAX_WAKE_CHECK = 0.25
+
+
 class JobQueue:
     def __init__(self, store=None) -> None:
         self.store = store or InMemoryJobStore()
+        self.notifier = ChangeNotifier()
 
     def enqueue(self, job: Job) -> Job:
-        return self.store.save_job(job)
+        saved = self.store.save_job(job)
+        self.notifier.notify()
+        return saved
+
+    @property
+    def version(self) -> int:
+        return self.notifier.version
+
+    async def wait_for_job(self, since: Optional[int] = None, timeout: float = 1.0) -> bool:
+        """
+        Block until a job may be available: an in-process enqueue after
+        version ``since``, or (for stores exposing ``change_token``) a commit
+        from another process. ``timeout`` bounds the wait so delayed jobs are
+        still picked up. Returns True when woken by a change.
+        """
+        change_token = getattr(self.store, "change_token", None)
+        if change_token is None:
+            return await self.notifier.wait(since, timeout)
+        token = change_token()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = _MIN_WAKE_CHECK
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            if await self.notifier.wait(since, min(delay, remaining)):
+                return True
+            if change_token() != token:
+                return True
+            delay = min(delay * 2, _MAX_WAKE_CHECK)
 
-    def create_and_enqueue(self, type: str, target: str, payload: Optional[dict] = None) -> Job:
-        job = Job(id=str(uuid4()), type=type, target=target, payload=payload or {})
+    def create_and_enqueue(
+        self,
+        type: str,
+        target: str,
+        payload: Optional[dict] = None,
+        priority: int = 0,
+        run_at: Optional[float] = None,
+    ) -> Job:
+        job = Job(id=str(uuid4()), type=type, target=target, payload=payload or {}, priority=priority, run_at=run_at)
         return self.enqueue(job)
 
     def dequeue(self) -> Optional[Job]:
         return self.store.dequeue_job()
 
+    def dequeue_many(self, limit: int) -> List[Job]:
+        return self.store.dequeue_many(limit)
+
+    @property
+    def lease_seconds(self) -> Optional[float]:
+        """Claim lease length when the store expires claims, else None."""
+        return getattr(self.store, "visibility_timeout", None)
+
+    def heartbeat(self, job: Job) -> bool:
+        return self.store.heartbeat(job)
+
     def get(self, job_id: str) -> Optional[Job]:
         return self.store.get_job(job_id)
 
     def list(self) -> List[Job]:
         return self.store.list_jobs()
 
-    def update(self, job: Job) -> None:
-        self.store.update_job(job)
+    def update(self, job: Job) -> bool:
+        return self.store.update_job(job) is not False
 
 
 def _build_default_queue() -> JobQueue:
     secrets = get_default_secrets_manager()
     if secrets.is_enabled("N3_ENABLE_PERSISTENT_JOBS"):
         db_path = secrets.get("N3_JOBS_DB_PATH") or "namel3ss_jobs.db"
-        store = SQLiteJobStore(db_path)
+        try:
+            visibility_timeout = float(secrets.get("N3_JOBS_VISIBILITY_TIMEOUT") or DEFAULT_VISIBILITY_TIMEOUT)
+        except ValueError:
+            visibility_timeout = DEFAULT_VISIBILITY_TIMEOUT
+        store = SQLiteJobStore(db_path, visibility_timeout=visibility_timeout)
         return JobQueue(store=store)
     return JobQueue()
 
@@ -1,13 +1,24 @@
 """
 Worker loop to process jobs.
+
+A worker runs ``concurrency`` job slots on one event loop. When a
+``ProgramCache`` is supplied, a job's source is compiled once per hash; every
+job still runs on its own runtime, so frames and memory written by one job
+(or tenant) are never visible to the next. ``stop()`` drains the worker: slots finish the job
+they hold and exit. ``run_worker_processes`` shards a shared (persistent) queue
+across several processes, each running its own worker.
 """
 
 from __future__ import annotations
 
 import asyncio
-from typing import Callable, Optional
+import multiprocessing
+import signal
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
 
 from ..obs.tracer import Tracer
+from ..runtime.program_cache import ProgramCache
 from .models import Job
 from .queue import JobQueue
 
@@ -19,46 +30,149 @@ class Worker:
         job_queue: JobQueue,
         tracer: Optional[Tracer] = None,
         worker_id: str = "worker-1",
+        concurrency: int = 1,
+        runtime_cache: Optional[ProgramCache] = None,
     ) -> None:
         self.runtime_factory = runtime_factory
         self.job_queue = job_queue
         self.tracer = tracer
         self.worker_id = worker_id
+        self.concurrency = max(1, concurrency)
+        self.runtime_cache = runtime_cache
         self.processed_jobs = 0
+        self.in_flight = 0
+        self._stopping = False
+
+    @contextmanager
+    def _runtime(self, code: str | None) -> Iterator[object]:
+        if self.runtime_cache is not None:
+            with self.runtime_cache.engine(code or "") as runtime:
+                yield runtime
+            return
+        yield self.runtime_factory(code)
 
     async def run_once(self) -> Optional[Job]:
         job = self.job_queue.dequeue()
         if not job:
             return None
         job.status = "running"
-        runtime = self.runtime_factory(job.payload.get("code") if job.payload else None)
+        self.in_flight += 1
+        lease = self.job_queue.lease_seconds
+        execution = asyncio.ensure_future(self._run_job(job))
+        heartbeat = asyncio.create_task(self._heartbeat(job, lease, execution)) if lease else None
+        abandoned = False
         try:
-            result = await self._execute_job(runtime, job)
-            job.result = result
+            job.result = await execution
             job.status = "success"
+        except asyncio.CancelledError:
+            if heartbeat is None or not heartbeat.done() or heartbeat.cancelled():
+                raise
+            abandoned = True
         except Exception as exc:  # pragma: no cover - error path
             job.error = str(exc)
             job.status = "error"
-        self.job_queue.update(job)
-        self.processed_jobs += 1
+        finally:
+            self.in_flight -= 1
+            if heartbeat is not None:
+                heartbeat.cancel()
+        # a lost lease means another worker owns the job now and records its outcome
+        if not abandoned and self.job_queue.update(job):
+            self.processed_jobs += 1
         return job
 
-    async def run_forever(self, poll_interval: float = 0.1) -> None:
+    async def _run_job(self, job: Job):
+        with self._runtime(job.payload.get("code") if job.payload else None) as runtime:
+            return await self._execute_job(runtime, job)
+
+    async def _heartbeat(self, job: Job, lease: float, execution: "asyncio.Future") -> None:
+        # renew well before the lease runs out so a slow job is not handed to another worker
         while True:
+            await asyncio.sleep(lease / 3)
+            if not self.job_queue.heartbeat(job):
+                # the job was reclaimed; stop working on it rather than race the new owner
+                execution.cancel()
+                return
+
+    async def _slot(self, poll_interval: float) -> None:
+        while not self._stopping:
+            since = self.job_queue.version
             job = await self.run_once()
-            if not job:
-                await asyncio.sleep(poll_interval)
+            if not job and not self._stopping:
+                # block until an enqueue wakes us; poll_interval only bounds the wait
+                await self.job_queue.wait_for_job(since, timeout=poll_interval)
+
+    async def run_forever(self, poll_interval: float = 1.0) -> None:
+        """Run the job slots until ``stop()`` is called and in-flight jobs have finished."""
+        self._stopping = False
+        await asyncio.gather(*(self._slot(poll_interval) for _ in range(self.concurrency)))
+
+    def stop(self) -> None:
+        """Stop taking new jobs; ``run_forever`` returns once running jobs complete."""
+        self._stopping = True
+        self.job_queue.notifier.notify()
 
     async def _execute_job(self, runtime, job: Job):
         if job.type == "flow":
             return await runtime.a_execute_flow(job.target, payload=job.payload)
+        # synchronous job types run off the loop so other slots keep making progress
         if job.type == "agent":
-            return runtime.execute_agent(job.target)
+            return await asyncio.to_thread(runtime.execute_agent, job.target)
         if job.type == "page":
-            return runtime.execute_page_public(job.target)
+            return await asyncio.to_thread(runtime.execute_page_public, job.target)
         if job.type == "tool":
             tool = runtime.tool_registry.get(job.target)
             if not tool:
                 raise ValueError(f"Tool '{job.target}' not found")
-            return tool.run(**job.payload)
+            return await asyncio.to_thread(lambda: tool.run(**job.payload))
         raise ValueError(f"Unknown job type '{job.type}'")
+
+
+async def serve(worker: Worker, poll_interval: float = 1.0) -> None:
+    """Run ``worker`` until SIGTERM/SIGINT, then drain it."""
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, worker.stop)
+        except (NotImplementedError, RuntimeError):  # pragma: no cover - platform dependent
+            pass
+    await worker.run_forever(poll_interval=poll_interval)
+
+
+def _process_main(build_worker: Callable[[], Worker], index: int, poll_interval: float) -> None:
+    worker = build_worker()
+    worker.worker_id = f"{worker.worker_id}-{index}"
+    asyncio.run(serve(worker, poll_interval=poll_interval))
+
+
+def run_worker_processes(
+    build_worker: Callable[[], Worker], processes: int, poll_interval: float = 1.0
+) -> None:
+    """
+    Run ``processes`` workers in separate processes sharing one job store.
+    ``build_worker`` must be importable (module level) so child processes can
+    build their own worker; SIGTERM/SIGINT on the parent drains every child.
+    """
+    if processes <= 1:
+        asyncio.run(serve(build_worker(), poll_interval=poll_interval))
+        return
+    ctx = multiprocessing.get_context("spawn")
+    children = [
+        ctx.Process(target=_process_main, args=(build_worker, index, poll_interval), name=f"n3-worker-{index}")
+        for index in range(processes)
+    ]
+    for child in children:
+        child.start()
+
+    def _forward(signum, _frame) -> None:
+        for child in children:
+            if child.is_alive():
+                child.terminate()  # SIGTERM: the child drains before exiting
+
+    previous = {sig: signal.signal(sig, _forward) for sig in (signal.SIGTERM, signal.SIGINT)}
+    try:
+        for child in children:
+            child.join()
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import asyncio
 import time
 import urllib.error
 from typing import Any
 
+from ...ai.providers import iterate_in_thread
 from ...ai.registry import ModelRegistry
 from ...errors import (
     Namel3ssError,
@@ -16,14 +16,16 @@ from ...errors import (
 )
 from ...observability.metrics import default_metrics
 from ...observability.tracing import default_tracer
+from ...runtime.cache import build_provider_cache_key
 from ...runtime.retries import with_retries_and_timeout
+from ...runtime.singleflight import default_single_flight, single_flight_enabled
 from ..state.context import (
     ExecutionContext,
     _apply_conversation_summary_if_needed,
     _build_vector_context_messages,
     _upsert_vector_memory,
+    aexecute_ai_call_with_registry,
     build_memory_messages,
-    execute_ai_call_with_registry,
     get_vector_memory_settings,
     persist_memory_state,
     run_memory_pipelines,
@@ -34,6 +36,13 @@ from ..models import StreamEvent
 __all__ = ["_call_ai_step", "_stream_ai_step"]
 
 
+def _provider_stream(provider: Any, **kwargs: Any):
+    # native async streaming when the provider has it; otherwise keep blocking reads off the event loop
+    if callable(getattr(provider, "astream", None)):
+        return provider.astream(**kwargs)
+    return iterate_in_thread(lambda: provider.stream(**kwargs))
+
+
 async def _call_ai_step(
     self,
     ai_call,
@@ -73,8 +82,8 @@ async def _call_ai_step(
         last_error_type = exc.__class__.__name__
 
     async def _invoke() -> Any:
-        return await asyncio.to_thread(
-            execute_ai_call_with_registry,
+        # the provider request itself is awaited via agenerate, not parked in a worker thread
+        return await aexecute_ai_call_with_registry(
             ai_call,
             runtime_ctx.model_registry,
             runtime_ctx.router,
@@ -330,7 +339,20 @@ async def _stream_ai_step(
         },
     ):
         try:
-            for chunk in provider.stream(messages=messages, model=provider_model, tools=tools_payload):
+            def _open_stream():
+                return _provider_stream(provider, messages=messages, model=provider_model, tools=tools_payload)
+
+            if single_flight_enabled():
+                # identical streams already in flight fan out from one upstream response
+                flight_key = build_provider_cache_key(
+                    provider_name, provider_model, {"messages": messages, "tools": tools_payload, "stream": True}
+                )
+                chunks = default_single_flight.astream(
+                    flight_key, _open_stream, kind="ai_stream", name=f"{provider_name}:{provider_model}"
+                )
+            else:
+                chunks = _open_stream()
+            async for chunk in chunks:
                 delta = ""
                 if isinstance(chunk, dict):
                     delta = chunk.get("delta") or ""
@@ -13,7 +13,9 @@ from typing import Any, Callable
 
 from ... import ast_nodes
 from ...errors import Namel3ssError
+from ...runtime.cache import build_provider_cache_key
 from ...runtime.expressions import ExpressionEvaluator, VariableEnvironment
+from ...runtime.singleflight import default_single_flight, single_flight_enabled
 from ...tools.observability import after_tool_call, before_tool_call
 from ...tools.registry import DEFAULT_TOOL_TIMEOUT_SECONDS
 from ...tools.runtime import (
@@ -392,7 +394,7 @@ async def _execute_tool_call(self, node, state: FlowState, runtime_ctx: FlowRunt
         except Exception:
             pass
 
-    async def _do_request() -> tuple[int, dict[str, str], str]:
+    async def _send_request() -> tuple[int, dict[str, str], str]:
         # Support both sync and async transports; offload sync calls to a thread.
         if inspect.iscoroutinefunction(self._http_json_request):
             return await self._http_json_request(method, url_str, headers, body_bytes, timeout_seconds)
@@ -400,6 +402,15 @@ async def _execute_tool_call(self, node, state: FlowState, runtime_ctx: FlowRunt
             self._http_json_request, method, url_str, headers, body_bytes, timeout_seconds
         )
 
+    async def _do_request() -> tuple[int, dict[str, str], str]:
+        # Identical GET/HEAD calls already in flight share one request.
+        if method.upper() not in {"GET", "HEAD"} or not single_flight_enabled():
+            return await _send_request()
+        flight_key = build_provider_cache_key(
+            "tool", tool_cfg.name, {"method": method, "url": url_str, "headers": dict(headers)}
+        )
+        return await default_single_flight.ado(flight_key, _send_request, kind="tool", name=tool_cfg.name)
+
     status: int | None = None
     response_headers: dict[str, str] = {}
     raw_text = ""
@@ -15,7 +15,11 @@ __all__ = ["_execute_with_timing", "_extract_duration"]
 
 
 async def _execute_with_timing(
-    self, node: FlowNode, state: FlowState, runtime_ctx: FlowRuntimeContext
+    self,
+    node: FlowNode,
+    state: FlowState,
+    runtime_ctx: FlowRuntimeContext,
+    resolved_kind: str | None = None,
 ) -> Optional[FlowStepResult]:
     # Evaluate conditional guard (when) if present
     when_expr = node.config.get("when")
@@ -42,7 +46,7 @@ async def _execute_with_timing(
                     pass
             return None
 
-    resolved_kind = self._resolve_step_kind(node)
+    resolved_kind = resolved_kind or self._resolve_step_kind(node)
     step_name = node.config.get("step_name", node.id)
     timeout = node.config.get("timeout_seconds")
     target_label = node.config.get("target") if isinstance(node.config, dict) else None
@@ -92,7 +92,7 @@ class FlowEngine(
     _execute_local_function = _tools_execute_local_function
     _execute_tool_call = _tools_execute_tool_call
     _execute_with_timing = _timeouts_execute_with_timing
-    _extract_duration = _timeouts_extract_duration
+    _extract_duration = staticmethod(_timeouts_extract_duration)
     _sleep_backoff = _retries_sleep_backoff
     _execute_node = _steps_execute_node
     _run_condition_node = _steps_run_condition_node
@@ -125,6 +125,7 @@ class FlowEngine(
         self.max_parallel_tasks = max_parallel_tasks if max_parallel_tasks is not None else get_max_parallel_tasks()
         self.global_stream_callback = global_stream_callback
         self.frame_registry = FrameRegistry(program.frames if program else {})
+        self.frame_registry.index_records(getattr(program, "records", {}) if program else {})
         self.vector_registry = VectorStoreRegistry(program, secrets=secrets) if program else None
         self.graph_engine = GraphEngine(program.graphs if program else {}, program.graph_summaries if program else {})
         self.retry_config = get_default_retry_config()
@@ -10,6 +10,7 @@ from typing import Any, Callable, Dict, Optional
 
 from ..ir import IRFlow, IRFlowLoop, IRFlowStep, IRTransactionBlock
 from ..runtime.expressions import VariableEnvironment
+from ..runtime.frames import FrameSavepoint
 
 
 @dataclass
@@ -111,7 +112,7 @@ class FlowRuntimeContext:
     stream_callback: Callable[[Any], Any] | None = None
     provider_cache: Any = None
     step_aliases: dict[str, str] | None = None
-    transaction_stack: list[dict[str, list[dict]]] = field(default_factory=list)
+    transaction_stack: list[FrameSavepoint] = field(default_factory=list)
 
 
 def flow_ir_to_graph(flow: IRFlow) -> FlowGraph:
@@ -7,8 +7,9 @@ from typing import Any, Callable, Optional
 from ...errors import Namel3ssError
 from ...observability.tracing import default_tracer
 from ..errors import ReturnSignal
-from ..graph import FlowError, FlowGraph, FlowRuntimeContext, FlowState, flow_ir_to_graph
+from ..graph import FlowError, FlowGraph, FlowRuntimeContext, FlowState
 from ..models import FlowRunResult, FlowStepMetrics, FlowStepResult
+from ..plan import FlowPlan, build_flow_plan, compiled_flow
 
 __all__ = ["execute", "a_run_flow"]
 
@@ -19,6 +20,7 @@ async def a_run_flow(
     runtime_ctx: FlowRuntimeContext,
     flow_name: str | None = None,
     step_results: list[FlowStepResult] | None = None,
+    plan: FlowPlan | None = None,
 ) -> FlowRunResult:
     if step_results is None:
         step_results = []
@@ -32,131 +34,141 @@ async def a_run_flow(
     if runtime_ctx.metrics:
         runtime_ctx.metrics.record_flow_run(flow_name or graph.entry_id)
 
+    if plan is None:
+        plan = build_flow_plan(graph, self._resolve_step_kind)
+    steps = plan.steps
+
     async def run_node(
         node_id: str,
         current_state: FlowState,
         boundary_id: str | None = None,
         stop_at: str | None = None,
     ) -> FlowState:
-        if stop_at and node_id == stop_at:
-            return current_state
+        # Iterative driver: sequential edges, branches and joins advance in place so
+        # long flows do not grow the stack; only parallel branches and error handlers nest.
+        while True:
+            if stop_at and node_id == stop_at:
+                return current_state
 
-        node = graph.nodes[node_id]
-        resolved_kind = self._resolve_step_kind(node)
-        target_label = node.config.get("target") if isinstance(node.config, dict) else None
-        target_label = target_label or node.id
-        boundary_for_children = node.error_boundary_id or boundary_id
+            step = steps[node_id]
+            node = step.node
+            resolved_kind = step.kind or self._resolve_step_kind(node)
+            boundary_for_children = step.error_boundary_id or boundary_id
 
-        try:
-            step_result = await self._execute_with_timing(node, current_state, runtime_ctx)
-            if step_result:
-                step_results.append(step_result)
-        except ReturnSignal as rs:
-            if getattr(rs, "step_result", None):
-                step_results.append(rs.step_result)
-            current_state.set("last_output", getattr(rs, "value", None))
-            raise
-        except Exception as exc:  # pragma: no cover - errors handled below
-            duration = self._extract_duration(exc)
-            handled = boundary_for_children is not None
-            flow_error = FlowError(node_id=node.id, error=str(exc), handled=handled)
-            current_state.errors.append(flow_error)
-            diags = list(getattr(exc, "diagnostics", []) or [])
-            failure = FlowStepResult(
-                step_name=node.config.get("step_name", node.id),
-                kind=resolved_kind,
-                target=target_label,
-                success=False,
-                error_message=str(exc),
-                handled=handled,
-                node_id=node.id,
-                duration_seconds=duration,
-                diagnostics=diags,
-            )
-            step_results.append(failure)
-            if runtime_ctx.metrics:
-                runtime_ctx.metrics.record_flow_error(flow_name or graph.entry_id)
-            if tracer:
-                tracer.record_flow_error(
-                    node_id=node.id,
-                    node_kind=resolved_kind,
+            try:
+                step_result = await self._execute_with_timing(
+                    node, current_state, runtime_ctx, resolved_kind=resolved_kind
+                )
+                if step_result:
+                    step_results.append(step_result)
+            except ReturnSignal as rs:
+                if getattr(rs, "step_result", None):
+                    step_results.append(rs.step_result)
+                current_state.set("last_output", getattr(rs, "value", None))
+                raise
+            except Exception as exc:  # pragma: no cover - errors handled below
+                duration = self._extract_duration(exc)
+                handled = boundary_for_children is not None
+                flow_error = FlowError(node_id=node.id, error=str(exc), handled=handled)
+                current_state.errors.append(flow_error)
+                diags = list(getattr(exc, "diagnostics", []) or [])
+                failure = FlowStepResult(
+                    step_name=step.step_name,
+                    kind=resolved_kind,
+                    target=step.target_label,
+                    success=False,
+                    error_message=str(exc),
                     handled=handled,
-                    boundary_id=boundary_for_children,
+                    node_id=node.id,
+                    duration_seconds=duration,
+                    diagnostics=diags,
                 )
-            if handled:
-                # expose error object to handler
-                err_info = {"message": str(exc), "step": node.id}
-                if current_state.variables:
-                    if current_state.variables.has("error"):
-                        current_state.variables.assign("error", err_info)
-                    else:
+                step_results.append(failure)
+                if runtime_ctx.metrics:
+                    runtime_ctx.metrics.record_flow_error(flow_name or graph.entry_id)
+                if tracer:
+                    tracer.record_flow_error(
+                        node_id=node.id,
+                        node_kind=resolved_kind,
+                        handled=handled,
+                        boundary_id=boundary_for_children,
+                    )
+                if handled:
+                    # expose error object to handler
+                    err_info = {"message": str(exc), "step": node.id}
+                    if current_state.variables:
+                        if current_state.variables.has("error"):
+                            current_state.variables.assign("error", err_info)
+                        else:
+                            try:
+                                current_state.variables.declare("error", err_info)
+                            except Exception:
+                                current_state.variables.values["error"] = err_info
+                    if runtime_ctx.event_logger:
                         try:
-                            current_state.variables.declare("error", err_info)
+                            runtime_ctx.event_logger.log(
+                                {
+                                    "kind": "flow",
+                                    "event_type": "error_handler_start",
+                                    "flow": runtime_ctx.execution_context.flow_name if runtime_ctx.execution_context else None,
+                                    "failed_step": step.step_name,
+                                }
+                            )
                         except Exception:
-                            current_state.variables.values["error"] = err_info
-                if runtime_ctx.event_logger:
-                    try:
-                        runtime_ctx.event_logger.log(
-                            {
-                                "kind": "flow",
-                                "event_type": "error_handler_start",
-                                "flow": runtime_ctx.execution_context.flow_name if runtime_ctx.execution_context else None,
-                                "failed_step": node.config.get("step_name", node.id),
-                            }
-                        )
-                    except Exception:
-                        pass
-                handler_state = await run_node(boundary_for_children, current_state, None, stop_at)
-                if runtime_ctx.event_logger:
-                    try:
-                        runtime_ctx.event_logger.log(
-                            {
-                                "kind": "flow",
-                                "event_type": "error_handler_end",
-                                "flow": runtime_ctx.execution_context.flow_name if runtime_ctx.execution_context else None,
-                                "status": "success",
-                            }
-                        )
-                    except Exception:
-                        pass
-                return handler_state
-            raise
-
-        # Stop execution if a redirect has been requested.
-        if current_state.context.get("__redirect_flow__"):
-            return current_state
-        if current_state.context.get("__awaiting_input__"):
-            return current_state
+                            pass
+                    handler_state = await run_node(boundary_for_children, current_state, None, stop_at)
+                    if runtime_ctx.event_logger:
+                        try:
+                            runtime_ctx.event_logger.log(
+                                {
+                                    "kind": "flow",
+                                    "event_type": "error_handler_end",
+                                    "flow": runtime_ctx.execution_context.flow_name if runtime_ctx.execution_context else None,
+                                    "status": "success",
+                                }
+                            )
+                        except Exception:
+                            pass
+                    return handler_state
+                raise
 
-        # Branch evaluation
-        if resolved_kind == "branch":
-            next_id = self._evaluate_branch(node, current_state, runtime_ctx)
-            if next_id is None:
+            # Stop execution if a redirect has been requested.
+            if current_state.context.get("__redirect_flow__"):
+                return current_state
+            if current_state.context.get("__awaiting_input__"):
                 return current_state
-            return await run_node(next_id, current_state, boundary_for_children, stop_at)
 
-        # No outgoing edges -> terminate path
-        if not node.next_ids:
-            return current_state
+            # Branch evaluation
+            if resolved_kind == "branch":
+                next_id = self._evaluate_branch(node, current_state, runtime_ctx)
+                if next_id is None:
+                    return current_state
+                node_id, boundary_id = next_id, boundary_for_children
+                continue
 
-        # Single edge -> continue
-        if len(node.next_ids) == 1:
-            return await run_node(node.next_ids[0], current_state, boundary_for_children, stop_at)
+            # No outgoing edges -> terminate path
+            if not step.next_ids:
+                return current_state
 
-        # Parallel fan-out
-        join_id = node.config.get("join") or node.config.get("join_id")
-        branch_states = await self._run_parallel(
-            node.next_ids,
-            current_state,
-            boundary_for_children,
-            stop_at=join_id,
-            runtime_ctx=runtime_ctx,
-            run_node=run_node,
-        )
-        merged_state = self._merge_branch_states(current_state, node.next_ids, branch_states)
-        if join_id:
-            return await run_node(join_id, merged_state, boundary_for_children, None)
-        return merged_state
+            # Single edge -> continue
+            if len(step.next_ids) == 1:
+                node_id, boundary_id = step.next_ids[0], boundary_for_children
+                continue
+
+            # Parallel fan-out
+            branch_ids = list(step.next_ids)
+            branch_states = await self._run_parallel(
+                branch_ids,
+                current_state,
+                boundary_for_children,
+                stop_at=step.join_id,
+                runtime_ctx=runtime_ctx,
+                run_node=run_node,
+            )
+            merged_state = self._merge_branch_states(current_state, branch_ids, branch_states)
+            if not step.join_id:
+                return merged_state
+            node_id, current_state, boundary_id, stop_at = step.join_id, merged_state, boundary_for_children, None
 
     return_value: Any = None
     try:
@@ -208,7 +220,7 @@ async def execute(engine: Any, plan: dict[str, Any]) -> FlowRunResult | None:
     result: FlowRunResult | None = None
 
     while True:
-        graph = flow_ir_to_graph(current_flow)
+        graph, flow_plan = compiled_flow(current_flow, engine._resolve_step_kind)
         if tracer:
             tracer.start_flow(current_flow.name)
             tracer.record_flow_graph_build(current_flow.name, graph)
@@ -232,6 +244,7 @@ async def execute(engine: Any, plan: dict[str, Any]) -> FlowRunResult | None:
             runtime_ctx,
             flow_name=current_flow.name,
             step_results=step_results,
+            plan=flow_plan,
         )
         if tracer:
             tracer.end_flow()
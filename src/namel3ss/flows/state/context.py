@@ -3,6 +3,7 @@ from ...runtime.context import (
     _apply_conversation_summary_if_needed,
     _build_vector_context_messages,
     _upsert_vector_memory,
+    aexecute_ai_call_with_registry,
     build_memory_messages,
     execute_ai_call_with_registry,
     get_user_context,
@@ -16,6 +17,7 @@ __all__ = [
     "_apply_conversation_summary_if_needed",
     "_build_vector_context_messages",
     "_upsert_vector_memory",
+    "aexecute_ai_call_with_registry",
     "build_memory_messages",
     "execute_ai_call_with_registry",
     "get_user_context",
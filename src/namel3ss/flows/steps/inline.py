@@ -138,12 +138,8 @@ class FlowEngineInlineMixin:
         if stack is None:
             stack = []
             runtime_ctx.transaction_stack = stack
-        if stack:
-            raise Namel3ssError(
-                "Nested transactions are not supported yet. Remove the inner transaction: block or move its steps outside."
-            )
-        snapshot = frames.snapshot()
-        stack.append(snapshot)
+        # an inner transaction: block opens a savepoint inside the enclosing one
+        stack.append(frames.begin())
         flow_name = state.context.get("flow_name") or (
             runtime_ctx.execution_context.flow_name if runtime_ctx.execution_context else None
         )
@@ -153,7 +149,7 @@ class FlowEngineInlineMixin:
         try:
             await self._run_inline_sequence(step_id, body, state, runtime_ctx)
         except Exception as exc:
-            frames.restore(stack.pop())
+            frames.rollback(stack.pop())
             message = (
                 f"This transaction in {flow_label} failed and all record changes were rolled back.\n"
                 f"Reason: {exc}"
@@ -162,7 +158,7 @@ class FlowEngineInlineMixin:
             if hasattr(exc, "diagnostics"):
                 wrapped.diagnostics = getattr(exc, "diagnostics")
             raise wrapped from exc
-        stack.pop()
+        frames.commit(stack.pop())
         return {"transaction": "committed", "steps": len(body)}
 
     async def _execute_for_each(self, node: FlowNode, state: FlowState, runtime_ctx: FlowRuntimeContext):
@@ -21,6 +21,7 @@ class FlowEngineRagPipelineMixin:
         base_context: ExecutionContext,
         flow_name: str,
         step_name: str,
+        prefetched: dict[tuple[str, str, int], list[dict[str, Any]]] | None = None,
     ) -> dict[str, Any]:
         pipeline = getattr(runtime_ctx, "rag_pipelines", {}).get(pipeline_name) or getattr(self.program, "rag_pipelines", {}).get(pipeline_name)
         if not pipeline:
@@ -96,9 +97,19 @@ class FlowEngineRagPipelineMixin:
                     queries_to_run = [ctx.get("current_query") or question]
                 aggregated_matches: list[dict[str, Any]] = []
                 where_expr = stage.where
+                known = prefetched or {}
                 for target_vs in targets:
+                    pending = [q for q in queries_to_run if (target_vs, q, top_k_val) not in known]
+                    fetched = dict(
+                        zip(
+                            pending,
+                            runtime_ctx.vectorstores.query_many(target_vs, pending, top_k=top_k_val, frames=runtime_ctx.frames),
+                        )
+                    )
                     for query_text in queries_to_run:
-                        matches = runtime_ctx.vectorstores.query(target_vs, query_text, top_k=top_k_val, frames=runtime_ctx.frames)
+                        matches = known.get((target_vs, query_text, top_k_val))
+                        if matches is None:
+                            matches = fetched[query_text]
                         filtered_matches = []
                         if where_expr is None:
                             filtered_matches = matches
@@ -11,6 +11,15 @@ from ...graph import FlowState
 __all__ = ["FlowEngineRecordOperationsMixin"]
 
 
+def _order_pairs(order_by: list[Any] | None) -> list[tuple[str, bool]]:
+    pairs = []
+    for item in order_by or []:
+        field = getattr(item, "field_name", None) or (item.get("field_name") if isinstance(item, dict) else None)
+        direction = getattr(item, "direction", None) or (item.get("direction") if isinstance(item, dict) else None) or "asc"
+        pairs.append((field, str(direction).lower() == "desc"))
+    return pairs
+
+
 class FlowEngineRecordOperationsMixin:
     def _evaluate_pagination_expr(
         self,
@@ -172,20 +181,34 @@ class FlowEngineRecordOperationsMixin:
                     used_primary = True
             elif where_values:
                 filters_tree = self._evaluate_where_conditions(where_values, evaluator, step_name, record)
+            offset_value = self._evaluate_pagination_expr(offset_expr, evaluator, step_name, f"offset {alias} by", default=0)
+            limit_value = self._evaluate_pagination_expr(limit_expr, evaluator, step_name, f"limit {alias} to")
+            pushed_down = not used_primary and frames.uses_sqlite(frame_name)
             if used_primary:
                 rows = list(frames.query(frame_name, filters))
+            elif pushed_down:
+                # filtering, ordering and pagination run inside SQLite; only the requested page is decoded
+                rows = list(
+                    frames.select(
+                        frame_name,
+                        filters_tree,
+                        order_by=_order_pairs(order_values),
+                        offset=offset_value or 0,
+                        limit=limit_value,
+                        label=alias or record.name,
+                    )
+                )
             else:
                 rows = list(frames.query(frame_name, None))
                 if filters_tree:
                     rows = [row for row in rows if self._condition_tree_matches(filters_tree, row, alias or record.name)]
-            if order_values:
-                rows = self._sort_rows(rows, order_values, alias or record.name)
-            offset_value = self._evaluate_pagination_expr(offset_expr, evaluator, step_name, f"offset {alias} by", default=0)
-            if offset_value:
-                rows = rows[offset_value:]
-            limit_value = self._evaluate_pagination_expr(limit_expr, evaluator, step_name, f"limit {alias} to")
-            if limit_value is not None:
-                rows = rows[:limit_value]
+            if not pushed_down:
+                if order_values:
+                    rows = self._sort_rows(rows, order_values, alias or record.name)
+                if offset_value:
+                    rows = rows[offset_value:]
+                if limit_value is not None:
+                    rows = rows[:limit_value]
             rows = [dict(row) for row in rows]
             if isinstance(query_obj, IRRecordQuery) and getattr(query_obj, "relationships", None):
                 rows = self._apply_relationship_joins(
@@ -247,8 +270,7 @@ class FlowEngineRecordOperationsMixin:
                 getattr(runtime_ctx, "records", None),
                 operation="update",
             )
-            for row in rows:
-                row.update(updates)
+            frames.update_rows(frame_name, rows, updates)
             return dict(rows[0])
         if kind == "db_bulk_update":
             bulk_spec = params.get("bulk_update")
@@ -266,10 +288,13 @@ class FlowEngineRecordOperationsMixin:
                 enforce_required=False,
             )
             filters_tree = self._evaluate_where_conditions(bulk_spec.where_condition, evaluator, step_name, record)
-            rows = list(frames.query(frame_name, None))
-            if filters_tree:
-                alias_label = bulk_spec.alias or record.name
-                rows = [row for row in rows if self._condition_tree_matches(filters_tree, row, alias_label)]
+            if frames.uses_sqlite(frame_name):
+                rows = list(frames.query(frame_name, filters_tree))
+            else:
+                rows = list(frames.query(frame_name, None))
+                if filters_tree:
+                    alias_label = bulk_spec.alias or record.name
+                    rows = [row for row in rows if self._condition_tree_matches(filters_tree, row, alias_label)]
             if not rows:
                 return []
             runtime_records = getattr(runtime_ctx, "records", None)
@@ -298,8 +323,7 @@ class FlowEngineRecordOperationsMixin:
                 )
                 self._track_pending_uniques(record, candidate_row, local_uniques)
                 staged_rows.append((row, candidate_row))
-            for row, _candidate in staged_rows:
-                row.update(normalized_updates)
+            frames.update_rows(frame_name, [row for row, _candidate in staged_rows], normalized_updates)
             return [dict(row) for row in rows]
         if kind == "db_delete":
             by_id_values = self._evaluate_expr_dict(params.get("by_id"), evaluator, step_name, "by id")
@@ -6,7 +6,8 @@ from typing import Any, Optional
 from uuid import uuid4
 from ...errors import Namel3ssError
 from ...observability.tracing import default_tracer
-from ..graph import FlowNode, FlowRuntimeContext, FlowState, flow_ir_to_graph
+from ..graph import FlowNode, FlowRuntimeContext, FlowState
+from ..plan import compiled_flow
 from ..models import FlowStepResult
 from ..state.context import ExecutionContext
 from .runner_ai import _run_ai_step
@@ -434,9 +435,9 @@ async def _execute_node(
             subflow = runtime_ctx.program.flows.get(target)
             if not subflow:
                 raise Namel3ssError(f"Subflow '{target}' not found")
-            graph = flow_ir_to_graph(subflow)
+            graph, subflow_plan = compiled_flow(subflow, self._resolve_step_kind)
             sub_state = state.copy()
-            result = await self.a_run_flow(graph, sub_state, runtime_ctx, flow_name=target)
+            result = await self.a_run_flow(graph, sub_state, runtime_ctx, flow_name=target, plan=subflow_plan)
             output = {"subflow": target, "state": result.state.data if result.state else {}}
         elif resolved_kind == "script":
             statements = node.config.get("statements") or []
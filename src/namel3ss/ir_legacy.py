@@ -107,6 +107,17 @@ class IRAiCall:
     memory_name: str | None = None
     memory: "IRAiMemoryConfig | None" = None
     tools: list["IRAiToolBinding"] = field(default_factory=list)
+    semantic_cache: "IRAiSemanticCacheConfig | None" = None
+
+
+@dataclass
+class IRAiSemanticCacheConfig:
+    """Opt-in semantic response cache; unset fields fall back to runtime defaults."""
+
+    threshold: float | None = None
+    ttl_seconds: int | None = None
+    embedding_model: str | None = None
+    max_entries: int | None = None
 
 
 @dataclass
@@ -1549,6 +1560,19 @@ def _memory_config_is_empty(config: ast_nodes.AiMemoryConfig | None) -> bool:
     return True
 
 
+def _lower_ai_semantic_cache(
+    config: ast_nodes.AiSemanticCacheConfig | None,
+) -> IRAiSemanticCacheConfig | None:
+    if config is None:
+        return None
+    return IRAiSemanticCacheConfig(
+        threshold=config.threshold,
+        ttl_seconds=config.ttl_seconds,
+        embedding_model=config.embedding_model,
+        max_entries=config.max_entries,
+    )
+
+
 def _lower_ai_memory_config(
     mem: ast_nodes.AiMemoryConfig,
     ai_name: str,
@@ -2148,10 +2172,10 @@ def ast_to_ir(module: ast_nodes.Module) -> IRProgram:
         backend = (decl.backend or "").lower()
         if backend == "postgresql":
             backend = "pgvector"
-        supported_backends = {"memory", "pgvector", "faiss", "default_vector"}
+        supported_backends = {"memory", "pgvector", "faiss", "ivf", "default_vector"}
         if backend not in supported_backends:
             raise IRError(
-                f"Vector store '{decl.name}' uses backend '{backend}', which is not supported. Supported backends are: memory, pgvector, faiss.",
+                f"Vector store '{decl.name}' uses backend '{backend}', which is not supported. Supported backends are: memory, pgvector, faiss, ivf.",
                 decl.span and decl.span.line,
             )
         frame_name = decl.frame or ""
@@ -3222,6 +3246,7 @@ def ast_to_ir(module: ast_nodes.Module) -> IRProgram:
                 memory_name=getattr(decl, "memory_name", None),
                 memory=mem_cfg,
                 tools=tool_bindings,
+                semantic_cache=_lower_ai_semantic_cache(getattr(decl, "semantic_cache", None)),
             )
             if getattr(decl, "memory_name", None):
                 ai_memory_refs.append((decl.name, decl.memory_name or "", decl.span and decl.span.line))
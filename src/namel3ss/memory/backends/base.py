@@ -16,5 +16,9 @@ class MemoryStore(Protocol):
     def query(self, space: str, text: str) -> List[MemoryItem]:
         ...
 
+    def list_changes(self, space: Optional[str], since: int) -> List[MemoryItem]:
+        """Items written after change cursor ``since``, ordered by ``seq``."""
+        ...
+
     def clear_space(self, space: str) -> None:
         ...
@@ -1,16 +1,23 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+import itertools
+from typing import Dict, Iterator, List, Optional
 
 from ..models import MemoryItem
 from .base import MemoryStore
 
 
 class InMemoryMemoryStore(MemoryStore):
-    def __init__(self) -> None:
+    # seq restarts at 1 with the process, so cursors must not outlive it
+    durable = False
+
+    def __init__(self, sequence: Optional[Iterator[int]] = None) -> None:
         self._items: Dict[str, List[MemoryItem]] = {}
+        # stores sharing one engine can share a sequence so cursors stay comparable
+        self._sequence = sequence or itertools.count(1)
 
     def add(self, item: MemoryItem) -> MemoryItem:
+        item.seq = next(self._sequence)
         self._items.setdefault(item.space, []).append(item)
         return item
 
@@ -29,5 +36,17 @@ class InMemoryMemoryStore(MemoryStore):
             if text.lower() in item.content.lower()
         ]
 
+    def list_changes(self, space: Optional[str], since: int) -> List[MemoryItem]:
+        spaces = [space] if space is not None else list(self._items.keys())
+        changes: List[MemoryItem] = []
+        for name in spaces:
+            items = self._items.get(name, [])
+            # items are appended in seq order, so walk back only as far as the cursor
+            start = len(items)
+            while start > 0 and items[start - 1].seq > since:
+                start -= 1
+            changes.extend(items[start:])
+        return sorted(changes, key=lambda item: item.seq)
+
     def clear_space(self, space: str) -> None:
         self._items.pop(space, None)
@@ -10,6 +10,9 @@ from .base import MemoryStore
 
 
 class SQLiteMemoryStore(MemoryStore):
+    # seq values survive restarts, so sync cursors saved against them stay valid
+    durable = True
+
     def __init__(self, db_path: str | Path) -> None:
         self.db_path = str(db_path)
         self._ensure_schema()
@@ -26,25 +29,41 @@ class SQLiteMemoryStore(MemoryStore):
                     space TEXT,
                     type TEXT,
                     content TEXT,
-                    metadata TEXT
+                    metadata TEXT,
+                    seq INTEGER
                 )
                 """
             )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(memory_items)")}
+            if "seq" not in columns:
+                conn.execute("ALTER TABLE memory_items ADD COLUMN seq INTEGER")
+                conn.execute("UPDATE memory_items SET seq = rowid")
+            conn.execute("CREATE INDEX IF NOT EXISTS memory_items_space_seq ON memory_items (space, seq)")
+            # seq comes from a counter rather than MAX(seq) so it never goes back
+            # down when the rows holding the highest seq are deleted
+            conn.execute("CREATE TABLE IF NOT EXISTS memory_seq (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.execute(
+                "INSERT OR IGNORE INTO memory_seq (name, value) "
+                "SELECT 'memory_items', COALESCE(MAX(seq), 0) FROM memory_items"
+            )
 
     def add(self, item: MemoryItem) -> MemoryItem:
         metadata_json = json.dumps(item.metadata or {})
         with self._connect() as conn:
+            conn.execute("UPDATE memory_seq SET value = value + 1 WHERE name = 'memory_items'")
+            seq = int(conn.execute("SELECT value FROM memory_seq WHERE name = 'memory_items'").fetchone()[0])
             conn.execute(
                 """
-                INSERT OR REPLACE INTO memory_items (id, space, type, content, metadata)
-                VALUES (?, ?, ?, ?, ?)
+                INSERT OR REPLACE INTO memory_items (id, space, type, content, metadata, seq)
+                VALUES (?, ?, ?, ?, ?, ?)
                 """,
-                (item.id, item.space, item.type.value if hasattr(item.type, "value") else str(item.type), item.content, metadata_json),
+                (item.id, item.space, item.type.value if hasattr(item.type, "value") else str(item.type), item.content, metadata_json, seq),
             )
+            item.seq = seq
         return item
 
     def list(self, space: Optional[str] = None) -> List[MemoryItem]:
-        query = "SELECT id, space, type, content, metadata FROM memory_items"
+        query = "SELECT id, space, type, content, metadata, seq FROM memory_items"
         params = ()
         if space is not None:
             query += " WHERE space = ?"
@@ -53,12 +72,22 @@ class SQLiteMemoryStore(MemoryStore):
             rows = conn.execute(query, params).fetchall()
         return [self._row_to_item(row) for row in rows]
 
+    def list_changes(self, space: Optional[str], since: int) -> List[MemoryItem]:
+        query = "SELECT id, space, type, content, metadata, seq FROM memory_items WHERE seq > ?"
+        params: tuple = (since,)
+        if space is not None:
+            query += " AND space = ?"
+            params = (since, space)
+        with self._connect() as conn:
+            rows = conn.execute(query + " ORDER BY seq", params).fetchall()
+        return [self._row_to_item(row) for row in rows]
+
     def query(self, space: str, text: str) -> List[MemoryItem]:
         like = f"%{text}%"
         with self._connect() as conn:
             rows = conn.execute(
                 """
-                SELECT id, space, type, content, metadata FROM memory_items
+                SELECT id, space, type, content, metadata, seq FROM memory_items
                 WHERE space = ? AND content LIKE ?
                 """,
                 (space, like),
@@ -70,7 +99,7 @@ class SQLiteMemoryStore(MemoryStore):
             conn.execute("DELETE FROM memory_items WHERE space = ?", (space,))
 
     def _row_to_item(self, row: tuple) -> MemoryItem:
-        id_, space, typ, content, metadata_json = row
+        id_, space, typ, content, metadata_json, seq = row
         metadata = json.loads(metadata_json) if metadata_json else {}
         mem_type = MemoryType(typ) if typ in MemoryType._value2member_map_ else MemoryType.CONVERSATION
         return MemoryItem(
@@ -79,4 +108,5 @@ class SQLiteMemoryStore(MemoryStore):
             type=mem_type,
             content=content,
             metadata=metadata,
+            seq=int(seq or 0),
         )
@@ -5,9 +5,11 @@ High-level memory engine.
 from __future__ import annotations
 
 import hashlib
+import itertools
 from typing import Dict, List, Optional
 from uuid import uuid4
 
+from ..runtime.notify import ChangeNotifier
 from .backends.in_memory import InMemoryMemoryStore
 from .backends.sqlite import SQLiteMemoryStore
 from .backends.base import MemoryStore
@@ -24,6 +26,8 @@ class MemoryEngine:
         self.store: MemoryStore = store or InMemoryMemoryStore()
         self.spaces: Dict[str, MemorySpaceConfig] = {space.name: space for space in spaces}
         self.trigger_manager = trigger_manager
+        # bumped on every write so sync workers can wait for changes instead of polling
+        self.changes = ChangeNotifier()
 
     def record_conversation(self, space: str, message: str, role: str, namespace=None) -> MemoryItem:
         config = self.spaces.get(space)
@@ -60,6 +64,18 @@ class MemoryEngine:
     def list_all(self, space: str | None = None) -> List[MemoryItem]:
         return self.store.list(space)
 
+    @property
+    def durable_changes(self) -> bool:
+        """Whether change cursors stay valid across process restarts."""
+        return bool(getattr(self.store, "durable", False))
+
+    def changes_since(self, space: str | None, cursor: int) -> List[MemoryItem]:
+        """Items written after change cursor ``cursor``, ordered by ``seq``."""
+        if hasattr(self.store, "list_changes"):
+            return self.store.list_changes(space, cursor)
+        # stores without change tracking hand back everything; callers upsert idempotently
+        return [item for item in self.store.list(space) if not item.seq or item.seq > cursor]
+
     def load_conversation(self, space: str, session_id: str | None = None, limit: int = 50) -> list[dict]:
         session = session_id or "default"
         items = self.store.list(space)
@@ -87,6 +103,7 @@ class MemoryEngine:
             self._notify_triggers(space, added)
 
     def _notify_triggers(self, space: str, item: MemoryItem) -> None:
+        self.changes.notify()
         if self.trigger_manager:
             try:
                 self.trigger_manager.notify_memory_event(space, {"item": item.__dict__})
@@ -99,11 +116,13 @@ class ShardedMemoryEngine(MemoryEngine):
     def __init__(
         self, spaces: List[MemorySpaceConfig], num_shards: int = 4, trigger_manager: Optional[object] = None
     ) -> None:
-        self._stores = [InMemoryMemoryStore() for _ in range(num_shards)]
+        sequence = itertools.count(1)
+        self._stores = [InMemoryMemoryStore(sequence=sequence) for _ in range(num_shards)]
         self.spaces: Dict[str, MemorySpaceConfig] = {space.name: space for space in spaces}
         self.num_shards = num_shards
         self._counter = 0
         self.trigger_manager = trigger_manager
+        self.changes = ChangeNotifier()
 
     def _choose_store(self, key: str) -> InMemoryMemoryStore:
         # round-robin distribution to avoid skew
@@ -111,6 +130,10 @@ class ShardedMemoryEngine(MemoryEngine):
         self._counter += 1
         return self._stores[shard_idx]
 
+    @property
+    def durable_changes(self) -> bool:
+        return False
+
     def record_conversation(self, space: str, message: str, role: str, namespace=None) -> MemoryItem:
         config = self.spaces.get(space)
         memory_type = config.type if config else MemoryType.CONVERSATION
@@ -122,7 +145,9 @@ class ShardedMemoryEngine(MemoryEngine):
             content=message,
             metadata={"role": role, "namespace": namespace.__dict__ if namespace else None},
         )
-        return self._choose_store(item_id).add(item)
+        added = self._choose_store(item_id).add(item)
+        self.changes.notify()
+        return added
 
     def add_item(self, space: str, content: str, memory_type: MemoryType) -> MemoryItem:
         item_id = str(uuid4())
@@ -132,7 +157,9 @@ class ShardedMemoryEngine(MemoryEngine):
             type=memory_type,
             content=content,
         )
-        return self._choose_store(item_id).add(item)
+        added = self._choose_store(item_id).add(item)
+        self.changes.notify()
+        return added
 
     def get_recent(self, space: str, limit: int = 10) -> List[MemoryItem]:
         items: List[MemoryItem] = []
@@ -152,6 +179,12 @@ class ShardedMemoryEngine(MemoryEngine):
             items.extend(store.list(space))
         return items
 
+    def changes_since(self, space: str | None, cursor: int) -> List[MemoryItem]:
+        items: List[MemoryItem] = []
+        for store in self._stores:
+            items.extend(store.list_changes(space, cursor))
+        return sorted(items, key=lambda item: item.seq)
+
 
 class PersistentMemoryEngine(MemoryEngine):
     def __init__(
@@ -23,6 +23,8 @@ class MemoryItem:
     type: MemoryType
     content: str
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # monotonic change cursor assigned by the store on write (0 = not stored yet)
+    seq: int = 0
 
 
 @dataclass
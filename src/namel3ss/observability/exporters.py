@@ -0,0 +1,222 @@
+"""
+Span export in the OTLP/JSON format.
+
+Finished spans are handed to a ``BatchSpanProcessor``, which queues them
+(bounded; spans are dropped rather than blocking a request when the queue is
+full) and exports them in batches from a background thread. Two exporters
+are built in: ``OTLPJsonFileExporter`` appends one ``ExportTraceServiceRequest``
+JSON document per line to a local file, and ``OTLPHttpExporter`` posts the
+same documents to an OTLP/HTTP collector (``.../v1/traces``).
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import queue
+import threading
+import urllib.request
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .tracing import Span
+
+__all__ = [
+    "SpanExporter",
+    "OTLPJsonFileExporter",
+    "OTLPHttpExporter",
+    "BatchSpanProcessor",
+    "spans_to_otlp",
+    "span_processor_from_env",
+]
+
+SERVICE_NAME = "namel3ss"
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, str):
+        return {"stringValue": value}
+    return {"stringValue": json.dumps(value, default=str)}
+
+
+def _span_to_otlp(span: "Span") -> Dict[str, Any]:
+    data: Dict[str, Any] = {
+        "traceId": span.context.trace_id,
+        "spanId": span.context.span_id,
+        "name": span.name,
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(int(span.start_time * 1e9)),
+        "endTimeUnixNano": str(int((span.end_time or span.start_time) * 1e9)),
+        "attributes": [{"key": str(key), "value": _otlp_value(value)} for key, value in (span.attributes or {}).items()],
+        "status": {"code": 2, "message": span.exception} if span.exception else {"code": 1},
+    }
+    if span.context.parent_span_id:
+        data["parentSpanId"] = span.context.parent_span_id
+    return data
+
+
+def spans_to_otlp(spans: Sequence["Span"], service_name: str = SERVICE_NAME) -> Dict[str, Any]:
+    """Build an OTLP ``ExportTraceServiceRequest`` document for ``spans``."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+                "scopeSpans": [{"scope": {"name": "namel3ss.tracing"}, "spans": [_span_to_otlp(s) for s in spans]}],
+            }
+        ]
+    }
+
+
+class SpanExporter(ABC):
+    """Abstract span exporter."""
+
+    @abstractmethod
+    def export(self, spans: Sequence["Span"]) -> None:
+        """Send one batch of finished spans."""
+
+    def shutdown(self) -> None:
+        """Release resources; called once when the processor shuts down."""
+
+
+class OTLPJsonFileExporter(SpanExporter):
+    """Append one OTLP/JSON document per batch to ``path`` (JSON lines)."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = os.fspath(path)
+        parent = os.path.dirname(self.path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+
+    def export(self, spans: Sequence["Span"]) -> None:
+        line = json.dumps(spans_to_otlp(spans), separators=(",", ":"))
+        with open(self.path, "a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+
+
+class OTLPHttpExporter(SpanExporter):
+    """POST OTLP/JSON documents to a collector endpoint such as ``http://localhost:4318/v1/traces``."""
+
+    def __init__(self, endpoint: str, headers: Optional[Dict[str, str]] = None, timeout: float = 5.0) -> None:
+        self.endpoint = endpoint
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        self.timeout = timeout
+
+    def export(self, spans: Sequence["Span"]) -> None:
+        body = json.dumps(spans_to_otlp(spans)).encode("utf-8")
+        req = urllib.request.Request(self.endpoint, data=body, headers=self.headers, method="POST")
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:  # pragma: no cover - live collector
+            resp.read()
+
+
+class BatchSpanProcessor:
+    """Queue finished spans and export them in batches off the request path."""
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        max_queue_size: int = 2048,
+        max_batch_size: int = 256,
+        schedule_delay: float = 1.0,
+    ) -> None:
+        self.exporter = exporter
+        self.max_batch_size = max(1, max_batch_size)
+        self.schedule_delay = schedule_delay
+        self._queue: "queue.Queue[Span]" = queue.Queue(maxsize=max(1, max_queue_size))
+        self._export_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self.exported = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def on_end(self, span: "Span") -> None:
+        if self._worker is None:
+            self._start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._worker is not None:
+                return
+            self._worker = threading.Thread(target=self._run, name="n3-span-exporter", daemon=True)
+            self._worker.start()
+            atexit.register(self.shutdown)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=self.schedule_delay)
+            except queue.Empty:
+                continue
+            self._export([first] + self._drain(self.max_batch_size - 1))
+
+    def _drain(self, limit: int) -> List["Span"]:
+        batch: List["Span"] = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _export(self, batch: List["Span"]) -> None:
+        if not batch:
+            return
+        with self._export_lock:
+            try:
+                self.exporter.export(batch)
+                self.exported += len(batch)
+            except Exception:
+                # telemetry must never take the application down
+                self.failed += len(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def force_flush(self, timeout: float = 5.0) -> bool:
+        """Export everything queued so far; returns False if the worker's batch did not finish in time."""
+        while True:
+            batch = self._drain(self.max_batch_size)
+            if not batch:
+                break
+            self._export(batch)
+        # wait for a batch the worker took off the queue before we started
+        with self._queue.all_tasks_done:
+            return self._queue.all_tasks_done.wait_for(lambda: self._queue.unfinished_tasks == 0, timeout)
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        self.force_flush()
+        self.exporter.shutdown()
+
+    def stats(self) -> Dict[str, int]:
+        return {"exported": self.exported, "export_dropped": self.dropped, "export_failed": self.failed, "queued": self._queue.qsize()}
+
+
+def span_processor_from_env() -> BatchSpanProcessor | None:
+    """``N3_TRACE_EXPORT_PATH`` (JSON lines file) or ``N3_TRACE_EXPORT_ENDPOINT`` (OTLP/HTTP) enable export."""
+    path = os.getenv("N3_TRACE_EXPORT_PATH")
+    endpoint = os.getenv("N3_TRACE_EXPORT_ENDPOINT")
+    if path:
+        exporter: SpanExporter = OTLPJsonFileExporter(path)
+    elif endpoint:
+        exporter = OTLPHttpExporter(endpoint)
+    else:
+        return None
+    try:
+        max_queue = int(os.getenv("N3_TRACE_EXPORT_QUEUE_SIZE", "2048"))
+    except ValueError:
+        max_queue = 2048
+    return BatchSpanProcessor(exporter, max_queue_size=max_queue)
@@ -32,6 +32,9 @@ class MetricsRegistry:
         self._circuit_open: Dict[str, int] = {}
         self._cache_hits: Dict[tuple[str, str], int] = {}
         self._cache_misses: Dict[tuple[str, str], int] = {}
+        self._embedding_cache: Dict[tuple[str, str], Dict[str, int]] = {}
+        self._coalesced: Dict[tuple[str, str], int] = {}
+        self._semantic_cache: Dict[str, Dict[str, int]] = {}
         self._summary_counts: Dict[str, int] = {}
         self._vector_upserts: int = 0
         self._vector_queries: int = 0
@@ -94,6 +97,39 @@ class MetricsRegistry:
     def get_provider_cache_misses(self) -> Dict[tuple[str, str], int]:
         return dict(self._cache_misses)
 
+    def get_provider_cache_hit_ratios(self) -> Dict[tuple[str, str], float]:
+        """Share of cache lookups that hit, per (provider, model)."""
+        ratios: Dict[tuple[str, str], float] = {}
+        for key in set(self._cache_hits) | set(self._cache_misses):
+            hits = self._cache_hits.get(key, 0)
+            total = hits + self._cache_misses.get(key, 0)
+            ratios[key] = hits / total if total else 0.0
+        return ratios
+
+    def record_embedding_cache(self, provider: str, model: str, hits: int = 0, misses: int = 0) -> None:
+        key = (provider or "unknown", model or "unknown")
+        counters = self._embedding_cache.setdefault(key, {"hits": 0, "misses": 0})
+        counters["hits"] += hits
+        counters["misses"] += misses
+
+    def get_embedding_cache_counters(self) -> Dict[tuple[str, str], Dict[str, int]]:
+        return {key: dict(counters) for key, counters in self._embedding_cache.items()}
+
+    def record_semantic_cache(self, ai_name: str, hit: bool) -> None:
+        counters = self._semantic_cache.setdefault(ai_name or "unknown", {"hits": 0, "misses": 0})
+        counters["hits" if hit else "misses"] += 1
+
+    def get_semantic_cache_counters(self) -> Dict[str, Dict[str, int]]:
+        return {key: dict(counters) for key, counters in self._semantic_cache.items()}
+
+    def record_coalesced_call(self, kind: str, name: str) -> None:
+        key = (kind or "unknown", name or "unknown")
+        self._coalesced[key] = self._coalesced.get(key, 0) + 1
+
+    def get_coalesced_call_counts(self) -> Dict[tuple[str, str], int]:
+        """Calls that shared an in-flight upstream call instead of making their own, per (kind, name)."""
+        return dict(self._coalesced)
+
     def record_conversation_summary(self, status: str) -> None:
         key = status or "unknown"
         self._summary_counts[key] = self._summary_counts.get(key, 0) + 1
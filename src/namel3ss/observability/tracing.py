@@ -1,22 +1,43 @@
 """
 Lightweight tracing inspired by OpenTelemetry primitives.
+
+Retention is bounded: the tracer keeps the most recent ``N3_TRACE_MAX_TRACES``
+traces (least recently started are evicted first) and at most
+``N3_TRACE_MAX_SPANS_PER_TRACE`` spans per trace. ``N3_TRACE_SAMPLE_RATE``
+head-samples traces by trace id; traces that were not sampled are buffered
+until their root span finishes and kept anyway when a span failed or the
+trace took at least ``N3_TRACE_SLOW_MS`` (tail sampling). Kept spans can be
+exported in batches as OTLP/JSON, see ``exporters``.
 """
 
 from __future__ import annotations
 
+import os
+import random
+import threading
 import time
-import uuid
+from collections import OrderedDict
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 import contextvars
 
+from .exporters import BatchSpanProcessor, span_processor_from_env
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
 
 @dataclass
 class SpanContext:
     trace_id: str
     span_id: str
     parent_span_id: Optional[str] = None
+    sampled: bool = True
 
 
 @dataclass
@@ -27,6 +48,7 @@ class Span:
     start_time: float = field(default_factory=time.time)
     end_time: Optional[float] = None
     exception: Optional[str] = None
+    parent_context: Optional[SpanContext] = field(default=None, repr=False, compare=False)
 
     def finish(self) -> None:
         if self.end_time is None:
@@ -34,35 +56,105 @@ class Span:
 
 
 class Tracer:
-    def __init__(self) -> None:
-        self._spans: Dict[str, List[Span]] = {}
+    def __init__(
+        self,
+        max_traces: Optional[int] = None,
+        max_spans_per_trace: Optional[int] = None,
+        sample_rate: Optional[float] = None,
+        slow_trace_seconds: Optional[float] = None,
+        processor: Optional[BatchSpanProcessor] = None,
+    ) -> None:
+        self.max_traces = max(1, int(max_traces if max_traces is not None else _env_number("N3_TRACE_MAX_TRACES", 1000)))
+        self.max_spans_per_trace = max(
+            1, int(max_spans_per_trace if max_spans_per_trace is not None else _env_number("N3_TRACE_MAX_SPANS_PER_TRACE", 1000))
+        )
+        self.sample_rate = min(1.0, max(0.0, sample_rate if sample_rate is not None else _env_number("N3_TRACE_SAMPLE_RATE", 1.0)))
+        self.slow_trace_seconds = (
+            slow_trace_seconds if slow_trace_seconds is not None else _env_number("N3_TRACE_SLOW_MS", 1000.0) / 1000.0
+        )
+        self.processor = processor if processor is not None else span_processor_from_env()
+        # kept traces, and head-unsampled traces waiting for the tail decision
+        self._spans: "OrderedDict[str, List[Span]]" = OrderedDict()
+        self._pending: "OrderedDict[str, List[Span]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {
+            "spans_started": 0,
+            "spans_dropped": 0,
+            "traces_evicted": 0,
+            "traces_sampled_out": 0,
+            "traces_tail_kept": 0,
+        }
+        self._overhead_seconds = 0.0
         self._current_ctx: contextvars.ContextVar[Optional[SpanContext]] = contextvars.ContextVar(
             "current_span_ctx", default=None
         )
 
+    def _head_sampled(self, trace_id: str) -> bool:
+        # deterministic in the trace id, like OpenTelemetry's TraceIdRatioBased sampler
+        if self.sample_rate >= 1.0:
+            return True
+        return int(trace_id[:16], 16) < self.sample_rate * 2**64
+
     def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None, parent: Optional[SpanContext] = None) -> Span:
-        trace_id = parent.trace_id if parent else uuid.uuid4().hex
-        span_id = uuid.uuid4().hex
-        ctx = SpanContext(trace_id=trace_id, span_id=span_id, parent_span_id=parent.span_id if parent else None)
-        span = Span(name=name, context=ctx, attributes=attributes or {}, start_time=time.time())
-        self._spans.setdefault(trace_id, []).append(span)
+        began = time.perf_counter()
+        if parent:
+            trace_id, sampled = parent.trace_id, parent.sampled
+        else:
+            trace_id = f"{random.getrandbits(128):032x}"
+            sampled = self._head_sampled(trace_id)
+        ctx = SpanContext(
+            trace_id=trace_id,
+            span_id=f"{random.getrandbits(64):016x}",
+            parent_span_id=parent.span_id if parent else None,
+            sampled=sampled,
+        )
+        span = Span(name=name, context=ctx, attributes=attributes or {}, start_time=time.time(), parent_context=parent)
+        with self._lock:
+            self._counters["spans_started"] += 1
+            store = self._spans if sampled else self._pending
+            spans = store.get(trace_id)
+            if spans is None:
+                spans = store[trace_id] = []
+                while len(store) > self.max_traces:
+                    store.popitem(last=False)
+                    self._counters["traces_evicted"] += 1
+            if len(spans) < self.max_spans_per_trace:
+                spans.append(span)
+            else:
+                self._counters["spans_dropped"] += 1
+            self._overhead_seconds += time.perf_counter() - began
         self._current_ctx.set(ctx)
         return span
 
     def finish_span(self, span: Span) -> None:
+        began = time.perf_counter()
         span.finish()
-        # restore parent context if any
-        if span.context.parent_span_id:
-            parent_ctx = self._find_context(span.context.trace_id, span.context.parent_span_id)
-            self._current_ctx.set(parent_ctx)
-        else:
-            self._current_ctx.set(None)
-
-    def _find_context(self, trace_id: str, span_id: str) -> Optional[SpanContext]:
-        for s in self._spans.get(trace_id, []):
-            if s.context.span_id == span_id:
-                return s.context
-        return None
+        # the parent context travels with the span, so restoring it is O(1)
+        self._current_ctx.set(span.parent_context)
+        exported: List[Span] = []
+        with self._lock:
+            if span.context.sampled:
+                exported.append(span)
+            elif span.context.parent_span_id is None:
+                exported = self._tail_sample(span)
+            self._overhead_seconds += time.perf_counter() - began
+        if self.processor is not None:
+            for finished in exported:
+                self.processor.on_end(finished)
+
+    def _tail_sample(self, root: Span) -> List[Span]:
+        """Keep a head-unsampled trace if it failed or was slow; returns its spans to export."""
+        spans = self._pending.pop(root.context.trace_id, None) or []
+        slow = (root.end_time or root.start_time) - root.start_time >= self.slow_trace_seconds
+        if not (slow or any(s.exception for s in spans)):
+            self._counters["traces_sampled_out"] += 1
+            return []
+        self._counters["traces_tail_kept"] += 1
+        self._spans[root.context.trace_id] = spans
+        while len(self._spans) > self.max_traces:
+            self._spans.popitem(last=False)
+            self._counters["traces_evicted"] += 1
+        return [s for s in spans if s.end_time is not None]
 
     @contextmanager
     def span(self, name: str, attributes: Optional[Dict[str, Any]] = None):
@@ -80,10 +172,30 @@ class Tracer:
         return self._current_ctx.get()
 
     def get_trace(self, trace_id: str) -> List[Span]:
-        return list(self._spans.get(trace_id, []))
+        with self._lock:
+            return list(self._spans.get(trace_id, []))
 
     def all_traces(self) -> Dict[str, List[Span]]:
-        return self._spans
+        """Snapshot of the retained traces, oldest first."""
+        with self._lock:
+            return {trace_id: list(spans) for trace_id, spans in self._spans.items()}
+
+    def stats(self) -> Dict[str, Any]:
+        """Retention, sampling and export counters plus the time spent in tracer bookkeeping."""
+        with self._lock:
+            data: Dict[str, Any] = dict(self._counters)
+            data["traces_retained"] = len(self._spans)
+            data["traces_pending"] = len(self._pending)
+            data["spans_retained"] = sum(len(spans) for spans in self._spans.values())
+            data["overhead_seconds"] = self._overhead_seconds
+        if self.processor is not None:
+            data.update(self.processor.stats())
+        return data
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self._pending.clear()
 
 
 default_tracer = Tracer()
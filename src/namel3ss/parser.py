@@ -54,6 +54,7 @@ class Parser:
             "memory",
             "use",
             "tools",
+            "semantic_cache",
         }
         self._transaction_depth = 0
 
@@ -227,6 +228,7 @@ class Parser:
     parse_ai_called_block = decl_ai_core.parse_ai_called_block
     _parse_ai_tools_block = decl_ai_core._parse_ai_tools_block
     _parse_ai_tool_binding_entry = decl_ai_core._parse_ai_tool_binding_entry
+    _parse_ai_semantic_cache_block = decl_ai_core._parse_ai_semantic_cache_block
     _parse_memory_block = decl_ai_memory._parse_memory_block
     _suggest_memory_kind = decl_ai_memory._suggest_memory_kind
     _parse_memory_kinds_block = decl_ai_memory_kinds._parse_memory_kinds_block
@@ -6,7 +6,13 @@ from difflib import get_close_matches
 
 from .... import ast_nodes
 
-__all__ = ["parse_ai", "parse_ai_called_block", "_parse_ai_tools_block", "_parse_ai_tool_binding_entry"]
+__all__ = [
+    "parse_ai",
+    "parse_ai_called_block",
+    "_parse_ai_tools_block",
+    "_parse_ai_tool_binding_entry",
+    "_parse_ai_semantic_cache_block",
+]
 
 def parse_ai(self) -> ast_nodes.AICallDecl:
     start = self.consume("KEYWORD", "ai")
@@ -30,6 +36,7 @@ def parse_ai(self) -> ast_nodes.AICallDecl:
     memory_config: ast_nodes.AiMemoryConfig | None = None
     memory_profiles: list[str] = []
     tool_bindings: list[ast_nodes.AiToolBinding] = []
+    semantic_cache: ast_nodes.AiSemanticCacheConfig | None = None
     while not self.check("DEDENT"):
         if self.match("NEWLINE"):
             continue
@@ -142,6 +149,14 @@ def parse_ai(self) -> ast_nodes.AICallDecl:
         elif field_token.value == "tools":
             self.advance()
             tool_bindings.extend(self._parse_ai_tools_block())
+        elif field_token.value == "semantic_cache":
+            if semantic_cache is not None:
+                raise self.error(
+                    f"N3L-1420: AI '{name.value or ''}' has more than one 'semantic_cache:' section.",
+                    field_token,
+                )
+            self.advance()
+            semantic_cache = self._parse_ai_semantic_cache_block(field_token)
         else:
             self.advance()
             hint = ""
@@ -166,6 +181,7 @@ def parse_ai(self) -> ast_nodes.AICallDecl:
         memory=memory_config,
         memory_profiles=memory_profiles,
         tools=tool_bindings,
+        semantic_cache=semantic_cache,
         span=self._span(start),
     )
 
@@ -244,6 +260,54 @@ def _parse_ai_tool_binding_entry(self) -> ast_nodes.AiToolBinding:
     )
 
 
+def _parse_ai_semantic_cache_block(self, field_token) -> ast_nodes.AiSemanticCacheConfig:
+    config = ast_nodes.AiSemanticCacheConfig(span=self._span(field_token))
+    self.consume("COLON")
+    self.consume("NEWLINE")
+    self.consume("INDENT")
+    while not self.check("DEDENT"):
+        if self.match("NEWLINE"):
+            continue
+        cache_field = self.consume_any({"KEYWORD", "IDENT"})
+        field_name = cache_field.value or ""
+        if field_name in {"embedding", "max"}:
+            # two-word fields: "embedding model", "max entries"
+            second = self.consume_any({"KEYWORD", "IDENT"})
+            field_name = f"{field_name}_{second.value or ''}"
+        if field_name == "threshold":
+            self.consume("KEYWORD", "is")
+            num_tok = self.consume("NUMBER")
+            try:
+                threshold = float(num_tok.value or "")
+            except ValueError:
+                threshold = -1.0
+            if not 0 < threshold <= 1:
+                raise self.error("N3L-1421: semantic_cache threshold must be a number above 0 and at most 1.", num_tok)
+            config.threshold = threshold
+        elif field_name == "ttl":
+            self.consume("KEYWORD", "is")
+            num_tok = self.consume("NUMBER")
+            config.ttl_seconds = self._consume_positive_int(
+                num_tok, "N3L-1422: semantic_cache ttl must be a positive number of seconds."
+            )
+        elif field_name == "embedding_model":
+            self.consume("KEYWORD", "is")
+            model_tok = self.consume("STRING")
+            config.embedding_model = model_tok.value or None
+        elif field_name == "max_entries":
+            self.consume("KEYWORD", "is")
+            num_tok = self.consume("NUMBER")
+            config.max_entries = self._consume_positive_int(
+                num_tok, "N3L-1423: semantic_cache max entries must be a positive integer."
+            )
+        else:
+            raise self.error(f"Unexpected field '{cache_field.value}' in semantic_cache block", cache_field)
+        self.optional_newline()
+    self.consume("DEDENT")
+    self.optional_newline()
+    return config
+
+
 def parse_ai_called_block(
     self,
     model_name: str | None,
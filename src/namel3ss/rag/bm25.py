@@ -0,0 +1,101 @@
+"""
+Incremental BM25 inverted index for sparse retrieval.
+
+Posting lists map each term to ``{doc_id: term_frequency}`` so a query only
+touches documents that share a term with it. Document lengths and the running
+total length are kept alongside for BM25 length normalisation, and documents
+can be added, replaced or removed without rebuilding.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+
+def tokenize(text: str) -> List[str]:
+    return text.lower().split()
+
+
+class BM25Index:
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, Counter] = {}
+        self._doc_len: Dict[str, int] = {}
+        self._total_len = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_len
+
+    @property
+    def avg_doc_len(self) -> float:
+        return self._total_len / len(self._doc_len) if self._doc_len else 0.0
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Index ``text`` under ``doc_id``, replacing any previous version."""
+        self.remove(doc_id)
+        terms = tokenize(text)
+        counts = Counter(terms)
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+        self._doc_terms[doc_id] = counts
+        self._doc_len[doc_id] = len(terms)
+        self._total_len += len(terms)
+
+    def add_many(self, docs: Iterable[Tuple[str, str]]) -> None:
+        for doc_id, text in docs:
+            self.add(doc_id, text)
+
+    def remove(self, doc_id: str) -> None:
+        counts = self._doc_terms.pop(doc_id, None)
+        if counts is None:
+            return
+        for term in counts:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+        self._total_len -= self._doc_len.pop(doc_id, 0)
+
+    def idf(self, term: str) -> float:
+        df = len(self._postings.get(term, ()))
+        return math.log(1.0 + (len(self._doc_len) - df + 0.5) / (df + 0.5))
+
+    def scores(self, query: str) -> Dict[str, float]:
+        """BM25 score for every document sharing at least one term with ``query``."""
+        if not self._doc_len:
+            return {}
+        avg_len = self.avg_doc_len or 1.0
+        k1, b = self.k1, self.b
+        scores: Dict[str, float] = {}
+        for term, qtf in Counter(tokenize(query)).items():
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term) * qtf
+            for doc_id, tf in postings.items():
+                norm = k1 * (1.0 - b + b * self._doc_len[doc_id] / avg_len)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1.0) / (tf + norm)
+        return scores
+
+    def top_k(self, query: str, k: int) -> List[Tuple[str, float]]:
+        return heapq.nlargest(k, self.scores(query).items(), key=lambda pair: pair[1])
+
+
+def normalized(scores: Dict[str, float]) -> Dict[str, float]:
+    """Scale scores into [0, 1] by the best match so they blend with cosine similarity."""
+    if not scores:
+        return scores
+    best = max(scores.values())
+    if best <= 0:
+        return {doc_id: 0.0 for doc_id in scores}
+    return {doc_id: score / best for doc_id, score in scores.items()}
@@ -8,6 +8,7 @@ from typing import Dict, Optional
 
 from ..errors import Namel3ssError
 from ..secrets.manager import SecretsManager, get_default_secrets_manager
+from ..ai.embedding_cache import get_default_embedding_cache
 from ..ai.embedding_router import EmbeddingRouter
 from .embeddings import EmbeddingProvider, RouterEmbeddingProvider
 from .embeddings_deterministic import DeterministicEmbeddingProvider
@@ -19,7 +20,8 @@ class EmbeddingProviderRegistry:
     def __init__(self, secrets: Optional[SecretsManager] = None) -> None:
         self.secrets = secrets or get_default_secrets_manager()
         self.providers: Dict[str, EmbeddingProvider] = {}
-        self.router = EmbeddingRouter(self.secrets)
+        self.embedding_cache = get_default_embedding_cache()
+        self.router = EmbeddingRouter(self.secrets, embedding_cache=self.embedding_cache)
         self.default_provider: EmbeddingProvider = self._create_default()
 
     def _create_default(self) -> EmbeddingProvider:
@@ -7,8 +7,9 @@ from __future__ import annotations
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import List, Sequence
+from typing import List, Optional, Sequence
 
+from ..ai.embedding_cache import EmbeddingCache
 from ..ai.embedding_router import EmbeddingRouter
 from ..ai.embeddings import EmbeddingBatchResult
 
@@ -42,3 +43,13 @@ class RouterEmbeddingProvider(EmbeddingProvider):
 
     def embed_batch(self, texts: List[str], **kwargs) -> List[List[float]]:
         return self._run(texts).vectors
+
+
+def embed_batch_cached(provider, texts: List[str], cache: Optional[EmbeddingCache], **kwargs) -> List[List[float]]:
+    """Embed ``texts`` through ``cache`` so only uncached texts reach the provider."""
+    if cache is None or not texts or isinstance(provider, RouterEmbeddingProvider):
+        # the router keeps its own cache
+        return provider.embed_batch(texts, **kwargs)
+    name = getattr(provider, "name", None) or type(provider).__name__
+    model = kwargs.get("model") or getattr(provider, "model", None)
+    return cache.get_or_embed(name, model, texts, lambda misses: provider.embed_batch(misses, **kwargs))
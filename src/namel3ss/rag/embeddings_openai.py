@@ -4,11 +4,10 @@ OpenAI embeddings provider (mockable).
 
 from __future__ import annotations
 
-import json
-import urllib.request
 from typing import Any, Callable, Dict, List, Optional
 
 from ..errors import Namel3ssError
+from ..ai.transport import get_transport
 from .embeddings import EmbeddingProvider
 
 
@@ -57,8 +56,4 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
         return vectors
 
     def _default_http_client(self, url: str, body: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
-        payload = json.dumps(body).encode("utf-8")
-        req = urllib.request.Request(url, data=payload, headers=headers, method="POST")
-        with urllib.request.urlopen(req, timeout=15) as resp:  # pragma: no cover - live calls
-            text = resp.read().decode("utf-8")
-            return json.loads(text)
+        return get_transport().post_json(url, body, headers)
@@ -4,23 +4,31 @@ RAG engine orchestrating multi-index retrieval, hybrid scoring, and reranking.
 
 from __future__ import annotations
 
+import asyncio
+import heapq
+import logging
 import math
 from typing import Dict, List, Optional
 from uuid import uuid4
 
+from .bm25 import normalized
 from .factory import VectorStoreFactory
 from .models import RAGItem, ScoredItem
 from .index_config import RAGIndexConfig
 from .rewriter import DeterministicRewriter, QueryRewriter
 from .reranker import DeterministicReranker, Reranker
 from .embedding_registry import EmbeddingProviderRegistry
+from .embeddings import embed_batch_cached
 from .store_registry import VectorStoreRegistry
 from .vectorstores.memory import InMemoryVectorStore
+from ..errors import Namel3ssError
 from ..secrets.manager import SecretsManager, get_default_secrets_manager
 from ..metrics.tracker import MetricsTracker
 from ..obs.tracer import Tracer
 from ..memory.engine import MemoryEngine
 
+logger = logging.getLogger(__name__)
+
 
 class RAGEngine:
     def __init__(
@@ -31,8 +39,13 @@ class RAGEngine:
         tracer: Optional[Tracer] = None,
         memory_engine: Optional[MemoryEngine] = None,
         embedding_provider=None,
+        index_timeout: Optional[float] = None,
     ) -> None:
         self.secrets = secrets or get_default_secrets_manager()
+        # default per-index deadline (seconds) for retrieval; RAGIndexConfig.timeout overrides it.
+        # The deadline bounds how long a call waits: a search already running in a worker
+        # thread cannot be interrupted, it finishes in the background and its result is dropped.
+        self.index_timeout = index_timeout
         self.metrics = metrics
         self.tracer = tracer
         self.memory_engine = memory_engine
@@ -46,21 +59,55 @@ class RAGEngine:
         self.store = self._get_store(self.index_registry[self._default_index])
         registry = EmbeddingProviderRegistry(self.secrets)
         self.embedding_provider = embedding_provider or registry.get_default_provider()
+        self.embedding_cache = registry.embedding_cache
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        return embed_batch_cached(self.embedding_provider, texts, self.embedding_cache)
 
     def _get_store(self, index: RAGIndexConfig):
         return self.store_registry.get_store(index)
 
     def index_documents(self, index_name: str, texts: List[str]) -> None:
+        self._add_documents(self._index_store(index_name), index_name, [str(uuid4()) for _ in texts], texts)
+
+    def _index_store(self, index_name: str):
         if index_name not in self.index_registry:
             self.index_registry[index_name] = RAGIndexConfig(name=index_name, backend="memory", collection=index_name)
-        index = self.index_registry[index_name]
-        store = self._get_store(index)
-        embeddings = self.embedding_provider.embed_batch(texts)
+        return self._get_store(self.index_registry[index_name])
+
+    def upsert_documents(
+        self,
+        index_name: str,
+        ids: List[str],
+        texts: List[str],
+        metadata: Optional[List[dict]] = None,
+    ) -> None:
+        """
+        Index ``texts`` under caller-chosen ids; re-sending an id replaces that item.
+        Stores that do not declare ``upserts_by_id`` are refused, since they would
+        keep both versions.
+        """
+        store = self._index_store(index_name)
+        if not getattr(store, "upserts_by_id", False):
+            raise Namel3ssError(
+                f"RAG index '{index_name}' uses a vector store ({type(store).__name__}) that cannot replace items by id"
+            )
+        self._add_documents(store, index_name, ids, texts, metadata)
+
+    def _add_documents(
+        self,
+        store,
+        index_name: str,
+        ids: List[str],
+        texts: List[str],
+        metadata: Optional[List[dict]] = None,
+    ) -> None:
+        embeddings = self._embed(texts)
         items = [
             RAGItem(
-                id=str(uuid4()),
+                id=ids[idx],
                 text=text,
-                metadata={"index": index_name},
+                metadata={**((metadata[idx] if metadata else None) or {}), "index": index_name},
                 embedding=embeddings[idx],
                 source=index_name,
             )
@@ -69,7 +116,6 @@ class RAGEngine:
         if hasattr(store, "add_sync"):
             store.add_sync(items)  # type: ignore[attr-defined]
         else:
-            import asyncio
             self._run_coro_blocking(store.a_add(items))
 
     async def a_index_documents(self, index_name: str, texts: List[str]) -> None:
@@ -77,7 +123,7 @@ class RAGEngine:
             self.index_registry[index_name] = RAGIndexConfig(name=index_name, backend="memory", collection=index_name)
         index = self.index_registry[index_name]
         store = self._get_store(index)
-        embeddings = self.embedding_provider.embed_batch(texts)
+        embeddings = self._embed(texts)
         items = [
             RAGItem(
                 id=str(uuid4()),
@@ -95,35 +141,94 @@ class RAGEngine:
         query: str,
         index_names: Optional[List[str]] = None,
         include_memory: bool = True,
+        errors: Optional[Dict[str, str]] = None,
     ) -> List[ScoredItem]:
+        results = await self.a_retrieve_many(
+            [query], index_names=index_names, include_memory=include_memory, errors=errors
+        )
+        return results[0]
+
+    async def a_retrieve_many(
+        self,
+        queries: List[str],
+        index_names: Optional[List[str]] = None,
+        include_memory: bool = True,
+        errors: Optional[Dict[str, str]] = None,
+    ) -> List[List[ScoredItem]]:
+        """
+        Retrieve for several questions at once: one embedding batch and one
+        ``a_query_many`` call per index instead of one of each per question.
+
+        Indexes that fail or time out are skipped; pass an ``errors`` dict to
+        collect the reason for each skipped index of this call.
+        """
+        if not queries:
+            return []
         selected = index_names or list(self.index_registry.keys())
         if self.tracer:
-            self.tracer.record_rag_query(selected, hybrid=None)
-        query_text = query
+            for _ in queries:
+                self.tracer.record_rag_query(selected, hybrid=None)
         # Query rewrite
-        rewritten = await self._rewrite(query_text)
-        query_embedding = self.embedding_provider.embed_text(rewritten)
-        candidates: List[ScoredItem] = []
-        for name in selected:
-            index = self.index_registry.get(name)
-            if not index:
-                continue
-            store = self._get_store(index)
-            dense_results = await store.a_query(query_embedding, k=index.k)
-            # Sparse scoring (BM25-ish) on items if supported
-            if index.enable_hybrid and hasattr(store, "all_items"):
-                sparse_results = self._sparse_score(rewritten, store.all_items())
-                dense_results = self._merge_hybrid(dense_results, sparse_results, index)
-            candidates.extend(dense_results)
-        # Cross-store: memory
-        if include_memory and self.memory_engine:
-            mem_hits = self._memory_search(rewritten)
-            candidates.extend(mem_hits)
-        # Rerank
-        reranked = await self._rerank(rewritten, candidates)
-        if self.metrics:
-            self.metrics.record_rag_query(backends=selected, hybrid_used=any(self.index_registry[n].enable_hybrid for n in selected if n in self.index_registry))
-        return reranked
+        rewritten = [await self._rewrite(query) for query in queries]
+        query_embeddings = self._embed(rewritten)
+        indexes = [self.index_registry[name] for name in selected if name in self.index_registry]
+        # Fan out: every index (dense + sparse) and the memory scan run concurrently;
+        # an index that fails or times out contributes nothing instead of failing the call.
+        tasks = [self._query_index_bounded(index, rewritten, query_embeddings, errors) for index in indexes]
+        use_memory = include_memory and self.memory_engine is not None
+        if use_memory:
+            tasks.append(asyncio.to_thread(lambda: [self._memory_search(query) for query in rewritten]))
+        outcomes = await asyncio.gather(*tasks)
+        candidates: List[List[ScoredItem]] = [[] for _ in queries]
+        for batches in outcomes:
+            for pos, hits in enumerate(batches):
+                candidates[pos].extend(hits)
+        results: List[List[ScoredItem]] = []
+        hybrid_used = any(self.index_registry[n].enable_hybrid for n in selected if n in self.index_registry)
+        for pos, query_text in enumerate(rewritten):
+            # Rerank
+            results.append(await self._rerank(query_text, candidates[pos]))
+            if self.metrics:
+                self.metrics.record_rag_query(backends=selected, hybrid_used=hybrid_used)
+        return results
+
+    async def _query_index_bounded(
+        self,
+        index: RAGIndexConfig,
+        queries: List[str],
+        query_embeddings: List[List[float]],
+        errors: Optional[Dict[str, str]],
+    ) -> List[List[ScoredItem]]:
+        timeout = index.timeout if index.timeout is not None else self.index_timeout
+        try:
+            return await asyncio.wait_for(self._query_index(index, queries, query_embeddings), timeout)
+        except asyncio.TimeoutError:
+            reason = f"timed out after {timeout}s"
+        except Exception as exc:
+            reason = f"{type(exc).__name__}: {exc}"
+        logger.warning("RAG index '%s' skipped: %s", index.name, reason)
+        if errors is not None:
+            errors[index.name] = reason
+        return [[] for _ in queries]
+
+    async def _query_index(
+        self, index: RAGIndexConfig, queries: List[str], query_embeddings: List[List[float]]
+    ) -> List[List[ScoredItem]]:
+        store = self._get_store(index)
+        if getattr(store, "native_async", False) or not hasattr(store, "search_many"):
+            dense_batches = await store.a_query_many(query_embeddings, k=index.k)
+        else:
+            # in-process and blocking-driver stores scan in a worker thread (NumPy releases the GIL)
+            dense_batches = await asyncio.to_thread(store.search_many, query_embeddings, k=index.k)
+        if not (index.enable_hybrid and hasattr(store, "sparse_scores")):
+            return dense_batches
+        return await asyncio.to_thread(
+            lambda: [
+                # Sparse BM25 scoring when the store keeps an inverted index
+                self._merge_hybrid(dense, self._sparse_score(queries[pos], store, index.k, dense), index)
+                for pos, dense in enumerate(dense_batches)
+            ]
+        )
 
     def retrieve(self, source: Optional[str], query: str, top_k: int = 5) -> List[ScoredItem]:
         # Backward-compatible synchronous API: use default index or provided source.
@@ -133,16 +238,20 @@ class RAGEngine:
             self.tracer.update_last_rag_result_count(len(results))
         return results[:top_k]
 
-    def _sparse_score(self, query: str, items: List[RAGItem]) -> List[ScoredItem]:
-        query_terms = query.lower().split()
-        scored: List[ScoredItem] = []
-        for item in items:
-            text_terms = item.text.lower().split()
-            match = sum(text_terms.count(t) for t in query_terms)
-            score = match / (len(text_terms) + 1)
-            scored.append(ScoredItem(item=item, score=score, source=item.source or "memory"))
-        scored.sort(key=lambda x: x.score, reverse=True)
-        return scored
+    def _sparse_score(self, query: str, store, k: int, dense: List[ScoredItem]) -> List[ScoredItem]:
+        """
+        BM25 top-k for ``query`` plus the sparse scores of the dense hits, so
+        every merge candidate gets both signals.
+        """
+        scores = normalized(store.sparse_scores(query))
+        wanted = dict.fromkeys(hit.item.id for hit in dense if hit.item.id in scores)
+        wanted.update(dict.fromkeys(doc_id for doc_id, _ in heapq.nlargest(k, scores.items(), key=lambda pair: pair[1])))
+        items = store.get_items(wanted)
+        return [
+            ScoredItem(item=items[doc_id], score=scores[doc_id], source=items[doc_id].source or "memory")
+            for doc_id in wanted
+            if doc_id in items
+        ]
 
     def _merge_hybrid(
         self, dense: List[ScoredItem], sparse: List[ScoredItem], index: RAGIndexConfig
@@ -162,9 +271,7 @@ class RAGEngine:
                 combined[s.item.id] = ScoredItem(
                     item=s.item, score=index.sparse_weight * s.score, source=s.source
                 )
-        results = list(combined.values())
-        results.sort(key=lambda x: x.score, reverse=True)
-        return results
+        return heapq.nlargest(index.k, combined.values(), key=lambda x: x.score)
 
     def _memory_search(self, query: str) -> List[ScoredItem]:
         hits: List[ScoredItem] = []
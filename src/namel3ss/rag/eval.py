@@ -13,6 +13,7 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, Iterable, List, Optional
 from uuid import uuid4
 
+from .. import ast_nodes
 from ..errors import Namel3ssError
 from ..flows.graph import FlowState
 from ..runtime.context import ExecutionContext
@@ -90,8 +91,48 @@ def _compute_aggregates(rows: list[RagEvaluationRow], metric_names: list[str]) -
     return aggregates
 
 
-async def _run_single_question(flow_engine, eval_cfg, question: str, base_context: ExecutionContext, runtime_ctx, flow_name: str):
+def _prefetch_matches(program, eval_cfg, flow_engine, runtime_ctx, questions: list[str]) -> dict:
+    """
+    Batch the leading ``vector_retrieve`` stage across every dataset question.
+
+    Only static stages qualify (fixed vector store, literal top_k), since later
+    stages may depend on AI output. Failures are left to the per-row run so
+    errors are still reported on the row that triggered them.
+    """
+    pipeline = getattr(runtime_ctx, "rag_pipelines", {}).get(eval_cfg.pipeline) or getattr(
+        program, "rag_pipelines", {}
+    ).get(eval_cfg.pipeline)
+    if not pipeline or not getattr(pipeline, "stages", None) or not questions:
+        return {}
+    stage = pipeline.stages[0]
+    if (stage.type or "").lower() != "vector_retrieve" or not stage.vector_store:
+        return {}
+    if stage.top_k is not None and not isinstance(stage.top_k, (int, ast_nodes.Literal)):
+        return {}
+    top_k = flow_engine._evaluate_stage_number(stage.top_k, None, default=5)
+    if top_k < 1:
+        top_k = 5
+    unique_questions = list(dict.fromkeys(questions))
+    try:
+        batches = runtime_ctx.vectorstores.query_many(
+            stage.vector_store, unique_questions, top_k=top_k, frames=runtime_ctx.frames
+        )
+    except Exception:
+        return {}
+    return {(stage.vector_store, q, top_k): matches for q, matches in zip(unique_questions, batches)}
+
+
+async def _run_single_question(
+    flow_engine,
+    eval_cfg,
+    question: str,
+    base_context: ExecutionContext,
+    runtime_ctx,
+    flow_name: str,
+    prefetched: Optional[dict] = None,
+):
     state = FlowState(context={"flow_name": flow_name})
+    extra = {"prefetched": prefetched} if prefetched else {}
     result = await flow_engine._run_rag_pipeline(
         eval_cfg.pipeline,
         question,
@@ -100,6 +141,7 @@ async def _run_single_question(flow_engine, eval_cfg, question: str, base_contex
         base_context,
         flow_name=flow_name,
         step_name="rag_eval",
+        **extra,
     )
     return {
         "answer": result.get("answer"),
@@ -143,6 +185,12 @@ def run_rag_evaluation(program, eval_cfg, flow_engine, limit: Optional[int] = No
         rows: list[RagEvaluationRow] = []
         metric_names = list(eval_cfg.metrics or [])
         flow_name = f"rag_eval:{eval_cfg.name}"
+        questions = [
+            str(row.get(eval_cfg.question_column))
+            for row in rows_data
+            if isinstance(row, dict) and row.get(eval_cfg.question_column) is not None
+        ]
+        prefetched = _prefetch_matches(program, eval_cfg, flow_engine, runtime_ctx, questions)
 
         for row in rows_data:
             error: Optional[str] = None
@@ -163,7 +211,7 @@ def run_rag_evaluation(program, eval_cfg, flow_engine, limit: Optional[int] = No
                     )
                 question_text = str(question_val)
                 single_result = await _run_single_question(
-                    flow_engine, eval_cfg, question_text, base_context, runtime_ctx, flow_name
+                    flow_engine, eval_cfg, question_text, base_context, runtime_ctx, flow_name, prefetched
                 )
                 answer_val = single_result.get("answer")
                 context_text = single_result.get("context")
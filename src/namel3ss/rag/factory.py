@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Dict
 
 from .vectorstores.base import VectorStore
+from .vectorstores.ivf import IVFVectorStore
 from .vectorstores.memory import InMemoryVectorStore
 from .vectorstores.pgvector import PGVectorStore
 from .vectorstores.faiss import FAISSVectorStore
@@ -20,19 +21,37 @@ class VectorStoreFactory:
         if key in self._cache:
             return self._cache[key]
         backend = backend.lower()
+        options = config.get("options") or {}
         if backend == "memory":
-            store = InMemoryVectorStore()
+            store = InMemoryVectorStore(path=options.get("path"))
         elif backend == "pgvector":
             dsn = config.get("dsn") or self.secrets.get_pgvector_dsn()
             table = config.get("table") or self.secrets.get_pgvector_table(config.get("name") or config.get("collection", "rag_items"))
             if not dsn:
                 raise Namel3ssError("PGVector backend requested but DSN not set")
-            store = PGVectorStore(dsn=dsn, table=table)
+            dimension = config.get("dimension") or options.get("dimension")
+            store = PGVectorStore(
+                dsn=dsn,
+                table=table,
+                dimension=int(dimension) if dimension else None,
+                index_method=options.get("index"),
+                index_options=options.get("index_options"),
+                search_options=options.get("search_options"),
+                max_pool_size=int(options.get("pool_size", 10)),
+            )
         elif backend == "faiss":
             dimension = config.get("dimension")
             if dimension is None:
                 raise Namel3ssError("FAISS backend requires 'dimension'")
-            store = FAISSVectorStore(dimension=dimension)
+            store = FAISSVectorStore(dimension=dimension, path=options.get("path"))
+        elif backend == "ivf":
+            nlist = options.get("nlist")
+            store = IVFVectorStore(
+                nlist=int(nlist) if nlist is not None else None,
+                nprobe=int(options.get("nprobe", 8)),
+                train_threshold=int(options.get("train_threshold", 1024)),
+                path=options.get("path"),
+            )
         else:
             raise Namel3ssError(f"Unsupported vector store backend '{backend}'")
         self._cache[key] = store
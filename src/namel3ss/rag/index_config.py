@@ -17,4 +17,6 @@ class RAGIndexConfig:
     enable_rerank: bool = False
     enable_rewrite: bool = False
     dsn: Optional[str] = None
+    # seconds before retrieval gives up on this index and returns the others' results
+    timeout: Optional[float] = None
     options: Dict[str, Any] = field(default_factory=dict)
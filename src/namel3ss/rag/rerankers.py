@@ -30,10 +30,12 @@ class EmbeddingReranker:
     def rerank(self, query: str, candidates: Sequence[RetrievalResult]) -> List[RetrievalResult]:
         if not candidates:
             return []
-        query_emb = self.embedding_router.embed([query], model=self.model).vectors[0]
+        # Embed the query and every candidate in a single provider call.
+        texts = [query] + [cand.document.text for cand in candidates]
+        vectors = self.embedding_router.embed(texts, model=self.model).vectors
+        query_emb = vectors[0]
         rescored: List[RetrievalResult] = []
-        for cand in candidates:
-            doc_emb = self.embedding_router.embed([cand.document.text], model=self.model).vectors[0]
+        for cand, doc_emb in zip(candidates, vectors[1:]):
             score = _cosine(query_emb, doc_emb)
             rescored.append(
                 RetrievalResult(
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import heapq
 from dataclasses import dataclass
-from typing import Iterable, List, Sequence
+from typing import Dict, Iterable, List, Sequence
 from uuid import uuid4
 
 from ..ai.embedding_router import EmbeddingRouter
+from .bm25 import normalized
 from .retrieval_models import RAGDocument, RetrievalResult
 from .vectorstores.base import VectorStore
 
@@ -24,14 +26,11 @@ class RetrievalPipeline:
         query_emb = self.embedding_router.embed([query], model=self.embedding_model).vectors[0]
         return self.vector_store.search_results(query_emb, k=k)
 
-
-def lexical_score(query: str, doc: RAGDocument) -> float:
-    q_terms = query.lower().split()
-    doc_terms = doc.text.lower().split()
-    if not doc_terms:
-        return 0.0
-    matches = sum(doc_terms.count(t) for t in q_terms)
-    return matches / (len(doc_terms) + 1)
+    def retrieve_many(self, queries: Sequence[str], *, k: int = 5) -> List[List[RetrievalResult]]:
+        if not queries:
+            return []
+        query_embs = self.embedding_router.embed(list(queries), model=self.embedding_model).vectors
+        return self.vector_store.search_results_many(query_embs, k=k)
 
 
 @dataclass
@@ -41,35 +40,26 @@ class HybridRetrievalPipeline(RetrievalPipeline):
 
     def retrieve(self, query: str, *, k: int = 5) -> List[RetrievalResult]:
         dense_results = super().retrieve(query, k=k)
-        # Build lexical candidates from already indexed docs if available
-        lexical_candidates: List[RetrievalResult] = []
-        if hasattr(self.vector_store, "_items"):
-            items = getattr(self.vector_store, "_items")
-            for item in items.values():
-                doc = RAGDocument(id=item.id, text=item.text, metadata=item.metadata, source=item.source)
-                lexical_candidates.append(
-                    RetrievalResult(
-                        document=doc,
-                        score=lexical_score(query, doc),
-                        rank=0,
-                    )
-                )
-        merged = {res.document.id: res for res in dense_results}
-        for lex in lexical_candidates:
-            if lex.document.id in merged:
-                merged[lex.document.id] = RetrievalResult(
-                    document=lex.document,
-                    score=self.dense_weight * merged[lex.document.id].score + self.lexical_weight * lex.score,
-                    rank=0,
-                )
-            else:
-                merged[lex.document.id] = RetrievalResult(
-                    document=lex.document,
-                    score=self.lexical_weight * lex.score,
-                    rank=0,
-                )
-        combined = list(merged.values())
-        combined.sort(key=lambda r: r.score, reverse=True)
+        lexical: Dict[str, float] = {}
+        if hasattr(self.vector_store, "sparse_scores"):
+            lexical = normalized(self.vector_store.sparse_scores(query))
+        merged: Dict[str, RetrievalResult] = {}
+        for res in dense_results:
+            merged[res.document.id] = RetrievalResult(
+                document=res.document,
+                score=self.dense_weight * res.score + self.lexical_weight * lexical.get(res.document.id, 0.0),
+                rank=0,
+            )
+        # lexical-only candidates: BM25 top-k rather than a pass over the whole corpus
+        top_lexical = heapq.nlargest(k, lexical.items(), key=lambda pair: pair[1])
+        items = self.vector_store.get_items(doc_id for doc_id, _ in top_lexical) if top_lexical else {}
+        for doc_id, score in top_lexical:
+            item = items.get(doc_id)
+            if doc_id in merged or item is None:
+                continue
+            doc = RAGDocument(id=item.id, text=item.text, metadata=item.metadata, source=item.source)
+            merged[doc_id] = RetrievalResult(document=doc, score=self.lexical_weight * score, rank=0)
+        combined = heapq.nlargest(k, merged.values(), key=lambda r: r.score)
         for idx, res in enumerate(combined, start=1):
             res.rank = idx
-        return combined[:k]
+        return combined
@@ -25,6 +25,7 @@ class VectorStoreRegistry:
             "dsn": index.dsn,
             "table": self.secrets.get_pgvector_table(index.name) or index.collection,
             "dimension": index.options.get("dimension") if hasattr(index, "options") else None,
+            "options": getattr(index, "options", None) or {},
         }
         store = self.factory.get(backend, cfg)
         self._stores[key] = store
@@ -1,36 +1,115 @@
 """
 RAG sync worker for ingesting memory into vector store.
+
+The worker keeps a high-water mark per memory space (the ``seq`` change cursor
+assigned by memory stores) and only embeds items written since the last run.
+Items are upserted under ids derived from the space and memory item id, so a
+replayed batch replaces rather than duplicates what is already indexed; a
+vector store that cannot replace items by id is refused.
+
+Cursors are only saved to ``state_path`` for memory engines whose ``seq``
+values survive a restart; an in-memory store starts counting from 1 again, so
+a saved cursor would hide its new items.
 """
 
 from __future__ import annotations
 
-from typing import List, Optional
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
 
 from .engine import RAGEngine
 from ..memory.engine import MemoryEngine
+from ..memory.models import MemoryItem
+
+
+def memory_document_id(space: str, item: MemoryItem) -> str:
+    return hashlib.sha256(f"{space}\0{item.id}".encode("utf-8")).hexdigest()
 
 
 class RAGSyncWorker:
-    def __init__(self, memory_engine: MemoryEngine, rag_engine: RAGEngine) -> None:
+    def __init__(
+        self,
+        memory_engine: MemoryEngine,
+        rag_engine: RAGEngine,
+        state_path: Optional[str | os.PathLike[str]] = None,
+        batch_size: int = 256,
+    ) -> None:
         self.memory_engine = memory_engine
         self.rag_engine = rag_engine
+        self.state_path = Path(state_path) if state_path is not None else None
+        self.batch_size = max(1, batch_size)
+        self.cursors: Dict[str, int] = self._load_state()
+
+    def _persists_state(self) -> bool:
+        return self.state_path is not None and bool(getattr(self.memory_engine, "durable_changes", False))
 
-    async def run_once(self, space: Optional[str] = None) -> None:
+    def _load_state(self) -> Dict[str, int]:
+        if not self._persists_state() or not self.state_path.exists():
+            return {}
+        try:
+            data = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return {str(space): int(cursor) for space, cursor in (data.get("cursors") or {}).items()}
+
+    def _save_state(self) -> None:
+        if not self._persists_state():
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+        tmp_path.write_text(json.dumps({"cursors": self.cursors}), encoding="utf-8")
+        os.replace(tmp_path, self.state_path)
+
+    def _changes(self, space: str) -> List[MemoryItem]:
+        cursor = self.cursors.get(space, 0)
+        if hasattr(self.memory_engine, "changes_since"):
+            return self.memory_engine.changes_since(space, cursor)
+        if hasattr(self.memory_engine, "list_all"):
+            items = self.memory_engine.list_all(space)
+        else:
+            items = self.memory_engine.get_recent(space, limit=1000)
+        return [item for item in items if not item.seq or item.seq > cursor]
+
+    async def run_once(self, space: Optional[str] = None) -> int:
+        """Index memory written since the last run; returns the number of items embedded."""
         spaces = [space] if space else list(self.memory_engine.spaces.keys())
+        index_name = getattr(self.rag_engine, "_default_index", "default")
+        synced = 0
         for sp in spaces:
-            items = []
-            if hasattr(self.memory_engine, "list_all"):
-                items = self.memory_engine.list_all(sp)
-            else:
-                items = self.memory_engine.get_recent(sp, limit=1000)
-            texts: List[str] = [item.content for item in items]
-            if texts:
-                index_name = getattr(self.rag_engine, "_default_index", "default")
-                self.rag_engine.index_documents(index_name=index_name, texts=texts)
+            changes = self._changes(sp)
+            for start in range(0, len(changes), self.batch_size):
+                batch = changes[start : start + self.batch_size]
+                docs = [item for item in batch if item.content]
+                if docs:
+                    self.rag_engine.upsert_documents(
+                        index_name=index_name,
+                        ids=[memory_document_id(sp, item) for item in docs],
+                        texts=[item.content for item in docs],
+                        metadata=[{"memory_space": sp, "memory_id": item.id} for item in docs],
+                    )
+                    synced += len(docs)
+                high_water = max(item.seq for item in batch)
+                if high_water > self.cursors.get(sp, 0):
+                    self.cursors[sp] = high_water
+                    self._save_state()
+        return synced
 
     async def run_forever(self, poll_interval: float = 1.0) -> None:
+        """
+        Sync, then sleep until the memory engine reports a write. Engines
+        without change notifications (or writes from other processes) fall
+        back to ``poll_interval``.
+        """
         import asyncio
 
+        changes = getattr(self.memory_engine, "changes", None)
         while True:
+            since = changes.version if changes is not None else None
             await self.run_once()
-            await asyncio.sleep(poll_interval)
+            if changes is not None:
+                await changes.wait(since, timeout=poll_interval)
+            else:
+                await asyncio.sleep(poll_interval)
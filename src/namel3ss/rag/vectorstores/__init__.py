@@ -1,5 +1,6 @@
 from .base import VectorStore
+from .ivf import IVFVectorStore
 from .memory import InMemoryVectorStore
 from .pgvector import PGVectorStore
 
-__all__ = ["VectorStore", "InMemoryVectorStore", "PGVectorStore"]
+__all__ = ["VectorStore", "InMemoryVectorStore", "IVFVectorStore", "PGVectorStore"]
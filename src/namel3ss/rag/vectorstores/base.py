@@ -7,21 +7,34 @@ from ..retrieval_models import RAGDocument, RetrievalResult
 
 
 class VectorStore(Protocol):
+    # True when add_sync/a_add replace an item whose id is already stored
+    upserts_by_id: bool = False
+
     def add_sync(self, items: List[RAGItem]) -> None:
         ...
 
     def search(self, query_embedding: List[float], top_k: int = 5) -> List[ScoredItem]:
         ...
 
+    def search_many(self, query_embeddings: Sequence[List[float]], k: int = 5) -> List[List[ScoredItem]]:
+        """Answer several queries in one pass; results are returned in query order."""
+        ...
+
     async def a_add(self, items: List[RAGItem]) -> None:
         ...
 
     async def a_query(self, query_embedding: List[float], k: int = 10) -> List[ScoredItem]:
         ...
 
+    async def a_query_many(self, query_embeddings: Sequence[List[float]], k: int = 10) -> List[List[ScoredItem]]:
+        ...
+
     # New structured interfaces for retrieval pipelines
     def index(self, documents: Sequence[RAGDocument], *, embeddings: Sequence[List[float]] | None = None) -> None:
         ...
 
     def search_results(self, query_embedding: List[float], *, k: int = 5) -> List[RetrievalResult]:
         ...
+
+    def search_results_many(self, query_embeddings: Sequence[List[float]], *, k: int = 5) -> List[List[RetrievalResult]]:
+        ...
@@ -0,0 +1,213 @@
+"""
+On-disk, memory-mapped vector index format.
+
+An index directory holds:
+
+- ``manifest.json``: format version, generation, dimension, committed row
+  count, capacity.
+- ``vectors.f32``: row-major float32 matrix (``capacity x dimension``).
+- ``norms.f32``: precomputed row norms.
+- ``alive.u8``: one byte per row, 0 for deleted rows.
+- ``items.jsonl``: append-only log of row records (id, text, metadata, source)
+  and delete markers; the last record for an id wins.
+
+Generation 0 uses the names above; later generations insert the generation
+number (``vectors.3.f32``, ``items.3.jsonl``, ...).
+
+Arrays are opened with ``numpy.memmap`` so loading an index does not copy the
+matrix, and appends write straight into the mapped files. The manifest is
+replaced atomically after every batch, so rows past its ``rows`` count (from
+an interrupted write) are ignored on the next open. Compaction never moves
+rows in place: it writes the surviving rows and records to a new generation
+of files and then swaps the manifest, so an interrupted compaction leaves the
+previous generation intact.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ...errors import Namel3ssError
+from .memory import np
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+FORMAT_NAME = "namel3ss-vector-index"
+FORMAT_VERSION = 2
+# version 1 indexes are generation 0 of the current layout
+_READABLE_VERSIONS = {1, 2}
+_DATA_FILES = (("vectors", "f32"), ("norms", "f32"), ("alive", "u8"), ("items", "jsonl"))
+
+
+class VectorIndexFile:
+    def __init__(self, path: str | os.PathLike[str], dimension: Optional[int] = None) -> None:
+        if np is None:
+            raise Namel3ssError('numpy not installed; cannot open an on-disk vector index (pip install "namel3ss[vector]")')
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.dimension = dimension
+        self.rows = 0
+        self.capacity = 0
+        self.generation = 0
+        manifest = self._read_manifest()
+        if manifest:
+            if manifest.get("format") != FORMAT_NAME or manifest.get("version") not in _READABLE_VERSIONS:
+                raise Namel3ssError(f"Unsupported vector index format in '{self.path}'")
+            if dimension is not None and manifest["dimension"] != dimension:
+                raise Namel3ssError(
+                    f"Vector index '{self.path}' has dimension {manifest['dimension']}, expected {dimension}"
+                )
+            self.dimension = int(manifest["dimension"])
+            self.rows = int(manifest["rows"])
+            self.capacity = int(manifest["capacity"])
+            self.generation = int(manifest.get("generation", 0))
+
+    @property
+    def exists(self) -> bool:
+        return self.dimension is not None and self.capacity > 0
+
+    def _file(self, name: str) -> Path:
+        return self.path / name
+
+    def _data_file(self, stem: str, generation: Optional[int] = None) -> Path:
+        generation = self.generation if generation is None else generation
+        suffix = dict(_DATA_FILES)[stem]
+        return self.path / (f"{stem}.{suffix}" if generation == 0 else f"{stem}.{generation}.{suffix}")
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        manifest_path = self._file("manifest.json")
+        if not manifest_path.exists():
+            return {}
+        return json.loads(manifest_path.read_text(encoding="utf-8"))
+
+    def _map(self, stem: str, dtype: str, shape: Tuple[int, ...]) -> "np.memmap":
+        return np.memmap(self._data_file(stem), dtype=dtype, mode="r+", shape=shape)
+
+    def arrays(self) -> Tuple["np.memmap", "np.memmap", "np.memmap"]:
+        assert self.dimension is not None
+        return (
+            self._map("vectors", "float32", (self.capacity, self.dimension)),
+            self._map("norms", "float32", (self.capacity,)),
+            self._map("alive", "bool", (self.capacity,)),
+        )
+
+    def reserve(self, capacity: int) -> Tuple["np.memmap", "np.memmap", "np.memmap"]:
+        """Grow the backing files to ``capacity`` rows and return fresh mappings."""
+        if self.dimension is None:
+            raise Namel3ssError("Vector index dimension is unknown")
+        if capacity > self.capacity:
+            for stem, row_bytes in (
+                ("vectors", 4 * self.dimension),
+                ("norms", 4),
+                ("alive", 1),
+            ):
+                with open(self._data_file(stem), "ab") as fh:
+                    fh.truncate(capacity * row_bytes)
+            self.capacity = capacity
+        return self.arrays()
+
+    def commit(self, rows: int, arrays: Iterable["np.memmap"] = (), records: Optional[List[Dict[str, Any]]] = None) -> None:
+        """Flush mapped arrays, then the sidecar records, then publish the manifest."""
+        for arr in arrays:
+            if isinstance(arr, np.memmap):
+                arr.flush()
+        self.append_records(records or [])
+        self._publish(rows, self.capacity, self.generation)
+
+    def _publish(self, rows: int, capacity: int, generation: int) -> None:
+        manifest = {
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "generation": generation,
+            "dimension": self.dimension,
+            "rows": rows,
+            "capacity": capacity,
+            "dtype": "float32",
+            "metric": "cosine",
+        }
+        tmp_path = self._file("manifest.json.tmp")
+        tmp_path.write_text(json.dumps(manifest), encoding="utf-8")
+        os.replace(tmp_path, self._file("manifest.json"))
+        self.rows, self.capacity, self.generation = rows, capacity, generation
+
+    def append_records(self, records: List[Dict[str, Any]]) -> None:
+        if not records:
+            return
+        with open(self._data_file("items"), "a", encoding="utf-8") as fh:
+            for record in records:
+                fh.write(json.dumps(record, default=str) + "\n")
+            fh.flush()
+
+    def rewrite(
+        self, vectors: "np.ndarray", norms: "np.ndarray", records: List[Dict[str, Any]], capacity: int
+    ) -> Tuple["np.memmap", "np.memmap", "np.memmap"]:
+        """
+        Publish a compacted copy as the next generation and return its mappings.
+
+        The new files are written and synced before the manifest switches to
+        them; the previous generation is only removed afterwards.
+        """
+        assert self.dimension is not None
+        previous, generation = self.generation, self.generation + 1
+        rows = len(vectors)
+        capacity = max(capacity, rows, 1)
+        for stem, data, row_bytes in (
+            ("vectors", np.ascontiguousarray(vectors, dtype=np.float32), 4 * self.dimension),
+            ("norms", np.ascontiguousarray(norms, dtype=np.float32), 4),
+            ("alive", np.ones(rows, dtype=bool), 1),
+        ):
+            with open(self._data_file(stem, generation), "wb") as fh:
+                fh.write(data.tobytes())
+                fh.truncate(capacity * row_bytes)
+                fh.flush()
+                os.fsync(fh.fileno())
+        with open(self._data_file("items", generation), "w", encoding="utf-8") as fh:
+            for record in records:
+                fh.write(json.dumps(record, default=str) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+        self._publish(rows, capacity, generation)
+        for stem, _ in _DATA_FILES:
+            try:
+                self._data_file(stem, previous).unlink()
+            except OSError:  # still mapped elsewhere (Windows) or already gone
+                pass
+        return self.arrays()
+
+    def load_records(self) -> List[Optional[Dict[str, Any]]]:
+        """Replay the sidecar log into one record per committed row (None for deleted rows)."""
+        by_row: List[Optional[Dict[str, Any]]] = [None] * self.rows
+        rows_by_id: Dict[str, int] = {}
+        log_path = self._data_file("items")
+        if not log_path.exists():
+            return by_row
+        with open(log_path, "rb") as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                record = _loads(line)
+                if record.get("deleted"):
+                    row = rows_by_id.pop(record["id"], None)
+                    if row is not None:
+                        by_row[row] = None
+                    continue
+                row = int(record["row"])
+                if row >= self.rows:
+                    continue
+                previous = rows_by_id.get(record["id"])
+                if previous is not None and previous != row:
+                    by_row[previous] = None
+                displaced = by_row[row]
+                if displaced is not None and displaced["id"] != record["id"]:
+                    rows_by_id.pop(displaced["id"], None)
+                rows_by_id[record["id"]] = row
+                by_row[row] = record
+        return by_row
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence
 
 from .base import VectorStore
 from ..models import RAGItem, ScoredItem
@@ -13,54 +13,132 @@ except Exception:  # pragma: no cover
 
 
 class FAISSVectorStore(VectorStore):
-    def __init__(self, dimension: int) -> None:
+    """
+    FAISS flat L2 index. FAISS ids are row numbers; re-adding an item id
+    removes its previous row, so each id has one vector in the index.
+    """
+
+    upserts_by_id = True
+
+    def __init__(self, dimension: int, path: Optional[str] = None) -> None:
         if faiss is None:
             raise Namel3ssError("faiss not installed; cannot use FAISS backend")
         self.dimension = dimension
-        self.index = faiss.IndexFlatL2(dimension)
+        self.index = faiss.IndexIDMap(faiss.IndexFlatL2(dimension))
         self._items: Dict[int, RAGItem] = {}
+        # item id -> its current row
+        self._rows: Dict[str, int] = {}
         self._next_id = 0
+        self._disk = None
+        if path is not None:
+            from .disk import VectorIndexFile
+
+            self._disk = VectorIndexFile(path, dimension=dimension)
+            if self._disk.exists:
+                self._load_disk()
+
+    def _load_disk(self) -> None:
+        import numpy as np  # type: ignore
+
+        disk = self._disk
+        records = disk.load_records()
+        vectors, _norms, _alive = disk.arrays()
+        # only the latest row of each id is live; overwritten and deleted rows stay out of the index
+        live = [row for row, record in enumerate(records) if record is not None]
+        if live:
+            rows = np.asarray(live, dtype="int64")
+            self.index.add_with_ids(np.ascontiguousarray(vectors[rows]), rows)
+        for row in live:
+            record = records[row]
+            self._items[row] = RAGItem(
+                id=record["id"],
+                text=record.get("text") or "",
+                metadata=record.get("metadata") or {},
+                embedding=None,
+                source=record.get("source"),
+            )
+            self._rows[record["id"]] = row
+        self._next_id = disk.rows
+
+    def _append_disk(self, start: int, arr, items: List[RAGItem], replaced: List[int]) -> None:
+        import numpy as np  # type: ignore
+
+        disk = self._disk
+        end = start + len(arr)
+        capacity = disk.capacity or 64
+        while capacity < end:
+            capacity *= 2
+        vectors, norms, alive = disk.reserve(capacity)
+        vectors[start:end] = arr
+        norms[start:end] = np.linalg.norm(arr, axis=1)
+        alive[start:end] = True
+        alive[replaced] = False
+        records = [
+            {"row": row, "id": item.id, "text": item.text, "metadata": item.metadata, "source": item.source}
+            for row, item in enumerate(items, start=start)
+        ]
+        disk.commit(end, (vectors, norms, alive), records)
 
     def add_sync(self, items: List[RAGItem]) -> None:
-        vectors = []
-        ids = []
+        # one row per id; a repeated id in the batch keeps its last embedding
+        latest: Dict[str, RAGItem] = {}
         for item in items:
             if not item.embedding:
                 continue
             if len(item.embedding) != self.dimension:
                 raise Namel3ssError("Embedding dimension mismatch for FAISS index")
-            vectors.append(item.embedding)
-            ids.append(self._next_id)
-            self._items[self._next_id] = item
-            self._next_id += 1
-        if vectors:
-            import numpy as np  # type: ignore
+            latest.pop(item.id, None)
+            latest[item.id] = item
+        if not latest:
+            return
+        import numpy as np  # type: ignore
 
-            arr = np.array(vectors, dtype="float32")
-            self.index.add(arr)
+        added = list(latest.values())
+        replaced = [self._rows[item.id] for item in added if item.id in self._rows]
+        if replaced:
+            self.index.remove_ids(np.asarray(replaced, dtype="int64"))
+            for row in replaced:
+                del self._items[row]
+        start = self._next_id
+        rows = np.arange(start, start + len(added), dtype="int64")
+        for row, item in zip(rows.tolist(), added):
+            self._items[row] = item
+            self._rows[item.id] = row
+        self._next_id += len(added)
+        arr = np.array([item.embedding for item in added], dtype="float32")
+        self.index.add_with_ids(arr, rows)
+        if self._disk is not None:
+            self._append_disk(start, arr, added, replaced)
 
     async def a_add(self, items: List[RAGItem]) -> None:
         self.add_sync(items)
 
     async def a_query(self, query_embedding: List[float], k: int = 10) -> List[ScoredItem]:
+        return self.search_many([query_embedding], k=k)[0]
+
+    async def a_query_many(self, query_embeddings: Sequence[List[float]], k: int = 10) -> List[List[ScoredItem]]:
+        return self.search_many(query_embeddings, k=k)
+
+    def search_many(self, query_embeddings: Sequence[List[float]], k: int = 5) -> List[List[ScoredItem]]:
         import numpy as np  # type: ignore
 
-        if len(query_embedding) != self.dimension:
+        if any(len(query) != self.dimension for query in query_embeddings):
             raise Namel3ssError("Query embedding dimension mismatch for FAISS index")
-        if self.index.ntotal == 0:
-            return []
-        arr = np.array([query_embedding], dtype="float32")
+        if self.index.ntotal == 0 or not query_embeddings:
+            return [[] for _ in query_embeddings]
+        arr = np.array(query_embeddings, dtype="float32")
         scores, indices = self.index.search(arr, k)
-        results: List[ScoredItem] = []
-        for score, idx in zip(scores[0], indices[0]):
-            if idx == -1:
-                continue
-            item = self._items.get(int(idx))
-            if item:
-                results.append(ScoredItem(item=item, score=float(score), source=item.source or "faiss"))
-        return results
+        batches: List[List[ScoredItem]] = []
+        for row_scores, row_indices in zip(scores, indices):
+            results: List[ScoredItem] = []
+            for score, idx in zip(row_scores, row_indices):
+                if idx == -1:
+                    continue
+                item = self._items.get(int(idx))
+                if item:
+                    results.append(ScoredItem(item=item, score=float(score), source=item.source or "faiss"))
+            batches.append(results)
+        return batches
 
     def search(self, query_embedding: List[float], top_k: int = 5) -> List[ScoredItem]:
-        import asyncio
-
-        return asyncio.run(self.a_query(query_embedding, k=top_k))
+        return self.search_many([query_embedding], k=top_k)[0]
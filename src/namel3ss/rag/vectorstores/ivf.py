@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from typing import List, Optional, Sequence
+
+from ..models import RAGItem, ScoredItem
+from ...errors import Namel3ssError
+from .memory import InMemoryVectorStore, np
+
+
+def _kmeans(data: "np.ndarray", nlist: int, iterations: int, rng: "np.random.Generator") -> "np.ndarray":
+    """Spherical k-means over unit vectors; returns unit-length centroids."""
+    centroids = data[rng.choice(len(data), size=nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(data @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, data)
+        counts = np.bincount(assign, minlength=nlist)
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            # reseed empty clusters from random points so every list stays usable
+            sums[empty] = data[rng.choice(len(data), size=len(empty), replace=False)]
+        norms = np.linalg.norm(sums, axis=1)
+        centroids = sums / np.where(norms == 0, 1.0, norms)[:, None]
+    return centroids.astype(np.float32)
+
+
+class IVFVectorStore(InMemoryVectorStore):
+    """
+    Approximate nearest-neighbour store (IVF-flat) built on NumPy only.
+
+    Vectors are partitioned into ``nlist`` clusters by spherical k-means and a
+    query scans only the ``nprobe`` closest clusters. Until ``train_threshold``
+    vectors are present (or after ``reset_training``) searches are exact.
+    Inserts after training are assigned to their nearest centroid; the
+    clustering is retrained once the store has grown by ``retrain_growth``.
+    """
+
+    def __init__(
+        self,
+        nlist: Optional[int] = None,
+        nprobe: int = 8,
+        train_threshold: int = 1024,
+        retrain_growth: float = 2.0,
+        kmeans_iterations: int = 10,
+        train_sample: int = 64,
+        seed: int = 0,
+        compact_ratio: float = 0.25,
+        path: Optional[str] = None,
+    ) -> None:
+        if np is None:
+            raise Namel3ssError('numpy not installed; cannot use IVF backend (pip install "namel3ss[vector]")')
+        self._centroids: Optional["np.ndarray"] = None
+        self._postings: Optional[List["np.ndarray"]] = None
+        super().__init__(use_matrix=True, compact_ratio=compact_ratio, path=path)
+        self.nlist = nlist
+        self.nprobe = max(1, int(nprobe))
+        self.train_threshold = max(1, int(train_threshold))
+        self.retrain_growth = retrain_growth
+        self.kmeans_iterations = kmeans_iterations
+        self.train_sample = train_sample
+        self._rng = np.random.default_rng(seed)
+        self._trained_size = 0
+        if self._matrix is not None and len(self._matrix) >= self.train_threshold:
+            # centroids are not persisted; an index opened from disk retrains once
+            self.train()
+
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+
+    def reset_training(self) -> None:
+        self._centroids = None
+        self._trained_size = 0
+        self._postings = None
+
+    def _posting_lists(self) -> List["np.ndarray"]:
+        if self._postings is None:
+            matrix = self._matrix
+            assert matrix is not None and self._centroids is not None
+            rows = matrix.live_rows()
+            labels = matrix.labels(rows)
+            rows, labels = rows[labels >= 0], labels[labels >= 0]
+            order = np.argsort(labels, kind="stable")
+            counts = np.bincount(labels, minlength=len(self._centroids))
+            self._postings = np.split(rows[order], np.cumsum(counts)[:-1])
+        return self._postings
+
+    def train(self) -> None:
+        matrix = self._matrix
+        if matrix is None or len(matrix) == 0:
+            return
+        rows = matrix.live_rows()
+        nlist = self.nlist or int(np.sqrt(len(rows)))
+        nlist = max(1, min(nlist, len(rows)))
+        sample_size = min(len(rows), nlist * self.train_sample)
+        sample = rows if sample_size == len(rows) else np.sort(self._rng.choice(rows, size=sample_size, replace=False))
+        self._centroids = _kmeans(matrix.unit_vectors(sample), nlist, self.kmeans_iterations, self._rng)
+        self._trained_size = len(rows)
+        self._assign(rows)
+
+    def _assign(self, rows: "np.ndarray", chunk: int = 8192) -> None:
+        matrix = self._matrix
+        if matrix is None or self._centroids is None:
+            return
+        for start in range(0, len(rows), chunk):
+            part = rows[start : start + chunk]
+            labels = np.argmax(matrix.unit_vectors(part) @ self._centroids.T, axis=1)
+            matrix.set_labels(part, labels.astype(np.int32))
+
+    def add_sync(self, items: List[RAGItem]) -> None:
+        dims = {len(item.embedding) for item in items if item.embedding}
+        if self._matrix is not None:
+            dims.add(self._matrix.dimension)
+        if len(dims) > 1:
+            raise Namel3ssError("Embedding dimension mismatch for IVF index")
+        super().add_sync(items)
+
+    async def a_delete(self, ids: List[str]) -> None:
+        await super().a_delete(ids)
+        self._postings = None
+
+    def compact(self) -> None:
+        super().compact()
+        self._postings = None
+
+    def _index_matrix(self, items: List[RAGItem]) -> None:
+        super()._index_matrix(items)
+        self._postings = None
+        matrix = self._matrix
+        if matrix is None:
+            return
+        size = len(matrix)
+        if not self.trained:
+            if size >= self.train_threshold:
+                self.train()
+            return
+        if size >= self._trained_size * self.retrain_growth:
+            self.train()
+            return
+        self._assign(matrix.unlabeled_rows())
+
+    def _top_k_many(self, query_embeddings: Sequence[List[float]], k: int) -> List[List[ScoredItem]]:
+        with self._lock:
+            return self._probe_many(query_embeddings, k)
+
+    def _probe_many(self, query_embeddings: Sequence[List[float]], k: int) -> List[List[ScoredItem]]:
+        matrix = self._matrix
+        if matrix is None or self._centroids is None:
+            return super()._top_k_many(query_embeddings, k)
+        if any(len(query) != matrix.dimension for query in query_embeddings):
+            raise Namel3ssError("Query embedding dimension mismatch for IVF index")
+        if not query_embeddings:
+            return []
+        block = np.asarray(query_embeddings, dtype=np.float32)
+        nprobe = min(self.nprobe, len(self._centroids))
+        centroid_scores = block @ self._centroids.T
+        batches: List[List[ScoredItem]] = []
+        for pos, query in enumerate(query_embeddings):
+            probes = np.argpartition(-centroid_scores[pos], nprobe - 1)[:nprobe]
+            postings = self._posting_lists()
+            rows = np.sort(np.concatenate([postings[label] for label in probes]))
+            results: List[ScoredItem] = []
+            for id_, score in matrix.top_k_rows(query, rows, k):
+                item = self._items[id_]
+                results.append(ScoredItem(item=item, score=score, source=item.source or "ivf"))
+            batches.append(results)
+        return batches
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
 import math
-from typing import Dict, List, Sequence
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
 
+from ..bm25 import BM25Index
 from ..models import RAGItem, ScoredItem
 from ..retrieval_models import RAGDocument, RetrievalResult
+from ...errors import Namel3ssError
 from .base import VectorStore
 
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover
+    np = None
+
 
 def _cosine(a: List[float], b: List[float]) -> float:
     dot = sum(x * y for x, y in zip(a, b))
@@ -17,15 +25,306 @@ def _cosine(a: List[float], b: List[float]) -> float:
     return dot / (norm_a * norm_b)
 
 
+class _EmbeddingMatrix:
+    """
+    Contiguous float32 row storage with precomputed norms.
+
+    Rows are appended in insertion order; deletes leave tombstones that the
+    owning store squeezes out with ``compact`` once ``needs_compaction``. With a
+    ``storage`` (an on-disk ``VectorIndexFile``) the arrays are memory-mapped
+    files instead of heap buffers.
+    """
+
+    def __init__(self, dimension: int, compact_ratio: float = 0.25, initial_capacity: int = 64, storage=None) -> None:
+        self.dimension = dimension
+        self.compact_ratio = compact_ratio
+        self.storage = storage
+        if storage is not None:
+            if storage.dimension is None:
+                storage.dimension = dimension
+            self._vectors, self._norms, self._alive = storage.reserve(max(initial_capacity, storage.capacity))
+        else:
+            self._vectors = np.zeros((initial_capacity, dimension), dtype=np.float32)
+            self._norms = np.zeros(initial_capacity, dtype=np.float32)
+            self._alive = np.zeros(initial_capacity, dtype=bool)
+        # optional per-row partition label (e.g. IVF cluster); -1 means unassigned
+        self._labels = np.full(self._vectors.shape[0], -1, dtype=np.int32)
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._tombstones = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def used(self) -> int:
+        return len(self._ids)
+
+    @property
+    def arrays(self) -> tuple:
+        return (self._vectors, self._norms, self._alive)
+
+    @property
+    def needs_compaction(self) -> bool:
+        return bool(self._ids) and self._tombstones > self.compact_ratio * len(self._ids)
+
+    def restore(self, ids: Sequence[Optional[str]]) -> None:
+        """Adopt rows already present in ``storage``; ``None`` marks a deleted row."""
+        used = len(ids)
+        self._ids = list(ids)
+        self._rows = {id_: row for row, id_ in enumerate(self._ids) if id_ is not None}
+        self._alive[:used] = [id_ is not None for id_ in self._ids]
+        self._alive[used:] = False
+        self._tombstones = used - len(self._rows)
+
+    def _reserve(self, rows: int) -> None:
+        capacity = self._vectors.shape[0]
+        if rows <= capacity:
+            return
+        while capacity < rows:
+            capacity *= 2
+        if self.storage is not None:
+            self._vectors, self._norms, self._alive = self.storage.reserve(capacity)
+            labels = np.full(capacity, -1, dtype=np.int32)
+            labels[: len(self._labels)] = self._labels
+            self._labels = labels
+            return
+        vectors = np.zeros((capacity, self.dimension), dtype=np.float32)
+        norms = np.zeros(capacity, dtype=np.float32)
+        alive = np.zeros(capacity, dtype=bool)
+        labels = np.full(capacity, -1, dtype=np.int32)
+        used = len(self._ids)
+        vectors[:used] = self._vectors[:used]
+        norms[:used] = self._norms[:used]
+        alive[:used] = self._alive[:used]
+        labels[:used] = self._labels[:used]
+        self._vectors, self._norms, self._alive, self._labels = vectors, norms, alive, labels
+
+    def upsert(self, ids: Sequence[str], embeddings: Sequence[Sequence[float]]) -> None:
+        if not ids:
+            return
+        block = np.asarray(embeddings, dtype=np.float32).reshape(len(ids), self.dimension)
+        norms = np.linalg.norm(block, axis=1)
+        # one row per id; a repeated id in the batch keeps its last embedding
+        last = {id_: offset for offset, id_ in enumerate(ids)}
+        new_rows: List[int] = []
+        for id_, offset in last.items():
+            row = self._rows.get(id_)
+            if row is not None:
+                self._vectors[row] = block[offset]
+                self._norms[row] = norms[offset]
+                self._labels[row] = -1
+                continue
+            new_rows.append(offset)
+        if not new_rows:
+            return
+        start = len(self._ids)
+        self._reserve(start + len(new_rows))
+        end = start + len(new_rows)
+        self._vectors[start:end] = block[new_rows]
+        self._norms[start:end] = norms[new_rows]
+        self._alive[start:end] = True
+        self._labels[start:end] = -1
+        for row, offset in enumerate(new_rows, start=start):
+            self._ids.append(ids[offset])
+            self._rows[ids[offset]] = row
+
+    def delete(self, ids: Sequence[str]) -> None:
+        for id_ in ids:
+            row = self._rows.pop(id_, None)
+            if row is None:
+                continue
+            self._alive[row] = False
+            self._ids[row] = None
+            self._tombstones += 1
+
+    def compact(self, records: Optional[Callable[[], List[dict]]] = None) -> None:
+        """
+        Squeeze out deleted rows. With ``storage`` the compacted rows go to a
+        new file generation (``records`` builds its sidecar once rows are
+        renumbered); the mapped files are never rewritten in place.
+        """
+        used = len(self._ids)
+        keep = np.flatnonzero(self._alive[:used])
+        count = len(keep)
+        previous = (self._ids, self._rows, self._labels.copy(), self._tombstones)
+        self._labels[:count] = self._labels[keep]
+        self._labels[count:used] = -1
+        self._ids = [self._ids[row] for row in keep]
+        self._rows = {id_: row for row, id_ in enumerate(self._ids)}  # type: ignore[misc]
+        self._tombstones = 0
+        if self.storage is not None:
+            try:
+                self._vectors, self._norms, self._alive = self.storage.rewrite(
+                    self._vectors[keep], self._norms[keep], records() if records else [], self._vectors.shape[0]
+                )
+            except BaseException:
+                # the previous generation is still live; keep addressing it
+                self._ids, self._rows, self._labels, self._tombstones = previous
+                raise
+            return
+        self._vectors[:count] = self._vectors[keep]
+        self._norms[:count] = self._norms[keep]
+        self._alive[:count] = True
+        self._alive[count:used] = False
+
+    def row_of(self, id_: str) -> Optional[int]:
+        return self._rows.get(id_)
+
+    def live_rows(self) -> "np.ndarray":
+        return np.flatnonzero(self._alive[: len(self._ids)])
+
+    def unit_vectors(self, rows: "np.ndarray") -> "np.ndarray":
+        norms = self._norms[rows]
+        safe = np.where(norms == 0, 1.0, norms).astype(np.float32)
+        return self._vectors[rows] / safe[:, None]
+
+    def set_labels(self, rows: "np.ndarray", labels: "np.ndarray") -> None:
+        self._labels[rows] = labels
+
+    def labels(self, rows: "np.ndarray") -> "np.ndarray":
+        return self._labels[rows]
+
+    def unlabeled_rows(self) -> "np.ndarray":
+        used = len(self._ids)
+        return np.flatnonzero(self._alive[:used] & (self._labels[:used] < 0))
+
+    def top_k(self, query: Sequence[float], k: int) -> List[tuple[str, float]]:
+        return self.top_k_many([query], k)[0]
+
+    def top_k_many(self, queries: Sequence[Sequence[float]], k: int) -> List[List[tuple[str, float]]]:
+        used = len(self._ids)
+        if k <= 0 or not self._rows:
+            return [[] for _ in queries]
+        block = np.asarray(queries, dtype=np.float32).reshape(len(queries), self.dimension)
+        q_norms = np.linalg.norm(block, axis=1)
+        # one (rows x queries) product for the whole batch
+        dots = self._vectors[:used] @ block.T
+        denom = np.outer(self._norms[:used], q_norms)
+        scores = np.divide(dots, denom, out=np.zeros_like(dots), where=denom != 0)
+        alive = self._alive[:used]
+        scores[~alive] = -np.inf
+        rows = np.arange(used)
+        return [self._select(rows[alive], scores[alive, col], k) for col in range(len(queries))]
+
+    def top_k_rows(self, query: Sequence[float], rows: "np.ndarray", k: int) -> List[tuple[str, float]]:
+        """Exact top-k restricted to a candidate row subset (ascending row order)."""
+        if k <= 0 or not len(rows):
+            return []
+        vec = np.asarray(query, dtype=np.float32).reshape(self.dimension)
+        q_norm = float(np.linalg.norm(vec))
+        if q_norm == 0:
+            scores = np.zeros(len(rows), dtype=np.float32)
+        else:
+            dots = self._vectors[rows] @ vec
+            denom = self._norms[rows] * q_norm
+            scores = np.divide(dots, denom, out=np.zeros_like(dots), where=denom != 0)
+        return self._select(rows, scores, k)
+
+    def _select(self, rows: "np.ndarray", scores: "np.ndarray", k: int) -> List[tuple[str, float]]:
+        count = len(rows)
+        if k < count:
+            kth = np.partition(scores, count - k)[count - k]
+            # keep every row tied with the k-th score so insertion order breaks ties
+            keep = np.flatnonzero(scores >= kth)
+        else:
+            keep = np.arange(count)
+        order = keep[np.lexsort((rows[keep], -scores[keep]))][:k]
+        return [(self._ids[rows[pos]], float(scores[pos])) for pos in order]  # type: ignore[misc]
+
+
 class InMemoryVectorStore(VectorStore):
-    def __init__(self) -> None:
+    """
+    In-process vector store.
+
+    When NumPy is available (the ``vector`` extra), embeddings are mirrored
+    into a float32 matrix and queries run as one matrix product (one column
+    per query for ``search_many``) with partition-based top-k.
+    Otherwise (or when embedding dimensions are inconsistent) the store falls
+    back to a pure-Python cosine scan with identical ordering semantics;
+    ``use_matrix=True`` falls back the same way. A ``path`` needs NumPy.
+    """
+
+    upserts_by_id = True
+
+    def __init__(self, use_matrix: Optional[bool] = None, compact_ratio: float = 0.25, path: Optional[str] = None) -> None:
         self._items: Dict[str, RAGItem] = {}
+        self._use_matrix = (np is not None) if use_matrix is None else (use_matrix and np is not None)
+        self._compact_ratio = compact_ratio
+        self._matrix: Optional[_EmbeddingMatrix] = None
+        self._sparse: Optional[BM25Index] = None
+        # retrieval may scan from worker threads while writes land on the event loop
+        self._lock = threading.RLock()
+        self._disk = None
+        if path is not None:
+            from .disk import VectorIndexFile
 
-    async def a_add(self, items: List[RAGItem]) -> None:
-        for item in items:
-            self._items[item.id] = item
+            self._disk = VectorIndexFile(path)
+            self._use_matrix = True
+            if self._disk.exists:
+                self._load_disk()
 
-    async def a_query(self, query_embedding: List[float], k: int = 10) -> List[ScoredItem]:
+    def _load_disk(self) -> None:
+        # Items loaded from disk keep embedding=None: their vectors live in the mapped matrix.
+        disk = self._disk
+        records = disk.load_records()
+        matrix = _EmbeddingMatrix(disk.dimension, compact_ratio=self._compact_ratio, storage=disk)
+        matrix.restore([record["id"] if record else None for record in records])
+        for record in records:
+            if record is None:
+                continue
+            self._items[record["id"]] = RAGItem(
+                id=record["id"],
+                text=record.get("text") or "",
+                metadata=record.get("metadata") or {},
+                embedding=None,
+                source=record.get("source"),
+            )
+        self._matrix = matrix
+
+    def _persist(self, records: List[dict]) -> None:
+        if self._disk is None or self._matrix is None:
+            return
+        self._disk.commit(self._matrix.used, self._matrix.arrays, records)
+
+    def _row_record(self, item: RAGItem) -> dict:
+        row = self._matrix.row_of(item.id) if self._matrix is not None else None
+        if row is None:
+            return {"id": item.id, "deleted": True}
+        return {"row": row, "id": item.id, "text": item.text, "metadata": item.metadata, "source": item.source}
+
+    @property
+    def matrix_enabled(self) -> bool:
+        return self._use_matrix
+
+    def _index_matrix(self, items: List[RAGItem]) -> None:
+        if not self._use_matrix:
+            return
+        ids: List[str] = []
+        vectors: List[List[float]] = []
+        stale: List[str] = []
+        for item in {item.id: item for item in items}.values():
+            if not item.embedding:
+                stale.append(item.id)
+                continue
+            ids.append(item.id)
+            vectors.append(item.embedding)
+        if self._matrix is None and vectors:
+            self._matrix = _EmbeddingMatrix(len(vectors[0]), compact_ratio=self._compact_ratio, storage=self._disk)
+        if self._matrix is None:
+            return
+        if any(len(vec) != self._matrix.dimension for vec in vectors):
+            if self._disk is not None:
+                raise Namel3ssError("Embedding dimension mismatch for on-disk vector index")
+            # Mixed dimensions cannot share one matrix; keep exact Python scoring.
+            self._use_matrix = False
+            self._matrix = None
+            return
+        if stale:
+            self._matrix.delete(stale)
+        self._matrix.upsert(ids, vectors)
+
+    def _scan(self, query_embedding: List[float], k: int) -> List[ScoredItem]:
         scored: List[ScoredItem] = []
         for item in self._items.values():
             if not item.embedding:
@@ -35,27 +334,97 @@ class InMemoryVectorStore(VectorStore):
         scored.sort(key=lambda s: s.score, reverse=True)
         return scored[:k]
 
+    def _top_k(self, query_embedding: List[float], k: int) -> List[ScoredItem]:
+        return self._top_k_many([query_embedding], k)[0]
+
+    def _top_k_many(self, query_embeddings: Sequence[List[float]], k: int) -> List[List[ScoredItem]]:
+        with self._lock:
+            matrix = self._matrix
+            if (
+                not self._use_matrix
+                or matrix is None
+                or any(len(query) != matrix.dimension for query in query_embeddings)
+            ):
+                return [self._scan(query, k) for query in query_embeddings]
+            batches: List[List[ScoredItem]] = []
+            for hits in matrix.top_k_many(query_embeddings, k):
+                results: List[ScoredItem] = []
+                for id_, score in hits:
+                    item = self._items[id_]
+                    results.append(ScoredItem(item=item, score=score, source=item.source or "memory"))
+                batches.append(results)
+            return batches
+
+    async def a_add(self, items: List[RAGItem]) -> None:
+        self.add_sync(items)
+
+    async def a_query(self, query_embedding: List[float], k: int = 10) -> List[ScoredItem]:
+        return self._top_k(query_embedding, k)
+
+    async def a_query_many(self, query_embeddings: Sequence[List[float]], k: int = 10) -> List[List[ScoredItem]]:
+        return self._top_k_many(query_embeddings, k)
+
     async def a_delete(self, ids: List[str]) -> None:
-        for id_ in ids:
-            self._items.pop(id_, None)
+        with self._lock:
+            removed = [id_ for id_ in ids if self._items.pop(id_, None) is not None]
+            if self._sparse is not None:
+                for id_ in removed:
+                    self._sparse.remove(id_)
+            if self._matrix is None:
+                return
+            self._matrix.delete(ids)
+            if self._matrix.needs_compaction:
+                self.compact()
+            else:
+                self._persist([{"id": id_, "deleted": True} for id_ in removed])
+
+    def compact(self) -> None:
+        with self._lock:
+            if self._matrix is None:
+                return
+            matrix = self._matrix
+            # rows are renumbered, so an on-disk sidecar log is rebuilt from scratch
+            matrix.compact(
+                lambda: [self._row_record(item) for item in self._items.values() if matrix.row_of(item.id) is not None]
+            )
 
     def all_items(self) -> List[RAGItem]:
-        return list(self._items.values())
+        with self._lock:
+            return list(self._items.values())
+
+    def get_items(self, ids: Iterable[str]) -> Dict[str, RAGItem]:
+        """Items for the ``ids`` that are present, keyed by id."""
+        with self._lock:
+            return {id_: self._items[id_] for id_ in ids if id_ in self._items}
+
+    def sparse_index(self) -> BM25Index:
+        """BM25 index over item text, built on first use and kept in sync afterwards."""
+        with self._lock:
+            if self._sparse is None:
+                self._sparse = BM25Index()
+                self._sparse.add_many((item.id, item.text) for item in self._items.values())
+            return self._sparse
+
+    def sparse_scores(self, query: str) -> Dict[str, float]:
+        with self._lock:
+            return self.sparse_index().scores(query)
 
     def add_sync(self, items: List[RAGItem]) -> None:
-        for item in items:
-            self._items[item.id] = item
+        with self._lock:
+            for item in items:
+                self._items[item.id] = item
+                if self._sparse is not None:
+                    self._sparse.add(item.id, item.text)
+            self._index_matrix(items)
+            if self._disk is not None:
+                self._persist([self._row_record(item) for item in items])
 
     def search(self, query_embedding: List[float], top_k: int = 5) -> List[ScoredItem]:
         # synchronous helper for backwards compatibility
-        scored: List[ScoredItem] = []
-        for item in self._items.values():
-            if not item.embedding:
-                continue
-            score = _cosine(query_embedding, item.embedding)
-            scored.append(ScoredItem(item=item, score=score, source=item.source or "memory"))
-        scored.sort(key=lambda s: s.score, reverse=True)
-        return scored[:top_k]
+        return self._top_k(query_embedding, top_k)
+
+    def search_many(self, query_embeddings: Sequence[List[float]], k: int = 5) -> List[List[ScoredItem]]:
+        return self._top_k_many(query_embeddings, k)
 
     # Structured API for new retrieval pipeline
     def index(self, documents: Sequence[RAGDocument], *, embeddings: Sequence[List[float]] | None = None) -> None:
@@ -83,3 +452,13 @@ class InMemoryVectorStore(VectorStore):
             doc = RAGDocument(id=sc.item.id, text=sc.item.text, metadata=sc.item.metadata, source=sc.item.source)
             results.append(RetrievalResult(document=doc, score=sc.score, rank=rank))
         return results
+
+    def search_results_many(self, query_embeddings: Sequence[List[float]], *, k: int = 5) -> List[List[RetrievalResult]]:
+        batches: List[List[RetrievalResult]] = []
+        for scored in self.search_many(query_embeddings, k=k):
+            results: List[RetrievalResult] = []
+            for rank, sc in enumerate(scored, start=1):
+                doc = RAGDocument(id=sc.item.id, text=sc.item.text, metadata=sc.item.metadata, source=sc.item.source)
+                results.append(RetrievalResult(document=doc, score=sc.score, rank=rank))
+            batches.append(results)
+        return batches
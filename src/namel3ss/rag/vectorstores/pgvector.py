@@ -1,79 +1,287 @@
 from __future__ import annotations
 
-from typing import List
+import json
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 try:
     import psycopg  # type: ignore
 except Exception:  # pragma: no cover
     psycopg = None
 
+try:
+    from psycopg_pool import AsyncConnectionPool, ConnectionPool  # type: ignore
+except Exception:  # pragma: no cover
+    AsyncConnectionPool = ConnectionPool = None
+
 from ..models import RAGItem, ScoredItem
 from .base import VectorStore
 from ...errors import Namel3ssError
 
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)?$")
+_INDEX_DEFAULTS: Dict[str, Dict[str, int]] = {
+    "hnsw": {"m": 16, "ef_construction": 64},
+    "ivfflat": {"lists": 100},
+}
+# session settings that tune approximate index scans at query time
+_SEARCH_SETTINGS = {"ef_search": "hnsw.ef_search", "probes": "ivfflat.probes"}
+
+
+def _vector_literal(embedding: Sequence[float]) -> str:
+    return "[" + ",".join(repr(float(x)) for x in embedding) + "]"
+
 
 class PGVectorStore(VectorStore):
-    def __init__(self, dsn: str, table: str = "rag_items") -> None:
-        if psycopg is None:
+    """
+    Postgres + pgvector store backed by connection pools.
+
+    Async methods run on an ``AsyncConnectionPool`` and never block the event
+    loop; the synchronous helpers (``add_sync``, ``search``, ``search_many``)
+    use a separate ``ConnectionPool`` instead of spinning up an event loop.
+    Large upserts stream through ``COPY`` into a staging table, small ones use
+    ``executemany``; lookups are sent as prepared statements.
+    """
+
+    native_async = True
+    upserts_by_id = True
+
+    def __init__(
+        self,
+        dsn: str,
+        table: str = "rag_items",
+        dimension: Optional[int] = None,
+        index_method: Optional[str] = None,
+        index_options: Optional[Dict[str, int]] = None,
+        search_options: Optional[Dict[str, int]] = None,
+        min_pool_size: int = 1,
+        max_pool_size: int = 10,
+        copy_threshold: int = 64,
+        pool: Any = None,
+        async_pool: Any = None,
+    ) -> None:
+        if psycopg is None and pool is None and async_pool is None:
             raise Namel3ssError("psycopg/pgvector not installed; cannot use pgvector backend")
         if not dsn:
             raise Namel3ssError("PGVector backend requested but DSN not set")
+        if not _IDENTIFIER.match(table or ""):
+            raise Namel3ssError(f"Invalid pgvector table name '{table}'")
+        method = (index_method or "").lower() or None
+        if method is not None and method not in _INDEX_DEFAULTS:
+            raise Namel3ssError(f"Unsupported pgvector index '{index_method}'; use 'hnsw' or 'ivfflat'")
+        if method is not None and not dimension:
+            raise Namel3ssError("pgvector index creation requires 'dimension'")
         self.dsn = dsn
         self.table = table
+        self.dimension = int(dimension) if dimension else None
+        self.index_method = method
+        self.index_options = {**_INDEX_DEFAULTS.get(method or "", {}), **(index_options or {})}
+        self.search_options = {key: int(value) for key, value in (search_options or {}).items() if key in _SEARCH_SETTINGS}
+        self.copy_threshold = copy_threshold
+        self._min_pool_size = min_pool_size
+        self._max_pool_size = max_pool_size
+        self._pool = pool
+        self._async_pool = async_pool
+        self._async_pool_opened = async_pool is not None
         self._ensure_table()
 
-    def _ensure_table(self) -> None:
-        with psycopg.connect(self.dsn) as conn:  # pragma: no cover - env dependent
-            conn.execute(
-                f"""
-                CREATE TABLE IF NOT EXISTS {self.table} (
-                    id TEXT PRIMARY KEY,
-                    text TEXT,
-                    metadata JSONB,
-                    embedding VECTOR
-                )
-                """
+    # -- pools -----------------------------------------------------------------
+
+    def _configure(self, conn) -> None:  # pragma: no cover - env dependent
+        for key, value in self.search_options.items():
+            conn.execute(f"SET {_SEARCH_SETTINGS[key]} = {int(value)}")
+        conn.commit()
+
+    async def _a_configure(self, conn) -> None:  # pragma: no cover - env dependent
+        for key, value in self.search_options.items():
+            await conn.execute(f"SET {_SEARCH_SETTINGS[key]} = {int(value)}")
+        await conn.commit()
+
+    def _sync_pool(self):
+        if self._pool is None:
+            if ConnectionPool is None:
+                raise Namel3ssError("psycopg_pool not installed; install 'psycopg[pool]' for the pgvector backend")
+            self._pool = ConnectionPool(  # pragma: no cover - env dependent
+                self.dsn,
+                min_size=self._min_pool_size,
+                max_size=self._max_pool_size,
+                configure=self._configure if self.search_options else None,
+                open=True,
             )
-            conn.commit()
+        return self._pool
 
-    async def a_add(self, items: List[RAGItem]) -> None:
-        with psycopg.connect(self.dsn) as conn:  # pragma: no cover - env dependent
-            for item in items:
-                conn.execute(
-                    f"INSERT INTO {self.table} (id, text, metadata, embedding) VALUES (%s, %s, %s, %s) "
-                    f"ON CONFLICT (id) DO UPDATE SET text = EXCLUDED.text, metadata = EXCLUDED.metadata, embedding = EXCLUDED.embedding",
-                    (item.id, item.text, item.metadata, item.embedding),
-                )
-            conn.commit()
+    async def _pool_async(self):
+        if self._async_pool is None:
+            if AsyncConnectionPool is None:
+                raise Namel3ssError("psycopg_pool not installed; install 'psycopg[pool]' for the pgvector backend")
+            self._async_pool = AsyncConnectionPool(  # pragma: no cover - env dependent
+                self.dsn,
+                min_size=self._min_pool_size,
+                max_size=self._max_pool_size,
+                configure=self._a_configure if self.search_options else None,
+                open=False,
+            )
+        if not self._async_pool_opened:
+            await self._async_pool.open()
+            self._async_pool_opened = True
+        return self._async_pool
 
-    async def a_query(self, query_embedding: List[float], k: int = 10) -> List[ScoredItem]:
-        with psycopg.connect(self.dsn) as conn:  # pragma: no cover - env dependent
-            rows = conn.execute(
-                f"SELECT id, text, metadata, 1 - (embedding <=> %s) as score FROM {self.table} "
-                f"ORDER BY embedding <=> %s LIMIT %s",
-                (query_embedding, query_embedding, k),
-            ).fetchall()
-        scored: List[ScoredItem] = []
+    async def a_close(self) -> None:
+        if self._async_pool is not None and self._async_pool_opened:
+            await self._async_pool.close()
+            self._async_pool_opened = False
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    # -- SQL -------------------------------------------------------------------
+
+    def _schema_sql(self) -> List[str]:
+        column = f"VECTOR({self.dimension})" if self.dimension else "VECTOR"
+        statements = [
+            "CREATE EXTENSION IF NOT EXISTS vector",
+            f"""
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                id TEXT PRIMARY KEY,
+                text TEXT,
+                metadata JSONB,
+                embedding {column}
+            )
+            """,
+        ]
+        if self.index_method:
+            options = ", ".join(f"{key} = {int(value)}" for key, value in self.index_options.items())
+            index_name = f"{self.table.replace('.', '_')}_embedding_{self.index_method}"
+            statements.append(
+                f"CREATE INDEX IF NOT EXISTS {index_name} ON {self.table} "
+                f"USING {self.index_method} (embedding vector_cosine_ops) WITH ({options})"
+            )
+        return statements
+
+    def _upsert_sql(self, source: str) -> str:
+        return (
+            f"INSERT INTO {self.table} (id, text, metadata, embedding) {source} "
+            f"ON CONFLICT (id) DO UPDATE SET text = EXCLUDED.text, metadata = EXCLUDED.metadata, embedding = EXCLUDED.embedding"
+        )
+
+    @property
+    def _stage_table(self) -> str:
+        return f"{self.table.replace('.', '_')}_stage"
+
+    def _stage_sql(self) -> Tuple[str, str, str]:
+        return (
+            f"CREATE TEMP TABLE IF NOT EXISTS {self._stage_table} "
+            f"(id TEXT, text TEXT, metadata JSONB, embedding VECTOR) ON COMMIT DELETE ROWS",
+            f"COPY {self._stage_table} (id, text, metadata, embedding) FROM STDIN",
+            self._upsert_sql(f"SELECT id, text, metadata, embedding FROM {self._stage_table}"),
+        )
+
+    def _query_many_sql(self) -> str:
+        return (
+            f"SELECT q.ord, r.id, r.text, r.metadata, r.score "
+            f"FROM unnest(%s::text[]) WITH ORDINALITY AS q(embedding, ord) "
+            f"CROSS JOIN LATERAL ("
+            f"SELECT t.id, t.text, t.metadata, 1 - (t.embedding <=> q.embedding::vector) AS score "
+            f"FROM {self.table} t ORDER BY t.embedding <=> q.embedding::vector LIMIT %s"
+            f") r ORDER BY q.ord, r.score DESC"
+        )
+
+    @staticmethod
+    def _rows(items: List[RAGItem]) -> List[Tuple[str, str, str, str]]:
+        # one row per id (last wins): ON CONFLICT cannot touch the same row twice in one statement
+        latest = {item.id: item for item in items}
+        return [
+            (item.id, item.text, json.dumps(item.metadata or {}, default=str), _vector_literal(item.embedding or []))
+            for item in latest.values()
+        ]
+
+    @staticmethod
+    def _group(rows, count: int) -> List[List[ScoredItem]]:
+        grouped: Dict[int, List[ScoredItem]] = {}
         for row in rows:
-            item = RAGItem(id=row[0], text=row[1], metadata=row[2] or {}, embedding=None, source="pgvector")
-            scored.append(ScoredItem(item=item, score=float(row[3]), source="pgvector"))
-        return scored
+            metadata = row[3]
+            if isinstance(metadata, str):
+                metadata = json.loads(metadata)
+            item = RAGItem(id=row[1], text=row[2], metadata=metadata or {}, embedding=None, source="pgvector")
+            grouped.setdefault(int(row[0]), []).append(ScoredItem(item=item, score=float(row[4]), source="pgvector"))
+        return [grouped.get(pos, []) for pos in range(1, count + 1)]
 
-    def add_sync(self, items: List[RAGItem]) -> None:
-        # delegate to async implementation
-        import asyncio
+    # -- sync API --------------------------------------------------------------
 
-        asyncio.run(self.a_add(items))
+    def _ensure_table(self) -> None:
+        with self._sync_pool().connection() as conn:
+            for statement in self._schema_sql():
+                conn.execute(statement)
+
+    def add_sync(self, items: List[RAGItem]) -> None:
+        if not items:
+            return
+        rows = self._rows(items)
+        with self._sync_pool().connection() as conn:
+            if len(rows) < self.copy_threshold:
+                with conn.cursor() as cur:
+                    cur.executemany(self._upsert_sql("VALUES (%s, %s, %s::jsonb, %s::vector)"), rows)
+                return
+            create_stage, copy_sql, merge_sql = self._stage_sql()
+            with conn.cursor() as cur:
+                cur.execute(create_stage)
+                with cur.copy(copy_sql) as copy:
+                    for row in rows:
+                        copy.write_row(row)
+                cur.execute(merge_sql)
 
     def search(self, query_embedding: List[float], top_k: int = 5) -> List[ScoredItem]:
-        import asyncio
+        return self.search_many([query_embedding], k=top_k)[0]
+
+    def search_many(self, query_embeddings: Sequence[List[float]], k: int = 5) -> List[List[ScoredItem]]:
+        if not query_embeddings:
+            return []
+        literals = [_vector_literal(emb) for emb in query_embeddings]
+        with self._sync_pool().connection() as conn:
+            rows = conn.execute(self._query_many_sql(), (literals, k), prepare=True).fetchall()
+        return self._group(rows, len(query_embeddings))
+
+    def delete_sync(self, ids: List[str]) -> None:
+        with self._sync_pool().connection() as conn:
+            conn.execute(f"DELETE FROM {self.table} WHERE id = ANY(%s)", (list(ids),))
 
-        return asyncio.run(self.a_query(query_embedding, k=top_k))
+    # -- async API -------------------------------------------------------------
+
+    async def a_add(self, items: List[RAGItem]) -> None:
+        if not items:
+            return
+        rows = self._rows(items)
+        pool = await self._pool_async()
+        async with pool.connection() as conn:
+            if len(rows) < self.copy_threshold:
+                async with conn.cursor() as cur:
+                    await cur.executemany(self._upsert_sql("VALUES (%s, %s, %s::jsonb, %s::vector)"), rows)
+                return
+            create_stage, copy_sql, merge_sql = self._stage_sql()
+            async with conn.cursor() as cur:
+                await cur.execute(create_stage)
+                async with cur.copy(copy_sql) as copy:
+                    for row in rows:
+                        await copy.write_row(row)
+                await cur.execute(merge_sql)
+
+    async def a_query(self, query_embedding: List[float], k: int = 10) -> List[ScoredItem]:
+        return (await self.a_query_many([query_embedding], k=k))[0]
+
+    async def a_query_many(self, query_embeddings: Sequence[List[float]], k: int = 10) -> List[List[ScoredItem]]:
+        if not query_embeddings:
+            return []
+        # One round-trip: unnest the query vectors and run a LATERAL top-k per query.
+        literals = [_vector_literal(emb) for emb in query_embeddings]
+        pool = await self._pool_async()
+        async with pool.connection() as conn:
+            cur = await conn.execute(self._query_many_sql(), (literals, k), prepare=True)
+            rows = await cur.fetchall()
+        return self._group(rows, len(query_embeddings))
 
     async def a_delete(self, ids: List[str]) -> None:
-        with psycopg.connect(self.dsn) as conn:  # pragma: no cover - env dependent
-            conn.execute(
-                f"DELETE FROM {self.table} WHERE id = ANY(%s)",
-                (ids,),
-            )
-            conn.commit()
+        pool = await self._pool_async()
+        async with pool.connection() as conn:
+            await conn.execute(f"DELETE FROM {self.table} WHERE id = ANY(%s)", (list(ids),))
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
 import json
 import os
+import sqlite3
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from hashlib import sha256
+from pathlib import Path
 from typing import Any, Dict, Optional, Protocol
 
 
@@ -23,6 +29,12 @@ def _env_float(name: str, default: float) -> float:
         return default
 
 
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# a set sweeps expired SQLite rows once per this many writes
+_DISK_SWEEP_EVERY = 256
+
+
 class ProviderCacheBackend(Protocol):
     async def get(self, key: str) -> Any | None: ...
 
@@ -33,34 +45,263 @@ class ProviderCacheBackend(Protocol):
 class _CacheEntry:
     value: Any
     expires_at: float | None
+    size: int = 0
+
+
+def _encode(value: Any) -> str | None:
+    try:
+        return json.dumps(value, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
 
 
 class InMemoryProviderCache(ProviderCacheBackend):
     """
-    Simple in-process cache with TTL support. Not distributed.
+    In-process LRU cache with TTL support, bounded by entry count and
+    approximate byte size. Expired entries are swept on every write, so
+    they do not pile up waiting for a read. Not distributed.
     """
 
-    def __init__(self) -> None:
-        self._store: Dict[str, _CacheEntry] = {}
+    def __init__(self, max_entries: int | None = None, max_bytes: int | None = None) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._store: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._expiry: list[tuple[float, str]] = []
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._store),
+            "bytes": self._bytes,
+        }
+
+    def get_sync(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is not None and entry.expires_at is not None and entry.expires_at < time.monotonic():
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._store.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def set_sync(self, key: str, value: Any, ttl: float | None = None, size: int | None = None) -> None:
+        if size is None:
+            encoded = _encode(value)
+            size = len(key) + (len(encoded) if encoded is not None else 0)
+        expires = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._sweep_locked()
+            if self.max_bytes is not None and size > self.max_bytes:
+                self._drop(key)
+                return
+            self._drop(key)
+            self._store[key] = _CacheEntry(value=value, expires_at=expires, size=size)
+            self._bytes += size
+            if expires is not None:
+                heapq.heappush(self._expiry, (expires, key))
+                if len(self._expiry) > 2 * len(self._store) + 64:
+                    # drop heap items left behind by rewritten or evicted keys
+                    self._expiry = [(e.expires_at, k) for k, e in self._store.items() if e.expires_at is not None]
+                    heapq.heapify(self._expiry)
+            while self._store and (
+                (self.max_entries is not None and len(self._store) > self.max_entries)
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                oldest = next(iter(self._store))
+                self._drop(oldest)
+                self.evictions += 1
 
     async def get(self, key: str) -> Any | None:
-        entry = self._store.get(key)
-        if not entry:
+        return self.get_sync(key)
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        self.set_sync(key, value, ttl)
+
+    def sweep(self) -> int:
+        """Remove expired entries; returns how many were dropped."""
+        with self._lock:
+            return self._sweep_locked()
+
+    def _sweep_locked(self) -> int:
+        now = time.monotonic()
+        dropped = 0
+        while self._expiry and self._expiry[0][0] < now:
+            expires, key = heapq.heappop(self._expiry)
+            entry = self._store.get(key)
+            # the heap can hold stale times for keys that were rewritten
+            if entry is not None and entry.expires_at == expires:
+                self._drop(key)
+                dropped += 1
+        return dropped
+
+    def _drop(self, key: str) -> None:
+        entry = self._store.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._store.clear()
+            self._expiry.clear()
+            self._bytes = 0
+
+
+class SQLiteProviderCache(ProviderCacheBackend):
+    """
+    Provider responses in a SQLite file (WAL mode), shared by every worker
+    process that points at the same path. Values must be JSON-serializable;
+    others are not persisted.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS provider_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS provider_cache_expiry ON provider_cache (expires_at)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def get_entry(self, key: str) -> tuple[Any, float | None] | None:
+        """The value and its remaining TTL in seconds (None when it never expires)."""
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM provider_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
             return None
-        if entry.expires_at is not None and entry.expires_at < time.monotonic():
-            self._store.pop(key, None)
+        value, expires_at = row
+        remaining = None
+        if expires_at is not None:
+            remaining = expires_at - time.time()
+            if remaining <= 0:
+                return None
+        return json.loads(value), remaining
+
+    def get_sync(self, key: str) -> Any | None:
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def set_sync(self, key: str, value: Any, ttl: float | None = None, encoded: str | None = None) -> None:
+        encoded = encoded if encoded is not None else _encode(value)
+        if encoded is None:
+            return
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO provider_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, encoded, expires_at),
+            )
+            self._writes += 1
+            if self._writes % _DISK_SWEEP_EVERY == 0:
+                self._conn.execute("DELETE FROM provider_cache WHERE expires_at < ?", (time.time(),))
+            self._conn.commit()
+
+    async def get(self, key: str) -> Any | None:
+        return self.get_sync(key)
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        self.set_sync(key, value, ttl)
+
+    def sweep(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM provider_cache WHERE expires_at < ?", (time.time(),))
+            self._conn.commit()
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class TieredProviderCache(ProviderCacheBackend):
+    """An in-memory LRU in front of a shared SQLite tier."""
+
+    def __init__(self, memory: InMemoryProviderCache, disk: SQLiteProviderCache) -> None:
+        self.memory = memory
+        self.disk = disk
+
+    def get_sync(self, key: str) -> Any | None:
+        value = self.memory.get_sync(key)
+        if value is not None:
+            return value
+        entry = self.disk.get_entry(key)
+        if entry is None:
             return None
-        return entry.value
+        value, remaining = entry
+        self.memory.set_sync(key, value, remaining)
+        return value
+
+    def set_sync(self, key: str, value: Any, ttl: float | None = None) -> None:
+        encoded = _encode(value)
+        self.memory.set_sync(key, value, ttl, size=len(key) + (len(encoded) if encoded is not None else 0))
+        self.disk.set_sync(key, value, ttl, encoded=encoded)
+
+    async def get(self, key: str) -> Any | None:
+        return self.get_sync(key)
 
     async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
-        expires = time.monotonic() + ttl if ttl else None
-        self._store[key] = _CacheEntry(value=value, expires_at=expires)
+        self.set_sync(key, value, ttl)
+
+    def stats(self) -> Dict[str, int]:
+        return self.memory.stats()
+
+
+_default_cache: ProviderCacheBackend | None = None
+_default_cache_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
 
 
 def get_default_provider_cache() -> ProviderCacheBackend | None:
+    """
+    The process-wide provider cache when ``N3_PROVIDER_CACHE_ENABLED`` is set,
+    bounded by ``N3_PROVIDER_CACHE_MAX_ENTRIES``/``N3_PROVIDER_CACHE_MAX_BYTES``
+    and backed by ``N3_PROVIDER_CACHE_PATH`` (SQLite) when given.
+    """
+    global _default_cache
     if not _env_bool("N3_PROVIDER_CACHE_ENABLED", False):
         return None
-    return InMemoryProviderCache()
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                memory = InMemoryProviderCache(
+                    max_entries=_env_int("N3_PROVIDER_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+                    max_bytes=_env_int("N3_PROVIDER_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES),
+                )
+                path = os.getenv("N3_PROVIDER_CACHE_PATH")
+                _default_cache = TieredProviderCache(memory, SQLiteProviderCache(path)) if path else memory
+    return _default_cache
+
+
+def reset_default_provider_cache() -> None:
+    """Forget the process-wide cache so the next lookup rereads the environment."""
+    global _default_cache
+    with _default_cache_lock:
+        cache, _default_cache = _default_cache, None
+    if isinstance(cache, TieredProviderCache):
+        cache.disk.close()
 
 
 def get_provider_cache_ttl_seconds() -> float:
@@ -84,23 +325,31 @@ def build_provider_cache_key(provider: str, model: str | None, payload: dict) ->
     return sha256(blob.encode("utf-8")).hexdigest()
 
 
+def _run_coroutine(coro: Any) -> Any:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # called from inside an event loop: run the coroutine on its own loop in a worker thread
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
 def cache_get_sync(cache: ProviderCacheBackend | None, key: str) -> Any | None:
     if cache is None:
         return None
-    try:
-        return asyncio.run(cache.get(key))
-    except RuntimeError:
-        # When already in an event loop, create a new task and run with loop
-        loop = asyncio.get_event_loop()
-        return loop.run_until_complete(cache.get(key))
+    get_sync = getattr(cache, "get_sync", None)
+    if get_sync is not None:
+        return get_sync(key)
+    # third-party backends that only implement the async protocol
+    return _run_coroutine(cache.get(key))
 
 
 def cache_set_sync(cache: ProviderCacheBackend | None, key: str, value: Any, ttl: float | None = None) -> None:
     if cache is None:
         return
-    try:
-        asyncio.run(cache.set(key, value, ttl))
-    except RuntimeError:
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(cache.set(key, value, ttl))
-
+    set_sync = getattr(cache, "set_sync", None)
+    if set_sync is not None:
+        set_sync(key, value, ttl)
+        return
+    _run_coroutine(cache.set(key, value, ttl))
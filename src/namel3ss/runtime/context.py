@@ -4,10 +4,11 @@ Execution context and stubbed executors for the runtime.
 
 from __future__ import annotations
 
+import asyncio
 import copy
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, List, Optional, TypedDict
+from typing import Any, Callable, Dict, Generator, List, Optional, TypedDict
 import base64
 import importlib
 import math
@@ -67,6 +68,15 @@ from .cache import (
     get_provider_cache_ttl_seconds,
     build_provider_cache_key,
 )
+from .semantic_cache import (
+    ai_call_fingerprint,
+    default_threshold as default_semantic_threshold,
+    default_ttl_seconds as default_semantic_ttl_seconds,
+    get_default_semantic_cache,
+    semantic_cache_enabled,
+    semantic_scope_key,
+)
+from .singleflight import default_single_flight, single_flight_enabled
 from ..memory.summarisation import ConversationSummaryConfig, get_summary_config_from_env, summarise_conversation
 from ..memory.vector_helpers import (
     get_vector_memory_settings,
@@ -371,6 +381,52 @@ def _apply_conversation_summary_if_needed(
             return messages
 
 
+def _semantic_cache_probe(
+    ai_call: IRAiCall,
+    provider_name: str,
+    model: str | None,
+    messages: list[dict[str, Any]],
+    prompt: str,
+) -> tuple[Any, Callable[[Any], None] | None]:
+    """
+    Look ``prompt`` up in the semantic cache of an AI that opted in.
+
+    Returns the cached payload (or None) and a callback that stores a fresh
+    payload for this prompt. Embedding failures only disable the cache for
+    this call.
+    """
+
+    cfg = getattr(ai_call, "semantic_cache", None)
+    if cfg is None or not prompt.strip() or not semantic_cache_enabled():
+        return None, None
+    cache = get_default_semantic_cache()
+    fingerprint = ai_call_fingerprint(ai_call)
+    scope_key = semantic_scope_key(ai_call.name, provider_name, model, cfg.embedding_model, messages)
+    try:
+        vector = cache.embed(prompt, cfg.embedding_model)
+    except Exception as exc:
+        logger.warning("Semantic cache skipped for AI '%s': embedding failed: %s", ai_call.name, exc)
+        return None, None
+    if vector is None:
+        return None, None
+    threshold = cfg.threshold if cfg.threshold is not None else default_semantic_threshold()
+    match = cache.lookup(ai_call.name, fingerprint, scope_key, vector, threshold=threshold)
+
+    def remember(payload: Any) -> None:
+        cache.store(
+            ai_call.name,
+            fingerprint,
+            scope_key,
+            prompt,
+            vector,
+            payload,
+            ttl=cfg.ttl_seconds if cfg.ttl_seconds is not None else default_semantic_ttl_seconds(),
+            max_entries=cfg.max_entries,
+        )
+
+    return (match[0] if match else None), remember
+
+
 def _build_vector_context_messages(
     vector_registry: VectorStoreRegistry | None,
     query: str,
@@ -1297,6 +1353,46 @@ def _labeled_memory_messages(kind: str, entries: list[Dict[str, Any]]) -> list[D
     return messages
 
 
+@dataclass
+class _ProviderRequest:
+    """The provider call of an AI step without tools, handed to the driver of ``_ai_call_steps``."""
+
+    provider: Any
+    messages: List[Dict[str, str]]
+    model: str | None
+    flight_key: str
+    flight_name: str
+
+    def generate(self) -> Any:
+        def call() -> Any:
+            return self.provider.generate(messages=self.messages, model=self.model)
+
+        if single_flight_enabled():
+            # identical calls already in flight share one provider request
+            return default_single_flight.do(self.flight_key, call, kind="ai", name=self.flight_name)
+        return call()
+
+    async def agenerate(self) -> Any:
+        async def call() -> Any:
+            if callable(getattr(self.provider, "agenerate", None)):
+                return await self.provider.agenerate(messages=self.messages, model=self.model)
+            return await asyncio.to_thread(self.provider.generate, messages=self.messages, model=self.model)
+
+        if single_flight_enabled():
+            return await default_single_flight.ado(self.flight_key, call, kind="ai", name=self.flight_name)
+        return await call()
+
+
+def _advance_ai_call(steps: Generator, method: str, value: Any = None) -> tuple[bool, Any]:
+    # StopIteration cannot cross a thread future, so the outcome is returned as (done, value)
+    try:
+        if method == "next":
+            return False, next(steps)
+        return False, getattr(steps, method)(value)
+    except StopIteration as stop:
+        return True, stop.value
+
+
 def execute_ai_call_with_registry(
     ai_call: IRAiCall,
     registry: ModelRegistry,
@@ -1305,6 +1401,51 @@ def execute_ai_call_with_registry(
     tools_mode: str | None = None,
 ) -> Dict[str, Any]:
     """Execute an AI call through the model registry."""
+    steps = _ai_call_steps(ai_call, registry, router, context, tools_mode)
+    done, value = _advance_ai_call(steps, "next")
+    while not done:
+        try:
+            invocation = value.generate()
+        except Exception as exc:
+            done, value = _advance_ai_call(steps, "throw", exc)
+        else:
+            done, value = _advance_ai_call(steps, "send", invocation)
+    return value
+
+
+async def aexecute_ai_call_with_registry(
+    ai_call: IRAiCall,
+    registry: ModelRegistry,
+    router: ModelRouter,
+    context: ExecutionContext,
+    tools_mode: str | None = None,
+) -> Dict[str, Any]:
+    """
+    Async ``execute_ai_call_with_registry``. The provider request of a call
+    without tools is awaited through ``agenerate`` on the event loop; only the
+    blocking work around it (memory, caches, persistence, tool loops) runs in
+    worker threads, so slow providers do not hold a thread each.
+    """
+    steps = _ai_call_steps(ai_call, registry, router, context, tools_mode)
+    done, value = await asyncio.to_thread(_advance_ai_call, steps, "next")
+    while not done:
+        try:
+            invocation = await value.agenerate()
+        except Exception as exc:
+            done, value = await asyncio.to_thread(_advance_ai_call, steps, "throw", exc)
+        else:
+            done, value = await asyncio.to_thread(_advance_ai_call, steps, "send", invocation)
+    return value
+
+
+def _ai_call_steps(
+    ai_call: IRAiCall,
+    registry: ModelRegistry,
+    router: ModelRouter,
+    context: ExecutionContext,
+    tools_mode: str | None = None,
+) -> Generator[_ProviderRequest, Any, Dict[str, Any]]:
+    """Body of an AI call; yields the provider request of a call without tools to its driver."""
 
     provider, provider_model, provider_name = registry.resolve_provider_for_ai(ai_call)
     provider_model = provider_model or getattr(provider, "default_model", None) or getattr(ai_call, "model_name", None)
@@ -1410,16 +1551,23 @@ def execute_ai_call_with_registry(
                 except Exception:
                     pass
 
-        req = urllib.request.Request(url, data=body, headers=headers, method=method)
-        try:  # pragma: no cover - live calls
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                text = resp.read().decode("utf-8", errors="replace")
-                status = resp.getcode()
-                resp_headers = dict(resp.headers.items())
-        except urllib.error.HTTPError as exc:  # pragma: no cover - fallback
-            text = exc.read().decode("utf-8", errors="replace") if exc.fp else ""
-            status = exc.code
-            resp_headers = dict(exc.headers.items()) if exc.headers else {}
+        def _send() -> tuple[int, dict[str, str], str]:
+            req = urllib.request.Request(url, data=body, headers=headers, method=method)
+            try:  # pragma: no cover - live calls
+                with urllib.request.urlopen(req, timeout=timeout) as resp:
+                    return resp.getcode(), dict(resp.headers.items()), resp.read().decode("utf-8", errors="replace")
+            except urllib.error.HTTPError as exc:  # pragma: no cover - fallback
+                text = exc.read().decode("utf-8", errors="replace") if exc.fp else ""
+                return exc.code, dict(exc.headers.items()) if exc.headers else {}, text
+
+        # only idempotent reads are shared between concurrent identical calls
+        if method.upper() in {"GET", "HEAD"} and single_flight_enabled():
+            flight_key = cache_key or build_provider_cache_key(
+                "http", provider_key or url, {"method": method, "url": url, "headers": headers}
+            )
+            status, resp_headers, text = default_single_flight.do(flight_key, _send, kind="tool", name=url)
+        else:
+            status, resp_headers, text = _send()
         if cache_enabled and cache_key:
             cache_set_sync(
                 provider_cache,
@@ -1883,9 +2031,9 @@ def execute_ai_call_with_registry(
             assistant_content = follow_up.final_text or ""
             provider_payload = _build_provider_payload(follow_up.raw, follow_up.finish_reason)
     else:
+        cache_payload = {"messages": messages, "tools": tool_schemas, "mode": tools_mode}
+        cache_key = build_provider_cache_key(selection.provider_name, provider_model, cache_payload)
         if cacheable:
-            cache_payload = {"messages": messages, "tools": tool_schemas, "mode": tools_mode}
-            cache_key = build_provider_cache_key(selection.provider_name, provider_model, cache_payload)
             cached = cache_get_sync(provider_cache, cache_key)
             if cached is not None:
                 cache_hit = True
@@ -1902,9 +2050,23 @@ def execute_ai_call_with_registry(
                     default_metrics.record_provider_cache_miss(selection.provider_name, provider_model)
                 except Exception:
                     pass
+        remember_semantic = None
+        if not cache_hit:
+            semantic_hit, remember_semantic = _semantic_cache_probe(
+                ai_call, selection.provider_name, provider_model, messages, user_content
+            )
+            if semantic_hit is not None:
+                cache_hit = True
+                provider_payload = dict(semantic_hit.get("provider_payload") or {})
+                provider_payload["messages"] = list(messages)
+                assistant_content = semantic_hit.get("assistant_content", "")
+                registry.provider_status[provider_name] = "ok"
+                ModelRegistry.last_status[provider_name] = "ok"
         if not cache_hit:
             try:
-                invocation = provider.generate(messages=messages, model=provider_model)
+                invocation = yield _ProviderRequest(
+                    provider, messages, provider_model, cache_key, f"{selection.provider_name}:{provider_model}"
+                )
                 registry.provider_status[provider_name] = "ok"
                 ModelRegistry.last_status[provider_name] = "ok"
             except urllib.error.HTTPError as exc:  # pragma: no cover - live calls
@@ -1936,6 +2098,8 @@ def execute_ai_call_with_registry(
                     {"provider_payload": provider_payload, "assistant_content": assistant_content},
                     ttl=cache_ttl,
                 )
+            if remember_semantic is not None:
+                remember_semantic({"provider_payload": provider_payload, "assistant_content": assistant_content})
 
     result = execute_ai_call(ai_call, context)
     result.update(
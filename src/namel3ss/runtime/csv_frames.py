@@ -0,0 +1,353 @@
+"""
+Streaming loader for file-backed (CSV) frames.
+
+Rows are read with ``csv.reader`` and only the columns a frame keeps (its
+``select`` list plus whatever its ``where`` clause reads) are converted. Each
+column gets a converter inferred from its first values; a value the converter
+does not fit goes through the generic ``coerce`` function, so the results are
+the same as coercing every cell. ``where`` is applied while reading.
+
+Kept rows are stored column by column (``ColumnarRows``): whole-int and
+whole-float columns become ``array`` buffers and repeated strings are shared.
+Dicts are built once, when the rows are first handed out. The parsed columns are
+also written to an on-disk cache keyed by the file's path, size and mtime and
+by the frame options, so loading an unchanged file again skips parsing. Each
+path and options pair keeps one cache file: writing the parse of an edited
+file removes the previous one. The cache format is JSON plus raw array
+bytes; nothing is unpickled.
+"""
+
+from __future__ import annotations
+
+import csv
+import dataclasses
+import hashlib
+import json
+import os
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from .. import ast_nodes
+from ..errors import Namel3ssError
+
+__all__ = ["ColumnarRows", "read_csv_frame", "frame_cache_dir"]
+
+FORMAT_VERSION = 1
+_MAGIC = b"N3FRAME1\n"
+_SAMPLE = 32
+_INT_MIN, _INT_MAX = -(2**63), 2**63 - 1
+
+
+class ColumnarRows:
+    """Rows of a file-backed frame stored column by column."""
+
+    __slots__ = ("names", "columns", "length", "extras")
+
+    def __init__(
+        self,
+        columns: Dict[str, Sequence[Any]],
+        length: int,
+        extras: Optional[Dict[int, list]] = None,
+    ) -> None:
+        self.names = list(columns)
+        self.columns = columns
+        self.length = length
+        # values past the header on ragged rows, stored under the None key like csv.DictReader
+        self.extras = extras or {}
+
+    def __len__(self) -> int:
+        return self.length
+
+    def row(self, index: int) -> dict:
+        row = {name: self.columns[name][index] for name in self.names}
+        if index in self.extras:
+            row[None] = list(self.extras[index])
+        return row
+
+    def __iter__(self) -> Iterator[dict]:
+        for index in range(self.length):
+            yield self.row(index)
+
+    def to_list(self) -> List[dict]:
+        return list(self)
+
+
+def frame_cache_dir() -> Optional[Path]:
+    """Where parsed frames are cached (``N3_FRAME_CACHE_DIR``); None when ``N3_FRAME_CACHE_ENABLED`` is off."""
+    if os.getenv("N3_FRAME_CACHE_ENABLED", "1").strip().lower() not in {"1", "true", "yes", "on"}:
+        return None
+    configured = os.getenv("N3_FRAME_CACHE_DIR")
+    return Path(configured) if configured else Path.home() / ".cache" / "namel3ss" / "frames"
+
+
+def _referenced_fields(expr: Any) -> Optional[set[str]]:
+    """Row fields ``expr`` can read, or None when it may read the whole row."""
+    names: set[str] = set()
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (list, tuple)):
+            stack.extend(node)
+            continue
+        if isinstance(node, ast_nodes.VarRef):
+            if node.root == "row":
+                if not node.path:
+                    return None
+                names.add(node.path[0])
+            else:
+                names.add(node.root)
+        elif isinstance(node, ast_nodes.Identifier):
+            parts = node.name.split(".")
+            if parts[0] == "row":
+                if len(parts) < 2:
+                    return None
+                names.add(parts[1])
+            else:
+                names.add(parts[0])
+        if dataclasses.is_dataclass(node) and not isinstance(node, type):
+            stack.extend(getattr(node, field.name) for field in dataclasses.fields(node))
+    return names
+
+
+def _looks_numeric(text: str) -> bool:
+    first = text[0]
+    return first in "+-." or first.isdigit()
+
+
+def _infer_converter(samples: List[str], coerce: Callable[[Any], Any]) -> Callable[[str], Any]:
+    """Pick a fast converter for a column; anything it does not handle falls back to ``coerce``."""
+    filled = [value.strip() for value in samples if value.strip()]
+
+    def as_int(value: str) -> Any:
+        try:
+            # int() accepts exactly the strings coerce turns into ints
+            return int(value)
+        except ValueError:
+            return coerce(value)
+
+    def as_text(value: str) -> Any:
+        stripped = value.strip()
+        if stripped and not _looks_numeric(stripped):
+            return stripped
+        return coerce(value)
+
+    if filled and all(isinstance(coerce(value), int) and "." not in value for value in filled):
+        return as_int
+    if filled and not any(_looks_numeric(value) for value in filled):
+        return as_text
+    return coerce
+
+
+def _compact(values: list) -> Sequence[Any]:
+    if values and all(value.__class__ is int for value in values):
+        try:
+            return array("q", values)
+        except OverflowError:
+            return values
+    if values and all(value.__class__ is float for value in values):
+        return array("d", values)
+    return values
+
+
+def _cache_source(path: str, frame: Any) -> str:
+    """Cache-file prefix shared by every version of one file loaded with the same options."""
+    parts = [
+        FORMAT_VERSION,
+        os.path.abspath(path),
+        getattr(frame, "delimiter", None) or ",",
+        list(getattr(frame, "select_cols", None) or []),
+        repr(getattr(frame, "where", None)),
+    ]
+    return hashlib.sha256(json.dumps(parts, default=str).encode("utf-8")).hexdigest()
+
+
+def _cache_key(path: str, stat: os.stat_result, frame: Any) -> str:
+    return f"{_cache_source(path, frame)}-{stat.st_size}-{stat.st_mtime_ns}"
+
+
+def _remove_stale(target: Path) -> None:
+    source = target.name.split("-", 1)[0]
+    for stale in target.parent.glob(f"{source}-*.n3frame"):
+        if stale != target:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+
+def _write_cache(target: Path, rows: ColumnarRows) -> None:
+    blobs: list[bytes] = []
+    columns = []
+    for name in rows.names:
+        values = rows.columns[name]
+        if isinstance(values, array):
+            blob = values.tobytes()
+            columns.append({"name": name, "typecode": values.typecode, "nbytes": len(blob)})
+            blobs.append(blob)
+        else:
+            columns.append({"name": name, "values": values})
+    meta = {
+        "length": rows.length,
+        "byteorder": sys.byteorder,
+        "columns": columns,
+        "extras": [[index, values] for index, values in rows.extras.items()],
+    }
+    header = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(_MAGIC)
+        fh.write(len(header).to_bytes(8, "little"))
+        fh.write(header)
+        for blob in blobs:
+            fh.write(blob)
+    os.replace(tmp, target)
+
+
+def _read_cache(target: Path) -> Optional[ColumnarRows]:
+    try:
+        with open(target, "rb") as fh:
+            if fh.read(len(_MAGIC)) != _MAGIC:
+                return None
+            size = int.from_bytes(fh.read(8), "little")
+            meta = json.loads(fh.read(size).decode("utf-8"))
+            if meta.get("byteorder") != sys.byteorder:
+                return None
+            columns: Dict[str, Sequence[Any]] = {}
+            for column in meta["columns"]:
+                if "typecode" in column:
+                    values = array(column["typecode"])
+                    values.frombytes(fh.read(column["nbytes"]))
+                    columns[column["name"]] = values
+                else:
+                    columns[column["name"]] = column["values"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    extras = {int(index): values for index, values in meta.get("extras", [])}
+    return ColumnarRows(columns, int(meta["length"]), extras)
+
+
+def read_csv_frame(
+    frame: Any,
+    coerce: Callable[[Any], Any],
+    where_predicate: Callable[[Any, str], Callable[[dict], bool]],
+) -> ColumnarRows | List[list]:
+    """
+    Load a file-backed frame. Frames with headers come back as
+    ``ColumnarRows``; headerless frames as lists of values.
+    """
+    path = getattr(frame, "path", None)
+    delimiter = getattr(frame, "delimiter", None) or ","
+    if not getattr(frame, "has_headers", False):
+        return _read_headerless(frame, path, delimiter, coerce)
+    stat = os.stat(path)
+    cache_dir = frame_cache_dir()
+    cache_file = cache_dir / f"{_cache_key(path, stat, frame)}.n3frame" if cache_dir is not None else None
+    if cache_file is not None and cache_file.exists():
+        cached = _read_cache(cache_file)
+        if cached is not None:
+            return cached
+    rows = _read_with_headers(frame, path, delimiter, coerce, where_predicate)
+    if cache_file is not None:
+        try:
+            _write_cache(cache_file, rows)
+            _remove_stale(cache_file)
+        except (OSError, TypeError, ValueError):
+            # an unwritable or unencodable cache only costs the next load a re-parse
+            pass
+    return rows
+
+
+def _read_with_headers(
+    frame: Any,
+    path: str,
+    delimiter: str,
+    coerce: Callable[[Any], Any],
+    where_predicate: Callable[[Any, str], Callable[[dict], bool]],
+) -> ColumnarRows:
+    frame_name = getattr(frame, "name", "")
+    with open(path, newline="", encoding="utf-8") as fh:
+        reader = csv.reader(fh, delimiter=delimiter)
+        header = next(reader, None) or []
+        select_cols = list(getattr(frame, "select_cols", None) or [])
+        for col in select_cols:
+            if col not in header:
+                available = ", ".join(header)
+                raise Namel3ssError(
+                    f"N3F-1002: Frame '{frame_name}' selects column '{col}', but that column does not exist in the source. Available columns are: {available}."
+                )
+        where = getattr(frame, "where", None)
+        matches = where_predicate(where, frame_name) if where is not None else None
+        # a repeated header name keeps its last column, as csv.DictReader does
+        positions = {name: index for index, name in enumerate(header)}
+        names = list(dict.fromkeys(header))
+        if select_cols:
+            referenced = _referenced_fields(where) if where is not None else set()
+            wanted = set(select_cols) | (set(header) if referenced is None else referenced)
+            names = [name for name in names if name in wanted]
+        kept = select_cols or names
+        read = [(name, positions[name]) for name in names]
+        width = len(header)
+        values: Dict[str, list] = {name: [] for name in kept}
+        shared: Dict[str, dict] = {name: {} for name in kept}
+        converters: Dict[str, Callable[[str], Any]] = {}
+        pending: list[list[str]] = []
+        extras: Dict[int, list] = {}
+
+        def keep(raw: list[str]) -> None:
+            row = {}
+            for name, position in read:
+                cell = raw[position] if position < len(raw) else None
+                row[name] = None if cell is None else converters[name](cell)
+            if len(raw) > width and not select_cols:
+                row[None] = raw[width:]
+            if matches is not None and not matches(row):
+                return
+            index = len(values[kept[0]]) if kept else 0
+            for name in kept:
+                value = row.get(name)
+                if value.__class__ is str:
+                    value = shared[name].setdefault(value, value)
+                values[name].append(value)
+            if None in row:
+                extras[index] = row[None]
+
+        for raw in reader:
+            if not raw:
+                continue
+            if not converters:
+                pending.append(raw)
+                if len(pending) < _SAMPLE:
+                    continue
+                for name, position in read:
+                    samples = [row[position] for row in pending if position < len(row)]
+                    converters[name] = _infer_converter(samples, coerce)
+                for buffered in pending:
+                    keep(buffered)
+                pending = []
+                continue
+            keep(raw)
+        if pending:
+            for name, position in read:
+                converters[name] = _infer_converter([row[position] for row in pending if position < len(row)], coerce)
+            for buffered in pending:
+                keep(buffered)
+    length = len(values[kept[0]]) if kept else 0
+    return ColumnarRows({name: _compact(values[name]) for name in kept}, length, extras)
+
+
+def _read_headerless(frame: Any, path: str, delimiter: str, coerce: Callable[[Any], Any]) -> List[list]:
+    frame_name = getattr(frame, "name", "")
+    rows: list[list[Any]] = []
+    with open(path, newline="", encoding="utf-8") as fh:
+        for raw in csv.reader(fh, delimiter=delimiter):
+            if getattr(frame, "select_cols", None):
+                raise Namel3ssError(
+                    f"N3F-1001: Frame '{frame_name}' selects columns but no headers are available. Add 'has headers' to use select."
+                )
+            if getattr(frame, "where", None) is not None:
+                raise Namel3ssError(f"N3F-1001: Frame '{frame_name}' cannot use a where clause without headers.")
+            rows.append([coerce(value) for value in raw])
+    return rows
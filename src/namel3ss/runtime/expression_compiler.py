@@ -0,0 +1,423 @@
+"""
+Compile expression trees into Python closures.
+
+``ExpressionEvaluator.evaluate`` walks a long ``isinstance`` chain for every
+node it visits. Expressions in frame filters, flow conditions and loops are
+evaluated again and again against fresh bindings, so the hot node types
+(literals, variables, field access, unary/binary operators, list/record
+literals, ``get ... otherwise`` and collection pipelines) are compiled once
+into closures of the form ``fn(evaluator) -> value``. Children are bound directly, so a compiled tree
+evaluates without re-dispatching on node type. Every other node falls back to
+the interpreter, whose children are compiled in turn.
+
+The closures mirror the interpreter branch for branch: operands are evaluated
+in the same order (``and``/``or`` do not short-circuit) and raise the same
+``EvaluationError`` messages. Compiled closures are cached per node object
+until the node is garbage collected; expression trees are treated as immutable
+once parsed.
+"""
+
+from __future__ import annotations
+
+import operator
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from .. import ast_nodes
+from ..ir import IRCollectionPipeline
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .expressions import ExpressionEvaluator
+
+__all__ = ["CompiledExpr", "compile_expression", "clear_expression_cache"]
+
+CompiledExpr = Callable[["ExpressionEvaluator"], Any]
+
+_COMPARISONS = {"<": operator.lt, ">": operator.gt, "<=": operator.le, ">=": operator.ge}
+_ARITHMETIC = {"-": operator.sub, "*": operator.mul}
+# exact classes ``_to_number`` passes through unchanged (bool is deliberately absent)
+_NUMBERS = (int, float)
+
+_cache: Dict[int, tuple] = {}
+_cache_lock = threading.Lock()
+
+
+def compile_expression(expr: Any) -> CompiledExpr:
+    """Return the cached closure for ``expr``, compiling it on first use."""
+    key = id(expr)
+    entry = _cache.get(key)
+    if entry is not None and entry[0]() is expr:
+        return entry[1]
+    compiled = _compile(expr)
+    try:
+        ref = weakref.ref(expr, lambda _ref, key=key: _cache.pop(key, None))
+    except TypeError:
+        # None and other plain values cannot be weakly referenced; they are cheap to recompile
+        return compiled
+    with _cache_lock:
+        _cache[key] = (ref, compiled)
+    return compiled
+
+
+def clear_expression_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
+
+def _compile(expr: Any) -> CompiledExpr:
+    compiler = _COMPILERS.get(type(expr))
+    if compiler is None:
+        return _interpret(expr)
+    return compiler(expr)
+
+
+def _interpret(expr: Any) -> CompiledExpr:
+    def interpret(ev: "ExpressionEvaluator") -> Any:
+        return ev._evaluate_node(expr)
+
+    return interpret
+
+
+def _none(ev: "ExpressionEvaluator") -> Any:
+    return None
+
+
+def _optional(expr: Optional[ast_nodes.Expr]) -> CompiledExpr:
+    # a missing child evaluates to None, as in the interpreter
+    return compile_expression(expr) if expr is not None else _none
+
+
+def _constant(expr: Optional[ast_nodes.Expr]) -> tuple[bool, Any]:
+    if expr is None:
+        return True, None
+    if type(expr) is ast_nodes.Literal:
+        return True, expr.value
+    return False, None
+
+
+def _compile_literal(expr: ast_nodes.Literal) -> CompiledExpr:
+    value = expr.value
+
+    def literal(ev: "ExpressionEvaluator") -> Any:
+        return value
+
+    return literal
+
+
+def _compile_lookup(name: str, on_missing: CompiledExpr) -> CompiledExpr:
+    from .expressions import VariableEnvironment
+
+    def lookup(ev: "ExpressionEvaluator") -> Any:
+        env = ev.env
+        if env.__class__ is VariableEnvironment:
+            # env.has() + env.resolve() without the two method calls
+            if name in env._declared:
+                return env.values[name]
+        elif env.has(name):
+            return env.resolve(name)
+        return on_missing(ev)
+
+    return lookup
+
+
+def _compile_path(name: str, base: str, path: list[str], on_missing: CompiledExpr) -> CompiledExpr:
+    from .expressions import VariableEnvironment
+
+    def path_lookup(ev: "ExpressionEvaluator") -> Any:
+        env = ev.env
+        if env.__class__ is VariableEnvironment:
+            declared = env._declared
+            if name in declared:
+                return env.values[name]
+            if base not in declared:
+                return on_missing(ev)
+            current = env.values[base]
+        elif env.has(name):
+            return env.resolve(name)
+        elif env.has(base):
+            current = env.resolve(base)
+        else:
+            return on_missing(ev)
+        index = 0
+        for part in path:
+            if current.__class__ is not dict or part not in current:
+                # objects and missing fields take the evaluator's walker, which owns the error messages
+                return ev._resolve_path_value(current, path[index:])
+            current = current[part]
+            index += 1
+        return current
+
+    return path_lookup
+
+
+def _compile_resolver(name: str, unknown: str, *, return_missing: bool) -> CompiledExpr:
+    def resolve(ev: "ExpressionEvaluator") -> Any:
+        found, value = ev.resolver(name)
+        if found:
+            return value
+        ev._unknown_identifier(unknown)
+        if return_missing:
+            return value
+
+    return resolve
+
+
+def _compile_var_ref(expr: ast_nodes.VarRef) -> CompiledExpr:
+    root = expr.root
+    path = list(expr.path)
+    if not path:
+        return _compile_lookup(root, _compile_resolver(root, root, return_missing=False))
+    dotted = ".".join([root] + path)
+    resolve = _compile_resolver(dotted, dotted, return_missing=False)
+    return _compile_path(dotted, root, path, resolve)
+
+
+def _compile_identifier(expr: ast_nodes.Identifier) -> CompiledExpr:
+    name = expr.name
+    if "." not in name:
+        return _compile_lookup(name, _compile_resolver(name, name, return_missing=True))
+    base, *rest = name.split(".")
+    resolve = _compile_resolver(name, base, return_missing=True)
+    return _compile_path(name, base, rest, resolve)
+
+
+def _compile_field_access(expr: ast_nodes.RecordFieldAccess) -> CompiledExpr:
+    from .expressions import EvaluationError, build_missing_field_error
+
+    target_fn = _optional(expr.target)
+    field = expr.field
+
+    def field_access(ev: "ExpressionEvaluator") -> Any:
+        target = target_fn(ev)
+        if not isinstance(target, dict):
+            raise EvaluationError(
+                f"N3-3300: I can only look up fields on a record, but got {ev._render_value(target)} instead."
+            )
+        if field not in target:
+            raise EvaluationError(
+                build_missing_field_error(field, target, context=f"I don't know field {field} on this record.")
+            )
+        return target.get(field)
+
+    return field_access
+
+
+def _compile_unary(expr: ast_nodes.UnaryOp) -> CompiledExpr:
+    from .expressions import EvaluationError
+
+    operand = _optional(expr.operand)
+    op = expr.op
+    if op == "not":
+
+        def not_(ev: "ExpressionEvaluator") -> Any:
+            return not bool(operand(ev))
+
+        return not_
+    if op in {"+", "-"}:
+        sign = 1 if op == "+" else -1
+
+        def sign_(ev: "ExpressionEvaluator") -> Any:
+            return ev._numeric_unary(operand(ev), sign)
+
+        return sign_
+
+    def unsupported(ev: "ExpressionEvaluator") -> Any:
+        operand(ev)
+        raise EvaluationError(f"Unsupported unary operator '{op}'")
+
+    return unsupported
+
+
+def _compile_binary(expr: ast_nodes.BinaryOp) -> CompiledExpr:
+    from .expressions import EvaluationError
+
+    op = expr.op
+    left = _optional(expr.left)
+    right = _optional(expr.right)
+    right_is_constant, constant = _constant(expr.right)
+
+    if op == "and":
+
+        def and_(ev: "ExpressionEvaluator") -> Any:
+            lval = left(ev)
+            rval = right(ev)
+            return bool(lval) and bool(rval)
+
+        return and_
+    if op == "or":
+
+        def or_(ev: "ExpressionEvaluator") -> Any:
+            lval = left(ev)
+            rval = right(ev)
+            return bool(lval) or bool(rval)
+
+        return or_
+    if op in {"==", "=", "is"}:
+        if right_is_constant:
+
+            def eq_constant(ev: "ExpressionEvaluator") -> Any:
+                return left(ev) == constant
+
+            return eq_constant
+
+        def eq(ev: "ExpressionEvaluator") -> Any:
+            lval = left(ev)
+            return lval == right(ev)
+
+        return eq
+    if op in {"!=", "is not"}:
+        if right_is_constant:
+
+            def ne_constant(ev: "ExpressionEvaluator") -> Any:
+                return left(ev) != constant
+
+            return ne_constant
+
+        def ne(ev: "ExpressionEvaluator") -> Any:
+            lval = left(ev)
+            return lval != right(ev)
+
+        return ne
+    if op in _COMPARISONS:
+        compare = _COMPARISONS[op]
+        if right_is_constant:
+
+            def compare_constant(ev: "ExpressionEvaluator") -> Any:
+                lval = left(ev)
+                try:
+                    return compare(lval, constant)
+                except Exception as exc:  # pragma: no cover - defensive
+                    raise EvaluationError(f"Invalid comparison for operator '{op}'") from exc
+
+            return compare_constant
+
+        def comparison(ev: "ExpressionEvaluator") -> Any:
+            lval = left(ev)
+            rval = right(ev)
+            try:
+                return compare(lval, rval)
+            except Exception as exc:  # pragma: no cover - defensive
+                raise EvaluationError(f"Invalid comparison for operator '{op}'") from exc
+
+        return comparison
+    if op == "+":
+
+        def add(ev: "ExpressionEvaluator") -> Any:
+            lval = left(ev)
+            rval = right(ev)
+            if lval.__class__ in _NUMBERS and rval.__class__ in _NUMBERS:
+                return lval + rval
+            if isinstance(lval, list) and isinstance(rval, list):
+                return lval + rval
+            if isinstance(lval, str) and isinstance(rval, str):
+                return lval + rval
+            return ev._to_number(lval) + ev._to_number(rval)
+
+        return add
+    if op in _ARITHMETIC:
+        apply = _ARITHMETIC[op]
+
+        def arithmetic(ev: "ExpressionEvaluator") -> Any:
+            lval = left(ev)
+            rval = right(ev)
+            if lval.__class__ in _NUMBERS and rval.__class__ in _NUMBERS:
+                return apply(lval, rval)
+            return apply(ev._to_number(lval), ev._to_number(rval))
+
+        return arithmetic
+    if op in {"/", "%"}:
+        apply = operator.truediv if op == "/" else operator.mod
+
+        def divide(ev: "ExpressionEvaluator") -> Any:
+            lval = left(ev)
+            rval = right(ev)
+            lnum = ev._to_number(lval)
+            rnum = ev._to_number(rval)
+            if rnum == 0:
+                raise EvaluationError("Cannot divide by zero")
+            return apply(lnum, rnum)
+
+        return divide
+
+    def unsupported(ev: "ExpressionEvaluator") -> Any:
+        left(ev)
+        right(ev)
+        raise EvaluationError(f"Unsupported operator '{op}'")
+
+    return unsupported
+
+
+def _compile_list(expr: ast_nodes.ListLiteral) -> CompiledExpr:
+    items = [compile_expression(item) for item in expr.items]
+
+    def list_(ev: "ExpressionEvaluator") -> Any:
+        return [item(ev) for item in items]
+
+    return list_
+
+
+def _compile_record(expr: ast_nodes.RecordLiteral) -> CompiledExpr:
+    if any(not field.key for field in expr.fields):
+        # the interpreter raises after evaluating the earlier fields; keep that behaviour
+        return _interpret(expr)
+    fields = [(field.key, compile_expression(field.value)) for field in expr.fields]
+
+    def record(ev: "ExpressionEvaluator") -> Any:
+        result: dict[str, Any] = {}
+        for key, value in fields:
+            result[key] = value(ev)
+        return result
+
+    return record
+
+
+def _compile_get_with_default(expr: ast_nodes.GetRecordFieldWithDefault) -> CompiledExpr:
+    from .expressions import EvaluationError
+
+    record = _optional(expr.record)
+    default = _optional(expr.default)
+    field = expr.field
+
+    def get_or_default(ev: "ExpressionEvaluator") -> Any:
+        record_val = record(ev)
+        if not isinstance(record_val, dict):
+            raise EvaluationError(
+                f"I expected a record for 'get ... otherwise ...', but got {ev._render_value(record_val)} instead."
+            )
+        if field is None:
+            raise EvaluationError("get ... otherwise ... requires a field name.")
+        if field in record_val:
+            return record_val.get(field)
+        return default(ev)
+
+    return get_or_default
+
+
+def _compile_collection_pipeline(expr: ast_nodes.CollectionPipeline) -> CompiledExpr:
+    from .expressions import collection_pipeline_to_ir
+
+    # the AST -> IR step conversion happens once instead of on every evaluation
+    return _compile_ir_pipeline(collection_pipeline_to_ir(expr))
+
+
+def _compile_ir_pipeline(pipeline: IRCollectionPipeline) -> CompiledExpr:
+    def collection_pipeline(ev: "ExpressionEvaluator") -> Any:
+        return ev._eval_collection_pipeline(pipeline)
+
+    return collection_pipeline
+
+
+_COMPILERS: Dict[type, Callable[[Any], CompiledExpr]] = {
+    ast_nodes.Literal: _compile_literal,
+    ast_nodes.VarRef: _compile_var_ref,
+    ast_nodes.Identifier: _compile_identifier,
+    ast_nodes.RecordFieldAccess: _compile_field_access,
+    ast_nodes.UnaryOp: _compile_unary,
+    ast_nodes.BinaryOp: _compile_binary,
+    ast_nodes.ListLiteral: _compile_list,
+    ast_nodes.RecordLiteral: _compile_record,
+    ast_nodes.GetRecordFieldWithDefault: _compile_get_with_default,
+    ast_nodes.CollectionPipeline: _compile_collection_pipeline,
+    IRCollectionPipeline: _compile_ir_pipeline,
+}
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import difflib
+import heapq
 import re
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Callable, Tuple
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Iterator, Tuple
 
 from .. import ast_nodes
 from ..errors import Namel3ssError
@@ -18,6 +21,7 @@ from ..ir import (
     IRCollectionTakeStep,
     IRLet,
 )
+from .expression_compiler import compile_expression
 
 
 class EvaluationError(Namel3ssError):
@@ -48,6 +52,30 @@ def build_missing_field_error(field: str, record: Any, *, context: str, include_
     return " ".join(parts)
 
 
+def collection_pipeline_to_ir(expr: ast_nodes.CollectionPipeline) -> IRCollectionPipeline:
+    ir_steps = []
+    for step in expr.steps:
+        if isinstance(step, ast_nodes.CollectionKeepRowsStep):
+            ir_steps.append(IRCollectionKeepRowsStep(condition=step.condition))
+        elif isinstance(step, ast_nodes.CollectionDropRowsStep):
+            ir_steps.append(IRCollectionDropRowsStep(condition=step.condition))
+        elif isinstance(step, ast_nodes.CollectionGroupByStep):
+            ir_steps.append(IRCollectionGroupByStep(key=step.key, body=getattr(step, "body", []) or []))
+        elif isinstance(step, ast_nodes.CollectionSortStep):
+            ir_steps.append(
+                IRCollectionSortStep(
+                    kind=getattr(step, "kind", "rows"),
+                    key=step.key,
+                    direction=getattr(step, "direction", "asc"),
+                )
+            )
+        elif isinstance(step, ast_nodes.CollectionTakeStep):
+            ir_steps.append(IRCollectionTakeStep(count=step.count))
+        elif isinstance(step, ast_nodes.CollectionSkipStep):
+            ir_steps.append(IRCollectionSkipStep(count=step.count))
+    return IRCollectionPipeline(source=expr.source, steps=ir_steps)
+
+
 class VariableEnvironment:
     """Per-run variable environment."""
 
@@ -129,6 +157,10 @@ class ExpressionEvaluator:
         )
 
     def evaluate(self, expr: ast_nodes.Expr) -> Any:
+        return compile_expression(expr)(self)
+
+    def _evaluate_node(self, expr: ast_nodes.Expr) -> Any:
+        """Interpret a single node; used for node types the expression compiler does not handle."""
         if isinstance(expr, ast_nodes.Literal):
             return expr.value
         if isinstance(expr, ast_nodes.VarRef):
@@ -290,28 +322,7 @@ class ExpressionEvaluator:
                 raise EvaluationError("has key ... on ... requires a key literal.")
             return expr.key in record_val
         if isinstance(expr, ast_nodes.CollectionPipeline):
-            ir_steps = []
-            for step in expr.steps:
-                if isinstance(step, ast_nodes.CollectionKeepRowsStep):
-                    ir_steps.append(IRCollectionKeepRowsStep(condition=step.condition))
-                elif isinstance(step, ast_nodes.CollectionDropRowsStep):
-                    ir_steps.append(IRCollectionDropRowsStep(condition=step.condition))
-                elif isinstance(step, ast_nodes.CollectionGroupByStep):
-                    ir_steps.append(IRCollectionGroupByStep(key=step.key, body=getattr(step, "body", []) or []))
-                elif isinstance(step, ast_nodes.CollectionSortStep):
-                    ir_steps.append(
-                        IRCollectionSortStep(
-                            kind=getattr(step, "kind", "rows"),
-                            key=step.key,
-                            direction=getattr(step, "direction", "asc"),
-                        )
-                    )
-                elif isinstance(step, ast_nodes.CollectionTakeStep):
-                    ir_steps.append(IRCollectionTakeStep(count=step.count))
-                elif isinstance(step, ast_nodes.CollectionSkipStep):
-                    ir_steps.append(IRCollectionSkipStep(count=step.count))
-            ir_pipeline = IRCollectionPipeline(source=expr.source, steps=ir_steps)
-            return self._eval_collection_pipeline(ir_pipeline)
+            return self._eval_collection_pipeline(collection_pipeline_to_ir(expr))
         if isinstance(expr, IRCollectionPipeline):
             return self._eval_collection_pipeline(expr)
         if isinstance(expr, ast_nodes.FilterExpression):
@@ -668,20 +679,26 @@ class ExpressionEvaluator:
             f"I expected a list or frame here, but got {type(value).__name__}. Collection pipelines only work on lists and frames."
         )
 
-    def _with_row_binding(self, row: Any) -> tuple[bool, Any]:
-        had_prev = self.env.has("row")
-        prev_val = self.env.resolve("row") if had_prev else None
+    def _bind_variable(self, name: str, value: Any) -> tuple[bool, Any]:
+        had_prev = self.env.has(name)
+        prev_val = self.env.resolve(name) if had_prev else None
         if had_prev:
-            self.env.assign("row", row)
+            self.env.assign(name, value)
         else:
-            self.env.declare("row", row)
+            self.env.declare(name, value)
         return had_prev, prev_val
 
-    def _restore_row_binding(self, had_prev: bool, prev_val: Any) -> None:
+    def _restore_variable(self, name: str, had_prev: bool, prev_val: Any) -> None:
         if had_prev:
-            self.env.assign("row", prev_val)
+            self.env.assign(name, prev_val)
         else:
-            self.env.remove("row")
+            self.env.remove(name)
+
+    def _with_row_binding(self, row: Any) -> tuple[bool, Any]:
+        return self._bind_variable("row", row)
+
+    def _restore_row_binding(self, had_prev: bool, prev_val: Any) -> None:
+        self._restore_variable("row", had_prev, prev_val)
 
     def _evaluate_group_expression(
         self, expr: ast_nodes.Expr | None, rows: list[Any], evaluator: "ExpressionEvaluator"
@@ -730,126 +747,138 @@ class ExpressionEvaluator:
         return evaluator.evaluate(expr)
 
     def _eval_collection_pipeline(self, pipeline: IRCollectionPipeline) -> list[Any]:
+        """
+        Run a pipeline as a chain of lazy stages. keep/drop/take/skip stream row
+        by row, so ``take first N`` stops pulling rows once it has N of them;
+        only group by and sort hold the rows reaching them, and a sort directly
+        followed by ``take first`` keeps just the top N.
+        """
         source_val = self.evaluate(pipeline.source) if pipeline.source is not None else None
-        items = self._ensure_collection(source_val)
-        for step in pipeline.steps:
+        items: Iterable[Any] = self._ensure_collection(source_val)
+        steps = pipeline.steps
+        index = 0
+        while index < len(steps):
+            step = steps[index]
+            index += 1
             if isinstance(step, IRCollectionKeepRowsStep):
-                kept: list[Any] = []
-                for row in items:
-                    had_prev, prev_val = self._with_row_binding(row)
-                    try:
-                        cond_val = self.evaluate(step.condition) if step.condition is not None else False
-                        result = self._ensure_boolean(cond_val, "keep rows where ...")
-                        if result:
-                            kept.append(row)
-                    finally:
-                        self._restore_row_binding(had_prev, prev_val)
-                items = kept
-                continue
-            if isinstance(step, IRCollectionDropRowsStep):
-                kept: list[Any] = []
-                for row in items:
-                    had_prev, prev_val = self._with_row_binding(row)
-                    try:
-                        cond_val = self.evaluate(step.condition) if step.condition is not None else False
-                        result = self._ensure_boolean(cond_val, "drop rows where ...")
-                        if not result:
-                            kept.append(row)
-                    finally:
-                        self._restore_row_binding(had_prev, prev_val)
-                items = kept
-                continue
-            if isinstance(step, IRCollectionGroupByStep):
-                groups: dict[Any, list[Any]] = {}
-                for row in items:
-                    had_prev, prev_val = self._with_row_binding(row)
-                    try:
-                        key_val = self.evaluate(step.key) if step.key is not None else None
-                    finally:
-                        self._restore_row_binding(had_prev, prev_val)
-                    groups.setdefault(key_val, []).append(row)
-                grouped_records: list[dict[str, Any]] = []
-                for key_val, rows in groups.items():
-                    group_env = self.env.clone()
-                    if group_env.has("rows"):
-                        group_env.assign("rows", rows)
-                    else:
-                        group_env.declare("rows", rows)
-                    if group_env.has("group_key"):
-                        group_env.assign("group_key", key_val)
-                    else:
-                        group_env.declare("group_key", key_val)
-                    group_evaluator = ExpressionEvaluator(
-                        group_env,
-                        resolver=self.resolver,
-                        rulegroup_resolver=self.rulegroup_resolver,
-                        helper_resolver=self.helper_resolver,
-                    )
-                    record: dict[str, Any] = {"key": key_val}
-                    for stmt in step.body:
-                        if not isinstance(stmt, (ast_nodes.LetStatement, IRLet)):
-                            raise EvaluationError("Only let statements are supported inside group by blocks for now.")
-                        value = self._evaluate_group_expression(stmt.expr, rows, group_evaluator)
-                        if group_env.has(stmt.name):
-                            group_env.assign(stmt.name, value)
-                        else:
-                            group_env.declare(stmt.name, value, is_constant=stmt.is_constant)
-                        record[stmt.name] = value
-                    grouped_records.append(record)
-                items = grouped_records
-                continue
-            if isinstance(step, IRCollectionSortStep):
-                kind = step.kind
-                direction = step.direction
-
-                def sort_key(element: Any) -> Any:
-                    env_clone = self.env.clone()
-                    bind_name = "row" if kind == "rows" else "group"
-                    if env_clone.has(bind_name):
-                        env_clone.assign(bind_name, element)
-                    else:
-                        env_clone.declare(bind_name, element)
-                    if kind == "groups":
-                        if env_clone.has("row"):
-                            env_clone.assign("row", element)
-                        else:
-                            env_clone.declare("row", element)
-                        if isinstance(element, dict):
-                            for k, v in element.items():
-                                if env_clone.has(k):
-                                    env_clone.assign(k, v)
-                                else:
-                                    env_clone.declare(k, v)
-                    evaluator = ExpressionEvaluator(
-                        env_clone,
-                        resolver=self.resolver,
-                        rulegroup_resolver=self.rulegroup_resolver,
-                        helper_resolver=self.helper_resolver,
-                    )
-                    return evaluator.evaluate(step.key) if step.key is not None else None
+                items = self._filter_rows(items, step.condition, "keep rows where ...", keep=True)
+            elif isinstance(step, IRCollectionDropRowsStep):
+                items = self._filter_rows(items, step.condition, "drop rows where ...", keep=False)
+            elif isinstance(step, IRCollectionTakeStep):
+                items = islice(items, self._pipeline_count(step.count, "take first ..."))
+            elif isinstance(step, IRCollectionSkipStep):
+                items = islice(items, self._pipeline_count(step.count, "skip first ..."), None)
+            elif isinstance(step, IRCollectionGroupByStep):
+                items = self._group_rows(items, step)
+            elif isinstance(step, IRCollectionSortStep):
+                limit = None
+                if index < len(steps) and isinstance(steps[index], IRCollectionTakeStep):
+                    limit = self._pipeline_count(steps[index].count, "take first ...")
+                    index += 1
+                items = self._sort_rows(items, step, limit)
+            else:
+                raise EvaluationError(f"Unsupported collection pipeline step '{type(step).__name__}'")
+        return items if isinstance(items, list) else list(items)
 
-                try:
-                    items = sorted(items, key=sort_key, reverse=direction == "desc")
-                except Exception:
-                    raise EvaluationError("I couldn't sort these values because the sort keys are not comparable.")
-                continue
-            if isinstance(step, IRCollectionTakeStep):
-                count_val = self.evaluate(step.count) if step.count is not None else 0
-                if not isinstance(count_val, (int, float)) or isinstance(count_val, bool) or count_val < 0:
-                    raise EvaluationError(
-                        f"I expected a non-negative number for 'take first ...', but got {self._render_value(count_val)}."
-                    )
-                count_int = int(count_val)
-                items = items[:count_int]
-                continue
-            if isinstance(step, IRCollectionSkipStep):
-                count_val = self.evaluate(step.count) if step.count is not None else 0
-                if not isinstance(count_val, (int, float)) or isinstance(count_val, bool) or count_val < 0:
-                    raise EvaluationError(
-                        f"I expected a non-negative number for 'skip first ...', but got {self._render_value(count_val)}."
-                    )
-                count_int = int(count_val)
-                items = items[count_int:]
-                continue
-            raise EvaluationError(f"Unsupported collection pipeline step '{type(step).__name__}'")
-        return items
+    def _filter_rows(self, rows: Iterable[Any], condition: ast_nodes.Expr | None, context: str, *, keep: bool) -> Iterator[Any]:
+        for row in rows:
+            had_prev, prev_val = self._with_row_binding(row)
+            try:
+                cond_val = self.evaluate(condition) if condition is not None else False
+                result = self._ensure_boolean(cond_val, context)
+            finally:
+                self._restore_row_binding(had_prev, prev_val)
+            if result is keep:
+                yield row
+
+    def _pipeline_count(self, expr: ast_nodes.Expr | None, context: str) -> int:
+        count_val = self.evaluate(expr) if expr is not None else 0
+        if not isinstance(count_val, (int, float)) or isinstance(count_val, bool) or count_val < 0:
+            raise EvaluationError(
+                f"I expected a non-negative number for '{context}', but got {self._render_value(count_val)}."
+            )
+        return int(count_val)
+
+    def _group_rows(self, items: Iterable[Any], step: IRCollectionGroupByStep) -> list[dict[str, Any]]:
+        groups: dict[Any, list[Any]] = {}
+        for row in items:
+            had_prev, prev_val = self._with_row_binding(row)
+            try:
+                key_val = self.evaluate(step.key) if step.key is not None else None
+            finally:
+                self._restore_row_binding(had_prev, prev_val)
+            groups.setdefault(key_val, []).append(row)
+        grouped_records: list[dict[str, Any]] = []
+        for key_val, rows in groups.items():
+            group_env = self.env.clone()
+            if group_env.has("rows"):
+                group_env.assign("rows", rows)
+            else:
+                group_env.declare("rows", rows)
+            if group_env.has("group_key"):
+                group_env.assign("group_key", key_val)
+            else:
+                group_env.declare("group_key", key_val)
+            group_evaluator = ExpressionEvaluator(
+                group_env,
+                resolver=self.resolver,
+                rulegroup_resolver=self.rulegroup_resolver,
+                helper_resolver=self.helper_resolver,
+            )
+            record: dict[str, Any] = {"key": key_val}
+            for stmt in step.body:
+                if not isinstance(stmt, (ast_nodes.LetStatement, IRLet)):
+                    raise EvaluationError("Only let statements are supported inside group by blocks for now.")
+                value = self._evaluate_group_expression(stmt.expr, rows, group_evaluator)
+                if group_env.has(stmt.name):
+                    group_env.assign(stmt.name, value)
+                else:
+                    group_env.declare(stmt.name, value, is_constant=stmt.is_constant)
+                record[stmt.name] = value
+            grouped_records.append(record)
+        return grouped_records
+
+    def _sort_keys(self, rows: list[Any], step: IRCollectionSortStep) -> list[Any]:
+        # bind names on our own environment (no clone per element) and put them back afterwards
+        if step.key is None:
+            return [None] * len(rows)
+        if step.kind == "rows":
+            had_prev, prev_val = self._with_row_binding(None)
+            try:
+                keys = []
+                for element in rows:
+                    self.env.assign("row", element)
+                    keys.append(self.evaluate(step.key))
+                return keys
+            finally:
+                self._restore_row_binding(had_prev, prev_val)
+        keys = []
+        for element in rows:
+            bindings: list[tuple[str, Any]] = [("group", element), ("row", element)]
+            if isinstance(element, dict):
+                bindings.extend(element.items())
+            saved: list[tuple[str, bool, Any]] = []
+            try:
+                for name, value in bindings:
+                    saved.append((name, *self._bind_variable(name, value)))
+                keys.append(self.evaluate(step.key))
+            finally:
+                for name, had_prev, prev_val in reversed(saved):
+                    self._restore_variable(name, had_prev, prev_val)
+        return keys
+
+    def _sort_rows(self, items: Iterable[Any], step: IRCollectionSortStep, limit: int | None = None) -> list[Any]:
+        rows = items if isinstance(items, list) else list(items)
+        by_key = itemgetter(0)
+        try:
+            keyed = list(zip(self._sort_keys(rows, step), rows))
+            if limit is None:
+                ordered = sorted(keyed, key=by_key, reverse=step.direction == "desc")
+            elif step.direction == "desc":
+                # equivalent to sorted(..., reverse=True)[:limit], ties included, in O(n log limit)
+                ordered = heapq.nlargest(limit, keyed, key=by_key)
+            else:
+                ordered = heapq.nsmallest(limit, keyed, key=by_key)
+        except Exception:
+            raise EvaluationError("I couldn't sort these values because the sort keys are not comparable.")
+        return [element for _, element in ordered]
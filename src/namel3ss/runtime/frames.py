@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-import csv
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+import os
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence
 
 from .. import ast_nodes
 from ..errors import Namel3ssError
+from .csv_frames import ColumnarRows, read_csv_frame
 from .expressions import EvaluationError, ExpressionEvaluator, VariableEnvironment
+from .sqlite_frames import SQLiteFrameDatabase, SQLiteFrameTable
 
 
 @dataclass
@@ -23,76 +27,317 @@ class FrameSpec:
     where: ast_nodes.Expr | None = None
 
 
+class _HashIndex:
+    """Hash index over one field of a memory frame: value -> rows keyed by ``id(row)``."""
+
+    __slots__ = ("field", "buckets", "unhashable")
+
+    def __init__(self, field: str) -> None:
+        self.field = field
+        self.buckets: Dict[Any, Dict[int, dict]] = {}
+        # rows whose value cannot be hashed are candidates for every lookup
+        self.unhashable: Dict[int, dict] = {}
+
+    def add(self, row: dict) -> None:
+        value = row.get(self.field)
+        try:
+            self.buckets.setdefault(value, {})[id(row)] = row
+        except TypeError:
+            self.unhashable[id(row)] = row
+
+    def remove(self, row: dict) -> None:
+        value = row.get(self.field)
+        try:
+            bucket = self.buckets.get(value)
+        except TypeError:
+            self.unhashable.pop(id(row), None)
+            return
+        if bucket is not None:
+            bucket.pop(id(row), None)
+            if not bucket:
+                del self.buckets[value]
+
+    def estimate(self, values: list) -> int:
+        return sum(len(self.buckets.get(value, ())) for value in values) + len(self.unhashable)
+
+    def lookup(self, values: list) -> Dict[int, dict]:
+        rows: Dict[int, dict] = {}
+        for value in values:
+            rows.update(self.buckets.get(value, {}))
+        rows.update(self.unhashable)
+        return rows
+
+
+class _FrameIndexes:
+    """
+    The hash indexes of one memory frame plus each row's insertion position,
+    so index lookups return rows in the same order as a scan would.
+    """
+
+    def __init__(self) -> None:
+        self.by_field: Dict[str, _HashIndex] = {}
+        self.positions: Dict[int, int] = {}
+        self.next_position = 0
+        # the row list the indexes describe; writes that bypass the registry force a rebuild
+        self.rows: List[dict] | None = None
+        self.size = -1
+
+    def in_sync(self, rows: List[dict]) -> bool:
+        return rows is self.rows and len(rows) == self.size
+
+    def rebuild(self, rows: List[dict]) -> None:
+        fields = list(self.by_field)
+        self.by_field = {field: _HashIndex(field) for field in fields}
+        self.positions = {}
+        self.next_position = 0
+        for row in rows:
+            self.add(row)
+        self.synced(rows)
+
+    def synced(self, rows: List[dict]) -> None:
+        self.rows = rows
+        self.size = len(rows)
+
+    def add(self, row: dict) -> None:
+        self.positions[id(row)] = self.next_position
+        self.next_position += 1
+        for index in self.by_field.values():
+            index.add(row)
+
+    def remove(self, row: dict) -> None:
+        self.positions.pop(id(row), None)
+        for index in self.by_field.values():
+            index.remove(row)
+
+    def candidates(self, conditions: list[dict]) -> List[dict] | None:
+        """Rows that may match ``conditions`` using the most selective index, or None to scan."""
+        best: tuple[int, _HashIndex, list] | None = None
+        for field_name, values in _index_lookups(conditions):
+            index = self.by_field.get(field_name)
+            if index is None:
+                continue
+            try:
+                cost = index.estimate(values)
+            except TypeError:  # unhashable filter value
+                continue
+            if best is None or cost < best[0]:
+                best = (cost, index, values)
+        if best is None:
+            return None
+        rows = best[1].lookup(best[2])
+        if len(rows) <= 1:
+            return list(rows.values())
+        positions = self.positions
+        return sorted(rows.values(), key=lambda row: positions.get(id(row), 0))
+
+
+def _index_lookups(node: Any) -> List[tuple[str, list]]:
+    """Equality/membership leaves that every matching row must satisfy (i.e. reached only through ANDs)."""
+    if isinstance(node, list):
+        return [lookup for item in node for lookup in _index_lookups(item)]
+    if not isinstance(node, dict):
+        return []
+    ntype = node.get("type")
+    if ntype == "and":
+        return _index_lookups(node.get("left")) + _index_lookups(node.get("right"))
+    if ntype == "all":
+        return _index_lookups(node.get("children") or [])
+    if ntype in {"or", "any"}:
+        return []
+    field, op, value = node.get("field"), node.get("op"), node.get("value")
+    if not isinstance(field, str):
+        return []
+    if op == "eq":
+        return [(field, [value])]
+    if op == "in" and isinstance(value, (list, tuple, set)):
+        return [(field, list(value))]
+    return []
+
+
+_ABSENT = object()
+
+
+@dataclass
+class _UndoLog:
+    """Inverse operations for the writes made inside a transaction, newest last."""
+
+    entries: List[tuple] = field(default_factory=list)
+    # entries length at each open savepoint, innermost last
+    marks: List[int] = field(default_factory=list)
+
+
+@dataclass
+class FrameSavepoint:
+    log: _UndoLog
+    mark: int
+    # set on the outermost savepoint, which owns the log
+    token: Token | None = None
+
+
+# The open transaction's undo log per registry. One module-level variable rather
+# than one per registry: contexts hold strong references to their variables.
+# The mapping is replaced, never mutated, so copied contexts stay independent.
+_UNDO_LOGS: ContextVar[Mapping["FrameRegistry", _UndoLog]] = ContextVar("frame_undo_logs", default={})
+
+
 class FrameRegistry:
-    """Runtime registry for frames; loads lazily and caches per registry."""
+    """
+    Runtime registry for frames; loads lazily and caches per registry.
+
+    Memory frames can carry hash indexes (see ``ensure_index``/``index_records``).
+    Queries, updates and deletes whose filters contain an equality or ``in``
+    condition on an indexed field only examine the rows that index returns;
+    every candidate is still checked against the full filter.
+
+    Transactions (``begin``/``commit``/``rollback``) keep an undo log of the
+    writes made under them, so rolling back costs as much as those writes
+    rather than a copy of every frame. Savepoints nest. The log is bound to
+    the current context, so concurrent runs sharing the registry are not
+    rolled back by each other.
+
+    Frames declared with ``backend is "sqlite"`` are stored in the database
+    named by their ``url`` (see ``sqlite_frames``); the same methods push
+    their filters down into SQL. ``snapshot``/``restore`` cover memory frames
+    only.
+    """
 
     def __init__(self, frames: Dict[str, Any] | None = None) -> None:
         self.frames = frames or {}
-        self._cache: Dict[str, List[Any]] = {}
+        # file-backed frames: name -> (file size/mtime, parsed rows)
+        self._cache: Dict[str, tuple[tuple | None, ColumnarRows | List[Any]]] = {}
         self._store: Dict[str, List[dict]] = {}
+        self._indexes: Dict[str, _FrameIndexes] = {}
+        self._sqlite_dbs: Dict[str, SQLiteFrameDatabase] = {}
+        self._sqlite_tables: Dict[str, SQLiteFrameTable] = {}
 
     def register(self, name: str, spec: Any) -> None:
         self.frames[name] = spec
 
+    def ensure_index(self, name: str, field: str) -> None:
+        """Maintain a hash index on ``field`` of memory frame ``name`` (an SQL index for SQLite frames)."""
+        table = self._sqlite_table(name)
+        if table is not None:
+            table.ensure_index(field)
+            return
+        indexes = self._indexes.setdefault(name, _FrameIndexes())
+        if field in indexes.by_field:
+            return
+        indexes.by_field[field] = _HashIndex(field)
+        indexes.rebuild(self._store.setdefault(name, []))
+
+    def index_records(self, records: Dict[str, Any]) -> None:
+        """Index the primary key, unique fields and referenced fields of every record's frame."""
+        for record in (records or {}).values():
+            frame_name = getattr(record, "frame", None)
+            if not frame_name:
+                continue
+            if getattr(record, "primary_key", None):
+                self.ensure_index(frame_name, record.primary_key)
+            for record_field in (getattr(record, "fields", None) or {}).values():
+                if getattr(record_field, "primary_key", False) or getattr(record_field, "is_unique", False):
+                    self.ensure_index(frame_name, record_field.name)
+                target = records.get(getattr(record_field, "references_record", None) or "")
+                target_field = getattr(record_field, "reference_target_field", None)
+                if target is not None and getattr(target, "frame", None) and target_field:
+                    self.ensure_index(target.frame, target_field)
+
+    def uses_sqlite(self, name: str) -> bool:
+        frame = self.frames.get(name)
+        return (getattr(frame, "backend", None) or "").lower() == "sqlite"
+
+    def _sqlite_table(self, name: str) -> SQLiteFrameTable | None:
+        table = self._sqlite_tables.get(name)
+        if table is not None or not self.uses_sqlite(name):
+            return table
+        frame = self.frames[name]
+        path = self._sqlite_path(frame)
+        db = self._sqlite_dbs.get(path)
+        if db is None:
+            try:
+                db = self._sqlite_dbs[path] = SQLiteFrameDatabase(path)
+            except Exception as exc:
+                raise Namel3ssError(f"I couldn't open the SQLite database for frame '{name}' at '{path}': {exc}") from exc
+        table = self._sqlite_tables[name] = SQLiteFrameTable(db, getattr(frame, "table", None) or name, name)
+        return table
+
+    def _sqlite_path(self, frame: Any) -> str:
+        url = getattr(frame, "url", None)
+        if isinstance(url, ast_nodes.Literal):
+            url = url.value
+        elif isinstance(url, ast_nodes.VarRef) and url.root == "env" and len(url.path) == 1:
+            url = os.environ.get(url.path[0])
+        if not isinstance(url, str) or not url:
+            raise Namel3ssError(
+                f"Frame '{getattr(frame, 'name', '')}' needs a connection url for backend 'sqlite', such as \"sqlite:///data/app.db\" or env.DATABASE_URL."
+            )
+        for prefix in ("sqlite:///", "sqlite://", "file:"):
+            if url.startswith(prefix):
+                return url[len(prefix) :] or ":memory:"
+        return url
+
+    def close(self) -> None:
+        """Close the SQLite databases opened for this registry."""
+        for db in self._sqlite_dbs.values():
+            db.close()
+        self._sqlite_dbs.clear()
+        self._sqlite_tables.clear()
+
+    def _frame_indexes(self, name: str) -> _FrameIndexes | None:
+        indexes = self._indexes.get(name)
+        if indexes is None:
+            return None
+        rows = self._store.setdefault(name, [])
+        if not indexes.in_sync(rows):
+            indexes.rebuild(rows)
+        return indexes
+
+    def _candidate_rows(self, name: str, conditions: list[dict]) -> List[dict]:
+        data = self._store.get(name, [])
+        indexes = self._frame_indexes(name) if conditions else None
+        if indexes is not None:
+            candidates = indexes.candidates(conditions)
+            if candidates is not None:
+                return candidates
+        return data
+
     def get_rows(self, name: str) -> List[Any]:
         if name not in self.frames:
             raise Namel3ssError("N3F-1100: frame not defined")
         frame = self.frames[name]
+        table = self._sqlite_table(name)
+        if table is not None:
+            return list(table.rows())
         backend = getattr(frame, "backend", None) or getattr(frame, "source_kind", None) or ("file" if getattr(frame, "path", None) else "memory")
         if backend != "file" and backend != "file_source":
             # Memory-backed frames live in the in-memory store and should reflect current values.
             return list(self._store.get(name, []))
-        if name in self._cache:
-            return self._cache[name]
-        rows = self._load_frame(frame)
-        self._cache[name] = rows
+        signature = self._file_signature(frame)
+        cached = self._cache.get(name)
+        if cached is None or cached[0] != signature:
+            cached = self._cache[name] = (signature, self._load_frame(frame))
+        rows = cached[1]
+        if isinstance(rows, ColumnarRows):
+            # build the dicts once and keep them in place of the columns
+            rows = rows.to_list()
+            self._cache[name] = (signature, rows)
         return rows
 
-    def _load_frame(self, frame: Any) -> List[Any]:
+    def _file_signature(self, frame: Any) -> tuple | None:
+        # a changed file is reloaded on the next access
+        try:
+            stat = os.stat(getattr(frame, "path", None) or "")
+        except OSError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def _load_frame(self, frame: Any) -> ColumnarRows | List[Any]:
         path = getattr(frame, "path", None)
         if not path:
             raise Namel3ssError(
                 f"Frame '{getattr(frame, 'name', '')}' needs a data source. Add a 'source:' block with 'from file \"...\"'."
             )
-        delimiter = getattr(frame, "delimiter", None) or ","
         try:
-            with open(path, newline="", encoding="utf-8") as fh:
-                if getattr(frame, "has_headers", False):
-                    reader = csv.DictReader(fh, delimiter=delimiter)
-                    headers = reader.fieldnames or []
-                    select_cols = getattr(frame, "select_cols", None) or []
-                    if select_cols:
-                        for col in select_cols:
-                            if col not in headers:
-                                available = ", ".join(headers)
-                                raise Namel3ssError(
-                                    f"N3F-1002: Frame '{getattr(frame, 'name', '')}' selects column '{col}', but that column does not exist in the source. Available columns are: {available}."
-                                )
-                    rows: list[dict] = []
-                    for raw in reader:
-                        row = {k: self._coerce_value(v) for k, v in (raw or {}).items()}
-                        if getattr(frame, "where", None) is not None:
-                            if not self._eval_where(frame.where, row, getattr(frame, "name", "")):
-                                continue
-                        if select_cols:
-                            row = {col: row.get(col) for col in select_cols}
-                        rows.append(row)
-                    return rows
-                else:
-                    rows: list[list[Any]] = []
-                    reader = csv.reader(fh, delimiter=delimiter)
-                    for raw in reader:
-                        values = [self._coerce_value(v) for v in raw]
-                        if getattr(frame, "select_cols", None):
-                            raise Namel3ssError(
-                                f"N3F-1001: Frame '{getattr(frame, 'name', '')}' selects columns but no headers are available. Add 'has headers' to use select."
-                            )
-                        if getattr(frame, "where", None) is not None:
-                            raise Namel3ssError(
-                                f"N3F-1001: Frame '{getattr(frame, 'name', '')}' cannot use a where clause without headers."
-                            )
-                        rows.append(values)
-                    return rows
+            return read_csv_frame(frame, self._coerce_value, self._where_predicate)
         except Namel3ssError:
             raise
         except FileNotFoundError as exc:  # pragma: no cover - safety
@@ -108,7 +353,18 @@ class FrameRegistry:
         if not backend:
             # fallback to in-memory if no backend but still allow basic persistence
             backend = "memory"
-        self._store.setdefault(name, []).append(dict(row))
+        table = self._sqlite_table(name)
+        if table is not None:
+            self._log("sqlite_insert", name, table.insert(row))
+            return
+        rows = self._store.setdefault(name, [])
+        stored = dict(row)
+        indexes = self._frame_indexes(name)
+        rows.append(stored)
+        if indexes is not None:
+            indexes.add(stored)
+            indexes.synced(rows)
+        self._log("insert", name, stored)
 
     def query(self, name: str, filters: dict | None = None) -> list[dict]:
         frame = self.frames.get(name)
@@ -121,75 +377,264 @@ class FrameRegistry:
         )
         use_expr_filter = filters is not None and not isinstance(filters, (dict, list))
         conditions = None if use_expr_filter else self._normalize_conditions(filters)
+        table = self._sqlite_table(name)
+        if table is not None:
+            if use_expr_filter:
+                matches = self._where_predicate(filters, name)
+                return [r for r in table.rows() if matches(r)]
+            return list(table.rows(conditions, lambda row: self._row_matches(row, conditions)))
         if backend == "file":
             rows = self.get_rows(name)
             if isinstance(rows, list) and rows and isinstance(rows[0], dict):
                 if use_expr_filter:
-                    return [r for r in rows if self._eval_where(filters, r, name)]
+                    matches = self._where_predicate(filters, name)
+                    return [r for r in rows if matches(r)]
                 return [r for r in rows if self._row_matches(r, conditions or [])]
             return rows
-        data = self._store.get(name, [])
         if use_expr_filter:
-            return [r for r in data if self._eval_where(filters, r, name)]
-        return [r for r in data if self._row_matches(r, conditions or [])]
+            matches = self._where_predicate(filters, name)
+            return [r for r in self._store.get(name, []) if matches(r)]
+        return [r for r in self._candidate_rows(name, conditions or []) if self._row_matches(r, conditions or [])]
 
     def update(self, name: str, filters: dict | None, updates: dict) -> int:
         frame = self.frames.get(name)
         if not frame:
             raise Namel3ssError(f"N3L-830: Frame '{name}' is not declared.")
-        data = self._store.setdefault(name, [])
+        if self._sqlite_table(name) is not None:
+            return self.update_rows(name, self.query(name, filters), updates)
+        self._store.setdefault(name, [])
         conditions = self._normalize_conditions(filters)
-        count = 0
-        for row in data:
-            if self._row_matches(row, conditions):
+        rows = [row for row in self._candidate_rows(name, conditions) if self._row_matches(row, conditions)]
+        return self.update_rows(name, rows, updates)
+
+    def select(
+        self,
+        name: str,
+        filters: dict | list | None = None,
+        *,
+        order_by: Sequence[tuple[str, bool]] = (),
+        offset: int = 0,
+        limit: int | None = None,
+        label: str | None = None,
+    ) -> Iterator[dict]:
+        """
+        Stream the rows matching ``filters``, sorted by ``(field, descending)``
+        pairs and paginated. SQLite frames do all of it in SQL; other frames
+        filter, sort and slice the result of ``query``.
+        """
+        conditions = self._normalize_conditions(filters)
+        table = self._sqlite_table(name)
+        if table is not None:
+            return table.rows(
+                conditions,
+                lambda row: self._row_matches(row, conditions),
+                order_by=order_by,
+                offset=offset,
+                limit=limit,
+                label=label,
+            )
+        rows = self.query(name, conditions)
+        for sort_field, _desc in order_by:
+            if any(not isinstance(row, dict) or sort_field not in row for row in rows):
+                raise Namel3ssError(f"I can't sort {label or name} by {sort_field} because some rows don't have that field.")
+        try:
+            for sort_field, desc in reversed(order_by):
+                rows = sorted(rows, key=lambda row, f=sort_field: row[f], reverse=desc)
+        except TypeError as exc:
+            raise Namel3ssError(f"I couldn't sort {label or name} because the sort keys are not comparable: {exc}") from exc
+        return islice(rows, offset, None if limit is None else offset + limit)
+
+    def update_rows(self, name: str, rows: List[dict], updates: dict) -> int:
+        """Apply ``updates`` to stored ``rows`` (as returned by ``query``), keeping indexes current."""
+        log = self._current_log()
+        table = self._sqlite_table(name)
+        for row in rows:
+            if table is not None:
+                rowid = getattr(row, "rowid", None)
+                if rowid is None:
+                    raise Namel3ssError(f"update_rows on SQLite frame '{name}' needs rows returned by query().")
+                if log is not None:
+                    log.entries.append(("sqlite_update", name, rowid, dict(row)))
                 row.update(updates)
-                count += 1
-        return count
+                table.write(rowid, row)
+                continue
+            if log is not None:
+                log.entries.append(("update", name, row, {key: row.get(key, _ABSENT) for key in updates}))
+            self._apply_to_row(name, row, updates)
+        return len(rows)
+
+    def _apply_to_row(self, name: str, row: dict, values: dict) -> None:
+        # _ABSENT removes the field (used when undoing an update that added it)
+        indexes = self._frame_indexes(name)
+        touched = [index for index in indexes.by_field.values() if index.field in values] if indexes else []
+        for index in touched:
+            index.remove(row)
+        for key, value in values.items():
+            if value is _ABSENT:
+                row.pop(key, None)
+            else:
+                row[key] = value
+        for index in touched:
+            index.add(row)
 
     def delete(self, name: str, filters: dict | None) -> int:
         frame = self.frames.get(name)
         if not frame:
             raise Namel3ssError(f"N3L-830: Frame '{name}' is not declared.")
-        data = self._store.setdefault(name, [])
         conditions = self._normalize_conditions(filters)
+        table = self._sqlite_table(name)
+        if table is not None:
+            logging = self._current_log() is not None
+            deleted, removed = table.delete(
+                conditions, lambda row: self._row_matches(row, conditions), keep_rows=logging
+            )
+            if logging and removed:
+                self._log("sqlite_delete", name, removed)
+            return deleted
+        data = self._store.setdefault(name, [])
+        doomed = {id(row) for row in self._candidate_rows(name, conditions) if self._row_matches(row, conditions)}
+        if not doomed:
+            return 0
+        indexes = self._frame_indexes(name)
         remain: list[dict] = []
-        deleted = 0
-        for row in data:
-            if self._row_matches(row, conditions):
-                deleted += 1
+        removed: list[tuple[int, dict]] = []
+        for position, row in enumerate(data):
+            if id(row) in doomed:
+                removed.append((position, row))
+                if indexes is not None:
+                    indexes.remove(row)
                 continue
             remain.append(row)
         self._store[name] = remain
-        return deleted
+        if indexes is not None:
+            indexes.synced(remain)
+        self._log("delete", name, removed)
+        return len(doomed)
 
     def snapshot(self) -> Dict[str, List[dict]]:
+        """Deep copy of every memory frame; prefer ``begin``/``rollback`` for transactions."""
         return {name: [dict(row) for row in rows] for name, rows in self._store.items()}
 
     def restore(self, snapshot: Optional[Dict[str, List[dict]]]) -> None:
         if snapshot is None:
             return
+        self._log("replace", self._store)
         self._store = {name: [dict(row) for row in rows] for name, rows in snapshot.items()}
 
+    # -- transactions ----------------------------------------------------------
+
+    def begin(self) -> FrameSavepoint:
+        """Open a transaction, or a savepoint inside the current one."""
+        log = self._current_log()
+        if log is None:
+            log = _UndoLog()
+            savepoint = FrameSavepoint(log=log, mark=0, token=_UNDO_LOGS.set({**_UNDO_LOGS.get(), self: log}))
+        else:
+            savepoint = FrameSavepoint(log=log, mark=len(log.entries))
+        log.marks.append(savepoint.mark)
+        return savepoint
+
+    def commit(self, savepoint: FrameSavepoint) -> None:
+        """Keep the writes made since ``savepoint``; an enclosing transaction can still undo them."""
+        self._close(savepoint)
+
+    def rollback(self, savepoint: FrameSavepoint) -> None:
+        """Undo every write made since ``savepoint``, newest first."""
+        entries = savepoint.log.entries
+        try:
+            while len(entries) > savepoint.mark:
+                self._undo(entries.pop())
+        finally:
+            self._close(savepoint)
+
+    def _close(self, savepoint: FrameSavepoint) -> None:
+        log = savepoint.log
+        if not log.marks or log.marks[-1] != savepoint.mark:
+            raise Namel3ssError("Frame savepoints must be committed or rolled back innermost first.")
+        log.marks.pop()
+        if savepoint.token is not None:
+            log.entries.clear()
+            # drop only this registry's log: another registry's transaction may still be open
+            _UNDO_LOGS.set({reg: other for reg, other in _UNDO_LOGS.get().items() if reg is not self})
+
+    def _current_log(self) -> _UndoLog | None:
+        return _UNDO_LOGS.get().get(self)
+
+    def _log(self, *entry: Any) -> None:
+        log = self._current_log()
+        if log is not None:
+            log.entries.append(entry)
+
+    def _undo(self, entry: tuple) -> None:
+        kind, target = entry[0], entry[1]
+        if kind == "replace":
+            self._store = target
+            return
+        if kind.startswith("sqlite_"):
+            table = self._sqlite_table(target)
+            if kind == "sqlite_insert":
+                table.remove([entry[2]])
+            elif kind == "sqlite_update":
+                table.write(entry[2], entry[3])
+            else:
+                table.reinsert(entry[2])
+            return
+        if kind == "update":
+            self._apply_to_row(target, entry[2], entry[3])
+            return
+        rows = self._store.setdefault(target, [])
+        if kind == "insert":
+            row = entry[2]
+            # undone newest first, so the row is normally the last one
+            for position in range(len(rows) - 1, -1, -1):
+                if rows[position] is row:
+                    del rows[position]
+                    break
+            indexes = self._frame_indexes(target)
+            if indexes is not None:
+                indexes.remove(row)
+                indexes.synced(rows)
+            return
+        if kind == "delete":
+            restored = list(rows)
+            for position, row in entry[2]:
+                restored.insert(min(position, len(restored)), row)
+            # a new list object: the frame's indexes rebuild on next use
+            self._store[target] = restored
+
     def _eval_where(self, expr: ast_nodes.Expr, row: dict, frame_name: str) -> bool:
-        env = VariableEnvironment({"row": row, **dict(row)})
+        return self._where_predicate(expr, frame_name)(row)
+
+    def _where_predicate(self, expr: ast_nodes.Expr, frame_name: str) -> Callable[[dict], bool]:
+        """Build a row predicate for ``expr``; the evaluator is shared and only the row bindings change per row."""
+        current: Dict[str, Any] = {}
+
         def _resolver(name: str):
+            row = current["row"]
             if name == "row":
                 return True, row
             if isinstance(row, dict) and name in row:
                 return True, row.get(name)
-            if env.has(name):
-                return True, env.resolve(name)
+            if evaluator.env.has(name):
+                return True, evaluator.env.resolve(name)
             return False, None
-        evaluator = ExpressionEvaluator(env, resolver=_resolver)
-        try:
-            val = evaluator.evaluate(expr)
-        except EvaluationError as exc:
-            raise Namel3ssError(str(exc))
-        if not isinstance(val, bool):
-            raise Namel3ssError(
-                f"N3F-1003: The 'where' clause on frame '{frame_name}' must be a boolean expression."
-            )
-        return bool(val)
+
+        evaluator = ExpressionEvaluator(VariableEnvironment(), resolver=_resolver)
+
+        def matches(row: dict) -> bool:
+            current["row"] = row
+            evaluator.env = VariableEnvironment({"row": row, **dict(row)})
+            try:
+                val = evaluator.evaluate(expr)
+            except EvaluationError as exc:
+                raise Namel3ssError(str(exc))
+            if not isinstance(val, bool):
+                raise Namel3ssError(
+                    f"N3F-1003: The 'where' clause on frame '{frame_name}' must be a boolean expression."
+                )
+            return bool(val)
+
+        return matches
 
     def _coerce_value(self, value: Any) -> Any:
         if value is None:
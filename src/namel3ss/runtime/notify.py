@@ -0,0 +1,56 @@
+"""
+Wakeups for background loops.
+
+``ChangeNotifier`` is a version counter that coroutines can block on until it
+moves. ``notify()`` may be called from any thread (FastAPI sync routes run in
+a threadpool) and wakes waiters on whichever event loops they belong to.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Optional, Set, Tuple
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class ChangeNotifier:
+    def __init__(self) -> None:
+        self.version = 0
+        self._lock = threading.Lock()
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = set()
+
+    def notify(self) -> None:
+        with self._lock:
+            self.version += 1
+            waiters = list(self._waiters)
+            self._waiters.clear()
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:  # loop already closed
+                pass
+
+    async def wait(self, since: Optional[int] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the version moves past ``since`` (the current version when
+        omitted) or ``timeout`` elapses. Returns True if a change was seen.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if since is not None and self.version != since:
+                return True
+            entry = (loop, loop.create_future())
+            self._waiters.add(entry)
+        try:
+            await asyncio.wait_for(entry[1], timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                self._waiters.discard(entry)
@@ -12,11 +12,19 @@ class JobStore(Protocol):
     def dequeue_job(self) -> Optional[Job]:
         ...
 
+    def dequeue_many(self, limit: int) -> List[Job]:
+        ...
+
+    def heartbeat(self, job: Job) -> bool:
+        """Extend the claim on a running job; False if the claim was lost."""
+        ...
+
     def get_job(self, job_id: str) -> Optional[Job]:
         ...
 
     def list_jobs(self) -> List[Job]:
         ...
 
-    def update_job(self, job: Job) -> None:
+    def update_job(self, job: Job) -> bool:
+        """Record a claimed job's outcome; False if the claim was lost and nothing was written."""
         ...
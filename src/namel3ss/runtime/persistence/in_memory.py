@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from collections import deque
-from typing import Deque, Dict, List, Optional
+import heapq
+import itertools
+import time
+from typing import Dict, List, Optional, Tuple
 
 from ...distributed.models import Job
 from .base import JobStore
@@ -9,20 +11,39 @@ from .base import JobStore
 
 class InMemoryJobStore(JobStore):
     def __init__(self) -> None:
-        self._queue: Deque[Job] = deque()
+        # (-priority, enqueue order, job): highest priority first, FIFO within a priority
+        self._queue: List[Tuple[int, int, Job]] = []
+        self._order = itertools.count()
         self._jobs: Dict[str, Job] = {}
 
     def save_job(self, job: Job) -> Job:
-        self._queue.append(job)
+        heapq.heappush(self._queue, (-job.priority, next(self._order), job))
         self._jobs[job.id] = job
         return job
 
     def dequeue_job(self) -> Optional[Job]:
-        if not self._queue:
-            return None
-        job = self._queue.popleft()
-        self._jobs[job.id] = job
-        return job
+        jobs = self.dequeue_many(1)
+        return jobs[0] if jobs else None
+
+    def dequeue_many(self, limit: int) -> List[Job]:
+        now = time.time()
+        ready: List[Job] = []
+        deferred = []
+        while self._queue and len(ready) < limit:
+            entry = heapq.heappop(self._queue)
+            job = entry[2]
+            if job.run_at is not None and job.run_at > now:
+                deferred.append(entry)
+                continue
+            job.attempts += 1
+            self._jobs[job.id] = job
+            ready.append(job)
+        for entry in deferred:
+            heapq.heappush(self._queue, entry)
+        return ready
+
+    def heartbeat(self, job: Job) -> bool:
+        return True
 
     def get_job(self, job_id: str) -> Optional[Job]:
         return self._jobs.get(job_id)
@@ -30,5 +51,6 @@ class InMemoryJobStore(JobStore):
     def list_jobs(self) -> List[Job]:
         return list(self._jobs.values())
 
-    def update_job(self, job: Job) -> None:
+    def update_job(self, job: Job) -> bool:
         self._jobs[job.id] = job
+        return True
@@ -1,25 +1,55 @@
 from __future__ import annotations
 
 import json
+import os
+import socket
 import sqlite3
+import threading
 import time
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
 from ...distributed.models import Job
 from .base import JobStore
 
+DEFAULT_VISIBILITY_TIMEOUT = 300.0
+
+_COLUMNS = "id, type, target, payload, status, result, error, created_at, priority, run_at, attempts"
+# columns added after the first schema version, with their definitions for ALTER TABLE
+_MIGRATED_COLUMNS = {
+    "priority": "INTEGER NOT NULL DEFAULT 0",
+    "run_at": "REAL NOT NULL DEFAULT 0",
+    "attempts": "INTEGER NOT NULL DEFAULT 0",
+    "lease_owner": "TEXT",
+    "lease_expires_at": "REAL",
+}
+
 
 class SQLiteJobStore(JobStore):
-    def __init__(self, db_path: str | Path) -> None:
+    """
+    SQLite-backed job store safe for several worker processes.
+
+    Jobs are claimed inside a ``BEGIN IMMEDIATE`` transaction, so two workers
+    can never take the same job. A claim is a lease: a worker that stops
+    heartbeating for ``visibility_timeout`` seconds loses its jobs, and they
+    return to the queue. The claim query walks a covering index on
+    ``(status, priority, created_at)``, so it does not slow down as the table
+    grows.
+    """
+
+    def __init__(self, db_path: str | Path, visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT) -> None:
         self.db_path = str(db_path)
+        self.visibility_timeout = float(visibility_timeout)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
         self._ensure_schema()
 
-    def _connect(self) -> sqlite3.Connection:
-        return sqlite3.connect(self.db_path)
-
     def _ensure_schema(self) -> None:
-        with self._connect() as conn:
+        with self._lock:
+            conn = self._conn
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS jobs (
@@ -34,16 +64,34 @@ class SQLiteJobStore(JobStore):
                 )
                 """
             )
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, definition in _MIGRATED_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_claim_idx "
+                "ON jobs (status, priority DESC, created_at, run_at, id)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_lease_idx ON jobs (status, lease_expires_at)")
+            # jobs left running by a version without leases get one now, so they expire like any other claim
+            conn.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE status = 'running' AND lease_expires_at IS NULL",
+                (time.time() + self.visibility_timeout,),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
 
     def save_job(self, job: Job) -> Job:
         created_at = time.time()
-        with self._connect() as conn:
-            existing = conn.execute("SELECT created_at FROM jobs WHERE id = ?", (job.id,)).fetchone()
+        with self._lock:
+            existing = self._conn.execute("SELECT created_at FROM jobs WHERE id = ?", (job.id,)).fetchone()
             created_at = existing[0] if existing else created_at
-            conn.execute(
+            self._conn.execute(
                 """
-                INSERT OR REPLACE INTO jobs (id, type, target, payload, status, result, error, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT OR REPLACE INTO jobs (id, type, target, payload, status, result, error, created_at, priority, run_at, attempts)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     job.id,
@@ -54,64 +102,113 @@ class SQLiteJobStore(JobStore):
                     json.dumps(job.result),
                     job.error,
                     created_at,
+                    int(job.priority),
+                    float(job.run_at or 0.0),
+                    int(job.attempts),
                 ),
             )
         return job
 
     def dequeue_job(self) -> Optional[Job]:
-        with self._connect() as conn:
-            row = conn.execute(
-                """
-                SELECT id, type, target, payload, status, result, error, created_at
-                FROM jobs
-                WHERE status = 'queued'
-                ORDER BY created_at ASC
-                LIMIT 1
-                """
-            ).fetchone()
-            if not row:
-                return None
-            job = self._row_to_job(row)
-            conn.execute("UPDATE jobs SET status = 'running' WHERE id = ?", (job.id,))
-            job.status = "running"
-            return job
+        jobs = self.dequeue_many(1)
+        return jobs[0] if jobs else None
 
-    def get_job(self, job_id: str) -> Optional[Job]:
-        with self._connect() as conn:
-            row = conn.execute(
+    def dequeue_many(self, limit: int) -> List[Job]:
+        """Atomically claim up to ``limit`` ready jobs, highest priority and oldest first."""
+        if limit <= 0:
+            return []
+        now = time.time()
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # jobs whose worker stopped heartbeating go back to the queue
+                conn.execute(
+                    """
+                    UPDATE jobs SET status = 'queued', lease_owner = NULL, lease_expires_at = NULL
+                    WHERE status = 'running' AND lease_expires_at < ?
+                    """,
+                    (now,),
+                )
+                ids = [
+                    row[0]
+                    for row in conn.execute(
+                        """
+                        SELECT id FROM jobs
+                        WHERE status = 'queued' AND run_at <= ?
+                        ORDER BY priority DESC, created_at ASC
+                        LIMIT ?
+                        """,
+                        (now, limit),
+                    )
+                ]
+                if not ids:
+                    conn.execute("COMMIT")
+                    return []
+                placeholders = ",".join("?" for _ in ids)
+                conn.execute(
+                    f"""
+                    UPDATE jobs
+                    SET status = 'running', lease_owner = ?, lease_expires_at = ?, attempts = attempts + 1
+                    WHERE id IN ({placeholders})
+                    """,
+                    (self.owner, now + self.visibility_timeout, *ids),
+                )
+                rows = conn.execute(f"SELECT {_COLUMNS} FROM jobs WHERE id IN ({placeholders})", ids).fetchall()
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        by_id = {row[0]: self._row_to_job(row) for row in rows}
+        return [by_id[job_id] for job_id in ids]
+
+    def heartbeat(self, job: Job) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
                 """
-                SELECT id, type, target, payload, status, result, error, created_at
-                FROM jobs WHERE id = ?
+                UPDATE jobs SET lease_expires_at = ?
+                WHERE id = ? AND status = 'running' AND lease_owner = ?
                 """,
-                (job_id,),
-            ).fetchone()
+                (time.time() + self.visibility_timeout, job.id, self.owner),
+            )
+        return cursor.rowcount > 0
+
+    def change_token(self) -> int:
+        """Changes whenever another connection (or process) commits to the database."""
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
         if not row:
             return None
         return self._row_to_job(row)
 
     def list_jobs(self) -> List[Job]:
-        with self._connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT id, type, target, payload, status, result, error, created_at
-                FROM jobs
-                """
-            ).fetchall()
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {_COLUMNS} FROM jobs").fetchall()
         return [self._row_to_job(row) for row in rows]
 
-    def update_job(self, job: Job) -> None:
-        with self._connect() as conn:
-            conn.execute(
+    def update_job(self, job: Job) -> bool:
+        """
+        Record the outcome of a job this store claimed. Returns False without
+        writing when the claim was lost, so a worker whose lease expired cannot
+        overwrite the run of whoever claimed the job next.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
                 """
                 UPDATE jobs
-                SET status = ?, result = ?, error = ?
-                WHERE id = ?
+                SET status = ?, result = ?, error = ?, lease_owner = NULL, lease_expires_at = NULL
+                WHERE id = ? AND lease_owner = ?
                 """,
-                (job.status, json.dumps(job.result), job.error, job.id),
+                (job.status, json.dumps(job.result), job.error, job.id, self.owner),
             )
+        return cursor.rowcount > 0
 
-    def _row_to_job(self, row: tuple) -> Job:
-        id_, type_, target, payload_json, status, result_json, error, _created_at = row
+    def _row_to_job(self, row: Sequence) -> Job:
+        id_, type_, target, payload_json, status, result_json, error, _created_at, priority, run_at, attempts = row
         payload = json.loads(payload_json) if payload_json else {}
         result = json.loads(result_json) if result_json else None
         return Job(
@@ -122,4 +219,7 @@ class SQLiteJobStore(JobStore):
             status=status,
             result=result,
             error=error,
+            priority=priority or 0,
+            run_at=run_at or None,
+            attempts=attempts or 0,
         )
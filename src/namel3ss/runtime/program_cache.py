@@ -0,0 +1,114 @@
+"""
+Compiled-program cache for the run endpoints.
+
+Sources are keyed by their sha256 so a program submitted again skips the
+lexer/parser/macro/IR pipeline. Only the compiled program is shared: every run
+gets a freshly built engine, because engines hold per-run state (memory-frame
+rows, memory and RAG stores, conversation history) that must not carry over
+from one request, job or principal to the next.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from hashlib import sha256
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from ..ir import IRProgram
+
+DEFAULT_MAX_PROGRAMS = 64
+
+
+def program_hash(source: str) -> str:
+    return sha256(source.encode("utf-8")).hexdigest()
+
+
+class ProgramCache:
+    def __init__(
+        self,
+        compile_fn: Callable[[str], IRProgram],
+        engine_factory: Callable[[IRProgram], Any],
+        max_programs: int = DEFAULT_MAX_PROGRAMS,
+    ) -> None:
+        self.compile_fn = compile_fn
+        self.engine_factory = engine_factory
+        self.max_programs = max(1, max_programs)
+        self._programs: "OrderedDict[str, IRProgram]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.compile_seconds = 0.0
+        self.engine_builds = 0
+        self.engine_build_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._programs)
+
+    def program(self, source: str) -> tuple[str, IRProgram]:
+        """Return ``(hash, program)``, compiling only on a miss. Compile errors are not cached."""
+        key = program_hash(source)
+        with self._lock:
+            cached = self._programs.get(key)
+            if cached is not None:
+                self._programs.move_to_end(key)
+                self.hits += 1
+                return key, cached
+        started = time.perf_counter()
+        compiled = self.compile_fn(source)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.misses += 1
+            self.compile_seconds += elapsed
+            # another request may have compiled the same source meanwhile; keep the first
+            existing = self._programs.get(key)
+            if existing is not None:
+                return key, existing
+            self._programs[key] = compiled
+            while len(self._programs) > self.max_programs:
+                self._programs.popitem(last=False)
+                self.evictions += 1
+        return key, compiled
+
+    def _build(self, program: IRProgram) -> Any:
+        started = time.perf_counter()
+        engine = self.engine_factory(program)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.engine_builds += 1
+            self.engine_build_seconds += elapsed
+        return engine
+
+    @contextmanager
+    def engine(self, source: str) -> Iterator[Any]:
+        """A new engine for ``source``, built from the cached program, for the duration of the block."""
+        _, program = self.program(source)
+        yield self._build(program)
+
+    def invalidate(self, source: Optional[str] = None) -> None:
+        with self._lock:
+            if source is None:
+                self._programs.clear()
+                return
+            self._programs.pop(program_hash(source), None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "programs": len(self._programs),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "compile_seconds_total": self.compile_seconds,
+                "compile_seconds_avg": self.compile_seconds / self.misses if self.misses else 0.0,
+                "engine_builds": self.engine_builds,
+                "engine_build_seconds_total": self.engine_build_seconds,
+            }
+
+
+__all__ = ["ProgramCache", "program_hash"]
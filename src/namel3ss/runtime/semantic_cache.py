@@ -0,0 +1,313 @@
+"""
+Semantic response cache for AI calls.
+
+Exact provider-cache keys miss as soon as a prompt is rephrased. AI calls
+that opt in with a ``semantic_cache:`` block also look up earlier prompts by
+embedding similarity: the final user message is embedded and compared
+against prompts answered before in the same scope, and the stored answer is
+reused when the cosine similarity reaches the threshold.
+
+A scope is one AI call's (name, provider, model, embedding model, system
+prompt, earlier messages), so answers never cross AIs, models, system prompts
+or conversation histories. Each AI also carries a fingerprint of its
+definition, and scopes are keyed by it too, so an AI whose definition
+changed, or a same-named AI in another program, never sees those answers;
+the stale scopes age out through the LRU.
+Entries expire after their TTL and each scope keeps at most ``max_entries``
+answers, evicting the least recently used. Since every conversation turn of
+an AI with memory is a new scope, the whole cache also keeps at most
+``max_total_entries`` answers, evicting from the least recently used scopes,
+and expired entries and empty scopes are swept every ``sweep_interval``
+seconds.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from hashlib import sha256
+from math import sqrt
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..observability.metrics import MetricsRegistry, default_metrics
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - fallback
+    np = None
+
+__all__ = [
+    "SemanticResponseCache",
+    "get_default_semantic_cache",
+    "reset_default_semantic_cache",
+    "semantic_cache_enabled",
+    "semantic_scope_key",
+    "ai_call_fingerprint",
+]
+
+DEFAULT_THRESHOLD = 0.92
+DEFAULT_TTL_SECONDS = 3600.0
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_MAX_TOTAL_ENTRIES = 10000
+DEFAULT_SWEEP_SECONDS = 60.0
+# below this many entries a plain loop beats building a matrix
+_MATRIX_MIN_ENTRIES = 64
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def semantic_cache_enabled() -> bool:
+    return os.getenv("N3_SEMANTIC_CACHE_ENABLED", "1").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _digest(value: Any) -> str:
+    return sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def semantic_scope_key(
+    ai_name: str,
+    provider: str | None,
+    model: str | None,
+    embedding_model: str | None,
+    messages: Sequence[dict],
+) -> str:
+    """Scope for ``messages``: everything but the final user message must match exactly."""
+    system = [msg.get("content") for msg in messages[:-1] if msg.get("role") == "system"]
+    context = [msg for msg in messages[:-1] if msg.get("role") != "system"]
+    return _digest(
+        {
+            "ai": ai_name,
+            "provider": provider or "unknown",
+            "model": model or "unknown",
+            "embedding_model": embedding_model or "auto",
+            "system": system,
+            "context": context,
+        }
+    )
+
+
+def ai_call_fingerprint(ai_call: Any) -> str:
+    """Hash of the parts of an AI definition that shape its answers."""
+    return _digest(
+        {
+            field: getattr(ai_call, field, None)
+            for field in ("model_name", "provider", "system_prompt", "description", "tools", "memory", "semantic_cache")
+        }
+    )
+
+
+class _Entry:
+    __slots__ = ("prompt", "vector", "payload", "expires_at")
+
+    def __init__(self, prompt: str, vector: array, payload: Any, expires_at: float | None) -> None:
+        self.prompt = prompt
+        self.vector = vector
+        self.payload = payload
+        self.expires_at = expires_at
+
+
+class _Scope:
+    __slots__ = ("entries", "matrix", "matrix_ids", "next_id")
+
+    def __init__(self) -> None:
+        self.entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self.matrix: Any = None
+        self.matrix_ids: List[int] = []
+        self.next_id = 0
+
+
+def _normalize(vector: Sequence[float]) -> array | None:
+    norm = sqrt(sum(x * x for x in vector))
+    if norm == 0:
+        return None
+    return array("d", (x / norm for x in vector))
+
+
+class SemanticResponseCache:
+    """In-process nearest-prompt index per scope; see the module docstring."""
+
+    def __init__(
+        self,
+        embedding_router: Any = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        metrics: Optional[MetricsRegistry] = None,
+        max_total_entries: int = DEFAULT_MAX_TOTAL_ENTRIES,
+        sweep_interval: float = DEFAULT_SWEEP_SECONDS,
+    ) -> None:
+        self._router = embedding_router
+        self.max_entries = max(1, int(max_entries))
+        self.max_total_entries = max(1, int(max_total_entries))
+        self.sweep_interval = sweep_interval
+        self.metrics = metrics or default_metrics
+        self._lock = threading.Lock()
+        # (ai name, fingerprint, scope key) -> scope, least recently used first
+        self._scopes: "OrderedDict[Tuple[str, str, str], _Scope]" = OrderedDict()
+        self._entries = 0
+        self._next_sweep = 0.0
+
+    def embed(self, text: str, model: str | None = None) -> array | None:
+        if self._router is None:
+            from ..ai.embedding_router import EmbeddingRouter
+
+            self._router = EmbeddingRouter()
+        vectors = self._router.embed([text], model=model).vectors
+        return _normalize(vectors[0]) if vectors else None
+
+    def _scope(self, ai_name: str, fingerprint: str, scope_key: str, create: bool) -> _Scope | None:
+        key = (ai_name, fingerprint, scope_key)
+        scope = self._scopes.get(key)
+        if scope is not None:
+            self._scopes.move_to_end(key)
+        elif create:
+            scope = self._scopes[key] = _Scope()
+        return scope
+
+    def _drop_ai(self, ai_name: str) -> None:
+        for key in [k for k in self._scopes if k[0] == ai_name]:
+            self._entries -= len(self._scopes.pop(key).entries)
+
+    def _expire(self, scope: _Scope, now: float) -> None:
+        expired = [i for i, e in scope.entries.items() if e.expires_at is not None and e.expires_at <= now]
+        for entry_id in expired:
+            del scope.entries[entry_id]
+        if expired:
+            self._entries -= len(expired)
+            scope.matrix = None
+
+    def _sweep(self, now: float) -> None:
+        """Drop expired entries in every scope, and the scopes left empty."""
+        for key in list(self._scopes):
+            scope = self._scopes[key]
+            self._expire(scope, now)
+            if not scope.entries:
+                del self._scopes[key]
+        self._next_sweep = now + self.sweep_interval
+
+    def _evict(self) -> None:
+        """Trim the least recently used scopes until the cache is back under ``max_total_entries``."""
+        while self._entries > self.max_total_entries and self._scopes:
+            key, scope = next(iter(self._scopes.items()))
+            if scope.entries:
+                scope.entries.popitem(last=False)
+                scope.matrix = None
+                self._entries -= 1
+            if not scope.entries:
+                del self._scopes[key]
+
+    @staticmethod
+    def _best(scope: _Scope, vector: array, now: float) -> Tuple[int | None, float]:
+        if np is not None and len(scope.entries) >= _MATRIX_MIN_ENTRIES:
+            if scope.matrix is None:
+                scope.matrix_ids = list(scope.entries.keys())
+                scope.matrix = np.vstack([np.frombuffer(scope.entries[i].vector, dtype=np.float64) for i in scope.matrix_ids])
+            scores = scope.matrix @ np.frombuffer(vector, dtype=np.float64)
+            for idx in np.argsort(-scores):
+                entry = scope.entries.get(scope.matrix_ids[idx])
+                if entry is not None and (entry.expires_at is None or entry.expires_at > now):
+                    return scope.matrix_ids[idx], float(scores[idx])
+            return None, 0.0
+        best_id, best_score = None, -1.0
+        for entry_id, entry in scope.entries.items():
+            if entry.expires_at is not None and entry.expires_at <= now:
+                continue
+            score = sum(x * y for x, y in zip(vector, entry.vector))
+            if score > best_score:
+                best_id, best_score = entry_id, score
+        return best_id, best_score
+
+    def lookup(
+        self, ai_name: str, fingerprint: str, scope_key: str, vector: array, threshold: float = DEFAULT_THRESHOLD
+    ) -> Tuple[Any, float] | None:
+        """Return ``(payload, similarity)`` of the closest live prompt at or above ``threshold``."""
+        with self._lock:
+            scope = self._scope(ai_name, fingerprint, scope_key, create=False)
+            match = None
+            if scope is not None and scope.entries:
+                entry_id, score = self._best(scope, vector, time.time())
+                if entry_id is not None and score >= threshold:
+                    scope.entries.move_to_end(entry_id)
+                    match = (scope.entries[entry_id].payload, score)
+        try:
+            self.metrics.record_semantic_cache(ai_name, hit=match is not None)
+        except Exception:
+            pass
+        return match
+
+    def store(
+        self,
+        ai_name: str,
+        fingerprint: str,
+        scope_key: str,
+        prompt: str,
+        vector: array,
+        payload: Any,
+        ttl: float | None = DEFAULT_TTL_SECONDS,
+        max_entries: int | None = None,
+    ) -> None:
+        limit = max(1, int(max_entries or self.max_entries))
+        now = time.time()
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+            scope = self._scope(ai_name, fingerprint, scope_key, create=True)
+            self._expire(scope, now)
+            while len(scope.entries) >= limit:
+                scope.entries.popitem(last=False)
+                self._entries -= 1
+            scope.entries[scope.next_id] = _Entry(prompt, vector, payload, now + ttl if ttl and ttl > 0 else None)
+            scope.next_id += 1
+            scope.matrix = None
+            self._entries += 1
+            self._evict()
+
+    def invalidate(self, ai_name: str | None = None) -> None:
+        with self._lock:
+            if ai_name is None:
+                self._scopes.clear()
+                self._entries = 0
+            else:
+                self._drop_ai(ai_name)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"scopes": len(self._scopes), "entries": self._entries}
+
+
+_default_cache: SemanticResponseCache | None = None
+_default_lock = threading.Lock()
+
+
+def get_default_semantic_cache() -> SemanticResponseCache:
+    """Process-wide cache; ``N3_SEMANTIC_CACHE_MAX_ENTRIES`` bounds each scope and
+    ``N3_SEMANTIC_CACHE_MAX_TOTAL_ENTRIES`` the whole cache."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = SemanticResponseCache(
+                max_entries=int(_env_float("N3_SEMANTIC_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+                max_total_entries=int(_env_float("N3_SEMANTIC_CACHE_MAX_TOTAL_ENTRIES", DEFAULT_MAX_TOTAL_ENTRIES)),
+            )
+        return _default_cache
+
+
+def reset_default_semantic_cache() -> None:
+    global _default_cache
+    with _default_lock:
+        _default_cache = None
+
+
+def default_threshold() -> float:
+    return _env_float("N3_SEMANTIC_CACHE_THRESHOLD", DEFAULT_THRESHOLD)
+
+
+def default_ttl_seconds() -> float:
+    return _env_float("N3_SEMANTIC_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)
@@ -0,0 +1,168 @@
+"""
+In-flight request coalescing ("single flight").
+
+Concurrent callers that ask for the same key share one upstream call: the
+first caller runs it and the rest wait for its result (or exception). Keys
+are the ones ``build_provider_cache_key`` produces, so a request that would
+hit the provider cache once it finishes is also shared while it is running.
+Nothing is kept after the call completes; that is the provider cache's job.
+
+``do`` serves blocking callers (worker threads), ``ado`` coroutines, and
+``astream`` fans one upstream async stream out to every consumer, replaying
+chunks a late joiner missed. The upstream stream is cancelled once its last
+consumer goes away, so nobody pays for tokens no one reads. Set ``N3_SINGLE_FLIGHT_ENABLED=0`` to turn
+coalescing off.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from ..observability.metrics import MetricsRegistry, default_metrics
+
+__all__ = ["SingleFlight", "default_single_flight", "single_flight_enabled"]
+
+
+def single_flight_enabled() -> bool:
+    return os.getenv("N3_SINGLE_FLIGHT_ENABLED", "1").strip().lower() in {"1", "true", "yes", "on"}
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class _StreamFlight:
+    __slots__ = ("items", "done", "error", "changed", "task", "consumers")
+
+    def __init__(self) -> None:
+        self.consumers = 0
+        self.items: List[Any] = []
+        self.done = False
+        self.error: BaseException | None = None
+        self.changed = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    def notify(self) -> None:
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+
+class SingleFlight:
+    """Coalesces concurrent identical calls; see the module docstring."""
+
+    def __init__(self, metrics: Optional[MetricsRegistry] = None) -> None:
+        self.metrics = metrics or default_metrics
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        # asyncio futures and streams belong to one event loop each
+        self._tasks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._streams: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, _StreamFlight]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _record(self, kind: str, name: str) -> None:
+        try:
+            self.metrics.record_coalesced_call(kind, name)
+        except Exception:
+            pass
+
+    def in_flight(self) -> int:
+        return len(self._calls) + sum(len(tasks) for tasks in list(self._tasks.values()))
+
+    def do(self, key: str, fn: Callable[[], Any], kind: str = "ai", name: str = "") -> Any:
+        """Run ``fn`` unless an identical call is already running; then wait for that one."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            self._record(kind, name)
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    async def ado(self, key: str, factory: Callable[[], Awaitable[Any]], kind: str = "ai", name: str = "") -> Any:
+        """Async ``do``: the upstream call runs as its own task, so one caller's cancellation does not fail the rest."""
+        tasks = self._tasks.setdefault(asyncio.get_running_loop(), {})
+        task = tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            tasks[key] = task
+            task.add_done_callback(lambda done: tasks.pop(key, None) if tasks.get(key) is done else None)
+        else:
+            self._record(kind, name)
+        return await asyncio.shield(task)
+
+    async def astream(
+        self, key: str, factory: Callable[[], AsyncIterator[Any]], kind: str = "ai", name: str = ""
+    ) -> AsyncIterator[Any]:
+        """Yield the items of one shared upstream stream; consumers joining late get the earlier items first."""
+        flights = self._streams.setdefault(asyncio.get_running_loop(), {})
+        flight = flights.get(key)
+        if flight is None:
+            flight = flights[key] = _StreamFlight()
+            flight.task = asyncio.ensure_future(self._pump(key, flights, flight, factory))
+        else:
+            self._record(kind, name)
+        flight.consumers += 1
+        index = 0
+        try:
+            while True:
+                while index < len(flight.items):
+                    yield flight.items[index]
+                    index += 1
+                if flight.done:
+                    if flight.error is not None:
+                        raise flight.error
+                    return
+                await flight.changed.wait()
+        finally:
+            flight.consumers -= 1
+            if flight.consumers == 0 and not flight.done:
+                # every consumer left early: stop the upstream stream; later callers open a new one
+                if flights.get(key) is flight:
+                    del flights[key]
+                if flight.task is not None:
+                    flight.task.cancel()
+
+    @staticmethod
+    async def _pump(
+        key: str, flights: Dict[str, _StreamFlight], flight: _StreamFlight, factory: Callable[[], AsyncIterator[Any]]
+    ) -> None:
+        try:
+            async for item in factory():
+                flight.items.append(item)
+                flight.notify()
+        except BaseException as exc:  # handed to every consumer
+            flight.error = exc
+        finally:
+            flight.done = True
+            if flights.get(key) is flight:
+                del flights[key]
+            flight.notify()
+
+
+default_single_flight = SingleFlight()
@@ -0,0 +1,361 @@
+"""
+SQLite storage for frames declared with ``backend is "sqlite"``.
+
+Each frame is one table of JSON documents kept in insertion order (``_pos``).
+Record filters (``eq``/``neq``/ranges/``in``/null checks), ordering and
+pagination are translated into SQL over ``json_extract`` expressions, and the
+fields ``FrameRegistry.ensure_index`` is asked for become expression indexes,
+so key lookups do not scan the table. Results are decoded batch by batch while
+a cursor is iterated instead of loading the table.
+
+Conditions that cannot be expressed in SQL (non-scalar values, unknown
+operators) narrow the query with the parts that can, and the caller's
+predicate checks the rest. Ordering is only pushed down while the sort fields
+hold JSON scalars: decimals, dates and datetimes are stored as tagged objects
+whose JSON text does not sort like the values, so those rows are sorted in
+Python. Comparisons between values of different types
+follow SQLite's ordering instead of raising, as the in-memory filters do.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
+
+from ..errors import Namel3ssError
+
+__all__ = ["SQLiteFrameDatabase", "SQLiteFrameTable", "SQLiteRow", "compile_conditions"]
+
+_FETCH_BATCH = 256
+# SQLITE_MAX_VARIABLE_NUMBER is 999 on older builds
+_MAX_PARAMS = 900
+_RANGE_OPS = {"gt": ">", "lt": "<", "ge": ">=", "le": "<="}
+
+
+class SQLiteRow(dict):
+    """A decoded row; ``rowid`` locates it for updates and deletes."""
+
+    __slots__ = ("rowid",)
+
+    def __init__(self, rowid: int, data: dict) -> None:
+        super().__init__(data)
+        self.rowid = rowid
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"$decimal": str(value)}
+    if isinstance(value, (tuple, set, frozenset)):
+        return list(value)
+    raise TypeError(f"values of type {type(value).__name__} cannot be stored")
+
+
+_DECODERS: dict[str, Callable[[str], Any]] = {
+    "$datetime": datetime.fromisoformat,
+    "$date": date.fromisoformat,
+    "$decimal": Decimal,
+}
+
+
+def _decode_object(obj: dict) -> Any:
+    if len(obj) == 1:
+        key, value = next(iter(obj.items()))
+        decoder = _DECODERS.get(key)
+        if decoder is not None and isinstance(value, str):
+            return decoder(value)
+    return obj
+
+
+def encode_row(row: dict) -> str:
+    return json.dumps(row, default=_encode_value, separators=(",", ":"))
+
+
+def decode_row(data: str) -> dict:
+    return json.loads(data, object_hook=_decode_object)
+
+
+def field_expr(field: Any) -> Optional[str]:
+    """The SQL expression for ``field``; indexes only apply to this exact text."""
+    if not isinstance(field, str) or not field or '"' in field or "'" in field:
+        return None
+    return f"json_extract(data, '$.\"{field}\"')"
+
+
+def _is_sql_scalar(value: Any) -> bool:
+    if value is None or isinstance(value, (str, float)):
+        return True
+    return isinstance(value, int) and -(2**63) <= value < 2**63
+
+
+def _combine(parts: list[tuple[Optional[str], list, bool]], joiner: str) -> tuple[Optional[str], list, bool]:
+    sql = [part for part, _params, _exact in parts if part is not None]
+    params = [param for part, part_params, _exact in parts if part is not None for param in part_params]
+    exact = all(part_exact for _part, _params, part_exact in parts)
+    if not sql:
+        return None, [], exact
+    return "(" + f" {joiner} ".join(sql) + ")", params, exact
+
+
+def _compile_leaf(node: dict) -> tuple[Optional[str], list, bool]:
+    column = field_expr(node.get("field"))
+    op, value = node.get("op"), node.get("value")
+    if column is None:
+        return None, [], False
+    if op in {"is_null", "is_not_null"}:
+        # json_extract is NULL both for a missing field and for a JSON null
+        return f"{column} IS {'NOT ' if op == 'is_not_null' else ''}NULL", [], True
+    if op == "in":
+        if not isinstance(value, (list, tuple, set)):
+            return None, [], False
+        values = list(value)
+        if not all(_is_sql_scalar(item) for item in values) or len(values) > _MAX_PARAMS:
+            return None, [], False
+        present = [item for item in values if item is not None]
+        checks = []
+        if present:
+            checks.append(f"{column} IN ({', '.join('?' * len(present))})")
+        if len(present) != len(values):
+            checks.append(f"{column} IS NULL")
+        return ("(" + " OR ".join(checks) + ")") if checks else "0", present, True
+    if not _is_sql_scalar(value):
+        return None, [], False
+    if op == "eq":
+        return f"{column} IS ?", [value], True
+    if op == "neq":
+        return f"{column} IS NOT ?", [value], True
+    if op in _RANGE_OPS and value is not None:
+        return f"{column} {_RANGE_OPS[op]} ?", [value], True
+    return None, [], False
+
+
+def _compile_node(node: Any) -> tuple[Optional[str], list, bool]:
+    if node is None:
+        return None, [], True
+    if isinstance(node, list):
+        return _combine([_compile_node(child) for child in node], "AND")
+    if not isinstance(node, dict):
+        return None, [], False
+    ntype = node.get("type")
+    if ntype in {"and", "or"}:
+        children = [node.get("left"), node.get("right")]
+    elif ntype in {"all", "any"}:
+        children = list(node.get("children") or [])
+    else:
+        return _compile_leaf(node)
+    parts = [_compile_node(child) for child in children]
+    if ntype in {"and", "all"}:
+        return _combine(parts, "AND")
+    if not parts:
+        return "0", [], True
+    if any(sql is None for sql, _params, _exact in parts):
+        # one side is unrestricted, so the disjunction is too
+        return None, [], all(exact for _sql, _params, exact in parts)
+    return _combine(parts, "OR")
+
+
+def compile_conditions(conditions: Sequence[Any]) -> tuple[Optional[str], list, bool]:
+    """
+    Translate normalized frame conditions into ``(where_sql, params, exact)``.
+
+    ``where_sql`` is None when nothing can be pushed down. When ``exact`` is
+    False the SQL only narrows the rows and the full conditions must still be
+    checked.
+    """
+    return _compile_node(list(conditions))
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class SQLiteFrameDatabase:
+    """One SQLite file (WAL mode) shared by every frame stored in it."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30.0)
+        if path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> sqlite3.Cursor:
+        with self.lock:
+            return self.conn.execute(sql, params)
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+
+class SQLiteFrameTable:
+    def __init__(self, db: SQLiteFrameDatabase, table: str, frame_name: str) -> None:
+        self.db = db
+        self.table = table
+        self.frame_name = frame_name
+        self._quoted = _quote(table)
+        self._indexed: set[str] = set()
+        db.execute(
+            f"CREATE TABLE IF NOT EXISTS {self._quoted} (_pos INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL)"
+        )
+
+    def ensure_index(self, field: str) -> None:
+        column = field_expr(field)
+        if column is None or field in self._indexed:
+            return
+        index_name = _quote(f"{self.table}__{field}")
+        self.db.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {self._quoted} ({column})")
+        self._indexed.add(field)
+
+    def _encode(self, row: dict) -> str:
+        try:
+            return encode_row(row)
+        except (TypeError, ValueError) as exc:
+            raise Namel3ssError(f"I can't store this row in SQLite frame '{self.frame_name}': {exc}.") from exc
+
+    # -- writes ----------------------------------------------------------------
+
+    def insert(self, row: dict) -> int:
+        return int(self.db.execute(f"INSERT INTO {self._quoted} (data) VALUES (?)", (self._encode(row),)).lastrowid)
+
+    def write(self, rowid: int, row: dict) -> None:
+        self.db.execute(f"UPDATE {self._quoted} SET data = ? WHERE _pos = ?", (self._encode(row), rowid))
+
+    def remove(self, rowids: Iterable[int]) -> int:
+        ids = list(rowids)
+        removed = 0
+        for start in range(0, len(ids), _MAX_PARAMS):
+            chunk = ids[start : start + _MAX_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            removed += self.db.execute(f"DELETE FROM {self._quoted} WHERE _pos IN ({placeholders})", chunk).rowcount
+        return removed
+
+    def reinsert(self, rows: Iterable[tuple[int, dict]]) -> None:
+        """Put deleted rows back at their original positions."""
+        with self.db.lock:
+            self.db.conn.executemany(
+                f"INSERT INTO {self._quoted} (_pos, data) VALUES (?, ?)",
+                [(rowid, self._encode(row)) for rowid, row in rows],
+            )
+
+    def delete(
+        self,
+        conditions: Sequence[Any],
+        matches: Callable[[dict], bool],
+        *,
+        keep_rows: bool = False,
+    ) -> tuple[int, list[tuple[int, dict]]]:
+        """Delete matching rows; the removed ``(rowid, row)`` pairs are returned when ``keep_rows`` is set."""
+        where, params, exact = compile_conditions(conditions)
+        if exact and not keep_rows:
+            clause = f" WHERE {where}" if where else ""
+            return self.db.execute(f"DELETE FROM {self._quoted}{clause}", params).rowcount, []
+        doomed = [(row.rowid, dict(row)) for row in self._stream(where, params) if exact or matches(row)]
+        return self.remove(rowid for rowid, _row in doomed), doomed
+
+    # -- reads -----------------------------------------------------------------
+
+    def _stream(
+        self,
+        where: Optional[str],
+        params: Sequence[Any],
+        order: str = "_pos",
+        page: str = "",
+    ) -> Iterator[SQLiteRow]:
+        clause = f" WHERE {where}" if where else ""
+        with self.db.lock:
+            cursor = self.db.conn.execute(f"SELECT _pos, data FROM {self._quoted}{clause} ORDER BY {order}{page}", params)
+        while True:
+            with self.db.lock:
+                batch = cursor.fetchmany(_FETCH_BATCH)
+            if not batch:
+                return
+            for rowid, data in batch:
+                yield SQLiteRow(rowid, decode_row(data))
+
+    def rows(
+        self,
+        conditions: Sequence[Any] = (),
+        matches: Callable[[dict], bool] | None = None,
+        *,
+        order_by: Sequence[tuple[str, bool]] = (),
+        offset: int = 0,
+        limit: int | None = None,
+        label: str | None = None,
+    ) -> Iterator[SQLiteRow]:
+        """
+        Stream rows matching ``conditions`` ordered by ``(field, descending)``
+        pairs, then by insertion order. ``matches`` checks whatever part of
+        the conditions SQL could not.
+        """
+        where, params, exact = compile_conditions(conditions)
+        stream: Iterable[SQLiteRow]
+        if order_by and exact and all(self._sql_sortable(field, where, params, label) for field, _desc in order_by):
+            order = "".join(f"{field_expr(field)} {'DESC' if desc else 'ASC'}, " for field, desc in order_by) + "_pos"
+            page = ""
+            if limit is not None or offset:
+                page = f" LIMIT {-1 if limit is None else int(limit)} OFFSET {int(offset)}"
+            return self._stream(where, params, order, page)
+        if order_by:
+            stream = self._sort_in_python(where, params, exact, matches, order_by, label)
+        else:
+            stream = self._stream(where, params)
+            if matches is not None:
+                stream = (row for row in stream if matches(row))
+        stop = None if limit is None else offset + limit
+        return islice(stream, offset, stop)
+
+    def _sql_sortable(self, field: str, where: Optional[str], params: Sequence[Any], label: str | None) -> bool:
+        """
+        Whether SQL can order the matching rows by ``field``: False when a value
+        is an object or array (tagged decimals and dates included). Raises when
+        a row lacks the field.
+        """
+        if field_expr(field) is None:
+            return False
+        # json_type is NULL only when the field is absent (a JSON null gives 'null')
+        kind = f"json_type(data, '$.\"{field}\"')"
+        condition = f"({kind} IS NULL OR {kind} IN ('object', 'array'))"
+        clause = f"({where}) AND {condition}" if where else condition
+        found = self.db.execute(f"SELECT {kind} IS NULL FROM {self._quoted} WHERE {clause} LIMIT 1", params).fetchone()
+        if found is None:
+            return True
+        if found[0]:
+            self._missing_field(field, label)
+        return False
+
+    def _missing_field(self, field: str, label: str | None) -> None:
+        raise Namel3ssError(
+            f"I can't sort {label or self.frame_name} by {field} because some rows don't have that field."
+        )
+
+    def _sort_in_python(
+        self,
+        where: Optional[str],
+        params: Sequence[Any],
+        exact: bool,
+        matches: Callable[[dict], bool] | None,
+        order_by: Sequence[tuple[str, bool]],
+        label: str | None,
+    ) -> List[SQLiteRow]:
+        rows = [row for row in self._stream(where, params) if exact or matches is None or matches(row)]
+        for field, _desc in order_by:
+            if any(field not in row for row in rows):
+                self._missing_field(field, label)
+        try:
+            for field, desc in reversed(order_by):
+                rows.sort(key=lambda row, f=field: row[f], reverse=desc)
+        except TypeError as exc:
+            raise Namel3ssError(
+                f"I couldn't sort {label or self.frame_name} because the sort keys are not comparable: {exc}"
+            ) from exc
+        return rows
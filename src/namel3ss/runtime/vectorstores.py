@@ -7,6 +7,10 @@ from typing import Dict, List, Optional
 from ..errors import Namel3ssError
 from ..ir import IRProgram
 from ..rag.embedding_registry import EmbeddingProviderRegistry
+from ..rag.embeddings import embed_batch_cached
+from ..rag.models import RAGItem
+from ..rag.vectorstores.ivf import IVFVectorStore
+from ..rag.vectorstores.memory import InMemoryVectorStore, np
 from ..secrets.manager import SecretsManager, get_default_secrets_manager
 
 
@@ -28,7 +32,7 @@ class EmbeddingClient:
 
     def embed(self, model_name: str, texts: List[str]) -> List[List[float]]:
         # EmbeddingProviderRegistry handles provider/model resolution internally.
-        return self.registry.get_default_provider().embed_batch(texts, model=model_name)  # type: ignore[arg-type]
+        return embed_batch_cached(self.registry.get_default_provider(), texts, self.registry.embedding_cache, model=model_name)
 
 
 class VectorBackend:
@@ -38,6 +42,9 @@ class VectorBackend:
     def query(self, cfg: VectorStoreConfig, embedding: List[float], top_k: int) -> List[Dict]:
         raise NotImplementedError
 
+    def query_many(self, cfg: VectorStoreConfig, embeddings: List[List[float]], top_k: int) -> List[List[Dict]]:
+        return [self.query(cfg, embedding, top_k) for embedding in embeddings]
+
 
 class InMemoryVectorBackend(VectorBackend):
     def __init__(self) -> None:
@@ -55,15 +62,27 @@ class InMemoryVectorBackend(VectorBackend):
             bucket.append((str(id_), emb, meta))
 
     def query(self, cfg: VectorStoreConfig, embedding: List[float], top_k: int) -> List[Dict]:
+        return self.query_many(cfg, [embedding], top_k)[0]
+
+    def query_many(self, cfg: VectorStoreConfig, embeddings: List[List[float]], top_k: int) -> List[List[Dict]]:
         bucket = self._store.get(cfg.name, [])
         if not bucket:
-            return []
-        results = []
-        for id_, emb, meta in bucket:
-            score = self._cosine_similarity(embedding, emb)
-            results.append({"id": id_, "score": score, "metadata": meta})
-        results.sort(key=lambda r: r["score"], reverse=True)
-        return results[:top_k]
+            return [[] for _ in embeddings]
+        # Row norms are shared by every query in the batch.
+        norms = [math.sqrt(sum(x * x for x in emb)) if emb else 0.0 for _, emb, _ in bucket]
+        batches: List[List[Dict]] = []
+        for embedding in embeddings:
+            q_norm = math.sqrt(sum(x * x for x in embedding)) if embedding else 0.0
+            results = []
+            for (id_, emb, meta), norm in zip(bucket, norms):
+                if not embedding or not emb or q_norm == 0 or norm == 0:
+                    score = 0.0
+                else:
+                    score = sum(x * y for x, y in zip(embedding, emb)) / (q_norm * norm)
+                results.append({"id": id_, "score": score, "metadata": meta})
+            results.sort(key=lambda r: r["score"], reverse=True)
+            batches.append(results[:top_k])
+        return batches
 
     def _cosine_similarity(self, a: List[float], b: List[float]) -> float:
         if not a or not b:
@@ -76,6 +95,62 @@ class InMemoryVectorBackend(VectorBackend):
         return dot / (norm_a * norm_b)
 
 
+class RAGStoreBackend(VectorBackend):
+    """
+    Backend over the RAG vector stores; keeps one store per vector store name.
+
+    ``options.path`` points the store at an on-disk memory-mapped index so the
+    vectors survive restarts.
+    """
+
+    def __init__(self, approximate: bool = False) -> None:
+        self.approximate = approximate
+        self._stores: Dict[str, InMemoryVectorStore] = {}
+
+    def _store_for(self, cfg: VectorStoreConfig) -> InMemoryVectorStore:
+        store = self._stores.get(cfg.name)
+        if store is None:
+            options = cfg.options or {}
+            path = options.get("path")
+            if self.approximate:
+                nlist = options.get("nlist")
+                store = IVFVectorStore(
+                    nlist=int(nlist) if nlist is not None else None,
+                    nprobe=int(options.get("nprobe", 8)),
+                    train_threshold=int(options.get("train_threshold", 1024)),
+                    path=path,
+                )
+            else:
+                store = InMemoryVectorStore(use_matrix=True, path=path)
+            self._stores[cfg.name] = store
+        return store
+
+    def index(self, cfg: VectorStoreConfig, ids: List[str], embeddings: List[List[float]], metadata: List[dict] | None = None) -> None:
+        if len(ids) != len(embeddings):
+            raise Namel3ssError("Mismatched ids and embeddings length during index")
+        items = []
+        for idx, (id_, emb) in enumerate(zip(ids, embeddings)):
+            meta = {}
+            if metadata and idx < len(metadata):
+                meta = metadata[idx] or {}
+            items.append(RAGItem(id=str(id_), text="", metadata=meta, embedding=emb, source=cfg.name))
+        self._store_for(cfg).add_sync(items)
+
+    def query(self, cfg: VectorStoreConfig, embedding: List[float], top_k: int) -> List[Dict]:
+        return self.query_many(cfg, [embedding], top_k)[0]
+
+    def query_many(self, cfg: VectorStoreConfig, embeddings: List[List[float]], top_k: int) -> List[List[Dict]]:
+        store = self._stores.get(cfg.name)
+        if store is None:
+            if not (cfg.options or {}).get("path"):
+                return [[] for _ in embeddings]
+            store = self._store_for(cfg)
+        return [
+            [{"id": hit.item.id, "score": hit.score, "metadata": hit.item.metadata} for hit in hits]
+            for hits in store.search_many(embeddings, k=top_k)
+        ]
+
+
 class VectorStoreRegistry:
     def __init__(self, program: IRProgram, secrets: Optional[SecretsManager] = None) -> None:
         self.configs: Dict[str, VectorStoreConfig] = {}
@@ -94,6 +169,9 @@ class VectorStoreRegistry:
             "memory": InMemoryVectorBackend(),
             "default_vector": InMemoryVectorBackend(),
         }
+        if np is not None:
+            self.backends["ivf"] = RAGStoreBackend(approximate=True)
+            self._persistent_memory = RAGStoreBackend()
         self.secrets = secrets or get_default_secrets_manager()
         self.embedding_client = EmbeddingClient(secrets=self.secrets)
 
@@ -110,8 +188,12 @@ class VectorStoreRegistry:
             )
         if backend not in self.backends:
             raise Namel3ssError(
-                f"Vector store '{cfg.name}' uses backend '{backend}', which is not supported. Supported backends are: memory, pgvector, faiss.",
+                f"Vector store '{cfg.name}' uses backend '{backend}', which is not supported. Supported backends are: memory, pgvector, faiss, ivf.",
             )
+        if backend == "memory" and (cfg.options or {}).get("path"):
+            if np is None:
+                raise Namel3ssError(f"Vector store '{cfg.name}' sets 'path', which requires numpy to be installed")
+            return self._persistent_memory
         return self.backends[backend]
 
     def index_texts(self, store_name: str, ids: List[str], texts: List[str], metadata: List[dict] | None = None) -> None:
@@ -123,30 +205,39 @@ class VectorStoreRegistry:
         backend.index(cfg, ids, embeddings, metadata)
 
     def query(self, store_name: str, query_text: str, top_k: int = 5, frames=None) -> List[Dict]:
+        return self.query_many(store_name, [query_text], top_k=top_k, frames=frames)[0]
+
+    def query_many(self, store_name: str, query_texts: List[str], top_k: int = 5, frames=None) -> List[List[Dict]]:
+        """Embed all query texts in one batch and answer them with one backend call."""
+        if not query_texts:
+            return []
         cfg = self.get(store_name)
-        embedding = self.embedding_client.embed(cfg.embedding_model, [query_text])[0]
+        embeddings = self.embedding_client.embed(cfg.embedding_model, list(query_texts))
         backend = self.backend_for(cfg)
-        results = backend.query(cfg, embedding, top_k)
-        if frames is not None:
-            enriched: list[Dict] = []
-            for res in results:
-                text_val = res.get("text")
-                if text_val is None:
-                    lookup_id = res.get("id")
-                    candidates = [lookup_id]
+        batches = backend.query_many(cfg, embeddings, top_k)
+        if frames is None:
+            return batches
+        return [self._enrich(cfg, results, frames) for results in batches]
+
+    def _enrich(self, cfg: VectorStoreConfig, results: List[Dict], frames) -> List[Dict]:
+        enriched: list[Dict] = []
+        for res in results:
+            text_val = res.get("text")
+            if text_val is None:
+                lookup_id = res.get("id")
+                candidates = [lookup_id]
+                try:
+                    if isinstance(lookup_id, str) and lookup_id.isdigit():
+                        candidates.append(int(lookup_id))
+                except Exception:
+                    pass
+                for cand in candidates:
                     try:
-                        if isinstance(lookup_id, str) and lookup_id.isdigit():
-                            candidates.append(int(lookup_id))
+                        rows = frames.query(cfg.frame, {cfg.id_column: cand})
+                        if rows and isinstance(rows, list) and isinstance(rows[0], dict):
+                            text_val = rows[0].get(cfg.text_column)
+                            break
                     except Exception:
-                        pass
-                    for cand in candidates:
-                        try:
-                            rows = frames.query(cfg.frame, {cfg.id_column: cand})
-                            if rows and isinstance(rows, list) and isinstance(rows[0], dict):
-                                text_val = rows[0].get(cfg.text_column)
-                                break
-                        except Exception:
-                            continue
-                enriched.append({**res, "text": text_val})
-            return enriched
-        return results
+                        continue
+            enriched.append({**res, "text": text_val})
+        return enriched
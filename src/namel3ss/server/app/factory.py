@@ -38,6 +38,7 @@ from ...plugins.registry import PluginRegistry
 from ...plugins.versioning import CORE_VERSION
 from ...runtime.context import ExecutionContext
 from ...runtime.engine import Engine
+from ...runtime.program_cache import ProgramCache
 from ...secrets.manager import get_default_secrets_manager
 from ...server.schemas import NamingMigrationSummary
 from ...studio.ai_calls import describe_ai_call_context
@@ -123,6 +124,7 @@ class RoutingDeps:
     overlay_store: OverlayStore
     studio_static_dir: Path | None
     studio_config_files: tuple[str, ...]
+    program_cache: ProgramCache | None = None
 
 
 def create_app(project_root: Path | None = None, daemon_state: Any | None = None) -> FastAPI:
@@ -206,6 +208,16 @@ def create_app(project_root: Path | None = None, daemon_state: Any | None = None
             plugin_registry=plugin_registry,
         )
 
+    program_cache = ProgramCache(
+        compile_fn=lambda code: Engine._load_program(code, filename="<string>"),
+        engine_factory=lambda program: Engine(
+            program,
+            metrics_tracker=metrics_tracker,
+            trigger_manager=trigger_manager,
+            plugin_registry=plugin_registry,
+        ),
+    )
+
     def _build_plugin_engine(code: str = "") -> Engine:
         return Engine.from_source(
             code,
@@ -403,6 +415,7 @@ def create_app(project_root: Path | None = None, daemon_state: Any | None = None
         overlay_store=overlay_store,
         studio_static_dir=STUDIO_STATIC_DIR,
         studio_config_files=STUDIO_CONFIG_FILES,
+        program_cache=program_cache,
     )
 
     routing_deps.build_canvas_manifest_fn = build_canvas_manifest
@@ -138,6 +138,7 @@ def include_routers(app: FastAPI, deps: RoutingDeps) -> None:
         recent_agent_traces=deps.recent_agent_traces,
         resolve_example_path=resolve_example_path,
         get_examples_root=get_examples_root,
+        program_cache=deps.program_cache,
     )
     app.include_router(run_router)
 
@@ -181,7 +182,7 @@ def include_routers(app: FastAPI, deps: RoutingDeps) -> None:
     rag_router = build_rag_router(engine_factory=deps.build_engine_from_source)
     app.include_router(rag_router)
 
-    metrics_router = build_metrics_router(metrics_tracker=deps.metrics_tracker)
+    metrics_router = build_metrics_router(metrics_tracker=deps.metrics_tracker, program_cache=deps.program_cache)
     app.include_router(metrics_router)
 
     ui_router = build_ui_router(
@@ -211,6 +212,7 @@ def include_routers(app: FastAPI, deps: RoutingDeps) -> None:
         ),
         job_queue=global_job_queue,
         tracer=Tracer(),
+        runtime_cache=deps.program_cache,
     )
 
     jobs_router = build_jobs_router(scheduler=scheduler, worker=worker, job_queue=global_job_queue)
@@ -9,14 +9,17 @@ from fastapi import APIRouter, Depends, HTTPException
 from ..deps import Principal, Role, get_principal
 
 
-def build_metrics_router(metrics_tracker) -> APIRouter:
+def build_metrics_router(metrics_tracker, program_cache=None) -> APIRouter:
     router = APIRouter()
 
     @router.get("/api/metrics")
     def api_metrics(principal: Principal = Depends(get_principal)) -> Dict[str, Any]:
         if principal.role not in {Role.ADMIN, Role.DEVELOPER}:
             raise HTTPException(status_code=403, detail="Forbidden")
-        return {"metrics": metrics_tracker.snapshot()}
+        payload: Dict[str, Any] = {"metrics": metrics_tracker.snapshot()}
+        if program_cache is not None:
+            payload["program_cache"] = program_cache.stats()
+        return payload
 
     return router
 
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import time
+from contextlib import contextmanager
 from typing import Any, Callable, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -24,9 +25,23 @@ def build_run_router(
     recent_agent_traces: List[Dict[str, Any]],
     resolve_example_path,
     get_examples_root,
+    program_cache=None,
 ) -> APIRouter:
     router = APIRouter()
 
+    @contextmanager
+    def _engine_for(source: str):
+        if program_cache is not None:
+            with program_cache.engine(source) as engine:
+                yield engine
+            return
+        yield engine_cls.from_source(
+            source,
+            metrics_tracker=metrics_tracker,
+            trigger_manager=trigger_manager,
+            plugin_registry=plugin_registry,
+        )
+
     @router.post("/api/run-app")
     def api_run_app(
         payload: RunAppRequest, principal: Principal = Depends(get_principal)
@@ -35,15 +50,10 @@ def build_run_router(
             raise HTTPException(status_code=403, detail="Forbidden")
         try:
             started_at = time.time()
-            engine = engine_cls.from_source(
-                payload.source,
-                metrics_tracker=metrics_tracker,
-                trigger_manager=trigger_manager,
-                plugin_registry=plugin_registry,
-            )
-            result = engine.run_app(
-                payload.app_name, include_trace=True, principal_role=principal.role.value
-            )
+            with _engine_for(payload.source) as engine:
+                result = engine.run_app(
+                    payload.app_name, include_trace=True, principal_role=principal.role.value
+                )
             set_last_trace(result.get("trace"))
             duration = time.time() - started_at
             stored = store_trace(None, get_last_trace(), "completed", started_at, duration)
@@ -137,15 +147,10 @@ def build_run_router(
             raise HTTPException(status_code=403, detail="Forbidden")
         try:
             started_at = time.time()
-            engine = engine_cls.from_source(
-                payload.source,
-                metrics_tracker=metrics_tracker,
-                trigger_manager=trigger_manager,
-                plugin_registry=plugin_registry,
-            )
-            result = engine.execute_flow(
-                payload.flow, principal_role=principal.role.value
-            )
+            with _engine_for(payload.source) as engine:
+                result = engine.execute_flow(
+                    payload.flow, principal_role=principal.role.value
+                )
             set_last_trace(result.get("trace"))
             duration = time.time() - started_at
             stored = store_trace(payload.flow, get_last_trace(), "completed", started_at, duration)
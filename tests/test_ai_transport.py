@@ -0,0 +1,268 @@
+import asyncio
+import json
+import threading
+import time
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from namel3ss.ai import transport as transport_module
+from namel3ss.ai.providers.ollama import OllamaProvider
+from namel3ss.ai.providers.openai import OpenAIProvider
+from namel3ss.ai.transport import HttpTransport
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, content_type="application/json", chunked=False):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for piece in body:
+                self.wfile.write(f"{len(piece):x}\r\n".encode() + piece + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append((self.path, request))
+        if self.path == "/unauthorized":
+            self._send(401, b'{"error": "bad key"}')
+        elif self.path == "/slow":
+            with self.server.lock:
+                self.server.in_flight += 1
+                self.server.peak = max(self.server.peak, self.server.in_flight)
+            time.sleep(0.05)
+            with self.server.lock:
+                self.server.in_flight -= 1
+            self._send(200, json.dumps({"choices": [{"message": {"content": "ok"}}]}).encode())
+        elif self.path == "/api/chat" and request.get("stream"):
+            lines = [json.dumps({"message": {"content": word}, "done": word == "!"}).encode() + b"\n" for word in ("hi", " there", "!")]
+            self._send(200, lines, content_type="application/x-ndjson", chunked=True)
+        elif request.get("stream"):
+            events = [
+                b'data: {"choices": [{"delta": {"content": "Hel"}}]}\n\n',
+                b'data: {"choices": [{"delta": {"content": "lo"}, "finish_reason": "stop"}]}\n\n',
+                b"data: [DONE]\n\n",
+            ]
+            self._send(200, events, content_type="text/event-stream", chunked=True)
+        else:
+            text = request["messages"][-1]["content"] if "messages" in request else "ok"
+            self._send(200, json.dumps({"choices": [{"message": {"content": f"echo {text}"}}]}).encode())
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.requests = []
+    server.lock = threading.Lock()
+    server.in_flight = 0
+    server.peak = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_transport(monkeypatch):
+    monkeypatch.setattr(transport_module, "_transport", HttpTransport(http2=False))
+    yield
+    transport_module.reset_transport()
+
+
+def test_blocking_requests_reuse_one_connection(stub_server):
+    server, base = stub_server
+    transport = HttpTransport(http2=False)
+    for idx in range(5):
+        data = transport.post_json(f"{base}/v1/chat", {"messages": [{"content": str(idx)}]})
+        assert data["choices"][0]["message"]["content"] == f"echo {idx}"
+    assert server.connections == 1
+    events = list(transport.stream_json(f"{base}/v1/chat", {"stream": True}))
+    assert [e["choices"][0]["delta"]["content"] for e in events] == ["Hel", "lo"]
+    assert server.connections == 1
+    transport.close()
+
+
+def test_http_errors_match_urlopen(stub_server):
+    _, base = stub_server
+    transport = HttpTransport(http2=False)
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        transport.post_json(f"{base}/unauthorized", {})
+    assert exc.value.code == 401
+    assert json.loads(exc.value.read()) == {"error": "bad key"}
+
+    async def run():
+        try:
+            await transport.apost_json(f"{base}/unauthorized", {})
+        finally:
+            await transport.aclose()
+
+    with pytest.raises(urllib.error.HTTPError):
+        asyncio.run(run())
+    transport.close()
+
+
+def test_http2_is_opt_in_and_keeps_urllib_errors(stub_server, monkeypatch):
+    pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+    import socket
+
+    monkeypatch.delenv("N3_PROVIDER_HTTP2", raising=False)
+    assert not HttpTransport().http2
+    monkeypatch.setenv("N3_PROVIDER_HTTP2", "1")
+    transport = HttpTransport()
+    assert transport.http2
+    _, base = stub_server
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        closed = f"http://127.0.0.1:{sock.getsockname()[1]}/v1/chat"
+
+    async def run():
+        try:
+            events = [e async for e in transport.astream_json(f"{base}/v1/chat", {"stream": True})]
+            assert [e["choices"][0]["delta"]["content"] for e in events] == ["Hel", "lo"]
+            with pytest.raises(urllib.error.HTTPError):
+                await transport.apost_json(f"{base}/unauthorized", {})
+            with pytest.raises(urllib.error.URLError) as refused:
+                await transport.apost_json(closed, {})
+            assert not isinstance(refused.value, urllib.error.HTTPError)
+            with pytest.raises(urllib.error.URLError):
+                async for _ in transport.astream_json(closed, {"stream": True}):
+                    pass
+        finally:
+            await transport.aclose()
+
+    asyncio.run(run())
+
+
+def test_async_generate_and_stream_use_pooled_native_connections(stub_server):
+    server, base = stub_server
+    provider = OpenAIProvider(name="openai", api_key="k", base_url=f"{base}/v1/chat", default_model="m")
+
+    async def run():
+        replies = [await provider.agenerate([{"role": "user", "content": str(idx)}]) for idx in range(3)]
+        chunks = [chunk async for chunk in provider.astream([{"role": "user", "content": "x"}])]
+        await transport_module.get_transport().aclose()
+        return replies, chunks
+
+    replies, chunks = asyncio.run(run())
+    assert [reply.text for reply in replies] == ["echo 0", "echo 1", "echo 2"]
+    assert "".join(chunk.delta for chunk in chunks) == "Hello"
+    assert chunks[-1].is_final
+    assert server.connections == 1
+
+
+def test_ndjson_streaming_for_ollama(stub_server):
+    _, base = stub_server
+    provider = OllamaProvider(name="ollama", base_url=base, default_model="llama")
+    assert "".join(chunk.delta for chunk in provider.stream([{"role": "user", "content": "x"}])) == "hi there!"
+
+    async def run():
+        chunks = [chunk async for chunk in provider.astream([{"role": "user", "content": "x"}])]
+        await transport_module.get_transport().aclose()
+        return chunks
+
+    chunks = asyncio.run(run())
+    assert [chunk.delta for chunk in chunks] == ["hi", " there", "!"]
+    assert chunks[-1].is_final
+
+
+def test_async_calls_are_bounded_per_provider(stub_server):
+    server, base = stub_server
+    provider = OpenAIProvider(name="openai", api_key="k", base_url=f"{base}/slow", default_model="m")
+    provider.max_concurrency = 2
+
+    async def run():
+        replies = await asyncio.gather(*(provider.agenerate([{"role": "user", "content": "x"}]) for _ in range(6)))
+        await transport_module.get_transport().aclose()
+        return replies
+
+    assert [reply.text for reply in asyncio.run(run())] == ["ok"] * 6
+    assert server.peak == 2
+
+
+def test_injected_http_client_is_used_by_async_api():
+    calls = []
+
+    def http_client(url, body, headers):
+        calls.append(body)
+        return {"choices": [{"message": {"content": "stubbed"}}]}
+
+    provider = OpenAIProvider(name="openai", api_key="k", default_model="m", http_client=http_client)
+    reply = asyncio.run(provider.agenerate([{"role": "user", "content": "x"}]))
+    assert reply.text == "stubbed"
+    assert calls and calls[0]["model"] == "m"
+
+
+def test_ai_calls_await_agenerate_instead_of_holding_threads():
+    from types import SimpleNamespace
+
+    from namel3ss.ai.config import default_global_ai_config
+    from namel3ss.ai.providers import DummyProvider
+    from namel3ss.ai.registry import ModelRegistry
+    from namel3ss.ai.router import ModelRouter
+    from namel3ss.config import ProviderConfig, ProvidersConfig
+    from namel3ss.runtime.context import ExecutionContext, aexecute_ai_call_with_registry
+
+    # more calls than the default thread pool has workers, all in flight at once
+    calls = 48
+
+    class RendezvousProvider(DummyProvider):
+        def __init__(self):
+            super().__init__(name="dummy", default_model="dummy-model")
+            self.waiting = 0
+            self.everyone_waiting = None
+
+        def generate(self, messages, **kwargs):  # type: ignore[override]
+            raise AssertionError("the async path must not call generate()")
+
+        async def agenerate(self, messages, **kwargs):  # type: ignore[override]
+            self.waiting += 1
+            if self.waiting == calls:
+                self.everyone_waiting.set()
+            await self.everyone_waiting.wait()
+            return DummyProvider.generate(self, messages, **kwargs)
+
+    provider = RendezvousProvider()
+
+    class StubRegistry(ModelRegistry):
+        def _create_provider(self, cfg):  # type: ignore[override]
+            return provider
+
+    registry = StubRegistry(providers_config=ProvidersConfig(default="dummy", providers={"dummy": ProviderConfig(type="dummy")}))
+    router = ModelRouter(registry, default_global_ai_config())
+
+    async def call(idx):
+        ai_call = SimpleNamespace(
+            name="support", model_name="dummy-model", input_source=f"question {idx}", system_prompt=None,
+            tools=[], memory=None, semantic_cache=None,
+        )
+        context = ExecutionContext(app_name="test", request_id=f"req-{idx}", provider_cache=None)
+        return await aexecute_ai_call_with_registry(ai_call, registry, router, context)
+
+    async def run():
+        provider.everyone_waiting = asyncio.Event()
+        return await asyncio.wait_for(asyncio.gather(*(call(idx) for idx in range(calls))), timeout=10)
+
+    results = asyncio.run(run())
+    assert [result["provider_result"]["messages"][-1]["content"] for result in results] == [
+        f"question {idx}" for idx in range(calls)
+    ]
@@ -0,0 +1,110 @@
+from array import array
+
+import pytest
+
+from namel3ss import ast_nodes
+from namel3ss.runtime import csv_frames
+from namel3ss.runtime.frames import FrameRegistry, FrameSpec
+
+
+@pytest.fixture(autouse=True)
+def _frame_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("N3_FRAME_CACHE_DIR", str(tmp_path / "cache"))
+
+
+def _write(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def _country_is(value):
+    return ast_nodes.BinaryOp(
+        left=ast_nodes.VarRef(name="row.country", root="row", path=["country"]),
+        op="==",
+        right=ast_nodes.Literal(value=value),
+    )
+
+
+def test_streaming_loader_coerces_selects_and_filters(tmp_path):
+    path = _write(
+        tmp_path / "sales.csv",
+        ["region,revenue,country,note", "be,100,BE, x ", "de,200.5,DE,", "us,50.0,BE,7", "", "fr,,BE,y"],
+    )
+    registry = FrameRegistry(
+        {
+            "all": FrameSpec(name="all", path=path, backend="file", has_headers=True),
+            "be": FrameSpec(
+                name="be", path=path, backend="file", has_headers=True, select_cols=["revenue"], where=_country_is("BE")
+            ),
+        }
+    )
+    assert registry.get_rows("all") == [
+        {"region": "be", "revenue": 100, "country": "BE", "note": "x"},
+        {"region": "de", "revenue": 200.5, "country": "DE", "note": ""},
+        {"region": "us", "revenue": 50, "country": "BE", "note": 7},
+        {"region": "fr", "revenue": "", "country": "BE", "note": "y"},
+    ]
+    # where reads a column that select drops
+    assert registry.get_rows("be") == [{"revenue": 100}, {"revenue": 50}, {"revenue": ""}]
+
+
+def test_numeric_columns_are_array_backed(tmp_path):
+    path = _write(tmp_path / "nums.csv", ["id,score,name"] + [f"{i},{i}.5,n{i % 3}" for i in range(100)])
+    rows = csv_frames.read_csv_frame(
+        FrameSpec(name="nums", path=path, has_headers=True), FrameRegistry()._coerce_value, None
+    )
+    assert isinstance(rows.columns["id"], array) and rows.columns["id"].typecode == "q"
+    assert isinstance(rows.columns["score"], array) and rows.columns["score"].typecode == "d"
+    assert rows.columns["name"][0] is rows.columns["name"][3]
+    assert rows.row(7) == {"id": 7, "score": 7.5, "name": "n1"}
+
+
+def test_parsed_frame_is_served_from_disk_cache_until_file_changes(tmp_path, monkeypatch):
+    path = _write(tmp_path / "data.csv", ["id,label", "1,a", "2,b"])
+    frames = {"data": FrameSpec(name="data", path=path, backend="file", has_headers=True)}
+    assert FrameRegistry(frames).get_rows("data") == [{"id": 1, "label": "a"}, {"id": 2, "label": "b"}]
+    assert list((tmp_path / "cache").glob("*.n3frame"))
+
+    parse = csv_frames._read_with_headers
+    monkeypatch.setattr(csv_frames, "_read_with_headers", lambda *args: pytest.fail("cache was not used"))
+    registry = FrameRegistry(frames)
+    assert registry.get_rows("data") == [{"id": 1, "label": "a"}, {"id": 2, "label": "b"}]
+
+    monkeypatch.setattr(csv_frames, "_read_with_headers", parse)
+    _write(tmp_path / "data.csv", ["id,label", "1,a", "2,b", "3,c"])
+    assert [row["id"] for row in registry.get_rows("data")] == [1, 2, 3]
+
+
+def test_cache_can_be_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("N3_FRAME_CACHE_ENABLED", "0")
+    path = _write(tmp_path / "data.csv", ["id", "1"])
+    registry = FrameRegistry({"data": FrameSpec(name="data", path=path, backend="file", has_headers=True)})
+    assert registry.get_rows("data") == [{"id": 1}]
+    assert not (tmp_path / "cache").exists()
+
+
+def test_repeated_access_reuses_the_built_rows(tmp_path):
+    path = _write(tmp_path / "data.csv", ["id,label", "1,a", "2,b"])
+    registry = FrameRegistry({"data": FrameSpec(name="data", path=path, backend="file", has_headers=True)})
+    first = registry.get_rows("data")
+    assert registry.get_rows("data") is first
+    assert registry.query("data", {"label": "b"})[0] is first[1]
+
+
+def test_editing_a_file_replaces_its_disk_cache_entry(tmp_path):
+    path = _write(tmp_path / "data.csv", ["id,label", "1,a"])
+    frames = {
+        "data": FrameSpec(name="data", path=path, backend="file", has_headers=True),
+        "ids": FrameSpec(name="ids", path=path, backend="file", has_headers=True, select_cols=["id"]),
+    }
+    registry = FrameRegistry(frames)
+    registry.get_rows("data")
+    registry.get_rows("ids")
+    before = set((tmp_path / "cache").glob("*.n3frame"))
+    assert len(before) == 2
+
+    _write(tmp_path / "data.csv", ["id,label", "1,a", "2,b"])
+    assert len(registry.get_rows("data")) == 2
+    after = set((tmp_path / "cache").glob("*.n3frame"))
+    # the edited file's old entry is gone; the entry for other options is untouched
+    assert len(after) == 2 and len(after & before) == 1
@@ -0,0 +1,109 @@
+from namel3ss.ai.embedding_cache import EmbeddingCache, reset_default_embedding_cache
+from namel3ss.ai.embedding_router import EmbeddingRouter
+from namel3ss.observability.metrics import MetricsRegistry
+from namel3ss.rag.engine import RAGEngine
+from namel3ss.secrets.manager import SecretsManager
+
+
+class CountingEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 0.5] for text in texts]
+
+
+def test_batch_only_embeds_distinct_misses():
+    metrics = MetricsRegistry()
+    cache = EmbeddingCache(metrics=metrics)
+    embed = CountingEmbedder()
+    first = cache.get_or_embed("p", "m", ["a", "bb", "a"], embed)
+    second = cache.get_or_embed("p", "m", ["bb", "ccc"], embed)
+    assert embed.calls == [["a", "bb"], ["ccc"]]
+    assert first == [[1.0, 0.5], [2.0, 0.5], [1.0, 0.5]]
+    assert second == [[2.0, 0.5], [3.0, 0.5]]
+    assert metrics.get_embedding_cache_counters()[("p", "m")] == {"hits": 1, "misses": 4}
+
+
+def test_cache_keys_include_provider_and_model():
+    cache = EmbeddingCache(metrics=MetricsRegistry())
+    embed = CountingEmbedder()
+    cache.get_or_embed("p", "m1", ["a"], embed)
+    cache.get_or_embed("p", "m2", ["a"], embed)
+    cache.get_or_embed("q", "m1", ["a"], embed)
+    assert len(embed.calls) == 3
+
+
+def test_lru_evicts_within_byte_budget():
+    cache = EmbeddingCache(max_bytes=200, metrics=MetricsRegistry())
+    embed = CountingEmbedder()
+    cache.get_or_embed("p", "m", ["a", "b", "c"], embed)
+    assert cache.size_bytes <= 200
+    assert cache.evictions == 1
+    cache.get_or_embed("p", "m", ["c"], embed)
+    cache.get_or_embed("p", "m", ["a"], embed)
+    assert embed.calls[1:] == [["a"]]
+
+
+def test_sqlite_tier_survives_restart(tmp_path):
+    path = tmp_path / "embeddings.db"
+    embed = CountingEmbedder()
+    cache = EmbeddingCache(path=path, metrics=MetricsRegistry())
+    cache.get_or_embed("p", "m", ["hello", "world"], embed)
+    cache.close()
+
+    reopened = EmbeddingCache(path=path, metrics=MetricsRegistry())
+    assert reopened.get_or_embed("p", "m", ["world", "hello"], embed) == [[5.0, 0.5], [5.0, 0.5]]
+    assert len(embed.calls) == 1
+    assert reopened.hits == 2
+
+
+def test_router_serves_repeated_texts_from_cache():
+    router = EmbeddingRouter(SecretsManager(env={}), embedding_cache=EmbeddingCache(metrics=MetricsRegistry()))
+    provider = router._provider_from_prefix("deterministic", None)
+    calls = []
+    original = provider.embed
+
+    def counting(texts, **kwargs):
+        calls.append(list(texts))
+        return original(texts, **kwargs)
+
+    provider.embed = counting
+    first = router.embed(["alpha", "beta"], model="deterministic")
+    second = router.embed(["beta", "gamma"], model="deterministic")
+    assert calls == [["alpha", "beta"], ["gamma"]]
+    assert second.vectors[0] == first.vectors[1]
+    assert second.dim == first.dim
+
+
+def test_rag_engine_reindexing_hits_cache():
+    # the default cache is process-wide; start from an empty one
+    reset_default_embedding_cache()
+    engine = RAGEngine(secrets=SecretsManager(env={}))
+    calls = []
+    original = engine.embedding_provider.embed_batch
+
+    def counting(texts, **kwargs):
+        calls.append(list(texts))
+        return original(texts, **kwargs)
+
+    engine.embedding_provider.embed_batch = counting
+    engine.index_documents("default", ["one", "two"])
+    engine.index_documents("default", ["one", "two", "three"])
+    assert calls == [["one", "two"], ["three"]]
+
+
+def test_default_cache_is_shared_across_routers(monkeypatch):
+    from namel3ss.ai.embedding_cache import get_default_embedding_cache
+
+    monkeypatch.delenv("N3_EMBEDDING_CACHE_ENABLED", raising=False)
+    reset_default_embedding_cache()
+    try:
+        first = EmbeddingRouter(SecretsManager(env={}))
+        second = EmbeddingRouter(SecretsManager(env={}))
+        assert first.embedding_cache is second.embedding_cache is get_default_embedding_cache()
+        monkeypatch.setenv("N3_EMBEDDING_CACHE_ENABLED", "0")
+        assert EmbeddingRouter(SecretsManager(env={})).embedding_cache is None
+    finally:
+        reset_default_embedding_cache()
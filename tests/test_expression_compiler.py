@@ -0,0 +1,142 @@
+import gc
+
+import pytest
+
+from namel3ss import ast_nodes
+from namel3ss.errors import Namel3ssError
+from namel3ss.runtime.expression_compiler import _cache, compile_expression
+from namel3ss.runtime.expressions import EvaluationError, ExpressionEvaluator, VariableEnvironment
+from namel3ss.runtime.frames import FrameRegistry, FrameSpec
+
+
+class _Interpreted(ExpressionEvaluator):
+    evaluate = ExpressionEvaluator._evaluate_node
+
+
+def _lit(value):
+    return ast_nodes.Literal(value=value)
+
+
+def _ref(root, *path):
+    return ast_nodes.VarRef(name=".".join((root,) + path), root=root, path=list(path))
+
+
+def _evaluators(values=None, resolved=None):
+    resolved = resolved or {}
+
+    def resolver(name):
+        return (True, resolved[name]) if name in resolved else (False, None)
+
+    def build(cls):
+        env = VariableEnvironment(dict(values or {}))
+        return cls(env, resolver=resolver)
+
+    return build(ExpressionEvaluator), build(_Interpreted)
+
+
+def _outcome(evaluator, expr):
+    try:
+        return ("ok", evaluator.evaluate(expr))
+    except Namel3ssError as exc:
+        return ("error", type(exc).__name__, str(exc))
+
+
+VALUES = {
+    "row": {"amount": 250, "status": "open", "nested": {"depth": 2}},
+    "total": 120,
+    "name": "ada",
+    "items": [1, 2],
+    "flag": True,
+}
+
+CASES = [
+    _lit(3),
+    _ref("total"),
+    _ref("row", "amount"),
+    _ref("row", "nested", "depth"),
+    _ref("row", "missing"),
+    _ref("total", "missing"),
+    _ref("unknown"),
+    _ref("state", "count"),
+    ast_nodes.Identifier(name="row.status"),
+    ast_nodes.Identifier(name="nobody"),
+    ast_nodes.RecordFieldAccess(target=_ref("row"), field="amount"),
+    ast_nodes.RecordFieldAccess(target=_ref("row"), field="amout"),
+    ast_nodes.RecordFieldAccess(target=_ref("total"), field="amount"),
+    ast_nodes.UnaryOp(op="not", operand=_ref("flag")),
+    ast_nodes.UnaryOp(op="-", operand=_ref("total")),
+    ast_nodes.UnaryOp(op="-", operand=_ref("name")),
+    ast_nodes.UnaryOp(op="~", operand=_ref("total")),
+    ast_nodes.BinaryOp(left=_ref("row", "amount"), op=">", right=_lit(100)),
+    ast_nodes.BinaryOp(left=_ref("total"), op="<=", right=_ref("row", "amount")),
+    ast_nodes.BinaryOp(left=_ref("name"), op="<", right=_lit(3)),
+    ast_nodes.BinaryOp(left=_ref("row", "status"), op="is", right=_lit("open")),
+    ast_nodes.BinaryOp(left=_ref("row", "status"), op="is not", right=_ref("name")),
+    ast_nodes.BinaryOp(left=_ref("flag"), op="and", right=_lit(0)),
+    ast_nodes.BinaryOp(left=_lit(1), op="or", right=_ref("unknown")),
+    ast_nodes.BinaryOp(left=_ref("total"), op="+", right=_lit(1.5)),
+    ast_nodes.BinaryOp(left=_ref("name"), op="+", right=_lit("!")),
+    ast_nodes.BinaryOp(left=_ref("items"), op="+", right=_ref("items")),
+    ast_nodes.BinaryOp(left=_ref("name"), op="+", right=_lit(1)),
+    ast_nodes.BinaryOp(left=_ref("flag"), op="*", right=_lit(2)),
+    ast_nodes.BinaryOp(left=_ref("total"), op="-", right=_lit(20)),
+    ast_nodes.BinaryOp(left=_ref("total"), op="/", right=_lit(0)),
+    ast_nodes.BinaryOp(left=_ref("name"), op="/", right=_ref("unknown")),
+    ast_nodes.BinaryOp(left=_ref("total"), op="%", right=_lit(7)),
+    ast_nodes.BinaryOp(left=_ref("total"), op="^", right=_lit(7)),
+    ast_nodes.ListLiteral(items=[_ref("total"), _lit("x")]),
+    ast_nodes.RecordLiteral(fields=[ast_nodes.RecordField(key="a", value=_ref("total"))]),
+    ast_nodes.RecordLiteral(fields=[ast_nodes.RecordField(key="", value=_lit(1))]),
+    ast_nodes.GetRecordFieldWithDefault(record=_ref("row"), field="region", default=_lit("n/a")),
+    ast_nodes.GetRecordFieldWithDefault(record=_ref("total"), field="region", default=_lit("n/a")),
+    ast_nodes.IndexExpr(seq=_ref("items"), index=_lit(-1)),
+]
+
+
+@pytest.mark.parametrize("expr", CASES, ids=lambda expr: type(expr).__name__)
+def test_compiled_matches_interpreter(expr):
+    compiled, interpreted = _evaluators(VALUES, resolved={"state.count": 4})
+    assert _outcome(compiled, expr) == _outcome(interpreted, expr)
+
+
+def test_expired_loop_variable_error_is_preserved():
+    compiled, interpreted = _evaluators()
+    for evaluator in (compiled, interpreted):
+        evaluator.env.mark_loop_var_exited("item")
+    expr = _ref("item")
+    with pytest.raises(EvaluationError) as compiled_exc:
+        compiled.evaluate(expr)
+    with pytest.raises(EvaluationError) as interpreted_exc:
+        interpreted.evaluate(expr)
+    assert str(compiled_exc.value) == str(interpreted_exc.value)
+    assert "exists only inside this loop" in str(compiled_exc.value)
+
+
+def test_compiled_closure_sees_new_bindings():
+    expr = ast_nodes.BinaryOp(left=_ref("row", "amount"), op=">", right=_lit(100))
+    env = VariableEnvironment({"row": {"amount": 50}})
+    evaluator = ExpressionEvaluator(env, resolver=lambda name: (False, None))
+    assert evaluator.evaluate(expr) is False
+    env.assign("row", {"amount": 500})
+    assert evaluator.evaluate(expr) is True
+
+
+def test_closures_are_cached_per_node_and_dropped_with_it():
+    expr = ast_nodes.BinaryOp(left=_lit(1), op="+", right=_lit(2))
+    assert compile_expression(expr) is compile_expression(expr)
+    assert id(expr) in _cache
+    key = id(expr)
+    del expr
+    gc.collect()
+    assert key not in _cache
+
+
+def test_frame_query_filters_rows_with_compiled_where():
+    registry = FrameRegistry({"orders": FrameSpec(name="orders", backend="memory")})
+    for amount in (10, 150, 300):
+        registry.insert("orders", {"amount": amount})
+    where = ast_nodes.BinaryOp(left=_ref("row", "amount"), op=">", right=_lit(100))
+    assert [row["amount"] for row in registry.query("orders", where)] == [150, 300]
+    with pytest.raises(Namel3ssError) as exc:
+        registry.query("orders", _ref("row", "amount"))
+    assert "N3F-1003" in str(exc.value)
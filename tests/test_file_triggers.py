@@ -60,3 +60,25 @@ def test_file_watcher_poll_detects_change(tmp_path: Path):
     assert len(queue.list()) == 1
     payload = queue.list()[0].payload["payload"]
     assert payload["event"] == "created"
+
+
+def test_file_watcher_wakes_on_filesystem_events(tmp_path: Path):
+    pytest.importorskip("watchdog")
+    queue = JobQueue()
+    mgr = TriggerManager(queue, project_root=tmp_path)
+    watcher = FileWatcher(mgr, tmp_path, poll_interval=30.0, idle_poll_interval=30.0)
+    mgr.file_watcher = watcher
+    mgr.register_trigger(FlowTrigger(id="t1", kind="file", flow_name="flow", config={"path": str(tmp_path), "pattern": "*.txt"}))
+
+    async def run():
+        await watcher.start()
+        await asyncio.sleep(0.2)
+        (tmp_path / "new.txt").write_text("data", encoding="utf-8")
+        for _ in range(100):
+            if queue.list():
+                break
+            await asyncio.sleep(0.02)
+        await watcher.stop()
+
+    asyncio.run(run())
+    assert len(queue.list()) == 1
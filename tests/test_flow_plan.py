@@ -0,0 +1,82 @@
+import asyncio
+
+from namel3ss.agent.engine import AgentRunner
+from namel3ss.ai.registry import ModelRegistry
+from namel3ss.ai.router import ModelRouter
+from namel3ss.flows.engine import FlowEngine
+from namel3ss.flows.graph import FlowGraph, FlowNode, FlowState
+from namel3ss.flows.plan import build_flow_plan, compiled_flow
+from namel3ss.ir import IRFlow, IRFlowStep, IRProgram
+from namel3ss.runtime.context import ExecutionContext
+from namel3ss.tools.registry import ToolRegistry
+
+
+def build_engine():
+    program = IRProgram()
+    registry = ModelRegistry()
+    router = ModelRouter(registry)
+    tools = ToolRegistry()
+    agent_runner = AgentRunner(program, registry, tools, router)
+    engine = FlowEngine(program, registry, tools, agent_runner, router)
+    ctx = engine._build_runtime_context(ExecutionContext(app_name="demo", request_id="req"))
+    return engine, ctx
+
+
+def _chain(length: int) -> FlowGraph:
+    nodes = {}
+    for idx in range(length):
+        nodes[f"s{idx}"] = FlowNode(
+            id=f"s{idx}",
+            kind="function",
+            config={"callable": lambda st, idx=idx: st.set("count", st.get("count", 0) + 1) or idx},
+            next_ids=[f"s{idx + 1}"] if idx < length - 1 else [],
+        )
+    return FlowGraph(nodes=nodes, entry_id="s0")
+
+
+def test_compiled_flow_is_reused_until_steps_change():
+    engine, _ = build_engine()
+    flow = IRFlow(name="f", description=None, steps=[IRFlowStep(name="a", kind="noop", target="a")])
+    graph, plan = compiled_flow(flow, engine._resolve_step_kind)
+    assert compiled_flow(flow, engine._resolve_step_kind) == (graph, plan)
+    assert plan.steps["a"].kind == "noop"
+
+    flow.steps.append(IRFlowStep(name="b", kind="noop", target="b"))
+    new_graph, new_plan = compiled_flow(flow, engine._resolve_step_kind)
+    assert new_graph is not graph
+    assert new_plan.steps["a"].next_ids == ("b",)
+
+
+def test_plan_precomputes_successors_and_joins():
+    engine, _ = build_engine()
+    graph = FlowGraph(
+        nodes={
+            "fan": FlowNode(id="fan", kind="noop", config={"join": "join"}, next_ids=["a", "b"]),
+            "a": FlowNode(id="a", kind="noop", config={"target": "tool_a"}, next_ids=["join"]),
+            "b": FlowNode(id="b", kind="noop", config={}, next_ids=["join"]),
+            "join": FlowNode(id="join", kind="join", config={}, next_ids=[]),
+        },
+        entry_id="fan",
+    )
+    plan = build_flow_plan(graph, engine._resolve_step_kind)
+    assert plan.steps["fan"].next_ids == ("a", "b")
+    assert plan.steps["fan"].join_id == "join"
+    assert plan.steps["a"].target_label == "tool_a"
+    assert plan.steps["b"].target_label == "b"
+
+
+def test_long_flows_run_without_recursion():
+    engine, runtime_ctx = build_engine()
+    result = asyncio.run(engine.a_run_flow(_chain(3000), FlowState(), runtime_ctx, flow_name="long"))
+    assert not result.errors
+    assert len(result.steps) == 3000
+    assert result.state.get("count") == 3000
+
+
+def test_unsupported_kind_still_fails_at_run_time():
+    engine, runtime_ctx = build_engine()
+    graph = FlowGraph(nodes={"x": FlowNode(id="x", kind="mystery", config={}, next_ids=[])}, entry_id="x")
+    plan = build_flow_plan(graph, engine._resolve_step_kind)
+    assert plan.steps["x"].kind is None
+    result = asyncio.run(engine.a_run_flow(graph, FlowState(), runtime_ctx, flow_name="bad", plan=plan))
+    assert result.errors and "mystery" in result.errors[0].error
@@ -0,0 +1,93 @@
+from namel3ss.ir import IRRecord, IRRecordField
+from namel3ss.runtime.frames import FrameRegistry, FrameSpec
+
+
+def _registry(rows=()):
+    registry = FrameRegistry({"users": FrameSpec(name="users", backend="memory")})
+    registry.ensure_index("users", "email")
+    for row in rows:
+        registry.insert("users", row)
+    return registry
+
+
+def _eq(field, value):
+    return [{"field": field, "op": "eq", "value": value}]
+
+
+def test_indexed_query_matches_scan_and_keeps_insertion_order():
+    rows = [{"id": idx, "email": f"u{idx % 5}@x", "age": idx} for idx in range(50)]
+    indexed = _registry(rows)
+    plain = FrameRegistry({"users": FrameSpec(name="users", backend="memory")})
+    for row in rows:
+        plain.insert("users", row)
+    filters = [
+        _eq("email", "u3@x"),
+        [{"field": "email", "op": "in", "value": ["u1@x", "u4@x", "u1@x"]}],
+        {"type": "and", "left": _eq("email", "u2@x")[0], "right": {"field": "age", "op": "gt", "value": 20}},
+        {"type": "or", "left": _eq("email", "u2@x")[0], "right": _eq("age", 3)[0]},
+        _eq("email", "missing"),
+        {"email": "u0@x"},
+    ]
+    for filt in filters:
+        assert indexed.query("users", filt) == plain.query("users", filt)
+
+
+def test_planner_only_examines_index_candidates(monkeypatch):
+    registry = _registry({"id": idx, "email": f"u{idx}@x"} for idx in range(1000))
+    calls = []
+    original = registry._row_matches
+    monkeypatch.setattr(registry, "_row_matches", lambda row, conds: calls.append(row) or original(row, conds))
+    assert registry.query("users", _eq("email", "u500@x")) == [{"id": 500, "email": "u500@x"}]
+    assert len(calls) == 1
+
+
+def test_indexes_follow_updates_deletes_and_restore():
+    registry = _registry([{"id": 1, "email": "a@x"}, {"id": 2, "email": "b@x"}])
+    snapshot = registry.snapshot()
+    assert registry.update("users", {"id": 1}, {"email": "c@x"}) == 1
+    assert registry.query("users", _eq("email", "a@x")) == []
+    assert registry.query("users", _eq("email", "c@x")) == [{"id": 1, "email": "c@x"}]
+    rows = registry.query("users", _eq("email", "b@x"))
+    registry.update_rows("users", rows, {"email": "d@x"})
+    assert registry.query("users", _eq("email", "d@x")) == [{"id": 2, "email": "d@x"}]
+    assert registry.delete("users", _eq("email", "c@x")) == 1
+    assert registry.query("users", _eq("email", "c@x")) == []
+    registry.restore(snapshot)
+    assert registry.query("users", _eq("email", "a@x")) == [{"id": 1, "email": "a@x"}]
+    # writes that bypass the registry are picked up by a rebuild
+    registry._store["users"] = [{"id": 9, "email": "z@x"}]
+    assert registry.query("users", _eq("email", "z@x")) == [{"id": 9, "email": "z@x"}]
+
+
+def test_unhashable_values_are_still_found():
+    registry = _registry([{"id": 1, "email": ["a@x"]}, {"id": 2, "email": "b@x"}])
+    assert registry.query("users", _eq("email", ["a@x"])) == [{"id": 1, "email": ["a@x"]}]
+    assert registry.query("users", _eq("email", "b@x")) == [{"id": 2, "email": "b@x"}]
+
+
+def test_index_records_covers_keys_unique_and_referenced_fields():
+    users = IRRecord(
+        name="User",
+        frame="users",
+        primary_key="id",
+        fields={
+            "id": IRRecordField(name="id", type="string", primary_key=True),
+            "email": IRRecordField(name="email", type="string", is_unique=True),
+            "handle": IRRecordField(name="handle", type="string"),
+        },
+    )
+    orders = IRRecord(
+        name="Order",
+        frame="orders",
+        primary_key="order_id",
+        fields={
+            "order_id": IRRecordField(name="order_id", type="string", primary_key=True),
+            "user_handle": IRRecordField(
+                name="user_handle", type="string", references_record="User", reference_target_field="handle"
+            ),
+        },
+    )
+    registry = FrameRegistry({"users": FrameSpec(name="users"), "orders": FrameSpec(name="orders")})
+    registry.index_records({"User": users, "Order": orders})
+    assert set(registry._indexes["users"].by_field) == {"id", "email", "handle"}
+    assert set(registry._indexes["orders"].by_field) == {"order_id"}
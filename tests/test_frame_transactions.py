@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from namel3ss.errors import Namel3ssError
+from namel3ss.runtime.frames import FrameRegistry, FrameSpec
+
+
+def _registry():
+    registry = FrameRegistry({"users": FrameSpec(name="users", backend="memory")})
+    registry.ensure_index("users", "email")
+    for idx in range(5):
+        registry.insert("users", {"id": idx, "email": f"u{idx}@x"})
+    return registry
+
+
+def _eq(field, value):
+    return [{"field": field, "op": "eq", "value": value}]
+
+
+def test_rollback_undoes_inserts_updates_and_deletes():
+    registry = _registry()
+    before = registry.snapshot()
+    savepoint = registry.begin()
+    registry.insert("users", {"id": 9, "email": "new@x"})
+    registry.update("users", {"id": 1}, {"email": "changed@x", "name": "added"})
+    registry.delete("users", _eq("email", "u3@x"))
+    registry.delete("users", {"id": 0})
+    registry.rollback(savepoint)
+    assert registry.snapshot() == before
+    assert registry.query("users", _eq("email", "u1@x")) == [{"id": 1, "email": "u1@x"}]
+    assert registry.query("users", _eq("email", "changed@x")) == []
+    assert registry.query("users", _eq("email", "new@x")) == []
+    assert registry.query("users", _eq("email", "u3@x")) == [{"id": 3, "email": "u3@x"}]
+
+
+def test_nested_savepoints_roll_back_independently():
+    registry = _registry()
+    outer = registry.begin()
+    registry.insert("users", {"id": 10, "email": "outer@x"})
+    inner = registry.begin()
+    registry.update("users", {"id": 10}, {"email": "inner@x"})
+    registry.rollback(inner)
+    assert registry.query("users", _eq("email", "outer@x")) == [{"id": 10, "email": "outer@x"}]
+    inner = registry.begin()
+    registry.delete("users", {"id": 2})
+    registry.commit(inner)
+    # the outer rollback also undoes what the committed savepoint did
+    registry.rollback(outer)
+    assert [row["id"] for row in registry.get_rows("users")] == [0, 1, 2, 3, 4]
+    with pytest.raises(Namel3ssError):
+        registry.commit(outer)
+
+
+def test_commit_keeps_writes_and_stops_logging():
+    registry = _registry()
+    savepoint = registry.begin()
+    registry.insert("users", {"id": 5, "email": "u5@x"})
+    registry.commit(savepoint)
+    assert registry._current_log() is None
+    assert savepoint.log.entries == []
+    assert len(registry.get_rows("users")) == 6
+
+
+def test_rollback_leaves_concurrent_writes_alone():
+    registry = _registry()
+
+    async def transaction(started, release):
+        savepoint = registry.begin()
+        registry.insert("users", {"id": 20, "email": "tx@x"})
+        started.set()
+        await release.wait()
+        registry.rollback(savepoint)
+
+    async def main():
+        started, release = asyncio.Event(), asyncio.Event()
+        task = asyncio.create_task(transaction(started, release))
+        await started.wait()
+        registry.insert("users", {"id": 21, "email": "other@x"})
+        release.set()
+        await task
+
+    asyncio.run(main())
+    assert [row["id"] for row in registry.get_rows("users")] == [0, 1, 2, 3, 4, 21]
+
+
+def test_transactions_on_different_registries_are_independent():
+    outer, inner = _registry(), _registry()
+    outer_sp = outer.begin()
+    inner_sp = inner.begin()
+    outer.insert("users", {"id": 30, "email": "outer@x"})
+    inner.insert("users", {"id": 31, "email": "inner@x"})
+    inner.rollback(inner_sp)
+    assert outer._current_log() is outer_sp.log
+    outer.commit(outer_sp)
+    assert [row["id"] for row in outer.get_rows("users")] == [0, 1, 2, 3, 4, 30]
+    assert [row["id"] for row in inner.get_rows("users")] == [0, 1, 2, 3, 4]
@@ -33,3 +33,122 @@ def test_in_memory_jobs_not_persistent():
     job = queue1.create_and_enqueue("flow", "pipeline", {"code": "snippet"})
     queue2 = JobQueue()
     assert queue2.get(job.id) is None
+
+
+def test_concurrent_workers_never_claim_the_same_job(tmp_path):
+    import threading
+
+    db_path = tmp_path / "jobs.db"
+    producer = JobQueue(store=SQLiteJobStore(db_path))
+    for idx in range(200):
+        producer.create_and_enqueue("flow", f"f{idx}")
+    claimed = []
+
+    def consume():
+        queue = JobQueue(store=SQLiteJobStore(db_path))
+        while True:
+            batch = queue.dequeue_many(3)
+            if not batch:
+                return
+            claimed.extend(job.id for job in batch)
+
+    threads = [threading.Thread(target=consume) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(claimed) == 200
+    assert len(set(claimed)) == 200
+
+
+def test_priority_and_delayed_jobs(tmp_path):
+    import time
+
+    queue = JobQueue(store=SQLiteJobStore(tmp_path / "jobs.db"))
+    low = queue.create_and_enqueue("flow", "low")
+    later = queue.create_and_enqueue("flow", "later", priority=10, run_at=time.time() + 3600)
+    high = queue.create_and_enqueue("flow", "high", priority=5)
+    assert [job.id for job in queue.dequeue_many(5)] == [high.id, low.id]
+    assert queue.get(later.id).status == "queued"
+
+
+def test_expired_leases_return_to_queue(tmp_path):
+    db_path = tmp_path / "jobs.db"
+    crashed = SQLiteJobStore(db_path, visibility_timeout=0.0)
+    job = JobQueue(store=crashed).create_and_enqueue("flow", "pipeline")
+    first = crashed.dequeue_job()
+    assert first.id == job.id and first.attempts == 1
+
+    survivor = SQLiteJobStore(db_path, visibility_timeout=60.0)
+    reclaimed = survivor.dequeue_job()
+    assert reclaimed.id == job.id and reclaimed.attempts == 2
+    assert survivor.heartbeat(reclaimed)
+    assert not crashed.heartbeat(reclaimed)
+    assert survivor.dequeue_job() is None
+
+    # the worker that lost its lease cannot overwrite the new run's outcome
+    first.status, first.error = "error", "stale"
+    assert not crashed.update_job(first)
+    assert survivor.get_job(job.id).status == "running"
+    reclaimed.status = "success"
+    assert survivor.update_job(reclaimed)
+    assert survivor.get_job(job.id).status == "success"
+
+
+def test_worker_abandons_a_job_whose_lease_was_lost(tmp_path):
+    import asyncio
+
+    from namel3ss.distributed.workers import Worker
+
+    db_path = tmp_path / "jobs.db"
+    store = SQLiteJobStore(db_path, visibility_timeout=0.03)
+    job = JobQueue(store=store).create_and_enqueue("flow", "pipeline")
+    other = SQLiteJobStore(db_path, visibility_timeout=60.0)
+    events = []
+
+    class SlowRuntime:
+        async def a_execute_flow(self, name, payload=None):
+            events.append("started")
+            # the lease expires and another worker claims the job meanwhile
+            other._conn.execute("UPDATE jobs SET lease_expires_at = 0 WHERE id = ?", (job.id,))
+            assert other.dequeue_job().id == job.id
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                events.append("cancelled")
+                raise
+            events.append("finished")
+
+    worker = Worker(lambda code: SlowRuntime(), JobQueue(store=store), None)
+    asyncio.run(asyncio.wait_for(worker.run_once(), timeout=2))
+    assert events == ["started", "cancelled"]
+    assert worker.processed_jobs == 0
+    assert other.get_job(job.id).status == "running"
+
+
+def test_legacy_jobs_table_is_migrated(tmp_path):
+    import sqlite3
+
+    db_path = tmp_path / "jobs.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE jobs (id TEXT PRIMARY KEY, type TEXT, target TEXT, payload TEXT, status TEXT, "
+        "result TEXT, error TEXT, created_at REAL)"
+    )
+    conn.execute("INSERT INTO jobs VALUES ('old', 'flow', 'x', '{}', 'queued', 'null', NULL, 1.0)")
+    # claimed before the upgrade, by a worker that is gone now
+    conn.execute("INSERT INTO jobs VALUES ('stranded', 'flow', 'x', '{}', 'running', 'null', NULL, 2.0)")
+    conn.commit()
+    conn.close()
+
+    store = SQLiteJobStore(db_path, visibility_timeout=0.0)
+    assert [job.id for job in store.dequeue_many(5)] == ["old", "stranded"]
+    assert store.get_job("stranded").attempts == 1
+    plan = " ".join(
+        str(row)
+        for row in store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM jobs WHERE status = 'queued' AND run_at <= 0 "
+            "ORDER BY priority DESC, created_at ASC LIMIT 1"
+        )
+    )
+    assert "COVERING INDEX jobs_claim_idx" in plan
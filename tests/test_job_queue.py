@@ -49,3 +49,102 @@ def test_worker_run_once_processes_job():
     worker = Worker(lambda code: DummyRuntime(), queue, None)
     asyncio.run(worker.run_once())
     assert job.status in ("success", "error")
+
+
+class FlowRuntime:
+    active = 0
+    peak = 0
+
+    async def a_execute_flow(self, name, payload=None):
+        FlowRuntime.active += 1
+        FlowRuntime.peak = max(FlowRuntime.peak, FlowRuntime.active)
+        await asyncio.sleep(0.01)
+        FlowRuntime.active -= 1
+        return {"flow": name}
+
+
+def test_worker_slots_run_jobs_concurrently_and_drain():
+    from namel3ss.runtime.program_cache import ProgramCache
+
+    queue = JobQueue()
+    jobs = [queue.create_and_enqueue("flow", f"f{idx}", {"code": "app"}) for idx in range(8)]
+    built = []
+
+    def factory(program):
+        built.append(program)
+        return FlowRuntime()
+
+    cache = ProgramCache(compile_fn=lambda code: code, engine_factory=factory)
+    worker = Worker(lambda code: FlowRuntime(), queue, None, concurrency=4, runtime_cache=cache)
+
+    async def run():
+        task = asyncio.create_task(worker.run_forever(poll_interval=0.005))
+        while worker.processed_jobs < len(jobs):
+            await asyncio.sleep(0.005)
+        worker.stop()
+        await asyncio.wait_for(task, timeout=1)
+
+    FlowRuntime.peak = 0
+    asyncio.run(run())
+    assert all(job.status == "success" for job in jobs)
+    assert FlowRuntime.peak == 4
+    assert len(built) == len(jobs)
+    assert cache.stats()["misses"] == 1
+
+
+def test_cached_runtimes_do_not_share_state_between_jobs():
+    from namel3ss.runtime.program_cache import ProgramCache
+
+    class RecordingRuntime:
+        def __init__(self, program):
+            self.records = []
+
+        async def a_execute_flow(self, name, payload=None):
+            self.records.append(payload["tenant"])
+            return list(self.records)
+
+    queue = JobQueue()
+    jobs = [queue.create_and_enqueue("flow", "f", {"code": "app", "tenant": tenant}) for tenant in ("a", "b")]
+    cache = ProgramCache(compile_fn=lambda code: code, engine_factory=RecordingRuntime)
+    worker = Worker(lambda code: RecordingRuntime(code), queue, None, runtime_cache=cache)
+    for _ in jobs:
+        asyncio.run(worker.run_once())
+    assert [job.result for job in jobs] == [["a"], ["b"]]
+    assert cache.stats()["misses"] == 1
+
+
+def test_idle_worker_wakes_on_enqueue():
+    import time
+
+    queue = JobQueue()
+    worker = Worker(lambda code: FlowRuntime(), queue, None)
+
+    async def run():
+        task = asyncio.create_task(worker.run_forever(poll_interval=30.0))
+        await asyncio.sleep(0.05)
+        started = time.monotonic()
+        queue.create_and_enqueue("flow", "late", {})
+        while worker.processed_jobs < 1:
+            await asyncio.sleep(0.001)
+        latency = time.monotonic() - started
+        worker.stop()
+        await asyncio.wait_for(task, timeout=1)
+        return latency
+
+    assert asyncio.run(run()) < 1.0
+
+
+def test_wait_for_job_sees_commits_from_other_connections(tmp_path):
+    from namel3ss.runtime.persistence.sqlite import SQLiteJobStore
+
+    consumer = JobQueue(store=SQLiteJobStore(tmp_path / "jobs.db"))
+    producer = JobQueue(store=SQLiteJobStore(tmp_path / "jobs.db"))
+
+    async def run():
+        waiter = asyncio.create_task(consumer.wait_for_job(consumer.version, timeout=30.0))
+        await asyncio.sleep(0.05)
+        producer.create_and_enqueue("flow", "remote", {})
+        return await asyncio.wait_for(waiter, timeout=2)
+
+    assert asyncio.run(run()) is True
+    assert consumer.dequeue().target == "remote"
@@ -17,3 +17,69 @@ def test_default_tracer_records_spans():
     with default_tracer.span("default-root") as s:
         trace_id = s.context.trace_id
     assert trace_id in default_tracer.all_traces()
+
+
+def test_retention_is_bounded_per_tracer_and_per_trace():
+    tracer = Tracer(max_traces=3, max_spans_per_trace=2)
+    trace_ids = []
+    for idx in range(5):
+        with tracer.span(f"root-{idx}") as root:
+            trace_ids.append(root.context.trace_id)
+            with tracer.span("child"):
+                with tracer.span("grandchild"):
+                    pass
+            assert tracer.current_span_context() == root.context
+    assert list(tracer.all_traces()) == trace_ids[2:]
+    assert [s.name for s in tracer.get_trace(trace_ids[-1])] == ["root-4", "child"]
+    stats = tracer.stats()
+    assert stats["traces_evicted"] == 2
+    assert stats["spans_dropped"] == 5
+    assert stats["overhead_seconds"] > 0
+
+
+def test_unsampled_traces_are_kept_only_when_failed_or_slow():
+    tracer = Tracer(sample_rate=0.0, slow_trace_seconds=60)
+    with tracer.span("fast") as fast:
+        pass
+    try:
+        with tracer.span("root") as failed:
+            with tracer.span("step"):
+                raise ValueError("boom")
+    except ValueError:
+        pass
+    assert fast.context.trace_id not in tracer.all_traces()
+    assert [s.name for s in tracer.get_trace(failed.context.trace_id)] == ["root", "step"]
+
+    tracer.slow_trace_seconds = 0
+    with tracer.span("slow") as slow:
+        pass
+    assert slow.context.trace_id in tracer.all_traces()
+    assert tracer.stats()["traces_sampled_out"] == 1
+    assert tracer.stats()["traces_tail_kept"] == 2
+
+
+def test_spans_are_exported_as_otlp_json(tmp_path):
+    import json
+
+    from namel3ss.observability.exporters import BatchSpanProcessor, OTLPJsonFileExporter
+
+    path = tmp_path / "spans.jsonl"
+    processor = BatchSpanProcessor(OTLPJsonFileExporter(path), schedule_delay=0.01)
+    tracer = Tracer(processor=processor)
+    with tracer.span("root", attributes={"flow": "demo", "attempt": 1}) as root:
+        with tracer.span("child"):
+            pass
+    assert processor.force_flush()
+    spans = [
+        span
+        for line in path.read_text().splitlines()
+        for resource in json.loads(line)["resourceSpans"]
+        for scope in resource["scopeSpans"]
+        for span in scope["spans"]
+    ]
+    assert [span["name"] for span in spans] == ["child", "root"]
+    assert spans[0]["parentSpanId"] == root.context.span_id
+    assert spans[1]["traceId"] == root.context.trace_id
+    assert {"key": "attempt", "value": {"intValue": "1"}} in spans[1]["attributes"]
+    assert tracer.stats()["exported"] == 2
+    processor.shutdown()
@@ -0,0 +1,114 @@
+import threading
+
+import pytest
+
+from namel3ss.runtime.program_cache import ProgramCache
+
+
+class FakeEngine:
+    def __init__(self, program):
+        self.program = program
+
+
+def _cache(**kwargs):
+    compiled = []
+
+    def compile_fn(source):
+        if "syntax error" in source:
+            raise ValueError("bad program")
+        compiled.append(source)
+        return {"source": source}
+
+    return ProgramCache(compile_fn=compile_fn, engine_factory=FakeEngine, **kwargs), compiled
+
+
+def test_identical_sources_compile_once():
+    cache, compiled = _cache()
+    _, first = cache.program("app a")
+    _, second = cache.program("app a")
+    cache.program("app b")
+    assert first is second
+    assert compiled == ["app a", "app b"]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_compile_errors_are_not_cached():
+    cache, _ = _cache()
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            cache.program("syntax error")
+    assert len(cache) == 0
+
+
+def test_lru_evicts_least_recent_program():
+    cache, compiled = _cache(max_programs=2)
+    with cache.engine("a"):
+        pass
+    cache.program("b")
+    cache.program("a")
+    cache.program("c")
+    assert cache.stats()["evictions"] == 1
+    cache.program("a")
+    assert compiled == ["a", "b", "c"]
+    cache.program("b")
+    assert compiled[-1] == "b"
+
+
+def test_every_run_gets_a_new_engine_for_the_shared_program():
+    cache, compiled = _cache()
+    with cache.engine("a") as first:
+        pass
+    with cache.engine("a") as second:
+        assert second is not first
+        assert second.program is first.program
+    assert compiled == ["a"]
+    assert cache.stats()["engine_builds"] == 2
+
+
+def test_records_written_by_one_run_are_not_seen_by_the_next():
+    from namel3ss.runtime.engine import Engine
+
+    source = (
+        'frame is "users":\n'
+        '  backend is "memory"\n'
+        '  table is "users"\n'
+        'record is "User":\n'
+        '  frame is "users"\n'
+        "  fields:\n"
+        "    id:\n"
+        '      type is "string"\n'
+        "      primary_key\n"
+        'flow is "signup":\n'
+        '  step is "create_user":\n'
+        '    kind is "db_create"\n'
+        '    record is "User"\n'
+        "    values:\n"
+        '      id: "user-1"\n'
+    )
+    cache = ProgramCache(
+        compile_fn=lambda code: Engine._load_program(code, filename="<string>"),
+        engine_factory=lambda program: Engine(program, trigger_manager=None),
+    )
+    with cache.engine(source) as first:
+        first.execute_flow("signup")
+        assert len(first.flow_engine.frame_registry.query("users")) == 1
+    with cache.engine(source) as second:
+        assert second.flow_engine.frame_registry.query("users") == []
+    assert cache.stats()["hits"] == 1
+
+
+def test_concurrent_checkouts_share_one_program():
+    cache, compiled = _cache()
+    seen = []
+
+    def run():
+        with cache.engine("shared") as engine:
+            seen.append(engine.program)
+
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(program is seen[0] for program in seen)
+    assert cache.stats()["engine_builds"] == 8
@@ -1,3 +1,4 @@
+import asyncio
 import time
 from types import SimpleNamespace
 
@@ -6,7 +7,15 @@ from namel3ss.ai.registry import ModelRegistry
 from namel3ss.ai.router import ModelRouter
 from namel3ss.ai.config import default_global_ai_config
 from namel3ss.config import ProviderConfig, ProvidersConfig
-from namel3ss.runtime.cache import InMemoryProviderCache, cache_get_sync, cache_set_sync
+from namel3ss.observability.metrics import MetricsRegistry
+from namel3ss.runtime.cache import (
+    InMemoryProviderCache,
+    SQLiteProviderCache,
+    TieredProviderCache,
+    cache_get_sync,
+    cache_set_sync,
+    reset_default_provider_cache,
+)
 from namel3ss.runtime.context import ExecutionContext, execute_ai_call_with_registry
 
 
@@ -64,3 +73,79 @@ def test_inmemory_cache_ttl_expires():
     time.sleep(0.02)
     assert cache_get_sync(cache, "key") is None
 
+
+
+def test_inmemory_cache_evicts_lru_and_sweeps_expired_on_write():
+    cache = InMemoryProviderCache(max_entries=2)
+    cache_set_sync(cache, "a", {"v": 1})
+    cache_set_sync(cache, "b", {"v": 2})
+    assert cache_get_sync(cache, "a") == {"v": 1}
+    cache_set_sync(cache, "c", {"v": 3})
+    assert cache_get_sync(cache, "b") is None
+    assert cache.stats()["evictions"] == 1
+
+    bounded = InMemoryProviderCache(max_bytes=200)
+    for idx in range(10):
+        cache_set_sync(bounded, f"k{idx}", "x" * 50)
+    assert bounded.stats()["bytes"] <= 200
+    assert cache_get_sync(bounded, "k9") == "x" * 50
+
+    expiring = InMemoryProviderCache()
+    cache_set_sync(expiring, "old", "value", ttl=0.01)
+    time.sleep(0.02)
+    cache_set_sync(expiring, "new", "value")
+    assert len(expiring) == 1
+
+
+def test_sqlite_tier_is_shared_between_caches(tmp_path):
+    path = tmp_path / "provider_cache.db"
+    writer = TieredProviderCache(InMemoryProviderCache(), SQLiteProviderCache(path))
+    cache_set_sync(writer, "key", {"assistant_content": "hi"}, ttl=60)
+    reader = TieredProviderCache(InMemoryProviderCache(), SQLiteProviderCache(path))
+    assert cache_get_sync(reader, "key") == {"assistant_content": "hi"}
+    assert len(reader.memory) == 1
+    cache_set_sync(writer, "gone", "value", ttl=0.01)
+    time.sleep(0.02)
+    assert cache_get_sync(reader, "gone") is None
+    assert writer.disk.sweep() == 1
+
+
+def test_default_provider_cache_is_process_wide(monkeypatch):
+    monkeypatch.setenv("N3_PROVIDER_CACHE_ENABLED", "true")
+    reset_default_provider_cache()
+    try:
+        first = ExecutionContext(app_name="test", request_id="req-1")
+        second = ExecutionContext(app_name="test", request_id="req-2")
+        assert first.provider_cache is not None
+        assert first.provider_cache is second.provider_cache
+    finally:
+        reset_default_provider_cache()
+
+
+def test_async_only_backend_works_inside_running_loop():
+    class AsyncOnlyCache:
+        def __init__(self):
+            self.data = {}
+
+        async def get(self, key):
+            return self.data.get(key)
+
+        async def set(self, key, value, ttl=None):
+            self.data[key] = value
+
+    cache = AsyncOnlyCache()
+
+    async def run():
+        cache_set_sync(cache, "key", "value")
+        return cache_get_sync(cache, "key")
+
+    assert asyncio.run(run()) == "value"
+
+
+def test_cache_hit_ratio_per_model():
+    metrics = MetricsRegistry()
+    metrics.record_provider_cache_hit("openai", "gpt")
+    metrics.record_provider_cache_hit("openai", "gpt")
+    metrics.record_provider_cache_miss("openai", "gpt")
+    metrics.record_provider_cache_miss("anthropic", "claude")
+    assert metrics.get_provider_cache_hit_ratios() == {("openai", "gpt"): 2 / 3, ("anthropic", "claude"): 0.0}
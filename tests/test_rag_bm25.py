@@ -0,0 +1,52 @@
+import asyncio
+import math
+
+from namel3ss.rag.bm25 import BM25Index
+from namel3ss.rag.models import RAGItem
+from namel3ss.rag.vectorstores.memory import InMemoryVectorStore
+
+
+def test_bm25_scores_match_formula():
+    index = BM25Index(k1=1.2, b=0.75)
+    index.add("1", "apple banana apple")
+    index.add("2", "banana cherry")
+    index.add("3", "cherry date elderberry fig")
+    scores = index.scores("apple")
+    assert set(scores) == {"1"}
+    idf = math.log(1 + (3 - 1 + 0.5) / (1 + 0.5))
+    avg_len = 9 / 3
+    expected = idf * 2 * 2.2 / (2 + 1.2 * (1 - 0.75 + 0.75 * 3 / avg_len))
+    assert math.isclose(scores["1"], expected)
+    assert index.top_k("banana cherry", 1)[0][0] == "2"
+
+
+def test_bm25_incremental_replace_and_remove():
+    index = BM25Index()
+    index.add("1", "red green")
+    index.add("2", "green blue")
+    index.add("1", "yellow")
+    assert "1" not in index.scores("red")
+    index.remove("2")
+    assert index.scores("green") == {}
+    assert len(index) == 1
+    assert index.avg_doc_len == 1.0
+
+
+def test_vector_store_keeps_sparse_index_in_sync():
+    store = InMemoryVectorStore()
+    store.add_sync([RAGItem(id="a", text="vector search", embedding=[1.0, 0.0])])
+    bm25 = store.sparse_index()
+    store.add_sync([RAGItem(id="b", text="keyword search", embedding=[0.0, 1.0])])
+    assert set(bm25.scores("search")) == {"a", "b"}
+    asyncio.run(store.a_delete(["a"]))
+    assert set(bm25.scores("search")) == {"b"}
+
+
+def test_hybrid_engine_surfaces_lexical_match():
+    from namel3ss.rag.engine import RAGEngine
+    from namel3ss.rag.index_config import RAGIndexConfig
+
+    engine = RAGEngine(indexes=[RAGIndexConfig(name="a", k=2, enable_hybrid=True, dense_weight=0.0, sparse_weight=1.0)])
+    engine.index_documents("a", ["zebra stripes", "lion mane", "tiger stripes zebra"])
+    results = asyncio.run(engine.a_retrieve("zebra", index_names=["a"], include_memory=False))
+    assert {r.item.text for r in results[:2]} == {"zebra stripes", "tiger stripes zebra"}
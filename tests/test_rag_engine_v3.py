@@ -35,3 +35,83 @@ def test_rerank_and_rewrite_deterministic():
     assert res
     # alpha should be top after rerank
     assert res[0].item.text.lower().startswith("alpha")
+
+
+def test_retrieve_many_matches_single_retrieve():
+    engine = RAGEngine(indexes=[RAGIndexConfig(name="a", enable_hybrid=True)])
+    asyncio.run(engine.a_index_documents("a", ["hello world", "foo bar", "hello again"]))
+    batched = asyncio.run(engine.a_retrieve_many(["hello", "foo"], index_names=["a"]))
+    singles = [asyncio.run(engine.a_retrieve(q, index_names=["a"])) for q in ["hello", "foo"]]
+    assert [[r.item.id for r in res] for res in batched] == [[r.item.id for r in res] for res in singles]
+
+
+class _SlowStore:
+    native_async = True
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    async def a_query_many(self, query_embeddings, k=10):
+        await asyncio.sleep(self.delay)
+        item = RAGItem(id="slow", text="slow doc", source="slow")
+        return [[ScoredItem(item=item, score=1.0, source="slow")] for _ in query_embeddings]
+
+
+class _BrokenStore:
+    native_async = True
+
+    async def a_query_many(self, query_embeddings, k=10):
+        raise RuntimeError("backend down")
+
+
+def test_slow_and_failing_indexes_return_partial_results():
+    engine = RAGEngine(
+        indexes=[
+            RAGIndexConfig(name="fast"),
+            RAGIndexConfig(name="slow", timeout=0.05),
+            RAGIndexConfig(name="broken"),
+        ]
+    )
+    engine.index_documents("fast", ["hello world"])
+    stores = {"slow": _SlowStore(5.0), "broken": _BrokenStore()}
+    original = engine._get_store
+    engine._get_store = lambda index: stores.get(index.name) or original(index)
+    errors = {}
+    res = asyncio.run(engine.a_retrieve("hello", index_names=["fast", "slow", "broken"], errors=errors))
+    assert [r.source for r in res] == ["fast"]
+    assert set(errors) == {"slow", "broken"}
+    assert "timed out" in errors["slow"]
+    # errors belong to the call that collected them
+    other = {}
+    asyncio.run(engine.a_retrieve("hello", index_names=["fast"], errors=other))
+    assert other == {}
+
+
+class _RendezvousStore:
+    """Only answers once every store sharing ``started`` has been queried."""
+
+    native_async = True
+
+    def __init__(self, name, started, expected):
+        self.name = name
+        self.started = started
+        self.expected = expected
+
+    async def a_query_many(self, query_embeddings, k=10):
+        self.started.append(self.name)
+        while len(self.started) < self.expected:
+            await asyncio.sleep(0)
+        item = RAGItem(id=self.name, text=f"{self.name} doc", source=self.name)
+        return [[ScoredItem(item=item, score=1.0, source=self.name)] for _ in query_embeddings]
+
+
+def test_indexes_are_queried_concurrently():
+    # queried one after the other, the first store would wait for the second until its deadline
+    engine = RAGEngine(indexes=[RAGIndexConfig(name="a"), RAGIndexConfig(name="b")], index_timeout=1.0)
+    started = []
+    stores = {name: _RendezvousStore(name, started, 2) for name in ("a", "b")}
+    engine._get_store = lambda index: stores[index.name]
+    errors = {}
+    res = asyncio.run(engine.a_retrieve("q", index_names=["a", "b"], errors=errors))
+    assert errors == {}
+    assert sorted(r.source for r in res) == ["a", "b"]
@@ -247,3 +247,42 @@ def test_cli_rag_eval_json_output(monkeypatch, capsys, tmp_path):
     payload = json.loads(captured)
     assert payload["name"] == "support_eval"
     assert payload["aggregates"]["context_relevance"]["count"] == 1
+
+
+def test_rag_evaluation_batches_leading_vector_retrieve():
+    from namel3ss.ir import IRRagPipelineStage, IRVectorStore
+
+    program = IRProgram()
+    frame = IRFrame(name="eval_questions", backend="memory", table="eval_questions", select_cols=[])
+    program.frames[frame.name] = frame
+    program.vector_stores["kb"] = IRVectorStore(
+        name="kb", backend="memory", frame="docs", text_column="text", id_column="id", embedding_model="fake"
+    )
+    pipeline = IRRagPipeline(name="pipe", stages=[IRRagPipelineStage(name="retrieve", type="vector_retrieve", vector_store="kb")])
+    program.rag_pipelines[pipeline.name] = pipeline
+    eval_cfg = IRRagEvaluation(
+        name="eval1", pipeline="pipe", dataset_frame=frame.name, question_column="question", metrics=["context_relevance"]
+    )
+    model_registry = ModelRegistry()
+    model_registry.register_model("default", provider_name=None)
+    router = ModelRouter(model_registry)
+    agent_runner = AgentRunner(program, model_registry, ToolRegistry(), router)
+    flow_engine = FlowEngine(program, model_registry, ToolRegistry(), agent_runner, router)
+    flow_engine.frame_registry._store[frame.name] = [{"question": "alpha"}, {"question": "beta"}, {"question": "gamma"}]
+
+    calls = []
+
+    class FakeEmbeddingClient:
+        def embed(self, model_name, texts):
+            calls.append(list(texts))
+            return [[float(len(t)), 1.0] for t in texts]
+
+    registry = flow_engine.vector_registry
+    registry.embedding_client = FakeEmbeddingClient()
+    registry.backends["memory"].index(registry.get("kb"), ["1", "2"], [[5.0, 1.0], [4.0, 1.0]], [{"text": "five"}, {"text": "four"}])
+
+    result = run_rag_evaluation(program, eval_cfg, flow_engine)
+
+    assert calls == [["alpha", "beta", "gamma"]]
+    assert all(row.error is None for row in result.rows)
+    assert all(row.context for row in result.rows)
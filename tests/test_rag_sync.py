@@ -1,5 +1,8 @@
 import asyncio
 
+import pytest
+
+from namel3ss.errors import Namel3ssError
 from namel3ss.memory.engine import ShardedMemoryEngine
 from namel3ss.memory.models import MemorySpaceConfig, MemoryType
 from namel3ss.rag.engine import RAGEngine
@@ -14,3 +17,129 @@ def test_rag_sync_worker_ingests_memory():
     asyncio.run(worker.run_once("short"))
     results = rag.store.search([0.0] * 8, top_k=5)
     assert results
+
+
+def _counting_rag():
+    rag = RAGEngine()
+    embedded = []
+    original = rag.embedding_provider.embed_batch
+
+    def counting(texts, **kwargs):
+        embedded.extend(texts)
+        return original(texts, **kwargs)
+
+    rag.embedding_provider.embed_batch = counting
+    rag.embedding_cache = None
+    return rag, embedded
+
+
+def test_rag_sync_worker_only_embeds_new_items(tmp_path):
+    from namel3ss.memory.engine import PersistentMemoryEngine
+
+    spaces = [MemorySpaceConfig(name="short", type=MemoryType.CONVERSATION)]
+    db_path = str(tmp_path / "memory.db")
+    memory = PersistentMemoryEngine(spaces, db_path=db_path)
+    rag, embedded = _counting_rag()
+    memory.record_conversation("short", "first", role="user")
+    memory.record_conversation("short", "second", role="user")
+    state_path = tmp_path / "sync.json"
+    worker = RAGSyncWorker(memory, rag, state_path=state_path)
+    assert asyncio.run(worker.run_once("short")) == 2
+    assert asyncio.run(worker.run_once("short")) == 0
+
+    # a restart reopens the database and reloads the saved cursor
+    memory = PersistentMemoryEngine(spaces, db_path=db_path)
+    memory.record_conversation("short", "third", role="user")
+    restarted = RAGSyncWorker(memory, rag, state_path=state_path)
+    assert asyncio.run(restarted.run_once("short")) == 1
+    assert embedded == ["first", "second", "third"]
+    assert len(rag.store._items) == 3
+
+
+def test_rag_sync_worker_does_not_persist_cursors_for_in_memory_stores(tmp_path):
+    spaces = [MemorySpaceConfig(name="short", type=MemoryType.CONVERSATION)]
+    rag, embedded = _counting_rag()
+    state_path = tmp_path / "sync.json"
+    memory = ShardedMemoryEngine(spaces)
+    for text in ("first", "second", "third"):
+        memory.record_conversation("short", text, role="user")
+    assert asyncio.run(RAGSyncWorker(memory, rag, state_path=state_path).run_once("short")) == 3
+
+    # after a restart the in-memory sequence starts at 1 again
+    memory = ShardedMemoryEngine(spaces)
+    memory.record_conversation("short", "fourth", role="user")
+    assert asyncio.run(RAGSyncWorker(memory, rag, state_path=state_path).run_once("short")) == 1
+    assert embedded == ["first", "second", "third", "fourth"]
+
+
+def test_sqlite_memory_seq_keeps_increasing_after_clear(tmp_path):
+    from namel3ss.memory.engine import PersistentMemoryEngine
+
+    spaces = [MemorySpaceConfig(name="short", type=MemoryType.CONVERSATION)]
+    memory = PersistentMemoryEngine(spaces, db_path=str(tmp_path / "memory.db"))
+    rag, embedded = _counting_rag()
+    worker = RAGSyncWorker(memory, rag)
+    memory.record_conversation("short", "old", role="user")
+    memory.record_conversation("short", "older", role="user")
+    asyncio.run(worker.run_once("short"))
+    memory.store.clear_space("short")
+    item = memory.record_conversation("short", "new", role="user")
+    assert item.seq == 3
+    assert asyncio.run(worker.run_once("short")) == 1
+    assert embedded == ["old", "older", "new"]
+
+
+def test_rag_sync_worker_replay_is_idempotent(tmp_path):
+    from namel3ss.memory.engine import PersistentMemoryEngine
+
+    memory = PersistentMemoryEngine(
+        [MemorySpaceConfig(name="short", type=MemoryType.CONVERSATION)], db_path=str(tmp_path / "memory.db")
+    )
+    rag = RAGEngine()
+    for idx in range(5):
+        memory.record_conversation("short", f"message {idx}", role="user")
+    asyncio.run(RAGSyncWorker(memory, rag, batch_size=2).run_once())
+    # a worker without saved state replays everything but upserts onto the same ids
+    asyncio.run(RAGSyncWorker(memory, rag, batch_size=2).run_once())
+    assert len(rag.store._items) == 5
+    assert [item.seq for item in memory.changes_since("short", 3)] == [4, 5]
+
+
+def test_rag_sync_worker_wakes_on_memory_writes():
+    memory = ShardedMemoryEngine([MemorySpaceConfig(name="short", type=MemoryType.CONVERSATION)])
+    rag = RAGEngine()
+    worker = RAGSyncWorker(memory, rag)
+
+    async def run():
+        task = asyncio.create_task(worker.run_forever(poll_interval=30.0))
+        await asyncio.sleep(0.05)
+        memory.record_conversation("short", "pushed", role="user")
+        for _ in range(100):
+            if worker.cursors.get("short"):
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+
+    asyncio.run(run())
+    assert worker.cursors.get("short")
+
+
+def test_rag_sync_worker_refuses_stores_that_cannot_upsert():
+    class AppendOnlyStore:
+        def __init__(self):
+            self.items = []
+
+        def add_sync(self, items):
+            self.items.extend(items)
+
+    memory = ShardedMemoryEngine([MemorySpaceConfig(name="short", type=MemoryType.CONVERSATION)])
+    memory.record_conversation("short", "Hello world", role="user")
+    rag = RAGEngine()
+    store = AppendOnlyStore()
+    rag._get_store = lambda index: store
+    with pytest.raises(Namel3ssError, match="cannot replace items by id"):
+        asyncio.run(RAGSyncWorker(memory, rag).run_once("short"))
+    assert store.items == []
+    # fresh-id indexing does not need replacement
+    rag.index_documents("default", ["note"])
+    assert len(store.items) == 1
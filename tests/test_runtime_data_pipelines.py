@@ -141,3 +141,60 @@ def test_pipeline_errors():
     with pytest.raises(EvaluationError) as excinfo4:
         _eval_pipeline(negative_skip)
     assert "non-negative number" in str(excinfo4.value)
+
+
+def _counting_evaluator(values: dict):
+    calls: list[str] = []
+    env = VariableEnvironment(dict(values))
+
+    def helper(name, args):
+        calls.append(name)
+        return args[0]
+
+    return ExpressionEvaluator(env, resolver=lambda name: (False, None), helper_resolver=helper), calls
+
+
+def test_take_stops_pulling_rows_once_satisfied():
+    from namel3ss import ast_nodes
+    from namel3ss.ir import IRCollectionKeepRowsStep, IRCollectionPipeline, IRCollectionTakeStep
+
+    evaluator, calls = _counting_evaluator({"xs": list(range(1000))})
+    # keep rows where seen(row % 2 is 0), take first 3
+    condition = ast_nodes.FunctionCall(
+        name="seen",
+        args=[
+            ast_nodes.BinaryOp(
+                left=ast_nodes.BinaryOp(left=ast_nodes.Identifier(name="row"), op="%", right=ast_nodes.Literal(value=2)),
+                op="is",
+                right=ast_nodes.Literal(value=0),
+            )
+        ],
+    )
+    pipeline = IRCollectionPipeline(
+        source=ast_nodes.Identifier(name="xs"),
+        steps=[IRCollectionKeepRowsStep(condition=condition), IRCollectionTakeStep(count=ast_nodes.Literal(value=3))],
+    )
+    assert evaluator.evaluate(pipeline) == [0, 2, 4]
+    assert len(calls) == 5
+    assert not evaluator.env.has("row")
+
+
+def test_sort_then_take_matches_full_sort():
+    from namel3ss import ast_nodes
+    from namel3ss.ir import IRCollectionPipeline, IRCollectionSortStep, IRCollectionTakeStep
+
+    rows = [{"id": idx, "score": (idx * 7) % 5} for idx in range(40)]
+    evaluator, _ = _counting_evaluator({"rows_in": rows, "row": "outer"})
+    key = ast_nodes.VarRef(name="row.score", root="row", path=["score"])
+    for direction in ("asc", "desc"):
+        pipeline = IRCollectionPipeline(
+            source=ast_nodes.Identifier(name="rows_in"),
+            steps=[
+                IRCollectionSortStep(kind="rows", key=key, direction=direction),
+                IRCollectionTakeStep(count=ast_nodes.Literal(value=6)),
+            ],
+        )
+        expected = sorted(rows, key=lambda r: r["score"], reverse=direction == "desc")[:6]
+        assert evaluator.evaluate(pipeline) == expected
+    # the sort binds row on the evaluator's own environment and restores it afterwards
+    assert evaluator.env.resolve("row") == "outer"
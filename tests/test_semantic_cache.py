@@ -0,0 +1,175 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from namel3ss import ast_nodes
+from namel3ss.ai.config import default_global_ai_config
+from namel3ss.ai.providers import DummyProvider
+from namel3ss.ai.registry import ModelRegistry
+from namel3ss.ai.router import ModelRouter
+from namel3ss.config import ProviderConfig, ProvidersConfig
+from namel3ss.errors import ParseError
+from namel3ss.ir import IRAiSemanticCacheConfig
+from namel3ss.observability.metrics import MetricsRegistry
+from namel3ss.parser import parse_source
+from namel3ss.runtime import semantic_cache as semantic_cache_module
+from namel3ss.runtime.context import ExecutionContext, execute_ai_call_with_registry
+from namel3ss.runtime.semantic_cache import SemanticResponseCache
+
+VOCAB = ["reset", "password", "change", "my", "how", "do", "i", "can", "refund", "order"]
+
+
+class BagOfWordsRouter:
+    def __init__(self):
+        self.calls = 0
+
+    def embed(self, texts, model=None):
+        self.calls += 1
+        vectors = []
+        for text in texts:
+            words = text.lower().replace("?", "").split()
+            vectors.append([float(words.count(word)) for word in VOCAB])
+        return SimpleNamespace(vectors=vectors)
+
+
+class CountingProvider(DummyProvider):
+    def __init__(self):
+        super().__init__(name="dummy", default_model="dummy-model")
+        self.calls = 0
+
+    def generate(self, messages, **kwargs):  # type: ignore[override]
+        self.calls += 1
+        return super().generate(messages, **kwargs)
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    registry = MetricsRegistry()
+    cache = SemanticResponseCache(embedding_router=BagOfWordsRouter(), metrics=registry)
+    monkeypatch.setattr(semantic_cache_module, "_default_cache", cache)
+    return registry
+
+
+def _run(provider, prompt, **overrides):
+    providers_config = ProvidersConfig(default="dummy", providers={"dummy": ProviderConfig(type="dummy")})
+
+    class StubRegistry(ModelRegistry):
+        def _create_provider(self, cfg):  # type: ignore[override]
+            return provider
+
+    registry = StubRegistry(providers_config=providers_config)
+    fields = dict(
+        name="support",
+        model_name="dummy-model",
+        input_source=prompt,
+        system_prompt="Answer support questions.",
+        tools=[],
+        memory=None,
+        semantic_cache=IRAiSemanticCacheConfig(threshold=0.8),
+    )
+    fields.update(overrides)
+    context = ExecutionContext(app_name="test", request_id="req-1")
+    return execute_ai_call_with_registry(
+        SimpleNamespace(**fields), registry, ModelRouter(registry, default_global_ai_config()), context
+    )
+
+
+def test_semantic_cache_block_parses():
+    module = parse_source(
+        'ai is "support":\n'
+        '  model is "default"\n'
+        "  semantic_cache:\n"
+        "    threshold is 0.9\n"
+        "    ttl is 600\n"
+        '    embedding model is "openai:text-embedding-3-small"\n'
+        "    max entries is 200\n"
+    )
+    decl = next(d for d in module.declarations if isinstance(d, ast_nodes.AICallDecl))
+    assert decl.semantic_cache.threshold == 0.9
+    assert decl.semantic_cache.ttl_seconds == 600
+    assert decl.semantic_cache.embedding_model == "openai:text-embedding-3-small"
+    assert decl.semantic_cache.max_entries == 200
+
+
+def test_semantic_cache_threshold_is_validated():
+    with pytest.raises(ParseError):
+        parse_source('ai is "support":\n  model is "default"\n  semantic_cache:\n    threshold is 2\n')
+
+
+def test_rephrased_prompt_reuses_answer(metrics):
+    provider = CountingProvider()
+    first = _run(provider, "How do I reset my password?")
+    second = _run(provider, "how can i reset my password")
+    assert provider.calls == 1
+    assert second["provider_result"]["result"] == first["provider_result"]["result"]
+    assert second["provider_result"]["messages"][-1]["content"] == "how can i reset my password"
+
+    _run(provider, "refund my order")
+    assert provider.calls == 2
+    assert metrics.get_semantic_cache_counters() == {"support": {"hits": 1, "misses": 2}}
+
+
+def test_answers_are_scoped_and_invalidated_on_program_change(metrics):
+    provider = CountingProvider()
+    _run(provider, "How do I reset my password?")
+    # a different system prompt is a different scope
+    _run(provider, "How do I reset my password?", system_prompt="Answer in French.")
+    assert provider.calls == 2
+    # the AI without a semantic_cache block never consults the cache
+    _run(provider, "How do I reset my password?", semantic_cache=None)
+    assert provider.calls == 3
+    # a changed definition does not reuse the earlier answers
+    changed = IRAiSemanticCacheConfig(threshold=0.8, ttl_seconds=60)
+    _run(provider, "How do I reset my password?", semantic_cache=changed)
+    assert provider.calls == 4
+    _run(provider, "how can i reset my password", semantic_cache=changed)
+    assert provider.calls == 4
+
+
+def test_entries_expire_and_scopes_are_bounded():
+    cache = SemanticResponseCache(embedding_router=BagOfWordsRouter(), metrics=MetricsRegistry())
+    vector = cache.embed("reset password")
+    cache.store("ai", "fp", "scope", "reset password", vector, {"answer": 1}, ttl=0.01)
+    assert cache.lookup("ai", "fp", "scope", vector) == ({"answer": 1}, pytest.approx(1.0))
+    time.sleep(0.02)
+    assert cache.lookup("ai", "fp", "scope", vector) is None
+
+    for idx, prompt in enumerate(["reset", "password", "refund", "order"]):
+        cache.store("ai", "fp", "scope", prompt, cache.embed(prompt), {"answer": idx}, max_entries=2)
+    assert cache.stats() == {"scopes": 1, "entries": 2}
+    assert cache.lookup("ai", "fp", "scope", cache.embed("reset")) is None
+    assert cache.lookup("ai", "fp", "scope", cache.embed("order"))[0] == {"answer": 3}
+
+
+def test_total_entries_are_bounded_and_expired_scopes_are_swept():
+    cache = SemanticResponseCache(
+        embedding_router=BagOfWordsRouter(), metrics=MetricsRegistry(), max_total_entries=3, sweep_interval=0
+    )
+    vector = cache.embed("reset password")
+    # every conversation turn is a new scope
+    for turn in range(5):
+        cache.store("ai", "fp", f"turn-{turn}", "reset password", vector, {"answer": turn})
+    assert cache.stats() == {"scopes": 3, "entries": 3}
+    assert cache.lookup("ai", "fp", "turn-0", vector) is None
+    assert cache.lookup("ai", "fp", "turn-4", vector)[0] == {"answer": 4}
+
+    cache.invalidate()
+    for turn in range(3):
+        cache.store("ai", "fp", f"turn-{turn}", "reset password", vector, {"answer": turn}, ttl=0.01)
+    time.sleep(0.02)
+    cache.store("ai", "fp", "turn-3", "reset password", vector, {"answer": 3})
+    assert cache.stats() == {"scopes": 1, "entries": 1}
+
+
+def test_same_named_ais_with_different_definitions_keep_their_answers():
+    cache = SemanticResponseCache(embedding_router=BagOfWordsRouter(), metrics=MetricsRegistry())
+    vector = cache.embed("reset password")
+    # two programs served by one process, each defining "support" differently
+    cache.store("support", "program-a", "scope", "reset password", vector, {"answer": "a"})
+    cache.store("support", "program-b", "scope", "reset password", vector, {"answer": "b"})
+    for _ in range(2):
+        assert cache.lookup("support", "program-a", "scope", vector)[0] == {"answer": "a"}
+        assert cache.lookup("support", "program-b", "scope", vector)[0] == {"answer": "b"}
+    cache.invalidate("support")
+    assert cache.stats() == {"scopes": 0, "entries": 0}
@@ -188,6 +188,22 @@ def test_run_app_endpoint_returns_execution():
     assert trace["pages"][0]["agents"]
 
 
+def test_run_app_reuses_compiled_program():
+    client = TestClient(create_app())
+    for _ in range(3):
+        response = client.post(
+            "/api/run-app",
+            json={"source": PROGRAM_TEXT, "app_name": "support_portal"},
+            headers={"X-API-Key": "dev-key"},
+        )
+        assert response.status_code == 200
+        assert response.json()["result"]["app"]["status"] == "ok"
+    stats = client.get("/api/metrics", headers={"X-API-Key": "dev-key"}).json()["program_cache"]
+    assert stats["misses"] == 1 and stats["hits"] == 2
+    assert stats["engine_builds"] == 3
+    assert stats["compile_seconds_total"] > 0
+
+
 def test_last_trace_endpoint_after_run():
     client = TestClient(create_app())
     client.post(
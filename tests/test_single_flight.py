@@ -0,0 +1,183 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from namel3ss.ai.embedding_cache import EmbeddingCache
+from namel3ss.observability.metrics import MetricsRegistry
+from namel3ss.runtime import singleflight
+from namel3ss.runtime.singleflight import SingleFlight
+
+
+def _run_threads(count, target):
+    results = [None] * count
+    errors = [None] * count
+
+    def run(idx):
+        try:
+            results[idx] = target()
+        except Exception as exc:
+            errors[idx] = exc
+
+    threads = [threading.Thread(target=run, args=(idx,)) for idx in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_concurrent_threads_share_one_call():
+    metrics = MetricsRegistry()
+    flight = SingleFlight(metrics=metrics)
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"text": "shared"}
+
+    results, errors = _run_threads(5, lambda: flight.do("k", slow, kind="ai", name="openai:m"))
+    assert errors == [None] * 5
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert metrics.get_coalesced_call_counts() == {("ai", "openai:m"): 4}
+    assert flight.in_flight() == 0
+    # nothing is remembered once the call finished
+    assert flight.do("k", lambda: "fresh") == "fresh"
+
+
+def test_errors_reach_every_waiter():
+    flight = SingleFlight(metrics=MetricsRegistry())
+
+    def failing():
+        time.sleep(0.1)
+        raise RuntimeError("provider down")
+
+    _, errors = _run_threads(3, lambda: flight.do("k", failing))
+    assert all(isinstance(error, RuntimeError) for error in errors)
+
+
+def test_async_callers_share_one_task_and_survive_cancellation():
+    metrics = MetricsRegistry()
+    flight = SingleFlight(metrics=metrics)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 42
+
+    async def run():
+        first = asyncio.ensure_future(flight.ado("k", fetch, kind="tool", name="weather"))
+        await asyncio.sleep(0)
+        others = [asyncio.ensure_future(flight.ado("k", fetch, kind="tool", name="weather")) for _ in range(3)]
+        await asyncio.sleep(0)
+        first.cancel()
+        return await asyncio.gather(*others)
+
+    assert asyncio.run(run()) == [42, 42, 42]
+    assert len(calls) == 1
+    assert metrics.get_coalesced_call_counts() == {("tool", "weather"): 3}
+
+
+def test_stream_fans_out_and_replays_for_late_joiners():
+    metrics = MetricsRegistry()
+    flight = SingleFlight(metrics=metrics)
+    opened = []
+
+    async def upstream():
+        opened.append(1)
+        for word in ("a", "b", "c"):
+            await asyncio.sleep(0.01)
+            yield word
+
+    async def consume(delay):
+        await asyncio.sleep(delay)
+        return [chunk async for chunk in flight.astream("k", upstream, kind="ai_stream", name="openai:m")]
+
+    async def run():
+        return await asyncio.gather(consume(0), consume(0.015), consume(0.025))
+
+    assert asyncio.run(run()) == [["a", "b", "c"]] * 3
+    assert len(opened) == 1
+    assert metrics.get_coalesced_call_counts() == {("ai_stream", "openai:m"): 2}
+
+
+def test_stream_errors_reach_every_consumer():
+    flight = SingleFlight(metrics=MetricsRegistry())
+
+    async def upstream():
+        yield "a"
+        raise ValueError("cut off")
+
+    async def consume():
+        seen = []
+        with pytest.raises(ValueError):
+            async for chunk in flight.astream("k", upstream):
+                seen.append(chunk)
+        return seen
+
+    async def run():
+        return await asyncio.gather(consume(), consume())
+
+    assert asyncio.run(run()) == [["a"], ["a"]]
+
+
+def test_stream_upstream_is_cancelled_when_every_consumer_leaves():
+    flight = SingleFlight(metrics=MetricsRegistry())
+    produced = []
+    cancelled = []
+
+    async def upstream():
+        try:
+            for idx in range(100):
+                await asyncio.sleep(0.01)
+                produced.append(idx)
+                yield idx
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def take(count):
+        seen = []
+        stream = flight.astream("k", upstream)
+        async for chunk in stream:
+            seen.append(chunk)
+            if len(seen) == count:
+                break
+        await stream.aclose()
+        return seen
+
+    async def run():
+        # one consumer leaving early does not stop the stream for the other
+        first, second = await asyncio.gather(take(1), take(3))
+        assert (first, second) == ([0], [0, 1, 2])
+        await asyncio.sleep(0.05)
+        # the last consumer left, so the upstream stream stopped rather than running on
+        assert cancelled == [True]
+        assert len(produced) <= 4
+
+    asyncio.run(run())
+
+
+def test_embedding_batches_are_coalesced_and_can_be_disabled(monkeypatch):
+    calls = []
+
+    def embed(texts):
+        calls.append(list(texts))
+        time.sleep(0.1)
+        return [[float(len(text))] for text in texts]
+
+    cache = EmbeddingCache(metrics=MetricsRegistry())
+    results, _ = _run_threads(3, lambda: cache.get_or_embed("openai", "m", ["hi", "there"], embed))
+    assert results == [[[2.0], [5.0]]] * 3
+    assert calls == [["hi", "there"]]
+
+    monkeypatch.setenv("N3_SINGLE_FLIGHT_ENABLED", "0")
+    assert not singleflight.single_flight_enabled()
+    calls.clear()
+    cache = EmbeddingCache(metrics=MetricsRegistry())
+    _run_threads(3, lambda: cache.get_or_embed("openai", "m", ["hi"], embed))
+    assert len(calls) == 3
@@ -0,0 +1,199 @@
+import sqlite3
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from namel3ss import ast_nodes
+from namel3ss.agent.engine import AgentRunner
+from namel3ss.ai.registry import ModelRegistry
+from namel3ss.ai.router import ModelRouter
+from namel3ss.errors import Namel3ssError
+from namel3ss.flows.engine import FlowEngine
+from namel3ss.ir import (
+    IRConditionAnd,
+    IRConditionLeaf,
+    IRFlow,
+    IRFlowStep,
+    IRFrame,
+    IRProgram,
+    IRRecord,
+    IRRecordField,
+    IRRecordOrderBy,
+    IRRecordQuery,
+)
+from namel3ss.runtime.context import ExecutionContext
+from namel3ss.runtime.frames import FrameRegistry, FrameSpec
+from namel3ss.runtime.sqlite_frames import compile_conditions
+from namel3ss.tools.registry import ToolRegistry
+
+
+def _registries(db_path):
+    url = ast_nodes.Literal(value=f"sqlite:///{db_path}")
+    sqlite = FrameRegistry({"users": FrameSpec(name="users", backend="sqlite", url=url, table="users")})
+    memory = FrameRegistry({"users": FrameSpec(name="users", backend="memory")})
+    return sqlite, memory
+
+
+ROWS = [
+    {"id": idx, "email": f"u{idx % 7}@x", "age": idx % 40, "team": None if idx % 5 == 0 else f"t{idx % 3}"}
+    for idx in range(120)
+]
+
+
+def _leaf(field, op, value=None):
+    return {"type": "leaf", "field": field, "op": op, "value": value}
+
+
+FILTERS = [
+    None,
+    {"email": "u3@x"},
+    [_leaf("age", "gt", 30)],
+    [_leaf("age", "le", 2), _leaf("team", "neq", "t1")],
+    {"type": "or", "left": _leaf("email", "eq", "u1@x"), "right": _leaf("age", "ge", 38)},
+    {"type": "any", "children": [_leaf("team", "is_null"), _leaf("id", "in", [1, 2, 3])]},
+    {"type": "all", "children": [_leaf("team", "in", ["t2", None]), _leaf("age", "lt", 10)]},
+    [_leaf("team", "is_not_null"), _leaf("team", "eq", None)],
+    # not expressible in SQL: checked in Python after narrowing
+    [_leaf("age", "lt", 20), _leaf("email", "in", [["u1@x"]])],
+]
+
+
+def test_sqlite_frame_matches_memory_frame(tmp_path):
+    sqlite, memory = _registries(tmp_path / "app.db")
+    for row in ROWS:
+        sqlite.insert("users", row)
+        memory.insert("users", row)
+    for filt in FILTERS:
+        assert sqlite.query("users", filt) == memory.query("users", filt)
+    assert sqlite.update("users", {"email": "u2@x"}, {"age": 99}) == memory.update("users", {"email": "u2@x"}, {"age": 99})
+    assert sqlite.delete("users", [_leaf("age", "lt", 5)]) == memory.delete("users", [_leaf("age", "lt", 5)])
+    assert sqlite.get_rows("users") == memory.get_rows("users")
+
+
+def test_rows_persist_and_keep_types(tmp_path):
+    first, _memory = _registries(tmp_path / "app.db")
+    stamp = datetime(2024, 5, 1, 12, 30)
+    first.insert("users", {"id": 1, "joined": stamp, "balance": Decimal("10.50"), "tags": ["a"], "active": True})
+    first.close()
+    second, _memory = _registries(tmp_path / "app.db")
+    assert second.get_rows("users") == [
+        {"id": 1, "joined": stamp, "balance": Decimal("10.50"), "tags": ["a"], "active": True}
+    ]
+    with pytest.raises(Namel3ssError):
+        second.insert("users", {"id": 2, "blob": object()})
+
+
+def test_select_pushes_down_order_and_pagination(tmp_path):
+    sqlite, memory = _registries(tmp_path / "app.db")
+    for row in ROWS:
+        sqlite.insert("users", row)
+        memory.insert("users", row)
+    order = [("age", True), ("email", False)]
+    for filt in FILTERS:
+        expected = list(memory.select("users", filt, order_by=order, offset=3, limit=7))
+        assert list(sqlite.select("users", filt, order_by=order, offset=3, limit=7)) == expected
+    with pytest.raises(Namel3ssError, match="can't sort people by nickname"):
+        list(sqlite.select("users", None, order_by=[("nickname", False)], label="people"))
+
+
+def test_decimal_and_datetime_fields_sort_by_value(tmp_path):
+    from datetime import timedelta, timezone
+
+    sqlite, memory = _registries(tmp_path / "app.db")
+    utc, plus_two = timezone.utc, timezone(timedelta(hours=2))
+    rows = [
+        {"id": 1, "price": Decimal("10"), "at": datetime(2024, 1, 1, 11, 0, tzinfo=utc)},
+        {"id": 2, "price": Decimal("100"), "at": datetime(2024, 1, 1, 12, 30, tzinfo=plus_two)},
+        {"id": 3, "price": Decimal("9.5"), "at": datetime(2024, 1, 1, 10, 0, tzinfo=utc)},
+    ]
+    for row in rows:
+        sqlite.insert("users", row)
+        memory.insert("users", row)
+    by_price = [row["id"] for row in sqlite.select("users", None, order_by=[("price", False)])]
+    assert by_price == [3, 1, 2]
+    # 12:30+02:00 is 10:30 UTC
+    by_time = [row["id"] for row in sqlite.select("users", None, order_by=[("at", True)], limit=2)]
+    assert by_time == [1, 2]
+    for order in ([("price", True)], [("at", False)]):
+        assert list(sqlite.select("users", None, order_by=order, offset=1)) == list(
+            memory.select("users", None, order_by=order, offset=1)
+        )
+
+
+def test_indexes_from_records_are_used(tmp_path):
+    sqlite, _memory = _registries(tmp_path / "app.db")
+    record = IRRecord(
+        name="User",
+        frame="users",
+        primary_key="id",
+        fields={"id": IRRecordField(name="id", type="int", primary_key=True)},
+    )
+    sqlite.index_records({"User": record})
+    where, params, exact = compile_conditions([_leaf("id", "eq", 5)])
+    assert exact
+    conn = sqlite3.connect(tmp_path / "app.db")
+    plan = " ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN SELECT data FROM users WHERE {where}", params))
+    assert "users__id" in plan
+
+
+def test_rollback_undoes_sqlite_writes(tmp_path):
+    sqlite, _memory = _registries(tmp_path / "app.db")
+    for row in ROWS[:5]:
+        sqlite.insert("users", row)
+    before = sqlite.get_rows("users")
+    savepoint = sqlite.begin()
+    sqlite.insert("users", {"id": 500})
+    sqlite.update("users", {"id": 1}, {"email": "changed@x"})
+    sqlite.delete("users", {"id": 3})
+    sqlite.rollback(savepoint)
+    assert sqlite.get_rows("users") == before
+
+
+def test_find_step_on_sqlite_frame(tmp_path):
+    record = IRRecord(
+        name="User",
+        frame="users",
+        primary_key="id",
+        fields={
+            "id": IRRecordField(name="id", type="int", primary_key=True, required=True),
+            "age": IRRecordField(name="age", type="int"),
+        },
+    )
+    query = IRRecordQuery(
+        alias="user",
+        record_name="User",
+        where_condition=IRConditionAnd(
+            left=IRConditionLeaf(field_name="age", op="ge", value=ast_nodes.Literal(value=10)),
+            right=IRConditionLeaf(field_name="age", op="lt", value=ast_nodes.Literal(value=30)),
+        ),
+        order_by=[IRRecordOrderBy(field_name="age", direction="desc")],
+        limit_expr=ast_nodes.Literal(value=3),
+        offset_expr=ast_nodes.Literal(value=1),
+    )
+    flow = IRFlow(
+        name="find_users",
+        description=None,
+        steps=[IRFlowStep(name="find", kind="find", target="User", params={"query": query})],
+    )
+    program = IRProgram(
+        frames={
+            "users": IRFrame(
+                name="users",
+                backend="sqlite",
+                url=ast_nodes.Literal(value=str(tmp_path / "app.db")),
+                table="users",
+            )
+        },
+        records={"User": record},
+        flows={"find_users": flow},
+    )
+    registry = ModelRegistry()
+    router = ModelRouter(registry)
+    tools = ToolRegistry()
+    engine = FlowEngine(program, registry, tools, AgentRunner(program, registry, tools, router), router)
+    for idx in range(40):
+        engine.frame_registry.insert("users", {"id": idx, "age": idx})
+    result = engine.run_flow(flow, ExecutionContext(app_name="test", request_id="req"))
+    assert not result.errors
+    assert [row["age"] for row in result.state.get("last_output")] == [28, 27, 26]
@@ -1,3 +1,5 @@
+import pytest
+
 from namel3ss.ir import ast_to_ir
 from namel3ss import parser
 from namel3ss.runtime.vectorstores import VectorStoreRegistry, InMemoryVectorBackend, EmbeddingClient
@@ -47,3 +49,45 @@ def test_query_empty_store():
     reg = build_registry()
     results = reg.query("kb", query_text="nothing", top_k=3)
     assert results == []
+
+
+def test_query_many_embeds_once_and_matches_single_queries():
+    reg = build_registry()
+    calls = []
+    original_embed = reg.embedding_client.embed
+
+    def counting_embed(model_name, texts):
+        calls.append(list(texts))
+        return original_embed(model_name, texts)
+
+    reg.embedding_client.embed = counting_embed
+    reg.index_texts("kb", ids=["1", "2", "3"], texts=["a", "bbbb", "cccccccc"])
+    calls.clear()
+    batched = reg.query_many("kb", ["x", "yyyyyyy"], top_k=2)
+    assert calls == [["x", "yyyyyyy"]]
+    assert batched == [reg.query("kb", "x", top_k=2), reg.query("kb", "yyyyyyy", top_k=2)]
+
+
+def test_ivf_backend_indexes_and_queries():
+    pytest.importorskip("numpy")
+    from namel3ss.runtime.vectorstores import RAGStoreBackend
+
+    reg = build_registry()
+    reg.configs["kb"].backend = "ivf"
+    reg.backends["ivf"] = RAGStoreBackend(approximate=True)
+    reg.index_texts("kb", ids=["1", "2"], texts=["hello", "world!"], metadata=[{"tag": "a"}, {"tag": "b"}])
+    results = reg.query("kb", query_text="hi", top_k=2)
+    assert {r["id"] for r in results} == {"1", "2"}
+    assert results[0]["metadata"]["tag"] in {"a", "b"}
+
+
+def test_memory_backend_with_path_persists(tmp_path):
+    pytest.importorskip("numpy")
+    reg = build_registry()
+    reg.configs["kb"].options = {"path": str(tmp_path / "kb")}
+    reg.index_texts("kb", ids=["1", "2"], texts=["hello", "world!"])
+    expected = reg.query("kb", query_text="hi", top_k=2)
+
+    reopened = build_registry()
+    reopened.configs["kb"].options = {"path": str(tmp_path / "kb")}
+    assert reopened.query("kb", query_text="hi", top_k=2) == expected
@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from namel3ss.errors import Namel3ssError
+from namel3ss.rag.models import RAGItem
+from namel3ss.rag.vectorstores.disk import VectorIndexFile
+from namel3ss.rag.vectorstores.ivf import IVFVectorStore
+from namel3ss.rag.vectorstores.memory import InMemoryVectorStore, np
+
+pytestmark = pytest.mark.skipif(np is None, reason="numpy not installed")
+
+
+def _items(count, dimension=8, seed=0, offset=0):
+    rng = np.random.default_rng(seed)
+    return [
+        RAGItem(id=str(offset + i), text=f"doc {offset + i}", metadata={"n": offset + i}, embedding=vec.tolist())
+        for i, vec in enumerate(rng.normal(size=(count, dimension)))
+    ]
+
+
+def _ids(results):
+    return [r.item.id for r in results]
+
+
+def test_reopened_index_matches_original(tmp_path):
+    items = _items(50)
+    store = InMemoryVectorStore(path=tmp_path / "idx")
+    store.add_sync(items)
+    query = items[3].embedding
+    expected = store.search(query, top_k=5)
+
+    reopened = InMemoryVectorStore(path=tmp_path / "idx")
+    results = reopened.search(query, top_k=5)
+    assert _ids(results) == _ids(expected)
+    assert [r.score for r in results] == pytest.approx([r.score for r in expected])
+    assert results[0].item.text == "doc 3"
+    assert results[0].item.metadata == {"n": 3}
+
+
+def test_deletes_appends_and_upserts_survive_reopen(tmp_path):
+    items = _items(20)
+    store = InMemoryVectorStore(path=tmp_path / "idx")
+    store.add_sync(items)
+    asyncio.run(store.a_delete(["0"]))
+    store.add_sync(_items(5, seed=1, offset=20))
+    store.add_sync([RAGItem(id="1", text="updated", embedding=items[2].embedding)])
+
+    reopened = InMemoryVectorStore(path=tmp_path / "idx")
+    assert len(reopened._items) == 24
+    assert "0" not in _ids(reopened.search(items[0].embedding, top_k=24))
+    top = reopened.search(items[2].embedding, top_k=2)
+    assert set(_ids(top)) == {"1", "2"}
+    assert reopened._items["1"].text == "updated"
+
+
+def test_compaction_rewrites_index(tmp_path):
+    items = _items(40)
+    store = InMemoryVectorStore(path=tmp_path / "idx", compact_ratio=0.25)
+    store.add_sync(items)
+    asyncio.run(store.a_delete([str(i) for i in range(20)]))
+    store.compact()
+    expected = store.search(items[30].embedding, top_k=5)
+
+    reopened = InMemoryVectorStore(path=tmp_path / "idx")
+    assert VectorIndexFile(tmp_path / "idx").rows == 20
+    assert _ids(reopened.search(items[30].embedding, top_k=5)) == _ids(expected)
+
+
+def test_interrupted_compaction_keeps_previous_generation(tmp_path, monkeypatch):
+    items = _items(40)
+    store = InMemoryVectorStore(path=tmp_path / "idx", compact_ratio=0.9)
+    store.add_sync(items)
+    asyncio.run(store.a_delete([str(i) for i in range(20)]))
+    expected = _ids(InMemoryVectorStore(path=tmp_path / "idx").search(items[30].embedding, top_k=5))
+
+    def crash(*args, **kwargs):
+        raise OSError("disk full")
+
+    # new-generation files are fully written, but the manifest never switches
+    monkeypatch.setattr(VectorIndexFile, "_publish", crash)
+    with pytest.raises(OSError):
+        store.compact()
+    monkeypatch.undo()
+    assert _ids(store.search(items[30].embedding, top_k=5)) == expected
+
+    reopened = InMemoryVectorStore(path=tmp_path / "idx")
+    assert VectorIndexFile(tmp_path / "idx").generation == 0
+    assert _ids(reopened.search(items[30].embedding, top_k=5)) == expected
+    assert reopened._items["30"].text == "doc 30"
+
+    reopened.compact()
+    assert VectorIndexFile(tmp_path / "idx").generation == 1
+    assert not (tmp_path / "idx" / "vectors.f32").exists()
+    assert _ids(InMemoryVectorStore(path=tmp_path / "idx").search(items[30].embedding, top_k=5)) == expected
+
+
+def test_uncommitted_rows_are_ignored(tmp_path):
+    store = InMemoryVectorStore(path=tmp_path / "idx")
+    store.add_sync(_items(10))
+    disk = VectorIndexFile(tmp_path / "idx")
+    # simulate a crash after the log was appended but before the manifest moved
+    disk.append_records([{"row": 10, "id": "ghost", "text": "", "metadata": {}, "source": None}])
+
+    reopened = InMemoryVectorStore(path=tmp_path / "idx")
+    assert "ghost" not in reopened._items
+    assert len(reopened._items) == 10
+
+
+def test_dimension_mismatch_is_rejected(tmp_path):
+    store = InMemoryVectorStore(path=tmp_path / "idx")
+    store.add_sync(_items(3, dimension=8))
+    with pytest.raises(Namel3ssError):
+        store.add_sync(_items(1, dimension=4, offset=3))
+
+
+def test_ivf_store_retrains_after_reopen(tmp_path):
+    items = _items(600, dimension=16)
+    store = IVFVectorStore(nlist=8, nprobe=8, train_threshold=500, path=tmp_path / "idx")
+    store.add_sync(items)
+    expected = store.search(items[7].embedding, top_k=5)
+
+    reopened = IVFVectorStore(nlist=8, nprobe=8, train_threshold=500, path=tmp_path / "idx")
+    assert reopened.trained
+    assert _ids(reopened.search(items[7].embedding, top_k=5)) == _ids(expected)
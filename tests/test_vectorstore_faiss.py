@@ -15,3 +15,24 @@ def test_faiss_vector_store_search():
     res = store.search([1.0, 0.0, 0.0], top_k=1)
     assert res
     assert res[0].item.id == "1"
+
+
+@pytest.mark.skipif(faiss is None, reason="faiss not installed")
+def test_faiss_reupsert_replaces_the_previous_vector(tmp_path):
+    store = FAISSVectorStore(dimension=3, path=str(tmp_path / "index"))
+    store.add_sync(
+        [
+            RAGItem(id="1", text="a", embedding=[1.0, 0.0, 0.0]),
+            RAGItem(id="2", text="b", embedding=[0.0, 1.0, 0.0]),
+            RAGItem(id="3", text="c", embedding=[0.0, 0.0, 1.0]),
+        ]
+    )
+    for _ in range(3):
+        store.add_sync([RAGItem(id="1", text="a2", embedding=[0.0, 0.9, 0.1])])
+    assert store.index.ntotal == 3
+
+    for reopened in (store, FAISSVectorStore(dimension=3, path=str(tmp_path / "index"))):
+        hits = reopened.search([1.0, 0.0, 0.0], top_k=3)
+        assert sorted(hit.item.id for hit in hits) == ["1", "2", "3"]
+        assert reopened.search([0.0, 1.0, 0.0], top_k=1)[0].item.id == "2"
+        assert reopened.search([0.0, 0.9, 0.1], top_k=1)[0].item.text == "a2"
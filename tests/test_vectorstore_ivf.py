@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from namel3ss.rag.factory import VectorStoreFactory
+from namel3ss.rag.models import RAGItem
+from namel3ss.rag.vectorstores.ivf import IVFVectorStore
+from namel3ss.rag.vectorstores.memory import InMemoryVectorStore, np
+from namel3ss.secrets.manager import SecretsManager
+
+pytestmark = pytest.mark.skipif(np is None, reason="numpy not installed")
+
+
+def _clustered_items(count, dimension=16, clusters=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dimension))
+    labels = rng.integers(0, clusters, size=count)
+    data = centers[labels] + 0.3 * rng.normal(size=(count, dimension))
+    return [RAGItem(id=str(i), text=f"doc {i}", embedding=vec.tolist()) for i, vec in enumerate(data)]
+
+
+def test_ivf_recall_against_exact_store():
+    items = _clustered_items(3000)
+    exact = InMemoryVectorStore()
+    exact.add_sync(items)
+    ivf = IVFVectorStore(nlist=32, nprobe=8, train_threshold=500)
+    ivf.add_sync(items)
+    assert ivf.trained
+    queries = [item.embedding for item in _clustered_items(50, seed=1)]
+    hits = 0
+    for expected, actual in zip(exact.search_many(queries, k=10), ivf.search_many(queries, k=10)):
+        hits += len({r.item.id for r in expected} & {r.item.id for r in actual})
+    assert hits / (10 * len(queries)) >= 0.9
+
+
+def test_ivf_exact_before_training_and_incremental_inserts():
+    items = _clustered_items(400)
+    ivf = IVFVectorStore(nlist=8, nprobe=8, train_threshold=300)
+    ivf.add_sync(items[:200])
+    assert not ivf.trained
+    ivf.add_sync(items[200:])
+    assert ivf.trained
+    # with every cluster probed the index is exact
+    query = items[7].embedding
+    assert ivf.search(query, top_k=1)[0].item.id == "7"
+    ivf.add_sync([RAGItem(id="new", text="new", embedding=query)])
+    assert {r.item.id for r in ivf.search(query, top_k=2)} == {"7", "new"}
+    asyncio.run(ivf.a_delete(["7"]))
+    assert ivf.search(query, top_k=1)[0].item.id == "new"
+
+
+def test_factory_builds_ivf_store_with_options():
+    factory = VectorStoreFactory(SecretsManager(env={}))
+    store = factory.get("ivf", {"name": "ann", "options": {"nlist": 4, "nprobe": 2}})
+    assert isinstance(store, IVFVectorStore)
+    assert store.nlist == 4 and store.nprobe == 2
@@ -1,7 +1,9 @@
 import asyncio
 
+import pytest
+
 from namel3ss.rag.models import RAGItem
-from namel3ss.rag.vectorstores.memory import InMemoryVectorStore
+from namel3ss.rag.vectorstores.memory import InMemoryVectorStore, np
 from namel3ss.rag.store import embed_text
 
 
@@ -18,3 +20,62 @@ def test_in_memory_vector_store_add_query_delete():
     asyncio.run(store.a_delete(["1"]))
     res2 = asyncio.run(store.a_query(embed_text("hello"), k=2))
     assert all(r.item.id != "1" for r in res2)
+
+
+@pytest.mark.skipif(np is None, reason="numpy not installed")
+def test_in_memory_vector_store_matrix_matches_python_scan():
+    texts = [f"doc {i} about topic {i % 7}" for i in range(200)]
+    items = [RAGItem(id=str(i), text=t, embedding=embed_text(t), source="idx") for i, t in enumerate(texts)]
+    matrix_store = InMemoryVectorStore()
+    scan_store = InMemoryVectorStore(use_matrix=False)
+    assert matrix_store.matrix_enabled and not scan_store.matrix_enabled
+    matrix_store.add_sync(items)
+    scan_store.add_sync(items)
+    query = embed_text("topic 3")
+    fast = matrix_store.search(query, top_k=10)
+    slow = scan_store.search(query, top_k=10)
+    assert [r.item.id for r in fast] == [r.item.id for r in slow]
+    assert all(abs(a.score - b.score) < 1e-5 for a, b in zip(fast, slow))
+
+
+@pytest.mark.skipif(np is None, reason="numpy not installed")
+def test_in_memory_vector_store_tombstones_and_compaction():
+    store = InMemoryVectorStore(compact_ratio=0.5)
+    store.add_sync([RAGItem(id=str(i), text=str(i), embedding=[float(i), 1.0]) for i in range(10)])
+    asyncio.run(store.a_delete(["9", "8"]))
+    assert store._matrix._tombstones == 2
+    res = store.search([1.0, 0.0], top_k=3)
+    assert [r.item.id for r in res] == ["7", "6", "5"]
+    asyncio.run(store.a_delete([str(i) for i in range(2, 8)]))
+    assert store._matrix._tombstones == 0
+    assert len(store._matrix) == 2
+    store.add_sync([RAGItem(id="1", text="1", embedding=[0.0, 1.0])])
+    res = store.search([0.0, 1.0], top_k=5)
+    assert [r.item.id for r in res] == ["0", "1"]
+
+
+def test_in_memory_vector_store_search_many_matches_search():
+    store = InMemoryVectorStore()
+    store.add_sync([RAGItem(id=str(i), text=str(i), embedding=embed_text(f"text {i}")) for i in range(30)])
+    queries = [embed_text("text 3"), embed_text("text 17"), [0.0] * 8]
+    batched = store.search_many(queries, k=4)
+    assert len(batched) == 3
+    for query, hits in zip(queries, batched):
+        assert [h.item.id for h in hits] == [h.item.id for h in store.search(query, top_k=4)]
+    assert asyncio.run(store.a_query_many(queries, k=4))[0][0].item.id == batched[0][0].item.id
+
+
+@pytest.mark.skipif(np is None, reason="numpy not installed")
+def test_repeated_id_in_one_batch_keeps_one_row():
+    store = InMemoryVectorStore()
+    store.add_sync(
+        [
+            RAGItem(id="a", text="first", embedding=embed_text("first"), source="idx"),
+            RAGItem(id="b", text="other", embedding=embed_text("other"), source="idx"),
+            RAGItem(id="a", text="second", embedding=embed_text("second"), source="idx"),
+        ]
+    )
+    assert len(store._matrix) == 2 and store._matrix.used == 2
+    hits = store.search(embed_text("second"), top_k=5)
+    assert [hit.item.id for hit in hits].count("a") == 1
+    assert hits[0].item.id == "a" and hits[0].item.text == "second"